@@ -223,7 +223,7 @@ class ACLSerializer(serializers.ModelSerializer[ACLBase]):
     ) -> None:
         # clear unset permissions of target ACLbased object
         permission: HistoricalPermission
-        for permission in role.permissions.filter(codename__startswith="%s." % acl_obj.id):
+        for permission in role.permissions.filter(object_permission__object_id=acl_obj.id):
             if acl_type == ACLType.Nothing:
                 permission.roles.remove(role)
             if acl_type.name != permission.name:
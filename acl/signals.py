@@ -1,14 +1,17 @@
 from typing import Any
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from airone.lib import permission_cache
 from airone.lib.acl import ACLType
 from category.models import Category
 from entity.models import Entity, EntityAttr
 from entry.models import Attribute, Entry
-from role.models import HistoricalPermission
+from group.models import Group
+from role.models import HistoricalPermission, Role
+from user.models import User
 
 from .models import ACLBase
 
@@ -66,3 +69,35 @@ def attribute_create_permission(
 ) -> None:
     if created:
         create_permission(instance)
+
+
+# These invalidate cached permission decisions (see airone.lib.permission_cache)
+@receiver(m2m_changed, sender=HistoricalPermission.roles.through)
+@receiver(m2m_changed, sender=Role.users.through)
+@receiver(m2m_changed, sender=Role.groups.through)
+@receiver(m2m_changed, sender=Role.admin_users.through)
+@receiver(m2m_changed, sender=Role.admin_groups.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_permission_cache_by_membership(sender: Any, action: str, **kwargs: Any) -> None:
+    if action.startswith("post_"):
+        permission_cache.invalidate()
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Role)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=HistoricalPermission)
+def invalidate_permission_cache_by_role(sender: Any, **kwargs: Any) -> None:
+    permission_cache.invalidate()
+
+
+@receiver(post_save)
+def forget_permission_decisions(
+    sender: Any, instance: Any, update_fields: Any = None, **kwargs: Any
+) -> None:
+    if not isinstance(instance, ACLBase):
+        return
+
+    if update_fields is None or {"is_public", "default_permission"} & set(update_fields):
+        permission_cache.forget_decisions(instance)
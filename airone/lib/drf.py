@@ -1,5 +1,5 @@
 from collections import OrderedDict
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from typing import IO, Any
 
 import yaml
@@ -12,6 +12,12 @@ from rest_framework.response import Response
 from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
 from rest_framework.views import exception_handler
 from yaml import SafeDumper
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.parser import Parser
+from yaml.reader import Reader
+from yaml.resolver import Resolver
+from yaml.scanner import Scanner
 
 from airone.lib.log import Logger
 from user.models import User
@@ -20,6 +26,57 @@ SafeDumper.add_representer(OrderedDict, yaml.representer.SafeRepresenter.represe
 SafeDumper.add_representer(ReturnDict, yaml.representer.SafeRepresenter.represent_dict)
 SafeDumper.add_representer(ReturnList, yaml.representer.SafeRepresenter.represent_list)
 
+# libyaml's loader parses large YAML (e.g. imported Items) much faster when it's available
+YAMLSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+if hasattr(yaml, "CSafeLoader"):
+    _YAMLEventParser = yaml.cyaml.CParser
+else:
+
+    class _YAMLEventParser(Reader, Scanner, Parser):  # type: ignore[no-redef]
+        def __init__(self, stream: IO[Any]):
+            Reader.__init__(self, stream)
+            Scanner.__init__(self)
+            Parser.__init__(self)
+
+
+class YAMLNotListError(ValueError):
+    """This is raised with the whole of the loaded data when a YAML isn't a list"""
+
+    def __init__(self, data: Any):
+        super().__init__("YAML is not a list")
+        self.data = data
+
+
+class YAMLListLoader(_YAMLEventParser, Composer, SafeConstructor, Resolver):  # type: ignore[misc]
+    """
+    This loads the items of the list at the top level of a YAML one by one, so that only
+    one of them is in memory at once (e.g. to validate a large file to be imported by
+    parts). Events are parsed by libyaml when it's available, as YAMLSafeLoader does.
+    """
+
+    def __init__(self, stream: IO[Any]):
+        _YAMLEventParser.__init__(self, stream)
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+
+    def iter_items(self) -> Iterator[Any]:
+        try:
+            self.get_event()  # StreamStartEvent
+            if self.check_event(yaml.StreamEndEvent):
+                raise YAMLNotListError(None)
+
+            self.get_event()  # DocumentStartEvent
+            if not self.check_event(yaml.SequenceStartEvent):
+                raise YAMLNotListError(self.construct_document(self.compose_node(None, None)))
+
+            self.get_event()
+            while not self.check_event(yaml.SequenceEndEvent):
+                yield self.construct_document(self.compose_node(None, None))
+        finally:
+            self.dispose()
+
 
 class YAMLParser(BaseParser):
     """
@@ -42,12 +99,29 @@ class YAMLParser(BaseParser):
 
         try:
             data = stream.read().decode(encoding)
-            loaded: dict[str, object] = yaml.safe_load(data)
+            loaded: dict[str, object] = yaml.load(data, Loader=YAMLSafeLoader)
             return loaded
         except (ValueError, yaml.parser.ParserError, yaml.scanner.ScannerError) as exc:
             raise ParseError("YAML parse error - %s" % str(exc))
 
 
+class YAMLStreamParser(BaseParser):
+    """
+    Accepts YAML without parsing it, and returns the incoming bytestream as it is
+    (e.g. to stage a large file to be parsed by a job instead of the request).
+    """
+
+    media_type = "application/yaml"
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: str | None = None,
+        parser_context: "Mapping[str, Any] | None" = None,
+    ) -> IO[bytes]:
+        return stream
+
+
 class YAMLRenderer(BaseRenderer):
     """
     Renders JSON-serialized data.
@@ -100,10 +174,6 @@ class InvalidValueError(ValidationError):
     default_code = "AE-250000"
 
 
-class FrequentImportError(ValidationError):
-    default_code = "AE-260000"
-
-
 class JobIsNotDoneError(ValidationError):
     default_code = "AE-270000"
 
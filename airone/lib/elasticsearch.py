@@ -1,5 +1,8 @@
 import enum
+import hashlib
+import json
 import re
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any, NotRequired
 
@@ -8,7 +11,7 @@ from elasticsearch import Elasticsearch
 from pydantic import BaseModel
 from typing_extensions import TypedDict
 
-from airone.lib.acl import ACLType
+from airone.lib.acl import ACLType, filter_permitted
 from airone.lib.es_inmemory import InMemoryElasticsearch
 from airone.lib.log import Logger
 from airone.lib.types import AttrType, BaseIntEnum, coerce_number
@@ -94,6 +97,9 @@ class EntryDocument(TypedDict):
     attr: list[AttributeDocument]
     referrals: list[dict[str, str | int | dict[str, str | int]]]
     is_readable: bool
+    # Digest of the fields above (see get_document_hash()), which lets writers skip
+    # registering a document that is same with the stored one.
+    content_hash: NotRequired[str]
 
 
 class ESS(Elasticsearch):
@@ -128,6 +134,9 @@ class ESS(Elasticsearch):
     def index(self, **kwargs: Any) -> Any:
         return super(ESS, self).index(index=self._index, **kwargs)
 
+    def mget(self, **kwargs: Any) -> Any:
+        return super(ESS, self).mget(index=self._index, **kwargs)
+
     def search(self, **kwargs: Any) -> dict[str, Any]:  # type: ignore[override]
         # expand max_result_window parameter which indicates numbers to return at one searching
         if not self.additional_config:
@@ -147,6 +156,59 @@ class ESS(Elasticsearch):
 
         return dict(super(ESS, self).search(index=self._index, **kwargs))
 
+    def get_content_hashes(self, ids: list[int]) -> dict[int, str]:
+        """
+        This returns content_hash of stored documents of specified IDs. Documents that
+        don't exist or that were registered before content_hash was introduced are omitted.
+
+        NOTE:
+          Documents are read by the realtime multi get API instead of searching them,
+          because documents that are written without refreshing the index (e.g. by imports)
+          aren't seen by searches until the next refresh.
+        """
+        if not ids:
+            return {}
+
+        res = self.mget(ids=[str(x) for x in ids], source_includes=["content_hash"])
+        return {
+            int(x["_id"]): x["_source"]["content_hash"]
+            for x in res["docs"]
+            if x.get("found") and x.get("_source", {}).get("content_hash")
+        }
+
+    def iterate_hits(
+        self, query: dict[str, Any], source: Any = True, size: int = 1000
+    ) -> Iterator[dict[str, Any]]:
+        """
+        This yields every hit of the query by pages of the specified size, without being
+        capped by max_result_window. Pages are read from a point in time with search_after,
+        so documents that are written while iterating are neither skipped nor repeated.
+        """
+        pit_id: str = self.open_point_in_time(index=self._index, keep_alive="1m")["id"]
+        try:
+            search_after: list[Any] | None = None
+            while True:
+                body: dict[str, Any] = {
+                    "query": query,
+                    "_source": source,
+                    "sort": [{"_shard_doc": "asc"}],
+                    "pit": {"id": pit_id, "keep_alive": "1m"},
+                }
+                if search_after is not None:
+                    body["search_after"] = search_after
+
+                # The index is bound to the point in time, so it must not be specified here.
+                res = super(ESS, self).search(body=body, size=size)
+                pit_id = res.get("pit_id", pit_id)
+
+                hits = res["hits"]["hits"]
+                yield from hits
+                if len(hits) < size:
+                    break
+                search_after = hits[-1]["sort"]
+        finally:
+            self.close_point_in_time(id=pit_id)
+
     def recreate_index(self) -> None:
         self.indices.delete(index=self._index, ignore_unavailable=True)
         self.indices.create(
@@ -262,6 +324,10 @@ class ESS(Elasticsearch):
                         "type": "boolean",
                         "index": "true",
                     },
+                    "content_hash": {
+                        "type": "keyword",
+                        "index": "false",
+                    },
                 }
             },
         )
@@ -309,11 +375,48 @@ class InMemoryESS(ESS):
         kwargs.setdefault("index", self._index)
         return self._engine.get(**kwargs)
 
+    def mget(self, **kwargs: Any) -> Any:
+        kwargs.setdefault("index", self._index)
+        return self._engine.mget(**kwargs)
+
     def search(self, **kwargs: Any) -> dict[str, Any]:  # type: ignore[override]
         if "size" not in kwargs:
             kwargs["size"] = settings.ES_CONFIG["MAXIMUM_RESULTS_NUM"]
         return self._engine.search(index=self._index, **kwargs)
 
+    def iterate_hits(
+        self, query: dict[str, Any], source: Any = True, size: int = 1000
+    ) -> Iterator[dict[str, Any]]:
+        # There is no point in time to open: the index order that "_shard_doc" follows is
+        # kept for documents that are updated while iterating.
+        search_after: list[Any] | None = None
+        while True:
+            body: dict[str, Any] = {
+                "query": query,
+                "_source": source,
+                "sort": [{"_shard_doc": "asc"}],
+            }
+            if search_after is not None:
+                body["search_after"] = search_after
+
+            hits = self._engine.search(index=self._index, body=body, size=size)["hits"]["hits"]
+            yield from hits
+            if len(hits) < size:
+                break
+            search_after = hits[-1]["sort"]
+
+
+def get_document_hash(document: EntryDocument | dict[str, Any]) -> str:
+    """
+    This returns a digest of the es-document that doesn't depend on the order of its keys,
+    so a document that is built from the database can be compared with the one that is
+    returned by Elasticsearch. The content_hash field itself is not a part of it.
+    """
+    content = {k: v for (k, v) in document.items() if k != "content_hash"}
+    return hashlib.sha1(
+        json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+
 
 def make_query(
     hint_entity: Entity,
@@ -1173,7 +1276,7 @@ def make_search_results(
             that was hit in the search
 
     """
-    from entry.models import Entry
+    from entry.models import Attribute, Entry
 
     # set numbers of found entries
     results = AdvancedSearchResults(
@@ -1199,6 +1302,49 @@ def make_search_results(
             continue
         ordered_hits.append((entry, hit["_source"]))
 
+    # Permissions of Entries and Attributes, which are not readable for everyone, are resolved
+    # at once for all hits instead of checking them one by one.
+    readable_entry_ids: set[int] = set()
+    if user is not None:
+        readable_entry_ids = {
+            x.id
+            for x in filter_permitted(
+                user,
+                [entry for (entry, entry_info) in ordered_hits if not entry_info["is_readable"]],
+                ACLType.Readable,
+            )
+        }
+
+    readable_hint_names = [x.name for x in hint_attrs if x.is_readable]
+    attr_check_entry_ids = {
+        entry.id
+        for (entry, entry_info) in ordered_hits
+        if any(
+            not x["is_readable"] and x["name"] in readable_hint_names for x in entry_info["attr"]
+        )
+    }
+    attrs_to_check: dict[tuple[int, str], Attribute] = {}
+    if attr_check_entry_ids:
+        # The first Attribute of each name is used as well as QuerySet.first() does
+        for attr in (
+            Attribute.objects.filter(
+                parent_entry__in=attr_check_entry_ids,
+                schema__name__in=readable_hint_names,
+                is_active=True,
+            )
+            .select_related("schema")
+            .order_by("-id")
+        ):
+            attrs_to_check[(attr.parent_entry_id, attr.schema.name)] = attr
+    readable_attr_ids = {
+        x.id
+        for x in (
+            attrs_to_check.values()
+            if user is None
+            else filter_permitted(user, attrs_to_check.values(), ACLType.Readable)
+        )
+    }
+
     for entry, entry_info in ordered_hits:
         record = AdvancedSearchResultRecord(
             entity={"id": entry.schema.id, "name": entry.schema.name},
@@ -1211,11 +1357,7 @@ def make_search_results(
             record.referrals = entry_info.get("referrals", [])
 
         # Check for has permission to Entry. But it will be omitted when user is None.
-        if (
-            entry_info["is_readable"]
-            or user is None
-            or user.has_permission(entry, ACLType.Readable)
-        ):
+        if entry_info["is_readable"] or user is None or entry.id in readable_entry_ids:
             record.is_readable = True
         else:
             record.is_readable = False
@@ -1251,7 +1393,7 @@ def make_search_results(
 
             # Check for has permission to Attribute
             if not attrinfo["is_readable"]:
-                attr = entry.attrs.filter(schema__name=attrinfo["name"], is_active=True).first()
+                attr = attrs_to_check.get((entry.id, attrinfo["name"]))
                 if not attr:
                     Logger.warning(
                         "Non exist Attribute (entry:%s, name:%s) is registered in ESS."
@@ -1259,7 +1401,7 @@ def make_search_results(
                     )
                     continue
 
-                if not user.has_permission(attr, ACLType.Readable):
+                if attr.id not in readable_attr_ids:
                     ret_attrinfo["is_readable"] = False
                     continue
 
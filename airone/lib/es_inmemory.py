@@ -14,8 +14,19 @@ Supported clauses: ``match_all``, ``ids``, ``term``, ``match``, ``regexp``,
 ``range``, ``exists``, ``bool`` (must / filter / should / must_not /
 minimum_should_match) and ``nested`` (including ``inner_hits``). Supported
 response features: ``_source`` filtering, ``from`` / ``size``,
-``track_total_hits``, sorting (plain, ``_score`` and nested-filtered) and the
-nested → filter → terms aggregation used by the "duplicated values" filter.
+``track_total_hits``, sorting (plain, ``_score``, ``_shard_doc`` and
+nested-filtered) with ``search_after`` paging, and the nested → filter → terms
+aggregation used by the "duplicated values" filter.
+
+Queries are planned before they are evaluated. Every index keeps per-field
+postings (value -> document ids) for each scalar leaf of its documents,
+including the nested ``attr.*``, ``entity.*`` and ``referrals.*`` paths, and
+updates them as documents are written. ``term`` / ``terms`` / ``ids`` /
+``exists`` clauses -- and the ``bool`` / ``nested`` clauses built from them --
+narrow the search to a candidate set from those postings; only the candidates
+are then evaluated clause by clause, which is what keeps nested semantics and
+``regexp`` / ``range`` exact. A query with nothing to plan on falls back to
+scanning every document, as it always did.
 
 Known divergences from a real cluster, all of them benign for local work:
 
@@ -38,15 +49,38 @@ import os
 import re
 import threading
 from datetime import date, datetime
-from typing import Any
+from typing import Any, TextIO
 
 from elasticsearch import NotFoundError
 
+from airone.lib.log import Logger
+
 # Sentinel used to sort documents that have no value for a sort key. Mirrors
 # Elasticsearch's default ``"missing": "_last"`` for both sort directions.
 _MISSING = object()
 
 
+class _Paths:
+    """Where one index is persisted: a snapshot plus an append-only operation log."""
+
+    __slots__ = ("snapshot", "log", "compacting", "legacy")
+
+    def __init__(self, root: str, index: str) -> None:
+        base = os.path.join(root, re.sub(r"[^A-Za-z0-9_.-]", "_", index))
+        self.snapshot = base + ".snapshot"
+        self.log = base + ".log"
+        # The log being folded into a snapshot by a compaction in progress.
+        self.compacting = base + ".log.compacting"
+        # The single JSON file indices were persisted as before the log.
+        self.legacy = base + ".json"
+
+
+#: Operations appended to an index's log before a compaction is considered.
+#: The actual threshold also scales with the index size, which keeps the cost
+#: of rewriting the snapshot amortised O(1) per write.
+_COMPACT_MIN_OPERATIONS = 1000
+
+
 class _Store:
     """Process-wide document storage, keyed by index name then document id.
 
@@ -55,12 +89,26 @@ class _Store:
     re-index, which reads as a bug rather than a restart; persisting the index
     next to the SQLite file keeps the two in step. Tests disable persistence
     (see ``AironeTestCase``) so they stay isolated and fast.
+
+    Every write is appended to the index's operation log as one JSON line, so
+    it costs O(document) rather than a rewrite of the whole index. Once the
+    log outgrows the index, a background thread folds it into a JSON
+    snapshot, which doesn't depend on the Python version. Loading an index
+    reads the snapshot and replays whatever log is left; replaying is
+    idempotent, so a compaction that died halfway through loses nothing.
     """
 
     def __init__(self) -> None:
         self._lock = threading.RLock()
         self._indices: dict[str, dict[str, dict[str, Any]]] = {}
+        self._postings: dict[str, _Postings] = {}
         self._loaded: set[str] = set()
+        self._logs: dict[str, TextIO] = {}
+        self._pending: dict[str, int] = {}
+        # Bumped whenever an index is recreated, dropped or forgotten, so a
+        # compaction that started before that does not resurrect old documents.
+        self._generations: dict[str, int] = {}
+        self._compactions: dict[str, threading.Thread] = {}
 
     @staticmethod
     def _persist_root() -> str | None:
@@ -69,64 +117,222 @@ class _Store:
         path = settings.ES_CONFIG.get("PERSIST_PATH")
         return str(path) if path else None
 
-    def _persist_file(self, index: str) -> str | None:
+    def _persist_paths(self, index: str) -> _Paths | None:
         root = self._persist_root()
         if not root:
             return None
-        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", index)
-        return os.path.join(root, "%s.json" % safe)
+        return _Paths(root, index)
 
     def _load(self, index: str) -> None:
         if index in self._loaded:
             return
         self._loaded.add(index)
 
-        path = self._persist_file(index)
-        if not path or not os.path.exists(path):
+        paths = self._persist_paths(index)
+        if not paths:
             return
-        try:
-            with open(path, encoding="utf-8") as handle:
-                self._indices[index] = json.load(handle)
-        except (OSError, ValueError):
-            # A corrupt dev index is not worth failing a request over; the
-            # next re-index rebuilds it.
-            self._indices[index] = {}
+
+        docs = self._indices[index] = _read_snapshot(paths)
+        for log in (paths.compacting, paths.log):
+            self._pending[index] = self._pending.get(index, 0) + _replay(log, docs)
+
+        postings = self._postings[index] = _Postings()
+        for doc_id, source in docs.items():
+            postings.add(doc_id, source)
+
+    def _append(self, index: str, operation: dict[str, Any]) -> None:
+        paths = self._persist_paths(index)
+        if not paths:
+            return
+        handle = self._logs.get(paths.log)
+        if handle is None:
+            os.makedirs(os.path.dirname(paths.log), exist_ok=True)
+            handle = self._logs[paths.log] = open(paths.log, "a", encoding="utf-8")
+        handle.write(json.dumps(operation, separators=(",", ":")) + "\n")
+        self._pending[index] = self._pending.get(index, 0) + 1
+
+    def _close_log(self, paths: _Paths) -> None:
+        handle = self._logs.pop(paths.log, None)
+        if handle is not None:
+            handle.close()
 
     def flush(self, index: str) -> None:
-        path = self._persist_file(index)
-        if not path:
+        """Push logged writes to the OS and compact the log once it has grown."""
+        with self._lock:
+            paths = self._persist_paths(index)
+            if not paths:
+                return
+            handle = self._logs.get(paths.log)
+            if handle is not None:
+                handle.flush()
+
+            threshold = max(_COMPACT_MIN_OPERATIONS, len(self._indices.get(index, {})))
+            running = self._compactions.get(index)
+            if self._pending.get(index, 0) > threshold and not (running and running.is_alive()):
+                thread = threading.Thread(
+                    target=self.compact, args=(index,), name="es-inmemory-compact", daemon=True
+                )
+                self._compactions[index] = thread
+                thread.start()
+
+    def compact(self, index: str) -> None:
+        """Fold the operation log into a fresh snapshot.
+
+        Only the hand-over happens under the lock: the current log is renamed
+        aside and new writes start a fresh one. Serialising the snapshot, the
+        expensive part, runs without blocking readers or writers.
+        """
+        with self._lock:
+            paths = self._persist_paths(index)
+            if not paths:
+                return
+            self._load(index)
+            generation = self._generations.get(index, 0)
+            docs = dict(self._indices.get(index, {}))
+            self._close_log(paths)
+            if os.path.exists(paths.log):
+                if os.path.exists(paths.compacting):
+                    # An earlier compaction never finished; keep both logs.
+                    with open(paths.log, encoding="utf-8") as src:
+                        with open(paths.compacting, "a", encoding="utf-8") as dst:
+                            dst.write(src.read())
+                    os.unlink(paths.log)
+                else:
+                    os.replace(paths.log, paths.compacting)
+            self._pending[index] = 0
+
+        tmp = paths.snapshot + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as handle:
+                json.dump(docs, handle, separators=(",", ":"))
+        except (OSError, ValueError):
+            # Nothing is lost: the renamed log is replayed on the next load.
             return
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        tmp = path + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as handle:
-            json.dump(self._indices.get(index, {}), handle)
-        os.replace(tmp, path)
+
+        with self._lock:
+            if self._generations.get(index, 0) != generation:
+                os.unlink(tmp)
+                return
+            os.replace(tmp, paths.snapshot)
+            for path in (paths.compacting, paths.legacy):
+                if os.path.exists(path):
+                    os.unlink(path)
 
     def docs(self, index: str) -> dict[str, dict[str, Any]]:
+        """The documents of an index, for reading. Write through ``put``/``remove``."""
         with self._lock:
             self._load(index)
             return self._indices.setdefault(index, {})
 
+    def postings(self, index: str) -> "_Postings":
+        with self._lock:
+            self._load(index)
+            return self._postings.setdefault(index, _Postings())
+
+    def put(self, index: str, doc_id: str, source: dict[str, Any]) -> None:
+        with self._lock:
+            docs = self.docs(index)
+            postings = self.postings(index)
+            previous = docs.get(doc_id)
+            if previous is not None:
+                postings.discard(doc_id, previous)
+            docs[doc_id] = source
+            postings.add(doc_id, source)
+            self._append(index, {"put": doc_id, "source": source})
+
+    def remove(self, index: str, doc_id: str) -> bool:
+        """Drop a document; returns whether there was one to drop."""
+        with self._lock:
+            previous = self.docs(index).pop(doc_id, None)
+            if previous is None:
+                return False
+            self.postings(index).discard(doc_id, previous, forget=True)
+            self._append(index, {"remove": doc_id})
+            return True
+
     def create(self, index: str) -> None:
         with self._lock:
-            self._loaded.add(index)
+            self.drop(index)
             self._indices[index] = {}
-            self.flush(index)
+            self._postings[index] = _Postings()
+            paths = self._persist_paths(index)
+            if paths:
+                os.makedirs(os.path.dirname(paths.snapshot), exist_ok=True)
+                with open(paths.snapshot, "w", encoding="utf-8") as handle:
+                    json.dump({}, handle)
 
     def drop(self, index: str) -> None:
         with self._lock:
             self._loaded.add(index)
+            self._generations[index] = self._generations.get(index, 0) + 1
             self._indices.pop(index, None)
-            path = self._persist_file(index)
-            if path and os.path.exists(path):
-                os.unlink(path)
+            self._postings.pop(index, None)
+            self._pending.pop(index, None)
+            paths = self._persist_paths(index)
+            if not paths:
+                return
+            self._close_log(paths)
+            for path in (paths.snapshot, paths.log, paths.compacting, paths.legacy):
+                if os.path.exists(path):
+                    os.unlink(path)
 
     def reset(self) -> None:
         with self._lock:
+            for handle in self._logs.values():
+                handle.close()
+            self._logs.clear()
+            for index in self._indices:
+                self._generations[index] = self._generations.get(index, 0) + 1
             self._indices.clear()
+            self._postings.clear()
+            self._pending.clear()
             self._loaded.clear()
 
 
+def _read_snapshot(paths: _Paths) -> dict[str, dict[str, Any]]:
+    for path in (paths.snapshot, paths.legacy):
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, encoding="utf-8") as handle:
+                docs = json.load(handle)
+            if isinstance(docs, dict):
+                return docs
+        except (OSError, ValueError):
+            pass
+
+        # A corrupt dev index is not worth failing a request over; the next
+        # re-index rebuilds it. The unreadable file is kept aside rather than
+        # overwritten by the next compaction, in case it's worth recovering.
+        Logger.warning("unreadable in-memory search index is moved to %s.unreadable", path)
+        try:
+            os.replace(path, path + ".unreadable")
+        except OSError:
+            pass
+        return {}
+    return {}
+
+
+def _replay(path: str, docs: dict[str, dict[str, Any]]) -> int:
+    """Apply a logged operation sequence to ``docs``; returns how many were read."""
+    if not os.path.exists(path):
+        return 0
+    count = 0
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                operation = json.loads(line)
+            except ValueError:
+                # A line torn by a crash mid-write; everything before it stands.
+                continue
+            if "put" in operation:
+                docs[operation["put"]] = operation["source"]
+            else:
+                docs.pop(operation["remove"], None)
+            count += 1
+    return count
+
+
 STORE = _Store()
 
 
@@ -311,6 +517,170 @@ def _as_datetime(value: Any) -> datetime | None:
     return parsed
 
 
+# ---------------------------------------------------------------------------
+# postings and query planning
+# ---------------------------------------------------------------------------
+
+
+class _Postings:
+    """Per-field inverted index over one index's documents.
+
+    Keys are the same text forms ``_equals`` compares, so a lookup returns
+    exactly the documents a ``term`` clause would match somewhere in them.
+    Booleans are kept apart because ``_equals`` lowercases the query value
+    only when the stored value is a boolean.
+
+    Postings are document-level: they do not know which nested sub-document a
+    value came from. That makes every planned candidate set a superset of the
+    real result, never a subset, and the evaluator settles the rest.
+    """
+
+    __slots__ = ("terms", "booleans", "present", "order", "_sequence")
+
+    def __init__(self) -> None:
+        self.terms: dict[str, dict[str, set[str]]] = {}
+        self.booleans: dict[str, dict[str, set[str]]] = {}
+        self.present: dict[str, set[str]] = {}
+        # First-insertion order of every document, so a planned search returns
+        # hits in the same order as a scan of the (insertion-ordered) docs.
+        self.order: dict[str, int] = {}
+        self._sequence = 0
+
+    def add(self, doc_id: str, source: dict[str, Any]) -> None:
+        if doc_id not in self.order:
+            self.order[doc_id] = self._sequence
+            self._sequence += 1
+        for field, value in _leaves(source):
+            self.present.setdefault(field, set()).add(doc_id)
+            if value is None or isinstance(value, dict):
+                continue
+            table = self.booleans if isinstance(value, bool) else self.terms
+            table.setdefault(field, {}).setdefault(_as_text(value) or "", set()).add(doc_id)
+
+    def discard(self, doc_id: str, source: dict[str, Any], forget: bool = False) -> None:
+        for field, value in _leaves(source):
+            _discard(self.present, field, doc_id)
+            if value is None or isinstance(value, dict):
+                continue
+            table = self.booleans if isinstance(value, bool) else self.terms
+            values = table.get(field)
+            if values is not None:
+                _discard(values, _as_text(value) or "", doc_id)
+                if not values:
+                    del table[field]
+        if forget:
+            self.order.pop(doc_id, None)
+
+    def lookup(self, field: str, wanted: Any) -> set[str]:
+        """Documents holding a value at ``field`` that ``_equals`` ``wanted``."""
+        field = _strip_keyword(field)
+        text = _as_text(wanted)
+        if text is None:
+            return set()
+        found = set(self.terms.get(field, {}).get(text, ()))
+        found.update(self.booleans.get(field, {}).get(text.lower(), ()))
+        return found
+
+    def plan(self, clause: dict[str, Any]) -> set[str] | None:
+        """Candidate document ids for a clause, or ``None`` when it cannot narrow.
+
+        Only clauses that can be answered from the postings narrow anything;
+        ``regexp``, ``range`` and ``must_not`` return ``None`` and leave the
+        decision to the per-document evaluation.
+        """
+        if len(clause) != 1:
+            raise ValueError("query clause must have exactly one key: %r" % sorted(clause))
+
+        ((kind, body),) = clause.items()
+
+        match kind:
+            case "match_all" | "regexp" | "range":
+                return None
+            case "match_none":
+                return set()
+            case "ids":
+                return {str(x) for x in body.get("values", [])}
+            case "term" | "match" | "match_phrase":
+                ((field, wanted),) = body.items()
+                if isinstance(wanted, dict):
+                    wanted = wanted.get("value", wanted.get("query"))
+                return self.lookup(field, wanted)
+            case "terms":
+                ((field, wanted_list),) = body.items()
+                found: set[str] = set()
+                for wanted in wanted_list:
+                    found |= self.lookup(field, wanted)
+                return found
+            case "exists":
+                return set(self.present.get(_strip_keyword(body["field"]), ()))
+            case "bool":
+                return self._plan_bool(body)
+            case "nested":
+                query = body.get("query")
+                return None if query is None else self.plan(query)
+            case _:
+                raise ValueError("unsupported query clause for lite mode: %r" % kind)
+
+    def _plan_bool(self, body: dict[str, Any]) -> set[str] | None:
+        must = _as_clause_list(body.get("must"))
+        filters = _as_clause_list(body.get("filter"))
+        should = _as_clause_list(body.get("should"))
+
+        narrowed = [self.plan(clause) for clause in must + filters]
+        sets = [found for found in narrowed if found is not None]
+
+        default_minimum = 0 if (must or filters) else 1
+        if should and int(body.get("minimum_should_match", default_minimum)) > 0:
+            # A document must match at least one "should" clause, so the union
+            # of their candidates bounds the result -- unless one of them
+            # cannot be planned, in which case nothing is known.
+            union: set[str] = set()
+            for clause in should:
+                found = self.plan(clause)
+                if found is None:
+                    break
+                union |= found
+            else:
+                sets.append(union)
+
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def ordered(self, candidates: set[str]) -> list[str]:
+        return sorted((c for c in candidates if c in self.order), key=self.order.__getitem__)
+
+
+def _leaves(value: Any, path: str = "") -> list[tuple[str, Any]]:
+    """``(field path, value)`` for every non-null value a document holds.
+
+    Lists are transparent the way ``_traverse`` treats them, and objects are
+    reported as well as their children so ``exists`` can be planned on them.
+    """
+    out: list[tuple[str, Any]] = []
+    if isinstance(value, list):
+        for item in value:
+            out.extend(_leaves(item, path))
+    elif isinstance(value, dict):
+        if path:
+            out.append((path, value))
+        for key, item in value.items():
+            out.extend(_leaves(item, "%s.%s" % (path, key) if path else key))
+    elif value is not None:
+        out.append((path, value))
+    return out
+
+
+def _discard(table: dict[str, set[str]], key: str, doc_id: str) -> None:
+    ids = table.get(key)
+    if ids is None:
+        return
+    ids.discard(doc_id)
+    if not ids:
+        del table[key]
+
+
 # ---------------------------------------------------------------------------
 # query evaluation
 # ---------------------------------------------------------------------------
@@ -712,6 +1082,15 @@ def _run_aggregation(spec: dict[str, Any], scopes: list[Scope]) -> dict[str, Any
 # ---------------------------------------------------------------------------
 
 
+def _candidate_docs(index: str, query: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    """The documents worth evaluating ``query`` against, in index order."""
+    docs = STORE.docs(index)
+    candidates = STORE.postings(index).plan(query)
+    if candidates is None:
+        return list(docs.items())
+    return [(doc_id, docs[doc_id]) for doc_id in STORE.postings(index).ordered(candidates)]
+
+
 class _Indices:
     """The ``client.indices`` namespace, reduced to what Pagoda calls."""
 
@@ -747,47 +1126,43 @@ class InMemoryElasticsearch:
 
     def index(self, *, id: Any, body: dict[str, Any], index: str | None = None, **_: Any) -> Any:
         index_name = index or self._index
-        STORE.docs(index_name)[str(id)] = body
+        STORE.put(index_name, str(id), body)
         STORE.flush(index_name)
         return {"result": "created", "_id": str(id)}
 
     def delete(self, *, id: Any, index: str | None = None, **_: Any) -> Any:
         index_name = index or self._index
-        docs = STORE.docs(index_name)
-        if str(id) not in docs:
+        if not STORE.remove(index_name, str(id)):
             raise NotFoundError("document not found: %s" % id, meta=None, body=None)  # type: ignore[arg-type]
-        del docs[str(id)]
         STORE.flush(index_name)
         return {"result": "deleted"}
 
     def bulk(self, *, body: list[dict[str, Any]], index: str | None = None, **_: Any) -> Any:
         index_name = index or self._index
-        docs = STORE.docs(index_name)
         pending_id: str | None = None
         for element in body:
             if pending_id is None:
                 action, meta = next(iter(element.items()))
                 if action == "delete":
-                    docs.pop(str(meta["_id"]), None)
+                    STORE.remove(index_name, str(meta["_id"]))
                     continue
                 pending_id = str(meta["_id"])
             else:
-                docs[pending_id] = element
+                STORE.put(index_name, pending_id, element)
                 pending_id = None
         STORE.flush(index_name)
         return {"errors": False, "items": []}
 
     def delete_by_query(self, *, query: dict[str, Any], index: str | None = None, **_: Any) -> Any:
         index_name = index or self._index
-        docs = STORE.docs(index_name)
         collector = _InnerHitCollector()
         doomed = [
             doc_id
-            for doc_id, source in list(docs.items())
+            for doc_id, source in _candidate_docs(index_name, query)
             if _score_clause(query, Scope(source, doc_id), collector) is not None
         ]
         for doc_id in doomed:
-            del docs[doc_id]
+            STORE.remove(index_name, doc_id)
         STORE.flush(index_name)
         return {"deleted": len(doomed), "failures": [], "timed_out": False}
 
@@ -806,6 +1181,29 @@ class InMemoryElasticsearch:
             raise NotFoundError("document not found: %s" % id, meta=None, body=None)  # type: ignore[arg-type]
         return {"_index": index_name, "_id": str(id), "found": True, "_source": docs[str(id)]}
 
+    def mget(
+        self,
+        *,
+        ids: list[Any],
+        index: str | None = None,
+        source_includes: list[str] | None = None,
+        **_: Any,
+    ) -> Any:
+        index_name = index or self._index
+        docs = STORE.docs(index_name)
+        results: list[dict[str, Any]] = []
+        for doc_id in [str(x) for x in ids]:
+            if doc_id not in docs:
+                results.append({"_index": index_name, "_id": doc_id, "found": False})
+                continue
+
+            source = docs[doc_id]
+            if source_includes is not None:
+                source = {k: v for (k, v) in source.items() if k in source_includes}
+            results.append({"_index": index_name, "_id": doc_id, "found": True, "_source": source})
+
+        return {"docs": results}
+
     def search(
         self,
         *,
@@ -817,7 +1215,6 @@ class InMemoryElasticsearch:
     ) -> dict[str, Any]:
         body = dict(body or {})
         index_name = index or self._index
-        docs = STORE.docs(index_name)
 
         query = body.get("query", {"match_all": {}})
         source_filter = body.get("_source")
@@ -827,7 +1224,7 @@ class InMemoryElasticsearch:
 
         matched: list[tuple[str, dict[str, Any], _InnerHitCollector]] = []
         scopes: list[Scope] = []
-        for doc_id, source in docs.items():
+        for doc_id, source in _candidate_docs(index_name, query):
             collector = _InnerHitCollector()
             scope = Scope(source, doc_id)
             score = _score_clause(query, scope, collector)
@@ -836,22 +1233,31 @@ class InMemoryElasticsearch:
                 matched.append((doc_id, source, collector))
                 scopes.append(scope)
 
-        if sort_clauses:
+        # ``_shard_doc`` is the index order, which is what a single shard reports.
+        order = STORE.postings(index_name).order
 
-            def sort_key(
-                item: tuple[str, dict[str, Any], _InnerHitCollector],
-            ) -> tuple[_SortKey, ...]:
-                return tuple(
-                    _SortKey(
-                        _sort_value(item[1], item[0], item[2].score, field, spec),
-                        spec.get("order", "asc") == "desc",
-                    )
-                    for field, spec in sort_clauses
-                )
+        def sort_values(item: tuple[str, dict[str, Any], _InnerHitCollector]) -> list[Any]:
+            return [
+                order.get(item[0], _MISSING)
+                if field == "_shard_doc"
+                else _sort_value(item[1], item[0], item[2].score, field, spec)
+                for field, spec in sort_clauses
+            ]
 
-            matched.sort(key=sort_key)
+        def sort_key(values: list[Any]) -> tuple[_SortKey, ...]:
+            return tuple(
+                _SortKey(value, spec.get("order", "asc") == "desc")
+                for value, (_, spec) in zip(values, sort_clauses)
+            )
+
+        if sort_clauses:
+            matched.sort(key=lambda item: sort_key(sort_values(item)))
 
         total = len(matched)
+        if sort_clauses and body.get("search_after") is not None:
+            # Like ES, search_after pages past the hits that sort up to the given values.
+            after = sort_key(body["search_after"])
+            matched = [x for x in matched if after < sort_key(sort_values(x))]
         window = matched[offset:] if limit is None else matched[offset : offset + int(limit)]
 
         hits = [
@@ -861,6 +1267,16 @@ class InMemoryElasticsearch:
                 "_score": collector.score or 1.0,
                 "_source": _filter_source(source, source_filter),
                 **({"inner_hits": collector.render()} if collector.declared else {}),
+                **(
+                    {
+                        "sort": [
+                            None if x is _MISSING else x
+                            for x in sort_values((doc_id, source, collector))
+                        ]
+                    }
+                    if sort_clauses
+                    else {}
+                ),
             }
             for doc_id, source, collector in window
         ]
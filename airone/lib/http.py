@@ -3,11 +3,11 @@ import importlib
 import json
 import urllib.parse
 from io import StringIO
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, cast
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, cast
 from urllib.parse import quote
 
 from django.conf import settings
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import render as django_render
 from django.utils.encoding import smart_str
 from django.utils.http import MAX_URL_LENGTH
@@ -236,6 +236,23 @@ def get_download_response(io_stream: StringIO, fname: str, encode: str = "utf-8"
     return response
 
 
+def get_streaming_download_response(
+    chunks: Iterable[str], fname: str, encode: str = "utf-8"
+) -> StreamingHttpResponse:
+    """
+    This is the streaming version of get_download_response(), which sends text of chunks
+    while reading them (e.g. Job.iter_cache()) instead of building whole of it in memory.
+    """
+    response = StreamingHttpResponse(
+        (x.encode(encode, errors="replace") for x in chunks),
+        content_type="application/force-download",
+    )
+    response["Content-Disposition"] = 'attachment; filename="{fn}"'.format(
+        fn=urllib.parse.quote(smart_str(fname))
+    )
+    return response
+
+
 def _is_valid(params: Dict[str, Any], meta_info: List[Dict[str, Any]]) -> bool:
     # These are existance checks of each parameters except for ones which has omittable parameter
     if not all([x["name"] in params for x in meta_info if "omittable" not in x]):
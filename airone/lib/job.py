@@ -14,6 +14,27 @@ def _handle_task(
     func: TaskHandler,
     job: Job,
     on_cancelled: Callable[[Job], None] | None = None,
+    on_finished: Callable[[Job], None] | None = None,
+) -> None:
+    try:
+        _run_task(kls, func, job, on_cancelled)
+    finally:
+        # This sends jobs, which are parked until this job is finished, to the queue again.
+        # Job.update() also does it, but some tasks finish their jobs without calling it.
+        if job.is_finished():
+            job.release_dependents()
+
+            # This is called after the status of this job is saved, even when the task
+            # raised an exception (e.g. to report it to the job that dispatched this job)
+            if on_finished:
+                on_finished(job)
+
+
+def _run_task(
+    kls: object,
+    func: TaskHandler,
+    job: Job,
+    on_cancelled: Callable[[Job], None] | None = None,
 ) -> None:
     if job.is_canceled() and on_cancelled:
         on_cancelled(job)
@@ -47,7 +68,10 @@ raised exception:
         ret = JobStatus.ERROR
 
     # update Job status after finishing Job processing
-    if isinstance(ret, JobStatus):
+    if ret == JobStatus.PROCESSING:
+        # the job is finished by other jobs that it has dispatched
+        return
+    elif isinstance(ret, JobStatus):
         job.update(status=ret)
     elif (
         isinstance(ret, tuple)
@@ -73,6 +97,7 @@ def may_schedule_until_job_is_ready(
 
 def may_schedule_until_job_is_ready_with_handlers(
     on_cancelled: Callable[[Job], None] | None = None,
+    on_finished: Callable[[Job], None] | None = None,
 ) -> Callable[[TaskHandler], Callable[[object, int], None]]:
     def decorator(
         func: TaskHandler,
@@ -80,7 +105,7 @@ def may_schedule_until_job_is_ready_with_handlers(
         @functools.wraps(func)
         def wrapper(kls: object, job_id: int) -> None:
             job = Job.objects.get(id=job_id)
-            _handle_task(kls, func, job, on_cancelled)
+            _handle_task(kls, func, job, on_cancelled, on_finished)
 
         return wrapper
 
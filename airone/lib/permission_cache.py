@@ -0,0 +1,131 @@
+"""Cache of permission decisions made by User.has_permission().
+
+Deciding whether a User may access a non-public object needs a query for the
+permissions that the User's Roles (looked up from ``UserRoleClosure``) have to
+the object. This caches them and the decisions inside a scope that is opened
+by ``permission_cache()`` -- every HTTP request opens one through
+``airone.middleware.permission_cache.PermissionCacheMiddleware``:
+
+* The permissions of the User's Roles are loaded once per scope with a single
+  query, as a map of ACLBase id to the highest ACLType that any of the Roles has.
+* Each decision is remembered per (User, object, ACLType), so walking the same
+  Entity/EntityAttr parents row after row doesn't repeat the work.
+
+When ``AIRONE["PERMISSION_CACHE_PROCESS_WIDE"]`` is set, the Role permission
+maps are also kept across scopes in this process, tagged with a version
+that is stored in Django's cache (see ``airone.lib.process_wide_cache``). The
+signal handlers in ``acl.signals`` change the version whenever Role memberships,
+Group hierarchy or Role permissions change, which invalidates the maps of every
+process that shares the cache backend.
+Changes of ``is_public`` / ``default_permission`` only drop decisions of the
+current scope, because the decisions never outlive it.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from django.db.models import Max
+
+from airone.lib.process_wide_cache import ProcessWideCache
+from role.models import ObjectPermission
+
+if TYPE_CHECKING:
+    from acl.models import ACLBase
+    from user.models import User
+
+_CURRENT: ContextVar["PermissionCache | None"] = ContextVar("permission_cache", default=None)
+
+# Role permissions of each User that are kept across scopes
+_role_permissions: ProcessWideCache[dict[int, int]] = ProcessWideCache(
+    "permission_cache", "PERMISSION_CACHE_PROCESS_WIDE"
+)
+
+
+class PermissionCache:
+    def __init__(self) -> None:
+        self.version: str = _role_permissions.get_version()
+        # (user_id, object_id, ACLType, is_public, default_permission) -> decision
+        self.decisions: dict[tuple[int, int, int, bool, int], bool] = {}
+        # object_id -> (is_public, default_permission) that the decisions were made with
+        self.acl_flags: dict[int, tuple[bool, int]] = {}
+        # user_id -> {object_id: the highest ACLType of the User's Roles}
+        self.role_permissions: dict[int, dict[int, int]] = {}
+
+    def clear(self) -> None:
+        self.version = _role_permissions.get_version()
+        self.decisions.clear()
+        self.acl_flags.clear()
+        self.role_permissions.clear()
+
+    def get_role_permissions(self, user: "User") -> dict[int, int]:
+        permissions = self.role_permissions.get(user.id)
+        if permissions is None:
+            permissions = self.role_permissions[user.id] = _load_role_permissions(
+                user, self.version
+            )
+        return permissions
+
+
+@contextmanager
+def permission_cache() -> Iterator[PermissionCache]:
+    """Open a scope that caches permission decisions. Nested scopes share the outer one."""
+    current = _CURRENT.get()
+    if current is not None:
+        yield current
+        return
+
+    scope = PermissionCache()
+    token = _CURRENT.set(scope)
+    try:
+        yield scope
+    finally:
+        _CURRENT.reset(token)
+
+
+def get_permission_cache() -> PermissionCache | None:
+    return _CURRENT.get()
+
+
+def invalidate() -> None:
+    """Discard every cached Role permission (of all processes) and decision."""
+    _role_permissions.invalidate()
+
+    current = _CURRENT.get()
+    if current is not None:
+        current.clear()
+
+
+def forget_decisions(obj: "ACLBase") -> None:
+    """
+    Discard decisions of the current scope when they were made with is_public or
+    default_permission of the object that are different from its saved ones.
+    """
+    current = _CURRENT.get()
+    if current is None:
+        return
+
+    flags = current.acl_flags.get(obj.id)
+    if flags is not None and flags != (obj.is_public, obj.default_permission):
+        current.decisions.clear()
+        current.acl_flags.clear()
+
+
+def get_role_permissions(user: "User") -> dict[int, int]:
+    """
+    This returns the highest ACLType that any Role of the User has, for each ACLBase id.
+    This is same with what Role.is_permitted() decides one by one.
+    """
+    return dict(
+        ObjectPermission.objects.filter(permission__roles__user_closures__user=user)
+        .values("object_id")
+        .annotate(max_acl_type=Max("acl_type"))
+        .values_list("object_id", "max_acl_type")
+    )
+
+
+def _load_role_permissions(user: "User", version: str) -> dict[int, int]:
+    return _role_permissions.get_or_load(
+        user.id, lambda: get_role_permissions(user), version=version
+    )
@@ -0,0 +1,76 @@
+"""Objects that are kept in a process across requests and invalidated in all processes.
+
+A ``ProcessWideCache`` keeps objects (e.g. ones that are loaded for each Entity) in the
+memory of this process, tagged with a version that is stored in Django's cache. Changing
+the version by ``invalidate()`` discards the objects of every process that shares the
+cache backend. Nothing is kept, and Django's cache isn't accessed at all, unless the
+``AIRONE`` setting that is named by ``setting_name`` is enabled.
+"""
+
+import threading
+import uuid
+from typing import Callable, Generic, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+_T = TypeVar("_T")
+
+
+class ProcessWideCache(Generic[_T]):
+    def __init__(self, name: str, setting_name: str, max_size: int = 10000):
+        self.version_key = "airone:%s:version" % name
+        self.setting_name = setting_name
+        # The number of objects that are kept in a process. They're all discarded when
+        # it's exceeded.
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._objects: dict[int, tuple[str, _T]] = {}
+
+    def is_enabled(self) -> bool:
+        return bool(settings.AIRONE.get(self.setting_name, False))
+
+    def get_version(self) -> str:
+        if not self.is_enabled():
+            return ""
+
+        version: str = cache.get_or_set(self.version_key, lambda: uuid.uuid4().hex, None)
+        return version
+
+    def get_or_load(
+        self,
+        key: int,
+        loader: Callable[[], _T],
+        version: str | None = None,
+        is_keepable: Callable[[_T], bool] | None = None,
+    ) -> _T:
+        """
+        This returns the object that is kept with the current version (or the specified one),
+        or loads and keeps it. The loaded object isn't kept when is_keepable returns False.
+        """
+        if not self.is_enabled():
+            return loader()
+
+        # the version has to be read before loading the object not to keep a stale one with
+        # the version after it's changed
+        if version is None:
+            version = self.get_version()
+        with self._lock:
+            cached = self._objects.get(key)
+            if cached and cached[0] == version:
+                return cached[1]
+
+        obj = loader()
+        if is_keepable is None or is_keepable(obj):
+            with self._lock:
+                if len(self._objects) >= self.max_size:
+                    self._objects.clear()
+                self._objects[key] = (version, obj)
+
+        return obj
+
+    def invalidate(self) -> None:
+        """Discard the objects of all processes."""
+        if self.is_enabled():
+            cache.set(self.version_key, uuid.uuid4().hex, None)
@@ -9,6 +9,7 @@ from typing import cast
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test import Client, TestCase, override_settings
 
 from airone.lib.acl import ACLType
@@ -79,6 +80,8 @@ class AironeTestCase(TestCase):
             PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
         )
         self._settings.enable()
+        # Clear values that are cached with ids of the objects of other tests (e.g. Jobs)
+        cache.clear()
         self.modify_settings(
             MIDDLEWARE={"remove": "airone.lib.log.LoggingRequestMiddleware"}
         ).enable()
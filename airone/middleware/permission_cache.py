@@ -0,0 +1,16 @@
+from typing import Callable
+
+from django.http import HttpRequest, HttpResponse
+
+from airone.lib.permission_cache import permission_cache
+
+
+class PermissionCacheMiddleware:
+    """Cache permission decisions of User.has_permission() while processing each request"""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with permission_cache():
+            return self.get_response(request)
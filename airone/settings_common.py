@@ -111,6 +111,7 @@ class Common(Configuration):  # type: ignore[misc]
         "django.middleware.common.CommonMiddleware",
         "django.middleware.csrf.CsrfViewMiddleware",
         "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "airone.middleware.permission_cache.PermissionCacheMiddleware",
         "django.contrib.messages.middleware.MessageMiddleware",
         "django.middleware.clickjacking.XFrameOptionsMiddleware",
         "social_django.middleware.SocialAuthExceptionMiddleware",
@@ -288,6 +289,22 @@ class Common(Configuration):  # type: ignore[misc]
         "SSO_DESC": env.str("AIRONE_SSO_DESC", "SSO"),
         "LEGACY_UI_DISABLED": env.bool("AIRONE_LEGACY_UI_DISABLED", False),
         "PASSWORD_RESET_DISABLED": env.bool("AIRONE_PASSWORD_RESET_DISABLED", False),
+        # Keep permissions of users' roles across requests in each process. Configure a
+        # shared CACHES backend when there are multiple processes, so that they are
+        # invalidated in all of them (see airone/lib/permission_cache.py).
+        "PERMISSION_CACHE_PROCESS_WIDE": env.bool("AIRONE_PERMISSION_CACHE_PROCESS_WIDE", False),
+        # Keep compiled trigger conditions of each model across requests and jobs in each
+        # process. This also needs a shared CACHES backend when there are multiple processes
+        # (see trigger.models.TriggerMatcher).
+        "TRIGGER_CACHE_PROCESS_WIDE": env.bool("AIRONE_TRIGGER_CACHE_PROCESS_WIDE", False),
+        # Keep active attributes of each model across requests and jobs in each process.
+        # This also needs a shared CACHES backend when there are multiple processes (see
+        # entity.models.EntitySchema).
+        "SCHEMA_CACHE_PROCESS_WIDE": env.bool("AIRONE_SCHEMA_CACHE_PROCESS_WIDE", False),
+        # Seconds to keep Users authenticated by API tokens in Django's cache. Configure a
+        # shared CACHES backend when there are multiple processes, so that regenerated or
+        # deleted tokens are invalidated in all of them (see api_v1.auth.AironeTokenAuth).
+        "TOKEN_AUTH_CACHE_TTL": env.int("AIRONE_TOKEN_AUTH_CACHE_TTL", 0),
         "CHECK_TERM_SERVICE": env.bool("AIRONE_CHECK_TERM_SERVICE", False),
         "TERMS_OF_SERVICE_URL": env.str("AIRONE_TERMS_OF_SERVICE_URL", "#"),
         "HEADER_COLOR": env.str("AIRONE_HEADER_COLOR", None),
@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from airone.lib.acl import ACLType, filter_permitted, get_permitted_objects
+from airone.lib.types import AttrType
+from entity.models import Entity, EntityAttr
+from entry.models import Entry
+from role.models import Role
+from user.models import User
+
+
+class ACLTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_superuser=True)
+        self.user = User.objects.create(username="user")
+        self.role = Role.objects.create(name="role")
+        self.role.users.add(self.user)
+
+        self.entity = Entity.objects.create(name="entity", created_user=self.admin, is_public=False)
+        self.entity.writable.roles.add(self.role)
+        for name, is_public in [("public", True), ("private", False)]:
+            EntityAttr.objects.create(
+                name=name,
+                type=AttrType.STRING,
+                created_user=self.admin,
+                parent_entity=self.entity,
+                is_public=is_public,
+            )
+
+    def _create_entries(self, count: int) -> list[Entry]:
+        entries = []
+        for index in range(count):
+            # public, default readable, permitted by role, and not permitted items
+            entry = Entry.objects.create(
+                name="e-%d" % index,
+                schema=self.entity,
+                created_user=self.admin,
+                is_public=(index % 4 == 0),
+                default_permission=(ACLType.Readable.id if index % 4 == 1 else ACLType.Nothing.id),
+            )
+            if index % 4 == 2:
+                entry.full.roles.add(self.role)
+            entry.complement_attrs(self.admin)
+            entries.append(entry)
+
+        return entries
+
+    def test_filter_permitted(self):
+        entries = self._create_entries(8)
+        attrs = [x for e in entries for x in e.attrs.all()]
+        entity_attrs = list(self.entity.attrs.all())
+
+        for objects in [entries, attrs, entity_attrs, [self.entity]]:
+            for level in ACLType.all():
+                self.assertEqual(
+                    filter_permitted(self.user, objects, level),
+                    [x for x in objects if self.user.has_permission(x, level)],
+                )
+
+        # superuser is permitted to everything
+        self.assertEqual(filter_permitted(self.admin, entries, ACLType.Full), entries)
+
+        # readonly user is never permitted to write
+        self.user.is_readonly = True
+        self.assertEqual(filter_permitted(self.user, entries, ACLType.Writable), [])
+
+    def test_filter_permitted_with_constant_queries(self):
+        def _count_queries(objects: list) -> int:
+            with CaptureQueriesContext(connection) as ctx:
+                filter_permitted(self.user, objects, ACLType.Writable)
+            return len(ctx.captured_queries)
+
+        entries = self._create_entries(40)
+        attrs = [x for e in entries for x in e.attrs.all()]
+
+        self.assertEqual(_count_queries(entries[:4]), _count_queries(entries))
+        self.assertEqual(_count_queries(attrs[:8]), _count_queries(attrs))
+
+    def test_get_permitted_objects(self):
+        public_attr = self.entity.attrs.get(name="public")
+        private_attr = self.entity.attrs.get(name="private")
+        self.assertEqual(
+            get_permitted_objects(self.user, EntityAttr, ACLType.Readable), [public_attr]
+        )
+
+        # private attribute is permitted by the role, and deleted one is never returned
+        private_attr.readable.roles.add(self.role)
+        public_attr.delete()
+
+        self.assertEqual(
+            get_permitted_objects(self.user, EntityAttr, ACLType.Readable), [private_attr]
+        )
+        self.assertEqual(get_permitted_objects(self.user, EntityAttr, ACLType.Full), [])
@@ -0,0 +1,52 @@
+import io
+import unittest
+
+import yaml
+
+from airone.lib.drf import YAMLListLoader, YAMLNotListError
+
+
+class YAMLListLoaderTest(unittest.TestCase):
+    def test_iter_items(self):
+        content = b"""
+- entity: e-0
+  entries:
+  - name: item
+    attrs: &attrs
+    - {name: str, value: foo}
+- entity: e-1
+  entries: []
+  attrs: *attrs
+"""
+        items = YAMLListLoader(io.BytesIO(content)).iter_items()
+
+        # items are loaded one by one, and aliases refer to the anchors of preceding items
+        self.assertEqual(
+            next(items),
+            {
+                "entity": "e-0",
+                "entries": [{"name": "item", "attrs": [{"name": "str", "value": "foo"}]}],
+            },
+        )
+        self.assertEqual(
+            next(items),
+            {"entity": "e-1", "entries": [], "attrs": [{"name": "str", "value": "foo"}]},
+        )
+        self.assertEqual(list(items), [])
+
+    def test_iter_items_of_empty_list(self):
+        self.assertEqual(list(YAMLListLoader(io.BytesIO(b"[]")).iter_items()), [])
+
+    def test_iter_items_of_non_list(self):
+        for content, data in [(b"", None), (b"{}", {}), (b"foo: bar", {"foo": "bar"})]:
+            with self.assertRaises(YAMLNotListError) as ctx:
+                list(YAMLListLoader(io.BytesIO(content)).iter_items())
+            self.assertEqual(ctx.exception.data, data)
+
+    def test_iter_items_of_broken_yaml(self):
+        items = YAMLListLoader(io.BytesIO(b"- foo\n- bar: baz: qux\n")).iter_items()
+
+        # items before the broken one are returned
+        self.assertEqual(next(items), "foo")
+        with self.assertRaises(yaml.YAMLError):
+            next(items)
@@ -6,6 +6,7 @@ how JSON types are indexed into a text field -- because a wrong answer here
 looks like a product bug, not a test-harness bug.
 """
 
+import json
 import os
 import tempfile
 
@@ -402,6 +403,42 @@ class SortTest(EngineTestBase):
         }
         self.assertEqual(self.names(body), ["earlier", "later"])
 
+    def test_search_after_pages_through_shard_doc_order(self):
+        for i, name in enumerate(["c", "a", "b", "d", "e"]):
+            self.index(i, doc(name))
+        body = {"sort": [{"_shard_doc": "asc"}]}
+
+        pages, search_after = [], None
+        while True:
+            res = self.es.search(
+                body={**body, **({"search_after": search_after} if search_after else {})},
+                size=2,
+            )
+            hits = res["hits"]["hits"]
+            self.assertEqual(res["hits"]["total"]["value"], 5)
+            if not hits:
+                break
+            pages.append([hit["_source"]["name"] for hit in hits])
+            search_after = hits[-1]["sort"]
+
+        self.assertEqual(pages, [["c", "a"], ["b", "d"], ["e"]])
+
+    def test_updated_documents_keep_their_shard_doc_position(self):
+        for i, name in enumerate(["a", "b", "c"]):
+            self.index(i, doc(name))
+        first = self.es.search(body={"sort": [{"_shard_doc": "asc"}]}, size=1)["hits"]["hits"]
+
+        # updating a document that was already read doesn't bring it to the next page
+        self.index(0, doc("a2"))
+        body = {"sort": [{"_shard_doc": "asc"}], "search_after": first[-1]["sort"]}
+        self.assertEqual(self.names(body), ["b", "c"])
+
+    def test_search_after_with_field_sort(self):
+        for i, name in enumerate(["c", "a", "b"]):
+            self.index(i, doc(name))
+        body = {"sort": [{"name.keyword": "asc"}], "search_after": ["a"]}
+        self.assertEqual(self.names(body), ["b", "c"])
+
 
 class ResponseShapeTest(EngineTestBase):
     def setUp(self):
@@ -432,6 +469,14 @@ class WriteTest(EngineTestBase):
         with self.assertRaises(NotFoundError):
             self.es.get(id=404)
 
+    def test_mget_reports_missing_documents(self):
+        self.index(1, doc("one"))
+        res = self.es.mget(ids=[1, 404], source_includes=["name"])
+        self.assertEqual(
+            [(x["_id"], x["found"], x.get("_source")) for x in res["docs"]],
+            [("1", True, {"name": "one"}), ("404", False, None)],
+        )
+
     def test_delete_missing_raises_not_found(self):
         # Entry.unregister_es() relies on catching exactly this.
         with self.assertRaises(NotFoundError):
@@ -455,6 +500,84 @@ class WriteTest(EngineTestBase):
         self.assertEqual(self.es.count()["count"], 0)
 
 
+class PlannerTest(EngineTestBase):
+    """Postings must track every write, or planned searches drift from the scan."""
+
+    def referring(self, entry_id):
+        body = {
+            "query": {
+                "nested": {"path": "referrals", "query": {"term": {"referrals.id": entry_id}}}
+            }
+        }
+        return sorted(self.names(body))
+
+    def test_reindexing_replaces_the_old_postings(self):
+        self.index(1, doc("one", referrals=[{"id": 10, "name": "ten"}]))
+        self.index(1, doc("one", referrals=[{"id": 20, "name": "twenty"}]))
+        self.assertEqual(self.referring(10), [])
+        self.assertEqual(self.referring(20), ["one"])
+
+    def test_deleted_documents_leave_no_postings(self):
+        self.index(1, doc("one", referrals=[{"id": 10, "name": "ten"}]))
+        self.index(2, doc("two", referrals=[{"id": 10, "name": "ten"}]))
+        self.es.delete(id=1)
+        self.es.bulk(body=[{"delete": {"_id": 2}}])
+        self.assertEqual(self.referring(10), [])
+        self.assertEqual(self.names({"query": {"term": {"name": "one"}}}), [])
+
+    def test_delete_by_query_updates_postings(self):
+        self.index(1, doc("drop"))
+        self.es.delete_by_query(index=INDEX, query={"term": {"name": "drop"}})
+        self.index(2, doc("drop"))
+        self.assertEqual(self.ids({"query": {"term": {"name": "drop"}}}), ["2"])
+
+    def test_terms_and_exists_are_planned_per_field(self):
+        self.index(1, doc("a", entity=("model", 1), attrs=[("when", "", "2020-01-01")]))
+        self.index(2, doc("b", entity=("model", 2), attrs=[("when", "", None)]))
+        self.index(3, doc("c", entity=("model", 3)))
+        body = {
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"nested": {"path": "entity", "query": {"terms": {"entity.id": [1, 2]}}}},
+                        {
+                            "nested": {
+                                "path": "attr",
+                                "query": {"exists": {"field": "attr.date_value"}},
+                            }
+                        },
+                    ]
+                }
+            }
+        }
+        self.assertEqual(self.names(body), ["a"])
+
+    def test_unplannable_should_clause_falls_back_to_a_scan(self):
+        self.index(1, doc("alpha"))
+        self.index(2, doc("beta"))
+        body = {
+            "query": {
+                "bool": {"should": [{"term": {"name": "alpha"}}, {"regexp": {"name": "b.*"}}]}
+            }
+        }
+        self.assertEqual(self.names(body), ["alpha", "beta"])
+
+    def test_planned_hits_keep_insertion_order(self):
+        for i, name in [(3, "c"), (1, "a"), (2, "b")]:
+            self.index(i, doc(name, entity=("model", 9)))
+        body = {"query": {"nested": {"path": "entity", "query": {"term": {"entity.id": 9}}}}}
+        self.assertEqual(self.names(body), ["c", "a", "b"])
+
+    def test_boolean_postings_follow_equals(self):
+        self.index(1, doc("flagged", attrs=[("flag", True, None)]))
+        self.index(2, doc("texty", attrs=[("flag", "True", None)]))
+        for wanted, expected in (("true", ["flagged"]), ("True", ["flagged", "texty"])):
+            body = {
+                "query": {"nested": {"path": "attr", "query": {"term": {"attr.value": wanted}}}}
+            }
+            self.assertEqual(self.names(body), expected, wanted)
+
+
 class AggregationTest(EngineTestBase):
     def test_terms_aggregation_finds_duplicated_attribute_values(self):
         # Backs the "duplicated values" advanced-search filter.
@@ -524,6 +647,10 @@ class PersistenceTest(SimpleTestCase):
                 res = second.search(body={"query": {"match_all": {}}})
                 self.assertEqual(res["hits"]["hits"][0]["_source"]["name"], "persisted")
 
+                # Postings are rebuilt from the loaded documents.
+                res = second.search(body={"query": {"term": {"name": "persisted"}}})
+                self.assertEqual(res["hits"]["total"]["value"], 1)
+
     def test_nothing_is_written_when_persistence_is_off(self):
         with tempfile.TemporaryDirectory() as tmp:
             with override_settings(ES_CONFIG=NO_PERSIST):
@@ -532,3 +659,101 @@ class PersistenceTest(SimpleTestCase):
                 es.indices.create(index=INDEX)
                 es.index(id=1, body=doc("ephemeral"))
             self.assertEqual(os.listdir(tmp), [])
+
+
+class OperationLogTest(SimpleTestCase):
+    """Writes append to a log; compaction folds it into a snapshot."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(
+            ES_CONFIG=dict(NO_PERSIST, PERSIST_PATH=self.tmp.name)
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(STORE.reset)
+
+        STORE.reset()
+        self.es = InMemoryElasticsearch(INDEX)
+        self.es.indices.create(index=INDEX)
+
+    def path(self, suffix):
+        return os.path.join(self.tmp.name, INDEX + suffix)
+
+    def reloaded_names(self):
+        STORE.reset()
+        res = InMemoryElasticsearch(INDEX).search(body={"sort": [{"name.keyword": "asc"}]})
+        return [hit["_source"]["name"] for hit in res["hits"]["hits"]]
+
+    def test_a_write_appends_one_line_and_leaves_the_snapshot_alone(self):
+        snapshot = os.path.getsize(self.path(".snapshot"))
+        self.es.index(id=1, body=doc("one"))
+        self.es.index(id=2, body=doc("two"))
+        self.es.delete(id=1)
+
+        self.assertEqual(os.path.getsize(self.path(".snapshot")), snapshot)
+        with open(self.path(".log"), encoding="utf-8") as handle:
+            self.assertEqual(len(handle.readlines()), 3)
+        self.assertEqual(self.reloaded_names(), ["two"])
+
+    def test_compaction_folds_the_log_into_the_snapshot(self):
+        self.es.bulk(body=[{"index": {"_id": 1}}, doc("one"), {"index": {"_id": 2}}, doc("two")])
+        self.es.delete(id=2)
+        STORE.compact(INDEX)
+
+        self.assertFalse(os.path.exists(self.path(".log")))
+        self.assertFalse(os.path.exists(self.path(".log.compacting")))
+        self.assertEqual(self.reloaded_names(), ["one"])
+
+    def test_writes_after_compaction_go_to_a_fresh_log(self):
+        self.es.index(id=1, body=doc("one"))
+        STORE.compact(INDEX)
+        self.es.index(id=2, body=doc("two"))
+        self.assertEqual(self.reloaded_names(), ["one", "two"])
+
+    def test_an_interrupted_compaction_is_replayed(self):
+        # A compaction that died after renaming the log but before writing the
+        # snapshot leaves its log behind; nothing in it may be lost.
+        self.es.index(id=1, body=doc("one"))
+        STORE.reset()
+        os.replace(self.path(".log"), self.path(".log.compacting"))
+        InMemoryElasticsearch(INDEX).index(id=2, body=doc("two"))
+        self.assertEqual(self.reloaded_names(), ["one", "two"])
+
+    def test_a_torn_log_line_is_skipped(self):
+        self.es.index(id=1, body=doc("one"))
+        STORE.reset()
+        with open(self.path(".log"), "a", encoding="utf-8") as handle:
+            handle.write('{"put": "2", "sour')
+        self.assertEqual(self.reloaded_names(), ["one"])
+
+    def test_an_index_persisted_as_json_is_still_loaded(self):
+        STORE.drop(INDEX)
+        with open(self.path(".json"), "w", encoding="utf-8") as handle:
+            json.dump({"1": doc("legacy")}, handle)
+        self.assertEqual(self.reloaded_names(), ["legacy"])
+
+    def test_an_unreadable_snapshot_is_kept_aside(self):
+        self.es.index(id=1, body=doc("one"))
+        STORE.compact(INDEX)
+        STORE.reset()
+        with open(self.path(".snapshot"), "wb") as handle:
+            handle.write(b"\xfb\x01broken")
+
+        with self.assertLogs("airone", level="WARNING"):
+            self.assertEqual(self.reloaded_names(), [])
+        with open(self.path(".snapshot.unreadable"), "rb") as handle:
+            self.assertEqual(handle.read(), b"\xfb\x01broken")
+
+        # the next compaction doesn't overwrite the unreadable one
+        InMemoryElasticsearch(INDEX).index(id=2, body=doc("two"))
+        STORE.compact(INDEX)
+        self.assertTrue(os.path.exists(self.path(".snapshot.unreadable")))
+        self.assertEqual(self.reloaded_names(), ["two"])
+
+    def test_recreating_the_index_discards_the_log(self):
+        self.es.index(id=1, body=doc("one"))
+        self.es.indices.delete(index=INDEX, ignore_unavailable=True)
+        self.es.indices.create(index=INDEX)
+        self.assertEqual(self.reloaded_names(), [])
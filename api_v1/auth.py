@@ -1,22 +1,52 @@
+import hashlib
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
 from user.models import User
 
 
+def _get_cache_key(key: str) -> str:
+    # keys of tokens are hashed not to expose them as the keys of the cache backend
+    return "airone:token_auth:%s" % hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def invalidate_token_auth_cache(key: str) -> None:
+    """
+    This removes the cached authentication of the token that has the specified key,
+    to be called when the token or its User is changed or deleted.
+    """
+    cache.delete(_get_cache_key(key))
+
+
 class AironeTokenAuth(TokenAuthentication):
-    def authenticate_credentials(self, key: str) -> tuple[User, Any]:
-        (django_user, token) = super(AironeTokenAuth, self).authenticate_credentials(key)
+    """
+    When AIRONE["TOKEN_AUTH_CACHE_TTL"] is set, the resolved User and Token are kept in
+    Django's cache for that many seconds, so that API requests of the same token don't
+    look them up again. The signal handlers in user.signals invalidate them when the token
+    is regenerated or deleted, or when its User is changed.
+    """
 
-        # get Airone user object from django_user id
-        user = User.objects.get(id=django_user.id)
+    def authenticate_credentials(self, key: str) -> tuple[User, Any]:
+        ttl = settings.AIRONE.get("TOKEN_AUTH_CACHE_TTL", 0)
+        cached = cache.get(_get_cache_key(key)) if ttl > 0 else None
+        if cached is not None:
+            (user, token) = cached
+        else:
+            # token.user is already an Airone User object because AUTH_USER_MODEL is
+            # user.User, so it doesn't need to be looked up again.
+            (user, token) = super(AironeTokenAuth, self).authenticate_credentials(key)
 
         if user.token_lifetime > 0 and datetime.now(tz=UTC) > token.created + timedelta(
             seconds=user.token_lifetime
         ):
             raise AuthenticationFailed("Token lifetime is expired")
 
+        if ttl > 0 and cached is None:
+            cache.set(_get_cache_key(key), (user, token), ttl)
+
         return (user, token)
@@ -6,7 +6,7 @@ from rest_framework.exceptions import ValidationError
 
 from airone.lib import custom_view
 from airone.lib.types import AttrType
-from entity.models import Entity, EntityAttr
+from entity.models import Entity, EntityAttr, EntitySchema
 from entry.models import AttributeValue, Entry
 from group.models import Group
 from role.models import Role
@@ -266,21 +266,22 @@ class PostEntrySerializer(serializers.Serializer[dict[str, Any]]):
                 raise ValidationError("Invalid Entry-ID is specified (%d)" % data["id"])
 
         # checks mandatory keys are specified when a new Entry will be created
+        entity_schema = EntitySchema.get(entity)
         if not entry and not all(
             [
                 False
-                for x in entity.attrs.filter(is_active=True, is_mandatory=True)
-                if x.name not in data["attrs"].keys()
+                for x in entity_schema.attrs
+                if x.is_mandatory and x.name not in data["attrs"].keys()
             ]
         ):
             raise ValidationError("Some mandatory attrs are not specified")
 
         # checks specified attr values are valid
         for attr_name, attr_value in data["attrs"].items():
-            if not entity.attrs.filter(is_active=True, name=attr_name).exists():
+            attr = entity_schema.attrs_by_name.get(attr_name)
+            if not attr:
                 raise ValidationError("Target entity doesn't specified attr(%s)" % (attr_name))
 
-            attr = entity.attrs.get(name=attr_name)
             validated_value = self._validate_attr(attr, attr_value)
             if validated_value is None:
                 raise ValidationError("Invalid attribute value(%s) is specified" % (attr_name))
@@ -4,13 +4,15 @@ from datetime import UTC, date, datetime, timedelta
 from unittest import mock
 
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from airone.lib.acl import ACLType
-from airone.lib.test import AironeViewTest
+from airone.lib.test import AironeViewTest, with_airone_settings
 from airone.lib.types import AttrType
 from entity.models import Entity, EntityAttr
 from entry import tasks
@@ -1149,6 +1151,50 @@ class APITest(AironeViewTest):
         )
         self.assertEqual(resp.status_code, 200)
 
+    @with_airone_settings({"TOKEN_AUTH_CACHE_TTL": 60})
+    def test_cached_token_auth(self):
+        user = User.objects.create(username="testuser")
+        token = Token.objects.create(user=user)
+        entity = Entity.objects.create(name="E1", created_user=user)
+        Entry.objects.create(name="e1", schema=entity, created_user=user)
+
+        def _get_entry(key):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(
+                    "/api/v1/entry",
+                    {"entity": "E1", "entry": "e1"},
+                    **{"HTTP_AUTHORIZATION": "Token %s" % key},
+                )
+            token_queries = [x for x in ctx.captured_queries if Token._meta.db_table in x["sql"]]
+            return (resp, len(token_queries))
+
+        self.assertEqual(_get_entry(token.key)[1], 1)
+
+        # the User and the Token are not looked up again while they are cached
+        (resp, token_query_count) = _get_entry(token.key)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(token_query_count, 0)
+
+        # cached authentication is invalidated when token_lifetime is changed
+        user.token_lifetime = 1
+        user.save()
+        with mock.patch("api_v1.auth.datetime") as dt_mock:
+            dt_mock.now = mock.Mock(return_value=datetime.now(tz=UTC) + timedelta(seconds=100))
+            self.assertEqual(_get_entry(token.key)[0].status_code, 403)
+
+        # cached authentication is invalidated when the token is regenerated
+        user.token_lifetime = 0
+        user.save()
+        self.assertEqual(_get_entry(token.key)[0].status_code, 200)
+        token.delete()
+        new_token = Token.objects.create(user=user)
+        self.assertEqual(_get_entry(token.key)[0].status_code, 403)
+        self.assertEqual(_get_entry(new_token.key)[0].status_code, 200)
+
+        # cached authentication is invalidated when the User is deleted
+        user.delete()
+        self.assertEqual(_get_entry(new_token.key)[0].status_code, 403)
+
     def test_edit_entry_with_same_value(self):
         user = self.guest_login()
 
@@ -39,7 +39,7 @@ def _csv_export(
         line_data = [entry_info.entry["name"]]
 
         # Abort processing when job is canceled
-        if index % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled():
+        if index % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled(with_cache=True):
             return None
 
         # Append the data which specifies Entity name to which target Entry belongs
@@ -158,7 +158,7 @@ def _yaml_export(
         }
 
         # Abort processing when job is canceled
-        if index % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled():
+        if index % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled(with_cache=True):
             return None
 
         for attrinfo in recv_data["attrinfo"]:
@@ -48,6 +48,14 @@ urlpatterns = [
             }
         ),
     ),
+    path(
+        "<int:entity_id>/entries/bulk/",
+        views.EntityEntryAPI.as_view(
+            {
+                "post": "bulk_create",
+            }
+        ),
+    ),
     path(
         "<int:entity_id>/histories/",
         views.EntityHistoryAPI.as_view(
@@ -30,7 +30,12 @@ from entity.api_v2.serializers import (
     EntityUpdateSerializer,
 )
 from entity.models import Entity, EntityAttr
-from entry.api_v2.serializers import EntryBaseSerializer, EntryCreateSerializer
+from entry.api_v2.serializers import (
+    EntryBaseSerializer,
+    EntryBulkCreateJobSerializer,
+    EntryBulkCreateRequestSerializer,
+    EntryCreateSerializer,
+)
 from entry.models import Entry
 from job.api_v2.serializers import ImportPreviewJobSerializer
 from job.models import Job
@@ -100,6 +105,7 @@ class EntityPermission(BasePermission):
         permissions = {
             "list": ACLType.Readable,
             "create": ACLType.Writable,
+            "bulk_create": ACLType.Writable,
         }
 
         # Only ViewSets expose the resolved action name. When plain APIViews
@@ -286,6 +292,7 @@ class EntityEntryAPI(PluginOverrideMixin, viewsets.ModelViewSet[Entry]):
     def get_serializer_class(self) -> type[serializers.Serializer[Any]]:
         serializer: dict[str, type[serializers.Serializer[Any]]] = {
             "create": EntryCreateSerializer,
+            "bulk_create": EntryBulkCreateRequestSerializer,
         }
         return serializer.get(self.action, EntryBaseSerializer)
 
@@ -327,6 +334,36 @@ class EntityEntryAPI(PluginOverrideMixin, viewsets.ModelViewSet[Entry]):
 
         return Response(status=status.HTTP_202_ACCEPTED)
 
+    @extend_schema(
+        request=EntryBulkCreateRequestSerializer, responses={202: EntryBulkCreateJobSerializer}
+    )
+    def bulk_create(self, request: Request, entity_id: int) -> Response:
+        """
+        This starts a job that creates many Items of the model at once. The created Items and
+        the ones that are invalid (with their indexes) are the result of the job.
+        """
+        entity = Entity.objects.filter(id=entity_id, is_active=True).first()
+        if not entity:
+            raise NotFound("specified entity(%s) does not exist" % entity_id)
+
+        # Plugins that override creating Items handle them one by one
+        if self._get_override_registration(entity.id, "create") is not None:
+            return Response(
+                "Items of this model can't be created in bulk", status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = cast(User, request.user)
+
+        serializer = EntryBulkCreateRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Items are staged as the artifact of the job instead of being stored in its params
+        job = Job.new_bulk_create_entries(user, entity, text="%s_bulk_create.json" % entity.name)
+        job.stage_rows(request.data["entries"])
+        job.run()
+
+        return Response({"job_id": job.id}, status=status.HTTP_202_ACCEPTED)
+
 
 class EntityHistoryAPI(viewsets.ReadOnlyModelViewSet[History]):
     serializer_class = EntityHistorySerializer
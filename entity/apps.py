@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class EntityConfig(AppConfig):
     name = "entity"
+
+    def ready(self) -> None:
+        from . import signals  # noqa
@@ -8,6 +8,7 @@ from simple_history.models import HistoricalRecords
 
 from acl.models import ACLBase
 from airone.lib.acl import ACLObjType
+from airone.lib.process_wide_cache import ProcessWideCache
 from airone.lib.types import AttrDefaultValue, AttrType
 from category.models import Category
 from webhook.models import Webhook
@@ -15,6 +16,10 @@ from webhook.models import Webhook
 if TYPE_CHECKING:
     from user.models import User
 
+_schemas: ProcessWideCache["EntitySchema"] = ProcessWideCache(
+    "entity_schema", "SCHEMA_CACHE_PROCESS_WIDE"
+)
+
 
 class ItemNameType(models.TextChoices):
     USER = ("US", "USER")  # Specify Item name manually by user
@@ -314,3 +319,55 @@ class Entity(ACLBase):
         if AliasEntry.objects.filter(name=name, entry__schema=self, entry__is_active=True).exists():
             return False
         return True
+
+    def get_unavailable_names(self, names: list[str]) -> set[str]:
+        """
+        This is is_available() for many names at once. It returns the names that are already
+        used by Items or Aliases in this model, which are folded to lower case as the database
+        collation does.
+        """
+        from entry.models import AliasEntry, Entry
+
+        item_names = Entry.objects.filter(name__in=names, schema=self, is_active=True).values_list(
+            "name", flat=True
+        )
+        alias_names = AliasEntry.objects.filter(
+            name__in=names, entry__schema=self, entry__is_active=True
+        ).values_list("name", flat=True)
+
+        return {x.lower() for x in item_names} | {x.lower() for x in alias_names}
+
+
+class EntitySchema(object):
+    """
+    Active EntityAttrs of an Entity, which are loaded at once with the referred Entities of
+    them and looked up by id or name without any query.
+
+    When AIRONE["SCHEMA_CACHE_PROCESS_WIDE"] is set, the EntitySchema of each Entity is kept
+    in the process, tagged with a version that is stored in Django's cache. The signal
+    handlers in entity.signals change the version whenever Entities or EntityAttrs are
+    edited, which invalidates the EntitySchemas of every process that shares the cache
+    backend. So the EntityAttrs of it are shared by callers and must not be changed.
+    """
+
+    def __init__(self, entity_id: int):
+        self.entity_id = entity_id
+        # EntityAttrs in the order of their creation, and in the order of their index
+        self.attrs: list[EntityAttr] = list(
+            EntityAttr.objects.filter(parent_entity_id=entity_id, is_active=True)
+            .prefetch_related("referral")
+            .order_by("id")
+        )
+        self.sorted_attrs: list[EntityAttr] = sorted(self.attrs, key=lambda x: x.index)
+        self.attrs_by_id: dict[int, EntityAttr] = {x.id: x for x in self.attrs}
+        self.attrs_by_name: dict[str, EntityAttr] = {x.name: x for x in self.attrs}
+
+    @classmethod
+    def get(kls, entity: Entity | int) -> "EntitySchema":
+        entity_id = entity if isinstance(entity, int) else entity.id
+        return _schemas.get_or_load(entity_id, lambda: kls(entity_id))
+
+
+def invalidate_schemas() -> None:
+    """Discard EntitySchemas of all processes. This is called when schemas are edited."""
+    _schemas.invalidate()
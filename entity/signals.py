@@ -0,0 +1,17 @@
+from typing import Any
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Entity, EntityAttr, invalidate_schemas
+
+
+# These invalidate cached EntitySchemas (see entity.models.EntitySchema). Historical records
+# of Entities and EntityAttrs are only made along these saves and changes of referrals.
+@receiver(post_save, sender=Entity)
+@receiver(post_save, sender=EntityAttr)
+@receiver(post_delete, sender=Entity)
+@receiver(post_delete, sender=EntityAttr)
+@receiver(m2m_changed, sender=EntityAttr.referral.through)
+def invalidate_schemas_by_edit(sender: Any, **kwargs: Any) -> None:
+    invalidate_schemas()
@@ -18,8 +18,9 @@ from airone.lib.types import AttrType
 from entity import tasks
 from entity.models import Entity, EntityAttr, ItemNameType
 from entry.models import Entry
-from entry.tasks import create_entry_v2
+from entry.tasks import bulk_create_entries, create_entry_v2
 from group.models import Group
+from job.models import Job, JobOperation, JobStatus
 from role.models import Role
 from trigger import tasks as trigger_tasks
 from trigger.models import TriggerCondition
@@ -3218,6 +3219,170 @@ class ViewTest(AironeViewTest):
             },
         )
 
+    @mock.patch("entry.tasks.bulk_create_entries.delay", mock.Mock(side_effect=bulk_create_entries))
+    def test_bulk_create_entries(self):
+        attr = {}
+        for attr_name in [x["name"] for x in self.ALL_TYPED_ATTR_PARAMS_FOR_CREATING_ENTITY]:
+            attr[attr_name] = self.entity.attrs.get(name=attr_name)
+
+        entry: Entry = self.add_entry(self.user, "Everest", self.entity)
+        entry.add_alias("Chomolungma")
+
+        params = {
+            "entries": [
+                {
+                    "name": "entry1",
+                    "attrs": [
+                        {"id": attr["val"].id, "value": "hoge"},
+                        {"id": attr["vals"].id, "value": ["hoge", "fuga"]},
+                        {"id": attr["ref"].id, "value": self.ref_entry.id},
+                        {"id": attr["refs"].id, "value": [self.ref_entry.id]},
+                        {"id": attr["name"].id, "value": {"name": "hoge", "id": self.ref_entry.id}},
+                        {
+                            "id": attr["names"].id,
+                            "value": [{"name": "hoge", "id": self.ref_entry.id}],
+                        },
+                        {"id": attr["group"].id, "value": self.group.id},
+                        {"id": attr["groups"].id, "value": [self.group.id]},
+                        {"id": attr["text"].id, "value": "hoge\nfuga"},
+                        {"id": attr["bool"].id, "value": True},
+                        {"id": attr["date"].id, "value": "2018-12-31"},
+                        {"id": attr["role"].id, "value": self.role.id},
+                        {"id": attr["roles"].id, "value": [self.role.id]},
+                        {"id": attr["num"].id, "value": 123.45},
+                        {"id": attr["nums"].id, "value": [123.45, 678.90]},
+                        {"id": attr["datetime"].id, "value": "2018-12-31T00:00Z"},
+                    ],
+                },
+                {"name": "Chomolungma"},
+                {"name": "entry2", "attrs": [{"id": attr["val"].id, "value": "fuga"}]},
+                {"name": "entry2"},
+                {"name": "entry3", "attrs": [{"id": 9999, "value": "hoge"}]},
+            ]
+        }
+        resp = self.client.post(
+            "/entity/api/v2/%s/entries/bulk/" % self.entity.id,
+            json.dumps(params),
+            "application/json",
+        )
+        self.assertEqual(resp.status_code, 202)
+
+        # the Items are created by a job, whose result reports the created and invalid ones
+        job = Job.objects.get(id=resp.json()["job_id"])
+        self.assertEqual(job.operation, JobOperation.BULK_CREATE_ENTRY)
+        self.assertEqual(job.status, JobStatus.DONE)
+        result = job.get_cache()
+
+        entry1 = Entry.objects.get(name="entry1", schema=self.entity, is_active=True)
+        entry2 = Entry.objects.get(name="entry2", schema=self.entity, is_active=True)
+        self.assertEqual(
+            result["entries"],
+            [
+                {"index": 0, "id": entry1.id, "name": "entry1"},
+                {"index": 2, "id": entry2.id, "name": "entry2"},
+            ],
+        )
+        self.assertEqual(
+            [(x["index"], x["name"], x["detail"][0]["code"]) for x in result["errors"]],
+            [
+                (1, "Chomolungma", "AE-220000"),
+                (3, "entry2", "AE-220000"),
+                (4, "entry3", "AE-230000"),
+            ],
+        )
+        self.assertFalse(Entry.objects.filter(name="entry3", schema=self.entity).exists())
+
+        # the created Items have values of the specified Attributes and the other Attributes
+        for entry in [entry1, entry2]:
+            self.assertEqual(entry.created_user, self.user)
+            self.assertEqual(entry.status, 0)
+            self.assertEqual(entry.attrs.count(), len(attr))
+        self.assertEqual(
+            {
+                attrv.parent_attr.name: attrv.get_value()
+                for attrv in [attr.get_latest_value() for attr in entry1.attrs.all()]
+            },
+            {
+                "bool": True,
+                "date": datetime.date(2018, 12, 31),
+                "group": "group0",
+                "groups": ["group0"],
+                "name": {"hoge": "r-0"},
+                "names": [{"hoge": "r-0"}],
+                "num": 123.45,
+                "nums": [123.45, 678.90],
+                "ref": "r-0",
+                "refs": ["r-0"],
+                "text": "hoge\nfuga",
+                "val": "hoge",
+                "vals": ["hoge", "fuga"],
+                "role": "role0",
+                "roles": ["role0"],
+                "datetime": datetime.datetime(2018, 12, 31, 0, 0, tzinfo=datetime.UTC),
+            },
+        )
+        self.assertEqual(entry2.attrs.get(name="val").get_latest_value().get_value(), "fuga")
+
+        # Attributes without any value have blank ones, which aren't made again at indexing
+        vals_attr = entry2.attrs.get(name="vals")
+        self.assertEqual(vals_attr.values.count(), 1)
+        self.assertEqual(vals_attr.get_latest_value().get_value(), [])
+
+        # the created Items are registered to Elasticsearch
+        for entry in [entry1, entry2]:
+            search_result = self._es.search(body={"query": {"term": {"name": entry.name}}})
+            self.assertEqual(search_result["hits"]["total"]["value"], 1)
+
+        # notifications of the created Items are sent by a job
+        jobs = Job.objects.filter(operation=JobOperation.NOTIFY_CREATE_ENTRIES)
+        self.assertEqual(jobs.count(), 1)
+        self.assertEqual(json.loads(jobs.first().params), {"entry_ids": [entry1.id, entry2.id]})
+
+    @mock.patch("entry.tasks.bulk_create_entries.delay", mock.Mock(side_effect=bulk_create_entries))
+    def test_bulk_create_entries_rolls_back_on_failure(self):
+        params = {"entries": [{"name": "entry%d" % i} for i in range(3)]}
+        with mock.patch(
+            "entry.models.Attribute.add_values_bulk", side_effect=RuntimeError("unexpected")
+        ):
+            resp = self.client.post(
+                "/entity/api/v2/%s/entries/bulk/" % self.entity.id,
+                json.dumps(params),
+                "application/json",
+            )
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(Job.objects.get(id=resp.json()["job_id"]).status, JobStatus.ERROR)
+
+        # none of the Items are left when creating them fails halfway
+        self.assertFalse(Entry.objects.filter(name__startswith="entry").exists())
+
+    @mock.patch.dict("entry.settings.CONFIG.conf", {"BULK_CREATE_MAX_ENTRIES": 2})
+    def test_bulk_create_entries_with_invalid_params(self):
+        # too many Items are specified
+        resp = self.client.post(
+            "/entity/api/v2/%s/entries/bulk/" % self.entity.id,
+            json.dumps({"entries": [{"name": "entry%d" % i} for i in range(3)]}),
+            "application/json",
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()["entries"][0]["code"], "AE-122000")
+
+        # no Item is specified
+        resp = self.client.post(
+            "/entity/api/v2/%s/entries/bulk/" % self.entity.id,
+            json.dumps({"entries": []}),
+            "application/json",
+        )
+        self.assertEqual(resp.status_code, 400)
+
+        # non-existent Model is specified
+        resp = self.client.post(
+            "/entity/api/v2/%s/entries/bulk/" % 9999,
+            json.dumps({"entries": [{"name": "entry"}]}),
+            "application/json",
+        )
+        self.assertEqual(resp.status_code, 404)
+        self.assertFalse(Entry.objects.filter(name__startswith="entry").exists())
+
     def test_create_entry_without_permission_entity(self):
         params = {
             "name": "entry1",
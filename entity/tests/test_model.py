@@ -1,12 +1,14 @@
 from copy import copy
+from unittest.mock import patch
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase
 
 from airone.lib.types import AttrType
 from category.models import Category
 from entity.admin import EntityAttrResource, EntityResource
-from entity.models import Entity, EntityAttr
+from entity.models import Entity, EntityAttr, EntitySchema
 from user.models import User
 
 
@@ -618,3 +620,43 @@ class ModelTest(TestCase):
         # None is always valid, but any non-None default is rejected for SELECT.
         self.assertTrue(attr.validate_default_value(None))
         self.assertFalse(attr.validate_default_value("abc"))
+
+    @patch.dict(settings.AIRONE, {"SCHEMA_CACHE_PROCESS_WIDE": True})
+    def test_entity_schema(self):
+        cache.clear()
+        ref_entity = Entity.objects.create(name="ref", created_user=self._test_user)
+        entity = Entity.objects.create(name="entity", created_user=self._test_user)
+        attrs = [
+            EntityAttr.objects.create(
+                name=name,
+                type=AttrType.OBJECT,
+                index=index,
+                created_user=self._test_user,
+                parent_entity=entity,
+            )
+            for (name, index) in [("foo", 2), ("bar", 1), ("baz", 3)]
+        ]
+        attrs[0].add_referral(ref_entity)
+        attrs[2].delete()
+
+        schema = EntitySchema.get(entity)
+        self.assertEqual([x.name for x in schema.attrs], ["foo", "bar"])
+        self.assertEqual([x.name for x in schema.sorted_attrs], ["bar", "foo"])
+        self.assertEqual(schema.attrs_by_name["foo"], attrs[0])
+        self.assertEqual(schema.attrs_by_id[attrs[1].id], attrs[1])
+
+        # EntitySchema and referrals of its EntityAttrs are kept in the process
+        with self.assertNumQueries(0):
+            self.assertIs(EntitySchema.get(entity.id), schema)
+            self.assertEqual([x.name for x in schema.attrs[0].referral.all()], ["ref"])
+
+        # it's loaded again after EntityAttrs or their referrals are changed
+        attrs[1].index = 3
+        attrs[1].save()
+        self.assertEqual([x.name for x in EntitySchema.get(entity).sorted_attrs], ["foo", "bar"])
+
+        attrs[0].referral_clear()
+        self.assertEqual(list(EntitySchema.get(entity).attrs[0].referral.all()), [])
+
+        attrs[0].delete()
+        self.assertEqual([x.name for x in EntitySchema.get(entity).attrs], ["bar"])
@@ -24,7 +24,7 @@ from entry.models import AttributeValue, Entry
 from job.models import Job
 from user.models import History, User
 
-from .models import Entity, EntityAttr
+from .models import Entity, EntityAttr, invalidate_schemas
 from .settings import CONFIG
 
 # Entity/EntityAttr name is defined as a CharField with a concrete max_length, but the
@@ -540,6 +540,7 @@ def do_conf_dashboard(
 
     # clear is_summarized flag for each EntityAttrs corresponding to the entity
     EntityAttr.objects.filter(parent_entity=entity_id).update(is_summarized=False)
+    invalidate_schemas()
 
     # set is_summarized flag for each specified EntityAttrs
     for attr in [EntityAttr.objects.get(id=x) for x in recv_data["attrs"]]:
@@ -2,7 +2,8 @@ import re
 from datetime import date, datetime
 from typing import Any, Literal, NotRequired, TypedDict
 
-from django.db.models import Prefetch, QuerySet
+from django.db import transaction
+from django.db.models import F, Prefetch, QuerySet
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field, extend_schema_serializer
 from pydantic import BaseModel, RootModel, field_validator
@@ -15,6 +16,7 @@ from airone.lib import custom_view, drf
 from airone.lib.acl import ACLType, get_permission_level
 from airone.lib.drf import (
     DuplicatedObjectExistsError,
+    ExceedLimitError,
     IncorrectTypeError,
     InvalidValueError,
     ObjectNotExistsError,
@@ -24,11 +26,11 @@ from airone.lib.elasticsearch import EntryFilterKey, FilterKey
 from airone.lib.log import Logger
 from airone.lib.types import AttrDefaultValue, AttrType, coerce_number
 from entity.api_v2.serializers import EntitySerializer
-from entity.models import Entity, EntityAttr
+from entity.models import Entity, EntityAttr, EntitySchema, ItemNameType
 from entry.models import AliasEntry, Attribute, AttributeValue, Entry
 from entry.settings import CONFIG as CONFIG_ENTRY
 from group.models import Group
-from job.models import Job, JobStatus
+from job.models import Job, JobBatch, JobStatus
 from role.models import Role
 from user.api_v2.serializers import UserBaseSerializer
 from user.models import User
@@ -491,6 +493,12 @@ class EntryBaseSerializer(serializers.ModelSerializer):
             # In update case, there is no problem with the same name
             if not (self.instance and self.instance.name == name):
                 raise DuplicatedObjectExistsError("specified name(%s) already exists" % name)
+
+        self._validate_name_format(schema, name)
+
+        return name
+
+    def _validate_name_format(self, schema: Entity, name: str) -> None:
         if "\t" in name:
             raise InvalidValueError("Names containing tab characters cannot be specified.")
 
@@ -506,9 +514,14 @@ class EntryBaseSerializer(serializers.ModelSerializer):
                 'Specified name doesn\'t match configured pattern "%s"' % schema.item_name_pattern
             )
 
-        return name
-
-    def _validate(self, schema: Entity, name: str, attrs: list[dict[str, Any]]) -> None:
+    def _validate(
+        self,
+        schema: Entity,
+        name: str,
+        attrs: list[dict[str, Any]],
+        check_name: bool = True,
+        entity_schema: EntitySchema | None = None,
+    ) -> None:
         # Perform basic validation using Pydantic for better type safety
         try:
             # Validate attributes structure
@@ -528,12 +541,17 @@ class EntryBaseSerializer(serializers.ModelSerializer):
         if "_user" in self.context:
             user = self.context["_user"]
 
+        # The caller that validates many items of the same Entity passes its EntitySchema not
+        # to load it for each item
+        if entity_schema is None:
+            entity_schema = EntitySchema.get(schema)
+
         # In create case, check attrs mandatory attribute
         if not self.instance:
             if user is None:
                 raise RequiredParameterError("user is required")
 
-            for mandatory_attr in schema.attrs.filter(is_mandatory=True, is_active=True):
+            for mandatory_attr in [x for x in entity_schema.attrs if x.is_mandatory]:
                 if not user.has_permission(mandatory_attr, ACLType.Writable):
                     raise PermissionDenied(
                         "mandatory attrs id(%s) is permission denied" % mandatory_attr.id
@@ -545,14 +563,15 @@ class EntryBaseSerializer(serializers.ModelSerializer):
                     )
 
         exclude_items = [self.instance.id] if self.instance else []
-        # Check there is another Alias that has same name
-        if not schema.is_available(name, exclude_items):
+        # Check there is another Alias that has same name, unless the caller checks names of
+        # many Items at once by itself
+        if check_name and not schema.is_available(name, exclude_items):
             raise DuplicatedObjectExistsError("A duplicated named Alias exists in this model")
 
         # check attrs
         for attr in attrs:
             # check attrs id
-            entity_attr = schema.attrs.filter(id=attr["id"], is_active=True).first()
+            entity_attr = entity_schema.attrs_by_id.get(attr["id"])
             if not entity_attr:
                 raise ObjectNotExistsError("attrs id(%s) does not exist" % attr["id"])
 
@@ -572,6 +591,38 @@ class EntryBaseSerializer(serializers.ModelSerializer):
     def get_aliases(self, obj: Entry) -> QuerySet[AliasEntry]:
         return obj.aliases.all()
 
+    def _register_es(self, entry: Entry) -> None:
+        # Callers that save many Entries in a row (e.g. import) can put a list at
+        # "deferred_es_entries" in the context to register them by bulk requests by themselves.
+        deferred_es_entries: list[Entry] | None = self.context.get("deferred_es_entries")
+        if deferred_es_entries is not None:
+            deferred_es_entries.append(entry)
+        else:
+            entry.register_es()
+
+    def _invoke_trigger(self, user: User, entry: Entry, attrs_data: list[Any]) -> None:
+        # Callers that save many Entries in a row can put a JobBatch at "job_batch" in the
+        # context to run TriggerActions and notifications of them by jobs for many Entries.
+        job_batch: JobBatch | None = self.context.get("job_batch")
+        if job_batch is not None:
+            job_batch.invoke_trigger(entry, attrs_data)
+        else:
+            Job.new_invoke_trigger(user, entry, attrs_data).run()
+
+    def _notify_create_entry(self, user: User, entry: Entry) -> None:
+        job_batch: JobBatch | None = self.context.get("job_batch")
+        if job_batch is not None:
+            job_batch.notify_create_entry(entry)
+        else:
+            Job.new_notify_create_entry(user, entry).run()
+
+    def _notify_update_entry(self, user: User, entry: Entry) -> None:
+        job_batch: JobBatch | None = self.context.get("job_batch")
+        if job_batch is not None:
+            job_batch.notify_update_entry(entry)
+        else:
+            Job.new_notify_update_entry(user, entry).run()
+
 
 class EntrySearchSerializer(EntryBaseSerializer):
     class Meta:
@@ -660,7 +711,7 @@ class EntryCreateSerializer(EntryBaseSerializer):
 
         entry.save()
 
-        for entity_attr in entry.schema.attrs.filter(is_active=True):
+        for entity_attr in EntitySchema.get(entry.schema_id).attrs:
             attr: Attribute = entry.add_attribute_from_base(entity_attr, user)
 
             # skip for unpermitted attributes
@@ -693,17 +744,16 @@ class EntryCreateSerializer(EntryBaseSerializer):
             custom_view.call_custom("after_create_entry_v2", entity_name, user, entry)
 
         # register entry information to Elasticsearch
-        entry.register_es()
+        self._register_es(entry)
 
         # run task that may run TriggerAction in response to TriggerCondition configuration
-        Job.new_invoke_trigger(user, entry, attrs_data).run()
+        self._invoke_trigger(user, entry, attrs_data)
 
         # clear flag to specify this entry has been completed to create
         entry.del_status(Entry.STATUS_CREATING)
 
         # Send notification to the webhook URL
-        job_notify_event: Job = Job.new_notify_create_entry(user, entry)
-        job_notify_event.run()
+        self._notify_create_entry(user, entry)
 
         return entry
 
@@ -712,6 +762,191 @@ class PrivilegedEntryCreateSerializer(EntryCreateSerializer):
     privileged_mode = True
 
 
+class EntryBulkCreateItemSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=200)
+    attrs = serializers.ListField(child=AttributeDataSerializer(), required=False, default=list)
+
+
+class EntryBulkCreateRequestSerializer(serializers.Serializer):
+    """
+    This only checks the format and the number of Items in a request to create them in bulk.
+    They are validated and created by EntryBulkCreateSerializer in a BULK_CREATE_ENTRY job.
+    """
+
+    entries = EntryBulkCreateItemSerializer(many=True, allow_empty=False)
+
+    def validate_entries(self, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if len(entries) > CONFIG_ENTRY.BULK_CREATE_MAX_ENTRIES:
+            raise ExceedLimitError(
+                "entries can be created up to %d at once" % CONFIG_ENTRY.BULK_CREATE_MAX_ENTRIES
+            )
+        return entries
+
+
+class EntryBulkCreateJobSerializer(serializers.Serializer):
+    job_id = serializers.IntegerField(help_text="Poll this job, then download its result")
+
+
+@extend_schema_serializer(exclude_fields=["schema"])
+class EntryBulkCreateSerializer(EntryBaseSerializer):
+    """
+    This creates many Items of a Model at once. Items are validated together, and ones that
+    are invalid are reported at "errors" of validated_data with their indexes instead of
+    aborting the others.
+    """
+
+    schema = serializers.PrimaryKeyRelatedField(
+        queryset=Entity.objects.filter(is_active=True), write_only=True, required=True
+    )
+    entries = EntryBulkCreateItemSerializer(many=True, write_only=True, allow_empty=False)
+
+    class Meta:
+        model = Entry
+        fields = ["schema", "entries"]
+
+    def validate(self, params: dict[str, Any]) -> dict[str, Any]:
+        schema: Entity = params["schema"]
+        entity_schema = EntitySchema.get(schema)
+
+        # names that are used by existing Items and Aliases, and by preceding valid items
+        unavailable_names = schema.get_unavailable_names([x["name"] for x in params["entries"]])
+
+        entries: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        for index, entry_data in enumerate(params["entries"]):
+            name = entry_data["name"]
+            try:
+                if name.lower() in unavailable_names:
+                    raise DuplicatedObjectExistsError("specified name(%s) already exists" % name)
+
+                self._validate_name_format(schema, name)
+                self._validate(
+                    schema, name, entry_data["attrs"], check_name=False, entity_schema=entity_schema
+                )
+
+            except (ValidationError, PermissionDenied) as e:
+                errors.append({"index": index, "name": name, "detail": e.get_full_details()})
+                continue
+
+            unavailable_names.add(name.lower())
+            entries.append({**entry_data, "index": index})
+
+        params["entries"] = entries
+        params["errors"] = errors
+        return params
+
+    def create(self, validated_data: dict[str, Any]) -> list[Entry]:
+        user: User | None = None
+        if "request" in self.context:
+            user = self.context["request"].user
+        if "_user" in self.context:
+            user = self.context["_user"]
+        if user is None:
+            raise RequiredParameterError("user is required")
+
+        schema: Entity = validated_data["schema"]
+        entity_attrs = EntitySchema.get(schema).attrs
+
+        # All valid items are created, or none of them are when any of them fails
+        with transaction.atomic():
+            # (created Entry, attrs data of it) of each valid item
+            created: list[tuple[Entry, list[dict[str, Any]]]] = []
+            for entry_data in validated_data["entries"]:
+                entry_data = {
+                    "name": entry_data["name"],
+                    "schema": schema,
+                    "attrs": entry_data["attrs"],
+                    "created_user": user,
+                }
+                if custom_view.is_custom("before_create_entry_v2", schema.name):
+                    entry_data = custom_view.call_custom(
+                        "before_create_entry_v2", schema.name, user, entry_data
+                    )
+
+                attrs_data = entry_data.pop("attrs", [])
+                entry = Entry(**entry_data, status=Entry.STATUS_CREATING)
+
+                # for history record
+                entry._history_user = user
+
+                entry.save()
+                created.append((entry, attrs_data))
+
+            # Entries and Attributes are saved one by one because Django can't bulk create models
+            # of multi-table inheritance (ACLBase), then AttributeValues of all of them are created
+            # by bulk inserts.
+            attr_values: list[tuple[Attribute, Any]] = []
+            # Attributes that aren't given any value have blank ones not to make them at indexing
+            blank_attrs: list[Attribute] = []
+            for entry, attrs_data in created:
+                values_by_id = {int(x["id"]): x["value"] for x in reversed(attrs_data)}
+                for entity_attr in entity_attrs:
+                    attr = Attribute.objects.create(
+                        name=entity_attr.name,
+                        schema=entity_attr,
+                        parent_entry=entry,
+                        created_user=user,
+                    )
+
+                    # skip for unpermitted attributes
+                    if not self.privileged_mode and not user.has_permission(attr, ACLType.Writable):
+                        blank_attrs.append(attr)
+                        continue
+
+                    default_value = None
+                    if entity_attr.type in [
+                        AttrType.STRING,
+                        AttrType.TEXT,
+                        AttrType.BOOLEAN,
+                        AttrType.NUMBER,
+                    ]:
+                        default_value = entity_attr.get_default_value()
+
+                    if entity_attr.id in values_by_id:
+                        attr_values.append((attr, values_by_id[entity_attr.id]))
+                    elif default_value is not None:
+                        attr_values.append((attr, default_value))
+                    else:
+                        blank_attrs.append(attr)
+
+            Attribute.add_values_bulk(user, attr_values, blank_attrs=blank_attrs)
+
+            entries = [x for (x, _) in created]
+
+            # Items of a Model whose names are specified by users keep them, and they aren't
+            # referred by any other Items yet to update their names
+            if schema.item_name_type != ItemNameType.USER:
+                for entry in entries:
+                    entry.save_autoname()
+
+            if custom_view.is_custom("after_create_entry_v2", schema.name):
+                for entry in entries:
+                    custom_view.call_custom("after_create_entry_v2", schema.name, user, entry)
+
+            # clear flag to specify these entries have been completed to create
+            Entry.objects.filter(id__in=[x.id for x in entries]).update(
+                status=F("status").bitand(~Entry.STATUS_CREATING)
+            )
+            for entry in entries:
+                entry.status &= ~Entry.STATUS_CREATING
+
+        # register entries information to Elasticsearch by bulk requests
+        deferred_es_entries: list[Entry] | None = self.context.get("deferred_es_entries")
+        if deferred_es_entries is not None:
+            deferred_es_entries.extend(entries)
+        else:
+            Entry.register_es_entries(entries)
+
+        # TriggerActions and notifications of them are run by jobs that carry many Entries
+        with JobBatch(user) as own_job_batch:
+            job_batch: JobBatch = self.context.get("job_batch") or own_job_batch
+            for entry, attrs_data in created:
+                job_batch.invoke_trigger(entry, attrs_data)
+                job_batch.notify_create_entry(entry)
+
+        return entries
+
+
 class EntryUpdateData(TypedDict, total=False):
     name: str
     attrs: list[AttributeDataSerializer]
@@ -779,27 +1014,59 @@ class EntryUpdateSerializer(EntryBaseSerializer):
             is_updated = True
             job_register_referrals = Job.new_register_referrals(user, entry)
 
-        for entity_attr in entry.schema.attrs.filter(is_active=True):
-            attr: Attribute = entry.attrs.filter(schema=entity_attr, is_active=True).first()
-            if not attr:
-                attr = entry.add_attribute_from_base(entity_attr, user)
+        # Attributes of the entry and their latest values are loaded at once, and only the ones
+        # that are specified are compared and updated. Latest flags of the previous values are
+        # cleared with one query for all of them.
+        entity_schema = EntitySchema.get(entry.schema_id)
+        attrs: dict[int, Attribute] = {}
+        for x in (
+            entry.attrs.filter(is_active=True)
+            .prefetch_related(
+                Prefetch(
+                    "values",
+                    queryset=AttributeValue.objects.filter(is_latest=True)
+                    .select_related("referral")
+                    .prefetch_related("data_array__referral")
+                    .order_by("id"),
+                    to_attr="prefetch_latest_values",
+                )
+            )
+            .order_by("id")
+        ):
+            attrs.setdefault(x.schema_id, x)
+        for entity_attr in entity_schema.attrs:
+            if entity_attr.id not in attrs:
+                attrs[entity_attr.id] = entry.add_attribute_from_base(entity_attr, user)
+
+        # the first value is used when the same attribute is specified more than once
+        values: dict[int, Any] = {}
+        for x in attrs_data:
+            values.setdefault(int(x["id"]), x["value"])
+
+        added_values: list[AttributeValue] = []
+        for entity_attr in entity_schema.attrs:
+            if entity_attr.id not in values:
+                continue
+
+            attr = attrs[entity_attr.id]
+            attr.schema = entity_attr
 
             # skip for unpermitted attributes
             if not self.privileged_mode and not user.has_permission(attr, ACLType.Writable):
                 continue
 
-            # make AttributeValue object if the value is specified
-            attr_data = [x for x in attrs_data if int(x["id"]) == entity_attr.id]
-            if not attr_data:
-                continue
-
             # Check a new update value is specified, or not
-            if not attr.is_updated(attr_data[0]["value"]):
+            latest_values = getattr(attr, "prefetch_latest_values", None)
+            if not attr.is_updated(
+                values[entity_attr.id], latest_value=latest_values[-1] if latest_values else None
+            ):
                 continue
 
-            attr.add_value(user, attr_data[0]["value"])
+            added_values.append(attr.add_value(user, values[entity_attr.id], unset_latest=False))
             is_updated = True
 
+        Attribute.unset_latest_flags(added_values)
+
         # Updating its name from attribute values if it's necessary
         entry.save_autoname()
 
@@ -808,11 +1075,11 @@ class EntryUpdateSerializer(EntryBaseSerializer):
 
         # update entry information to Elasticsearch
         if is_updated:
-            entry.register_es()
+            self._register_es(entry)
 
         # run task that may run TriggerAction in response to TriggerCondition configuration
         if validated_data["delay_trigger"]:
-            Job.new_invoke_trigger(user, entry, attrs_data).run()
+            self._invoke_trigger(user, entry, attrs_data)
         else:
             # This declaration prevents circular reference because TriggerAction module
             # imports this module indirectly. And this might affect little negative affect
@@ -832,8 +1099,7 @@ class EntryUpdateSerializer(EntryBaseSerializer):
 
         # running job to notify changing entry event
         if is_updated:
-            job_notify_event: Job = Job.new_notify_update_entry(user, entry)
-            job_notify_event.run()
+            self._notify_update_entry(user, entry)
 
         return entry
 
@@ -1093,9 +1359,7 @@ class EntryRetrieveSerializer(EntryBaseSerializer):
         # for both single OBJECT / NAMED_OBJECT branches and their ARRAY_*
         # variants that iterate AttributeValue.data_array children.
         display_attr_names: set[str] = {
-            ea.display_attr
-            for ea in obj.schema.attrs.filter(is_active=True).only("display_attr")
-            if ea.display_attr
+            ea.display_attr for ea in EntitySchema.get(obj.schema_id).attrs if ea.display_attr
         }
         parent_prefetches: list[Prefetch] = []
         child_prefetches: list[Prefetch] = []
@@ -1120,23 +1384,22 @@ class EntryRetrieveSerializer(EntryBaseSerializer):
             .prefetch_related(*parent_prefetches),
             to_attr="attrv_list",
         )
-        attr_prefetch = Prefetch(
-            "attribute_set",
-            queryset=Attribute.objects.filter(parent_entry=obj).prefetch_related(attrv_prefetch),
-            to_attr="attr_list",
-        )
-        entity_attrs = (
-            obj.schema.attrs.filter(is_active=True)
-            .prefetch_related(attr_prefetch)
-            .order_by("index")
-        )
+        # the first Attribute of each EntityAttr
+        attrs: dict[int, Attribute] = {}
+        for x in (
+            Attribute.objects.filter(parent_entry=obj)
+            .prefetch_related(attrv_prefetch)
+            .order_by("id")
+        ):
+            attrs.setdefault(x.schema_id, x)
 
         user: User = self.context["request"].user
 
         attrinfo: list[EntryAttributeType] = []
-        for entity_attr in entity_attrs:
-            attr = entity_attr.attr_list[0] if entity_attr.attr_list else None
+        for entity_attr in EntitySchema.get(obj.schema_id).sorted_attrs:
+            attr = attrs.get(entity_attr.id)
             if attr:
+                attr.schema = entity_attr
                 is_readable = user.has_permission(attr, ACLType.Readable)
             else:
                 is_readable = user.has_permission(entity_attr, ACLType.Readable)
@@ -1383,9 +1646,9 @@ class EntryImportEntitySerializer(serializers.Serializer):
             entity_attr.name: {
                 "id": entity_attr.id,
                 "type": entity_attr.type,
-                "refs": [x for x in entity_attr.referral.filter(is_active=True)],
+                "refs": [x for x in entity_attr.referral.all() if x.is_active],
             }
-            for entity_attr in entity.attrs.filter(is_active=True)
+            for entity_attr in EntitySchema.get(entity).attrs
         }
         for entry_data in params["entries"]:
             for attr_data in entry_data.get("attrs", []):
@@ -3,14 +3,13 @@ import logging
 import re
 from collections import Counter
 from copy import deepcopy
-from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from django.db.models import Prefetch, Q, QuerySet
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics, status, viewsets
-from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.exceptions import NotFound, ParseError, PermissionDenied
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import BasePermission, IsAuthenticated
 from rest_framework.request import Request
@@ -22,11 +21,10 @@ from airone.lib import custom_view
 from airone.lib.acl import ACLType
 from airone.lib.drf import (
     DuplicatedObjectExistsError,
-    FrequentImportError,
     IncorrectTypeError,
     ObjectNotExistsError,
     RequiredParameterError,
-    YAMLParser,
+    YAMLStreamParser,
 )
 from airone.lib.elasticsearch import (
     ENTRY_NAME_SORT_TARGET,
@@ -68,7 +66,7 @@ from entry.services import AdvancedSearchService
 from entry.settings import CONFIG
 from entry.settings import CONFIG as ENTRY_CONFIG
 from group.models import Group
-from job.models import Job, JobOperation, JobStatus
+from job.models import Job, JobArtifact, JobStatus
 from role.models import Role
 
 if TYPE_CHECKING:
@@ -804,13 +802,13 @@ class EntryAttrReferralsAPI(viewsets.ReadOnlyModelViewSet):
 
 
 class EntryImportAPI(generics.GenericAPIView):
-    parser_classes = [YAMLParser]
-    serializer_class = EntryImportSerializer
+    """
+    The uploaded YAML is staged to the storage as it is, and the job parses, validates and
+    splits it to the import jobs of each model, so that the request doesn't load it.
+    """
 
-    def get_queryset(self) -> QuerySet[Entity]:
-        import_data = self.request.data
-        entity_names = [d["entity"] for d in import_data]
-        return Entity.objects.filter(name__in=entity_names, is_active=True)
+    parser_classes = [YAMLStreamParser]
+    serializer_class = EntryImportSerializer
 
     @extend_schema(
         parameters=[
@@ -824,51 +822,20 @@ class EntryImportAPI(generics.GenericAPIView):
         if request.user.is_readonly:
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        import_datas = request.data
-        user: User = request.user
-        serializer = EntryImportSerializer(data=import_datas)
-        serializer.is_valid(raise_exception=True)
-        entities = self.get_queryset()
-
-        # limit import job to deny accidental frequent import for same entity
-        if request.query_params.get("force", "") not in ["true", "True"]:
-            valid_statuses: list[JobStatus] = [
-                JobStatus.PREPARING,
-                JobStatus.PROCESSING,
-                JobStatus.DONE,
-            ]
-            yesterday = datetime.now() - timedelta(days=1)
-            if Job.objects.filter(
-                status__in=valid_statuses,
-                operation=JobOperation.IMPORT_ENTRY_V2,
-                target__in=entities,
-                created_at__gte=yesterday,
-            ).exists():
-                raise FrequentImportError("Import job for each entity can apply once a day.")
-
-        job_ids: list[int] = []
-        error_list: list[str] = []
-        for import_data in import_datas:
-            entity: Entity | None = next(
-                (e for e in entities if e.name == import_data["entity"]), None
-            )
-            if not entity:
-                error_list.append("%s: Entity does not exists." % import_data["entity"])
-                continue
-
-            if not user.has_permission(entity, ACLType.Writable):
-                error_list.append("%s: Entity is permission denied." % import_data["entity"])
-                continue
-
-            job = Job.new_import_v2(
-                user, entity, text="Preparing to import data", params=import_data
-            )
-            job.run()
-            job_ids.append(job.id)
+        # an empty body isn't passed to the parser
+        if not hasattr(request.data, "read"):
+            raise ParseError("No data is uploaded")
 
-        return Response(
-            {"result": {"job_ids": job_ids, "error": error_list}}, status=status.HTTP_200_OK
+        user: User = request.user
+        job = Job.new_dispatch_import_v2(
+            user,
+            text="Preparing to import data",
+            params={"force": request.query_params.get("force", "") in ["true", "True"]},
         )
+        job.stage_file(request.data, JobArtifact.CONTENT_TYPE_YAML)
+        job.run()
+
+        return Response({"result": {"job_ids": [job.id], "error": []}}, status=status.HTTP_200_OK)
 
 
 class EntryAttributeValueRestoreAPI(generics.UpdateAPIView):
@@ -7,25 +7,26 @@ from typing import Any, Optional, Union, cast
 
 from django.conf import settings
 from django.db import models
-from django.db.models import Prefetch, Q, QuerySet
+from django.db.models import F, Prefetch, Q, QuerySet
 from elasticsearch import NotFoundError
 from simple_history.models import HistoricalRecords
 
 from acl.models import ACLBase
 from airone.lib import auto_complement
-from airone.lib.acl import ACLObjType, ACLType
+from airone.lib.acl import ACLObjType, ACLType, filter_permitted
 from airone.lib.drf import ExceedLimitError
 from airone.lib.elasticsearch import (
     ESS,
     AttributeDocument,
     EntryDocument,
+    get_document_hash,
 )
 from airone.lib.types import (
     AttrDefaultValue,
     AttrType,
     coerce_number,
 )
-from entity.models import Entity, EntityAttr, ItemNameType
+from entity.models import Entity, EntityAttr, EntitySchema, ItemNameType
 from group.models import Group
 from role.models import Role
 from user.models import User
@@ -671,26 +672,35 @@ class Attribute(ACLBase):
         return bool(self.schema.type & AttrType._ARRAY)
 
     # This checks whether each specified attribute needs to update
-    def is_updated(self, recv_value: Any) -> bool:
-        # the case new attribute-value is specified
-        if not self.values.exists():
-            # the result depends on the specified value
-            if isinstance(recv_value, bool):
-                # the case that first value is 'False' at the boolean typed parameter
+    def is_updated(self, recv_value: Any, latest_value: "AttributeValue | None" = None) -> bool:
+        """
+        This returns whether recv_value is different from the latest value of this Attribute.
+        The caller can pass the latest AttributeValue that it has already loaded (e.g. by
+        prefetching it with its data_array) not to look it up again.
+        """
+        if latest_value is not None:
+            last_value = latest_value
+        else:
+            # the case new attribute-value is specified
+            if not self.values.exists():
+                # the result depends on the specified value
+                if isinstance(recv_value, bool):
+                    # the case that first value is 'False' at the boolean typed parameter
+                    return True
+                else:
+                    return bool(recv_value)
+
+            # Self-heal: when the invariant "exactly one AttributeValue with
+            # is_latest=True" has been broken (e.g. by a race between concurrent
+            # imports racing in unset_latest_flag), force the next write to be
+            # treated as an update so add_value() creates a fresh AV and
+            # unset_latest_flag() restores the invariant.
+            if not self.values.filter(is_latest=True).exists():
                 return True
-            else:
-                return bool(recv_value)
-
-        # Self-heal: when the invariant "exactly one AttributeValue with
-        # is_latest=True" has been broken (e.g. by a race between concurrent
-        # imports racing in unset_latest_flag), force the next write to be
-        # treated as an update so add_value() creates a fresh AV and
-        # unset_latest_flag() restores the invariant.
-        if not self.values.filter(is_latest=True).exists():
-            return True
 
-        last_value = self.values.last()
-        assert last_value is not None  # guaranteed by the is_latest existence check above
+            last_value = self.values.last()
+            assert last_value is not None  # guaranteed by the is_latest existence check above
+
         match self.schema.type:
             case AttrType.STRING | AttrType.TEXT:
                 # the case that specified value is empty or invalid
@@ -1054,6 +1064,19 @@ class Attribute(ACLBase):
             else:
                 return _create_new_value()
 
+    def get_prefetched_latest_value(self) -> AttributeValue | None:
+        """
+        This returns the latest value from prefetch_values when it has been prefetched
+        (ordered by id) with this Attribute, and falls back to get_latest_value() otherwise.
+        """
+        prefetch_values = getattr(self, "prefetch_values", None)
+        if prefetch_values and prefetch_values[-1].data_type == self.schema.type:
+            attrv: AttributeValue = prefetch_values[-1]
+            attrv.parent_attr = self
+            return attrv
+
+        return self.get_latest_value()
+
     def get_last_value(self) -> AttributeValue:
         attrv = self.values.last()
         if not attrv:
@@ -1107,6 +1130,23 @@ class Attribute(ACLBase):
             exclude = Q(id=exclude_id)
         self.values.filter(is_latest=True).exclude(exclude).update(is_latest=False)
 
+    @classmethod
+    def unset_latest_flags(kls, attr_values: Iterable[AttributeValue]) -> None:
+        """
+        This clears latest flags of the Attributes of specified AttributeValues with one query,
+        except for the newest one of them for each Attribute.
+        """
+        latest_ids: dict[int, int] = {}
+        for attr_value in attr_values:
+            latest_ids[attr_value.parent_attr_id] = max(
+                latest_ids.get(attr_value.parent_attr_id, 0), attr_value.id
+            )
+
+        if latest_ids:
+            AttributeValue.objects.filter(attribute__in=latest_ids.keys(), is_latest=True).exclude(
+                id__in=latest_ids.values()
+            ).update(is_latest=False)
+
     def _validate_single_number(self, value: Any) -> bool:
         """Validates a single number value (helper for array number validation)"""
         if value is None or value == "":
@@ -1255,158 +1295,186 @@ class Attribute(ACLBase):
 
         return False
 
-    def add_value(self, user: User, value: Any, boolean: bool = False) -> AttributeValue:
-        """This method make AttributeValue and set it as the latest one"""
+    def _set_attrv(
+        self, attr_type: int, val: Any, attrv: AttributeValue, boolean: bool = False
+    ) -> AttributeValue | None:
+        """This is a helper method to set the value to AttributeValue by its AttrType"""
+        match attr_type:
+            case AttrType.STRING | AttrType.TEXT:
+                attrv.boolean = boolean
+                attrv.value = str(val)
+                if not attrv.value:  # if empty string or None coerced to ""
+                    return None  # For STRING, empty means no AttributeValue
 
-        # This is a helper method to set AttributeType
-        def _set_attrv(
-            attr_type: int,
-            val: Any,
-            attrv: AttributeValue | None = None,
-            params: dict[str, Any] = {},
-        ) -> AttributeValue | None:
-            if not attrv:
-                attrv = AttributeValue(**params)
+            case AttrType.SELECT:
+                attrv.boolean = boolean
+                attrv.value = "" if val is None else str(val)
+                if not attrv.value:
+                    return None
 
-            match attr_type:
-                case AttrType.STRING | AttrType.TEXT:
-                    attrv.boolean = boolean
-                    attrv.value = str(val)
-                    if not attrv.value:  # if empty string or None coerced to ""
-                        return None  # For STRING, empty means no AttributeValue
+            case AttrType.NUMBER:
+                if val is None or val == "":
+                    attrv.value = ""
+                elif isinstance(val, int | float):
+                    if isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
+                        # This should ideally be caught by validation earlier
+                        attrv.value = ""  # Or handle as error
+                    else:
+                        attrv.value = str(float(val))
+                elif isinstance(val, str):
+                    # Already validated by _validate_value, so should be
+                    # convertible and not NaN/Inf
+                    try:
+                        float_val = float(val)
+                        attrv.value = str(float_val)
+                    except ValueError:
+                        # Fallback, should have been caught by validation
+                        attrv.value = ""
+                else:
+                    # Should not happen if validation is correct
+                    attrv.value = ""
+                # For NUMBER, an AttributeValue is created regardless of value
+                # to maintain consistency with other types.
 
-                case AttrType.SELECT:
-                    attrv.boolean = boolean
-                    attrv.value = "" if val is None else str(val)
-                    if not attrv.value:
+            case AttrType.GROUP:
+                attrv.boolean = boolean
+                group_ref: Group | None = None
+                match val:
+                    case Group() if val.is_active:
+                        group_ref = val
+                    case int():
+                        group_ref = Group.objects.filter(id=val, is_active=True).first()  # type: ignore[misc, assignment]
+                    case str() if val.isdigit():
+                        group_ref = Group.objects.filter(id=val, is_active=True).first()  # type: ignore[misc, assignment]
+                    case _:
                         return None
+                if group_ref:
+                    attrv.group = group_ref
 
-                case AttrType.NUMBER:
-                    if val is None or val == "":
-                        attrv.value = ""
-                    elif isinstance(val, int | float):
-                        if isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
-                            # This should ideally be caught by validation earlier
-                            attrv.value = ""  # Or handle as error
-                        else:
-                            attrv.value = str(float(val))
-                    elif isinstance(val, str):
-                        # Already validated by _validate_value, so should be
-                        # convertible and not NaN/Inf
-                        try:
-                            float_val = float(val)
-                            attrv.value = str(float_val)
-                        except ValueError:
-                            # Fallback, should have been caught by validation
-                            attrv.value = ""
-                    else:
-                        # Should not happen if validation is correct
-                        attrv.value = ""
-                    # For NUMBER, an AttributeValue is created regardless of value
-                    # to maintain consistency with other types.
+            case AttrType.ROLE:
+                attrv.boolean = boolean
+                role_ref: Role | None = None
+                match val:
+                    case Role() if val.is_active:
+                        role_ref = val
+                    case int():
+                        role_ref = Role.objects.filter(id=val, is_active=True).first()
+                    case str() if val.isdigit():
+                        role_ref = Role.objects.filter(id=val, is_active=True).first()
+                    case _:
+                        return None
+                if role_ref:
+                    attrv.role = role_ref
 
-                case AttrType.GROUP:
-                    attrv.boolean = boolean
-                    group_ref: Group | None = None
-                    match val:
-                        case Group() if val.is_active:
-                            group_ref = val
-                        case int():
-                            group_ref = Group.objects.filter(id=val, is_active=True).first()  # type: ignore[misc, assignment]
-                        case str() if val.isdigit():
-                            group_ref = Group.objects.filter(id=val, is_active=True).first()  # type: ignore[misc, assignment]
-                        case _:
-                            return None
-                    if group_ref:
-                        attrv.group = group_ref
+            case AttrType.OBJECT:
+                attrv.boolean = boolean
+                # set None if the referral entry is not specified
+                attrv.referral = None
+                if not val:
+                    pass
+                elif isinstance(val, Entry):
+                    attrv.referral = val
+                elif isinstance(val, str) or isinstance(val, int):
+                    ref_entry = Entry.objects.filter(id=val, is_active=True).first()
+                    if ref_entry:
+                        attrv.referral = ref_entry
+
+                parent_entity = self.schema.parent_entity
+                if attrv.referral is not None:
+                    from isolation.models import IsolationParent
 
-                case AttrType.ROLE:
-                    attrv.boolean = boolean
-                    role_ref: Role | None = None
-                    match val:
-                        case Role() if val.is_active:
-                            role_ref = val
-                        case int():
-                            role_ref = Role.objects.filter(id=val, is_active=True).first()
-                        case str() if val.isdigit():
-                            role_ref = Role.objects.filter(id=val, is_active=True).first()
-                        case _:
-                            return None
-                    if role_ref:
-                        attrv.role = role_ref
+                    qs = Entry.objects.filter(id=attrv.referral.id, is_active=True)
+                    if IsolationParent.get_isolated_entry_ids(qs, parent_entity):
+                        attrv.referral = None
 
-                case AttrType.OBJECT:
-                    attrv.boolean = boolean
-                    # set None if the referral entry is not specified
-                    attrv.referral = None
-                    if not val:
-                        pass
-                    elif isinstance(val, Entry):
-                        attrv.referral = val
-                    elif isinstance(val, str) or isinstance(val, int):
-                        ref_entry = Entry.objects.filter(id=val, is_active=True).first()
-                        if ref_entry:
-                            attrv.referral = ref_entry
-
-                    parent_entity = self.schema.parent_entity
-                    if attrv.referral is not None:
-                        from isolation.models import IsolationParent
-
-                        qs = Entry.objects.filter(id=attrv.referral.id, is_active=True)
-                        if IsolationParent.get_isolated_entry_ids(qs, parent_entity):
-                            attrv.referral = None
-
-                    if not attrv.referral:
-                        return None
+                if not attrv.referral:
+                    return None
 
-                case AttrType.BOOLEAN:
-                    attrv.boolean = val
+            case AttrType.BOOLEAN:
+                attrv.boolean = val
 
-                case AttrType.DATE:
-                    if isinstance(val, str) and val:
-                        attrv.date = datetime.strptime(val, "%Y-%m-%d").date()
-                    elif isinstance(val, date):
-                        attrv.date = val
+            case AttrType.DATE:
+                if isinstance(val, str) and val:
+                    attrv.date = datetime.strptime(val, "%Y-%m-%d").date()
+                elif isinstance(val, date):
+                    attrv.date = val
 
-                    attrv.boolean = boolean
+                attrv.boolean = boolean
 
-                case AttrType.NAMED_OBJECT | AttrType.NAMED_OBJECT_BOOLEAN:
-                    attrv.value = val["name"] if "name" in val else ""
-                    if "boolean" in val:
-                        attrv.boolean = val["boolean"]
-                    else:
-                        attrv.boolean = boolean
+            case AttrType.NAMED_OBJECT | AttrType.NAMED_OBJECT_BOOLEAN:
+                attrv.value = val["name"] if "name" in val else ""
+                if "boolean" in val:
+                    attrv.boolean = val["boolean"]
+                else:
+                    attrv.boolean = boolean
 
+                attrv.referral = None
+                if "id" not in val or not val["id"]:
+                    pass
+                elif isinstance(val["id"], str) or isinstance(val["id"], int):
+                    ref_entry = Entry.objects.filter(id=val["id"], is_active=True).first()
+                    if ref_entry:
+                        attrv.referral = ref_entry
+                elif isinstance(val["id"], Entry):
+                    attrv.referral = val["id"]
+                else:
                     attrv.referral = None
-                    if "id" not in val or not val["id"]:
-                        pass
-                    elif isinstance(val["id"], str) or isinstance(val["id"], int):
-                        ref_entry = Entry.objects.filter(id=val["id"], is_active=True).first()
-                        if ref_entry:
-                            attrv.referral = ref_entry
-                    elif isinstance(val["id"], Entry):
-                        attrv.referral = val["id"]
-                    else:
+
+                parent_entity = self.schema.parent_entity
+                if attrv.referral is not None:
+                    from isolation.models import IsolationParent
+
+                    qs = Entry.objects.filter(id=attrv.referral.id, is_active=True)
+                    if IsolationParent.get_isolated_entry_ids(qs, parent_entity):
                         attrv.referral = None
 
-                    parent_entity = self.schema.parent_entity
-                    if attrv.referral is not None:
-                        from isolation.models import IsolationParent
+                if not attrv.referral and not attrv.value:
+                    return None
 
-                        qs = Entry.objects.filter(id=attrv.referral.id, is_active=True)
-                        if IsolationParent.get_isolated_entry_ids(qs, parent_entity):
-                            attrv.referral = None
+            case AttrType.DATETIME:
+                if isinstance(val, str) and val:
+                    attrv.datetime = datetime.fromisoformat(val)
+                elif isinstance(val, datetime):
+                    attrv.datetime = val
 
-                    if not attrv.referral and not attrv.value:
-                        return None
+        return attrv
 
-                case AttrType.DATETIME:
-                    if isinstance(val, str) and val:
-                        attrv.datetime = datetime.fromisoformat(val)
-                    elif isinstance(val, datetime):
-                        attrv.datetime = val
+    def _make_co_values(
+        self, value: Any, params: dict[str, Any], boolean: bool = False
+    ) -> list[AttributeValue]:
+        """This makes (unsaved) leaf AttributeValues for each element of an array value"""
+        if not value or not isinstance(value, Iterable):
+            return []
+
+        # MULTI_SELECT must hold a deduplicated set of choice values.
+        # Preserve insertion order so the resulting AttributeValues remain stable
+        # against unchanged input even if the caller passes duplicates.
+        if self.schema.type == AttrType.MULTI_SELECT and isinstance(value, list):
+            value = list(dict.fromkeys(v for v in value if isinstance(v, str) and v))
+
+        co_attrvs = []
+        for v in value:
+            # set AttributeValue for each values
+            co_attrv = self._set_attrv(
+                (self.schema.type & ~AttrType._ARRAY),
+                v,
+                AttributeValue(**params),
+                boolean,
+            )
+            if co_attrv:
+                co_attrvs.append(co_attrv)
 
-            return attrv
+        return co_attrvs
+
+    def add_value(
+        self, user: User, value: Any, boolean: bool = False, unset_latest: bool = True
+    ) -> AttributeValue:
+        """This method make AttributeValue and set it as the latest one
+
+        When unset_latest is False, latest flags of the previous values are left set. Then
+        the caller has to unset them by Attribute.unset_latest_flags() (e.g. at once for all
+        values that are added by an import).
+        """
 
         # checks the type of specified value is acceptable for this Attribute object
         if not self._validate_value(value):
@@ -1424,41 +1492,24 @@ class Attribute(ACLBase):
             # set status of parent data_array
             attr_value.set_status(AttributeValue.STATUS_DATA_ARRAY_PARENT)
 
-            if value and isinstance(value, Iterable):
-                # MULTI_SELECT must hold a deduplicated set of choice values.
-                # Preserve insertion order so the resulting AttributeValues remain stable
-                # against unchanged input even if the caller passes duplicates.
-                if self.schema.type == AttrType.MULTI_SELECT and isinstance(value, list):
-                    value = list(dict.fromkeys(v for v in value if isinstance(v, str) and v))
-
-                co_attrv_params = {
-                    "created_user": user,
-                    "parent_attr": self,
-                    "data_type": self.schema.type,
-                    "parent_attrv": attr_value,
-                    "is_latest": False,
-                    "boolean": boolean,
-                }
-
-                # create and append updated values
-                attrv_bulk = []
-                for v in value:
-                    # set AttributeValue for each values
-                    co_attrv = _set_attrv(
-                        (self.schema.type & ~AttrType._ARRAY),
-                        v,
-                        params=co_attrv_params,
-                    )
-                    if co_attrv:
-                        attrv_bulk.append(co_attrv)
+            co_attrv_params = {
+                "created_user": user,
+                "parent_attr": self,
+                "data_type": self.schema.type,
+                "parent_attrv": attr_value,
+                "is_latest": False,
+                "boolean": boolean,
+            }
 
-                # Create each leaf AttributeValue in bulk.
-                # This processing send only one query to the DB
-                # for making all AttributeValue objects.
-                AttributeValue.objects.bulk_create(attrv_bulk)
+            # Create each leaf AttributeValue in bulk.
+            # This processing send only one query to the DB
+            # for making all AttributeValue objects.
+            co_attrvs = self._make_co_values(value, co_attrv_params, boolean)
+            if co_attrvs:
+                AttributeValue.objects.bulk_create(co_attrvs)
 
         else:
-            _set_attrv(self.schema.type, value, attrv=attr_value)
+            self._set_attrv(self.schema.type, value, attr_value, boolean)
 
         # set previous value to make the relationship of updating chain
         attr_value.prev_value = self.values.filter(is_latest=True).exclude(id=attr_value.id).last()
@@ -1469,10 +1520,99 @@ class Attribute(ACLBase):
 
         # Clear the flag that means target AttrValues are latet from the Values
         # that are already created.
-        self.unset_latest_flag(exclude_id=attr_value.id)
+        if unset_latest:
+            self.unset_latest_flag(exclude_id=attr_value.id)
 
         return attr_value
 
+    @classmethod
+    def add_values_bulk(
+        kls,
+        user: User,
+        attr_values: list[tuple["Attribute", Any]],
+        boolean: bool = False,
+        blank_attrs: list["Attribute"] = [],
+    ) -> list[AttributeValue]:
+        """
+        This is add_value() for many Attributes that don't have any AttributeValue yet (e.g.
+        ones of Entries that are just created), which takes a value for each of them. All
+        AttributeValues of them are created by bulk inserts.
+
+        Attributes of blank_attrs are given blank AttributeValues, which are same with the
+        ones that get_latest_value() creates for Attributes that have no value.
+
+        NOTE:
+          ids of bulk created AttributeValues are looked up by their Attributes because MySQL
+          doesn't return them.
+        """
+        # checks the type of specified values are acceptable for their Attribute objects
+        for attr, value in attr_values:
+            if not attr._validate_value(value):
+                raise TypeError(
+                    '[%s] "%s" is not acceptable [attr_type:%d]'
+                    % (attr.schema.name, str(value), attr.schema.type)
+                )
+
+        attr_value_list: list[AttributeValue] = []
+        for attr, value in attr_values:
+            attr_value = AttributeValue(
+                created_user=user, parent_attr=attr, data_type=attr.schema.type
+            )
+            if attr.is_array():
+                attr_value.boolean = boolean
+                attr_value.status |= AttributeValue.STATUS_DATA_ARRAY_PARENT
+            else:
+                attr._set_attrv(attr.schema.type, value, attr_value, boolean)
+
+            attr_value_list.append(attr_value)
+
+        for attr in blank_attrs:
+            attr_value = AttributeValue(
+                value="", created_user=user, parent_attr=attr, data_type=attr.schema.type
+            )
+            if attr.is_array():
+                attr_value.status |= AttributeValue.STATUS_DATA_ARRAY_PARENT
+
+            attr_value_list.append(attr_value)
+
+        AttributeValue.objects.bulk_create(attr_value_list)
+        attr_value_ids = dict(
+            AttributeValue.objects.filter(
+                parent_attr__in=[x.parent_attr_id for x in attr_value_list],
+                parent_attrv__isnull=True,
+            ).values_list("parent_attr", "id")
+        )
+        for attr_value in attr_value_list:
+            attr_value.id = attr_value_ids[attr_value.parent_attr_id]
+
+        AttributeValue.objects.bulk_create(
+            [
+                co_attrv
+                for (attr, value), attr_value in zip(attr_values, attr_value_list)
+                if attr.is_array()
+                for co_attrv in attr._make_co_values(
+                    value,
+                    {
+                        "created_user": user,
+                        "parent_attr": attr,
+                        "data_type": attr.schema.type,
+                        "parent_attrv": attr_value,
+                        "is_latest": False,
+                        "boolean": boolean,
+                    },
+                    boolean,
+                )
+            ]
+        )
+        Attribute.values.through.objects.bulk_create(
+            [
+                Attribute.values.through(attribute_id=x.parent_attr_id, attributevalue_id=x.id)
+                for x in attr_value_list
+            ]
+        )
+
+        return attr_value_list
+
     def convert_value_to_register(self, value: Any) -> Any:
         """
         This absorbs difference values according to the type of Attributes
@@ -2052,9 +2192,9 @@ class Entry(ACLBase):
             parent_attr__parent_entry=self,
         )
 
-        entry_ids = [x.referral.id for x in AttributeValue.objects.filter(query) if x.referral]
+        entry_ids = AttributeValue.objects.filter(query).values_list("referral", flat=True)
 
-        return Entry.objects.filter(id__in=entry_ids)
+        return Entry.objects.filter(id__in=list(entry_ids))
 
     def get_referred_objects(
         self, filter_entities: list[str] = [], exclude_entities: list[str] = []
@@ -2072,10 +2212,11 @@ class Entry(ACLBase):
             return
         user = complemented_user
 
-        for attr_id in set(
-            self.schema.attrs.filter(is_active=True).values_list("id", flat=True)
-        ) - set(self.attrs.filter(is_active=True).values_list("schema", flat=True)):
-            entity_attr = self.schema.attrs.get(id=attr_id)
+        schema = EntitySchema.get(self.schema_id)
+        for attr_id in set(schema.attrs_by_id) - set(
+            self.attrs.filter(is_active=True).values_list("schema", flat=True)
+        ):
+            entity_attr = schema.attrs_by_id[attr_id]
             if not user.has_permission(entity_attr, ACLType.Readable):
                 continue
 
@@ -2109,18 +2250,16 @@ class Entry(ACLBase):
             .prefetch_related("data_array__referral"),
             to_attr="attrv_list",
         )
-        attr_prefetch = Prefetch(
-            "attribute_set",
-            queryset=Attribute.objects.filter(parent_entry=self, is_active=True).prefetch_related(
-                attrv_prefetch
-            ),
-            to_attr="attr_list",
-        )
-        for entity_attr in (
-            self.schema.attrs.filter(is_active=True)
-            .prefetch_related(attr_prefetch)
-            .order_by("index")
+        # the first Attribute of each EntityAttr
+        attrs: dict[int, Attribute] = {}
+        for x in (
+            Attribute.objects.filter(parent_entry=self, is_active=True)
+            .prefetch_related(attrv_prefetch)
+            .order_by("id")
         ):
+            attrs.setdefault(x.schema_id, x)
+
+        for entity_attr in EntitySchema.get(self.schema_id).sorted_attrs:
             attrinfo: dict[str, Any] = {
                 "id": "",
                 "entity_attr_id": entity_attr.id,
@@ -2133,11 +2272,12 @@ class Entry(ACLBase):
             }
 
             # check that attribute exists
-            attr = entity_attr.attr_list[0] if entity_attr.attr_list else None
+            attr = attrs.get(entity_attr.id)
             if not attr:
                 attrinfo["is_readable"] = user.has_permission(entity_attr, permission)
                 ret_attrs.append(attrinfo)
                 continue
+            attr.schema = entity_attr
             attrinfo["id"] = attr.id
 
             # check permission of attributes
@@ -2259,20 +2399,15 @@ class Entry(ACLBase):
         ):
             return None
 
-        attr_prefetch = Prefetch(
-            "attribute_set",
-            queryset=Attribute.objects.filter(
-                parent_entry=self, is_active=True, schema__is_active=True
-            ),
-            to_attr="attr_list",
-        )
-        sorted_attrs: list[Attribute] = [
-            x.attr_list[0]
-            for x in self.schema.attrs.filter(is_active=True)
-            .prefetch_related(attr_prefetch)
-            .order_by("index")
-            if x.attr_list
-        ]
+        # the first Attribute of each EntityAttr in the order of their index
+        entry_attrs: dict[int, Attribute] = {}
+        for x in Attribute.objects.filter(parent_entry=self, is_active=True).order_by("id"):
+            entry_attrs.setdefault(x.schema_id, x)
+        sorted_attrs: list[Attribute] = []
+        for entity_attr in EntitySchema.get(self.schema_id).sorted_attrs:
+            if entity_attr.id in entry_attrs:
+                entry_attrs[entity_attr.id].schema = entity_attr
+                sorted_attrs.append(entry_attrs[entity_attr.id])
 
         attrs = [
             x
@@ -2332,8 +2467,10 @@ class Entry(ACLBase):
 
         # update Elasticsearch index info which refered this entry not to refer this link
         es_object = ESS()
-        for entry in [x for x in self.get_referred_objects() if x.id != self.id]:
-            entry.register_es(es=es_object)
+        Entry.register_es_bulk(
+            self.get_referred_objects().exclude(id=self.id).values_list("id", flat=True),
+            es=es_object,
+        )
 
         # also delete each attributes
         for attr in self.attrs.filter(is_active=True):
@@ -2367,11 +2504,12 @@ class Entry(ACLBase):
 
         # update Elasticsearch index info which refered this entry to refer this link
         es_object = ESS()
-        for entry in [x for x in self.get_referred_objects()]:
-            entry.register_es(es=es_object)
+        Entry.register_es_bulk(
+            self.get_referred_objects().values_list("id", flat=True), es=es_object, refresh=False
+        )
 
         # update entry information to Elasticsearch
-        self.register_es()
+        self.register_es(es=es_object)
 
     def clone(self, user: User, **extra_params: Any) -> Optional["Entry"]:
         if not user.has_permission(self, ACLType.Readable) or not user.has_permission(
@@ -2406,19 +2544,121 @@ class Entry(ACLBase):
         cloned_entry.del_status(Entry.STATUS_CREATING)
         return cloned_entry
 
+    def clone_bulk(self, user: User, names: list[str]) -> list["Entry"]:
+        """
+        This is clone() for many names at once. Permissions and latest values of the
+        Attributes to be cloned are looked up once for all of them, and AttributeValues of
+        all cloned Attributes are created by bulk inserts.
+
+        NOTE:
+          Entries and Attributes are saved one by one because Django can't bulk create models
+          of multi-table inheritance (ACLBase). And ids of bulk created AttributeValues are
+          looked up by their cloned Attributes because MySQL doesn't return them.
+        """
+        if not user.has_permission(self, ACLType.Readable) or not user.has_permission(
+            self.schema, ACLType.Readable
+        ):
+            return []
+
+        # (Attribute, its latest value, co-values of it) of each Attribute to be cloned
+        sources: list[tuple[Attribute, AttributeValue | None, list[AttributeValue]]] = []
+        for attr in self.attrs.filter(is_active=True).select_related("schema"):
+            if not user.has_permission(attr, ACLType.Readable) or not user.has_permission(
+                attr.schema, ACLType.Readable
+            ):
+                continue
+
+            attrv = attr.get_latest_value()
+            co_attrvs = list(attrv.data_array.all()) if attrv and attr.is_array() else []
+            sources.append((attr, attrv, co_attrvs))
+
+        def _clone_value(attrv: AttributeValue, **params: Any) -> AttributeValue:
+            cloned_value = AttributeValue(
+                **{
+                    x.attname: getattr(attrv, x.attname)
+                    for x in AttributeValue._meta.concrete_fields
+                    if not x.primary_key
+                }
+            )
+            cloned_value.created_user = user
+            cloned_value.created_time = datetime.now()
+            for k, v in params.items():
+                setattr(cloned_value, k, v)
+            return cloned_value
+
+        cloned_entries: list[Entry] = []
+        # (cloned Attribute, the source of it) of all cloned Entries
+        cloned_attrs: list[tuple[Attribute, AttributeValue, list[AttributeValue]]] = []
+        for name in names:
+            cloned_entry = Entry(
+                name=name, created_user=user, schema=self.schema, status=Entry.STATUS_CREATING
+            )
+
+            # for history record
+            cloned_entry._history_user = user  # type: ignore[attr-defined]
+
+            cloned_entry.save()
+            cloned_entries.append(cloned_entry)
+
+            for attr, attrv, co_attrvs in sources:
+                cloned_attr = Attribute.objects.create(
+                    name=attr.name, created_user=user, schema=attr.schema, parent_entry=cloned_entry
+                )
+                if attrv:
+                    cloned_attrs.append((cloned_attr, attrv, co_attrvs))
+
+        AttributeValue.objects.bulk_create(
+            [_clone_value(attrv, parent_attr=x) for (x, attrv, _) in cloned_attrs]
+        )
+        cloned_value_ids = dict(
+            AttributeValue.objects.filter(
+                parent_attr__in=[x for (x, _, _) in cloned_attrs], parent_attrv__isnull=True
+            ).values_list("parent_attr", "id")
+        )
+        AttributeValue.objects.bulk_create(
+            [
+                _clone_value(co_attrv, parent_attr=x, parent_attrv_id=cloned_value_ids[x.id])
+                for (x, _, co_attrvs) in cloned_attrs
+                for co_attrv in co_attrvs
+            ]
+        )
+        Attribute.values.through.objects.bulk_create(
+            [
+                Attribute.values.through(
+                    attribute_id=x.id, attributevalue_id=cloned_value_ids[x.id]
+                )
+                for (x, _, _) in cloned_attrs
+            ]
+        )
+
+        Entry.objects.filter(id__in=[x.id for x in cloned_entries]).update(
+            status=F("status").bitand(~Entry.STATUS_CREATING)
+        )
+        for cloned_entry in cloned_entries:
+            cloned_entry.status &= ~Entry.STATUS_CREATING
+
+        return cloned_entries
+
     # NOTE: Type-Write
     def export(self, user: User) -> dict[str, Any]:
         attrinfo = {}
 
-        # This calling of complement_attrs is needed to take into account the case of the Attributes
-        # that are added after creating this entry.
-        self.complement_attrs(user)
-
-        for attr in self.attrs.filter(is_active=True, schema__is_active=True):
-            if not user.has_permission(attr, ACLType.Readable):
-                continue
+        # Attributes might be prefetched (and complemented) by the caller, e.g. when Entries
+        # are exported by chunks.
+        prefetch_attrs: list[Attribute] | None = getattr(self, "prefetch_attrs", None)
+        attrs: Iterable[Attribute]
+        if prefetch_attrs is not None:
+            attrs = [x for x in prefetch_attrs if x.schema.is_active]
+        else:
+            # This calling of complement_attrs is needed to take into account the case of the
+            # Attributes that are added after creating this entry.
+            self.complement_attrs(user)
+            attrs = self.attrs.filter(is_active=True, schema__is_active=True).select_related(
+                "schema"
+            )
 
-            latest_value = attr.get_latest_value()
+        for attr in filter_permitted(user, attrs, ACLType.Readable):
+            latest_value = attr.get_prefetched_latest_value()
             if latest_value:
                 attrinfo[attr.schema.name] = latest_value.get_value()
             else:
@@ -2429,17 +2669,28 @@ class Entry(ACLBase):
     def export_v2(self, user: User, with_entity: bool = False) -> dict[str, Any]:
         attrinfo = []
 
-        # This calling of complement_attrs is needed to take into account the case of the Attributes
-        # that are added after creating this entry.
-        self.complement_attrs(user)
-
-        for attr in self.attrs.filter(is_active=True, schema__is_active=True).order_by(
-            "schema__index"
-        ):
-            if not user.has_permission(attr, ACLType.Readable):
-                continue
-
-            latest_value = attr.get_latest_value()
+        # Attributes might be prefetched (and complemented) by the caller, e.g. when Entries
+        # are exported by chunks.
+        prefetch_attrs: list[Attribute] | None = getattr(self, "prefetch_attrs", None)
+        if prefetch_attrs is None:
+            # This calling of complement_attrs is needed to take into account the case of the
+            # Attributes that are added after creating this entry.
+            self.complement_attrs(user)
+
+        attrs: list[Attribute] = []
+        if prefetch_attrs is not None:
+            # EntityAttrs are prefetched with the Attributes, so the EntitySchema isn't loaded
+            # for each Entry
+            attrs = [x for x in prefetch_attrs if x.schema.is_active]
+        else:
+            schema = EntitySchema.get(self.schema_id)
+            for attr in self.attrs.filter(is_active=True, schema__in=list(schema.attrs_by_id)):
+                attr.schema = schema.attrs_by_id[attr.schema_id]
+                attrs.append(attr)
+        attrs.sort(key=lambda x: x.schema.index)
+
+        for attr in filter_permitted(user, attrs, ACLType.Readable):
+            latest_value = attr.get_prefetched_latest_value()
             value: Any | None = None
             if latest_value:
                 match latest_value.data_type:
@@ -2473,7 +2724,7 @@ class Entry(ACLBase):
         return {"name": self.name, "attrs": attrinfo, "id": self.id}
 
     # NOTE: Type-Write
-    def get_es_document(self, entity_attrs: QuerySet[EntityAttr] | None = None) -> EntryDocument:
+    def get_es_document(self, entity_attrs: Iterable[EntityAttr] | None = None) -> EntryDocument:
         """This processing registers entry information to Elasticsearch"""
 
         # This inner method truncates value in taking multi-byte in account
@@ -2605,7 +2856,12 @@ class Entry(ACLBase):
                     "name": x.name,
                     "schema": {"id": x.schema.id, "name": x.schema.name},
                 }
-                for x in self.get_referred_objects().select_related("schema")
+                for x in (
+                    # Use it when exists prefetch for faster
+                    self.prefetch_referrals  # type: ignore[attr-defined]
+                    if getattr(self, "prefetch_referrals", None) is not None
+                    else self.get_referred_objects().select_related("schema")
+                )
             ],
             "is_readable": True
             if (self.is_public or self.default_permission >= ACLType.Readable.id)
@@ -2617,20 +2873,20 @@ class Entry(ACLBase):
         # doesn't have an Attribute object associated with an EntityAttr, this registers blank
         # value to the Elasticsearch.
         if entity_attrs is None:
-            entity_attrs = self.schema.attrs.filter(is_active=True)
+            entity_attrs = EntitySchema.get(self.schema_id).attrs
 
         for entity_attr in entity_attrs:
             attrv: AttributeValue | None = None
 
             # Use it when exists prefetch for faster
-            if getattr(self, "prefetch_attrs", None):
+            if getattr(self, "prefetch_attrs", None) is not None:
                 entry_attrs = self.prefetch_attrs  # type: ignore[attr-defined]
             else:
                 entry_attrs = self.attrs.filter(schema=entity_attr, is_active=True)
 
             entry_attr: Attribute | None = None
             for attr in entry_attrs:
-                if attr.schema == entity_attr:
+                if attr.schema_id == entity_attr.id:
                     entry_attr = attr
                     break
 
@@ -2643,31 +2899,54 @@ class Entry(ACLBase):
 
             _set_attrinfo(entity_attr, entry_attr, attrv, document["attr"])
 
+        document["content_hash"] = get_document_hash(document)
+
         return document
 
-    def register_es(self, es: ESS | None = None, recursive_call_stack: list["Entry"] = []) -> None:
+    def register_es(
+        self,
+        es: ESS | None = None,
+        recursive_call_stack: list["Entry"] = [],
+        refresh: bool = True,
+    ) -> None:
         """
         Arguments
           * recursive_call_stack:
             - Entris that has ever been called, which is necessary to prevent
               falling into the infinite calling loop.
+          * refresh:
+            - Refresh the index after writing so that a following search can see
+              the result. Callers that don't read the index back can skip it.
 
         This updates es-documents which are associated with following Entries
         - 1. Entries that this Entry referred (This is necessary because es-documents of Entries,
              which were referred before but now are not, should be updated.
         - 2. This Entry (the variable "self" indicate)
         - 3. Entries that this Entry refers
+
+        All of them are sent to Elasticsearch by a single bulk request.
         """
         if not es:
             es = ESS()
 
-        es.index(id=self.id, body=self.get_es_document())
-        es.refresh()
-
         if recursive_call_stack:
+            document = self.get_es_document()
+            if es.get_content_hashes([self.id]).get(self.id) != document["content_hash"]:
+                es.index(id=self.id, body=document)
+                if refresh:
+                    es.refresh()
             return
 
-        # It's also needed to update es-document for Entries that this Entry refers to
+        Entry.register_es_entries([self], es=es, refresh=refresh)
+
+    def get_es_affected_entry_ids(self, es: ESS) -> set[int]:
+        """
+        This returns IDs of Entries whose es-documents have to be rebuilt when this Entry
+        is registered, because their "referrals" field contains this Entry.
+        - Entries that this Entry refers to now but Elasticsearch doesn't know about yet
+        - Entries that Elasticsearch says this Entry refers to, but it doesn't any more
+          (or it does with its previous name)
+        """
         search_result = es.search(
             body={
                 "query": {
@@ -2679,35 +2958,160 @@ class Entry(ACLBase):
                 }
             }
         )
-
-        refers_from_es = [
-            {
-                "dst_entry_id": int(x["_id"]),
-                "entry_name": x["inner_hits"]["referrals"]["hits"]["hits"][0]["_source"]["name"],
-            }
+        refers_from_es: dict[int, str] = {
+            int(x["_id"]): x["inner_hits"]["referrals"]["hits"]["hits"][0]["_source"]["name"]
             for x in search_result["hits"]["hits"]
-        ]
+        }
+        refers_from_db: set[int] = set(
+            self.get_refers_objects().exclude(id=self.id).values_list("id", flat=True)
+        )
 
-        refers_from_db = [
-            {"dst_entry_id": e.id, "entry_name": self.name}
-            for e in self.get_refers_objects()
-            if e.id != self.id
-        ]
+        # elasticsearch: exists, db: not exists (or change entry name)
+        affected_ids = {
+            entry_id
+            for entry_id, entry_name in refers_from_es.items()
+            if entry_id not in refers_from_db or entry_name != self.name
+        }
+        # elasticsearch: not exists, db: exists
+        affected_ids |= refers_from_db - set(refers_from_es)
+
+        affected_ids.discard(self.id)
+        return affected_ids
+
+    @classmethod
+    def register_es_entries(
+        kls, entries: Iterable["Entry"], es: ESS | None = None, refresh: bool = True
+    ) -> None:
+        """
+        This is register_es() for many Entries at once. Affected Entries are collected for
+        all of them against the current index before anything is written, then every
+        document is registered by bulk requests.
+        """
+        if not es:
+            es = ESS()
+
+        entry_ids: list[int] = []
+        affected_ids: set[int] = set()
+        for entry in entries:
+            entry_ids.append(entry.id)
+            affected_ids |= entry.get_es_affected_entry_ids(es)
+
+        Entry.register_es_bulk(
+            entry_ids + sorted(affected_ids - set(entry_ids)), es=es, refresh=refresh
+        )
+
+    @classmethod
+    def register_es_bulk(
+        kls, entry_ids: Iterable[int], es: ESS | None = None, refresh: bool = True
+    ) -> None:
+        """
+        This (re)builds es-documents of specified Entries and registers them by bulk
+        requests of CONFIG.MAX_ES_BULK_DOCUMENTS documents each, without following
+        their referrals. Documents whose content_hash is same with the stored one are
+        not sent, and the index is not refreshed when nothing is written.
+        """
+        if not es:
+            es = ESS()
+
+        target_ids = list(dict.fromkeys(entry_ids))
+        if not target_ids:
+            return
+
+        is_written = False
+        for start in range(0, len(target_ids), CONFIG.MAX_ES_BULK_DOCUMENTS):
+            chunk_ids = target_ids[start : start + CONFIG.MAX_ES_BULK_DOCUMENTS]
+            documents = Entry.build_es_documents(chunk_ids)
+            stored_hashes = es.get_content_hashes(list(documents.keys()))
+
+            # Elasticsearch bulk API format is add meta information and data pairs as sets.
+            body: list[dict[str, Any]] = []
+            for entry_id, document in documents.items():
+                if stored_hashes.get(entry_id) == document["content_hash"]:
+                    continue
+
+                body.append({"index": {"_id": entry_id}})
+                body.append(dict(document))
+
+            if body:
+                es.bulk(body=body)
+                is_written = True
+
+        if refresh and is_written:
+            es.refresh()
+
+    @classmethod
+    def build_es_documents(kls, entry_ids: Iterable[int]) -> dict[int, EntryDocument]:
+        """
+        This returns es-documents of specified Entries (keyed by Entry ID, in the specified
+        order) that are same with what get_es_document() returns for each of them.
+
+        Every data that makes up the documents -- Attributes and their latest values
+        (including array elements and referred Entries, Groups and Roles), active
+        EntityAttrs and referral Entries -- is fetched for all Entries at once, so the
+        number of queries doesn't depend on the number of Entries.
+        """
+        target_ids = list(dict.fromkeys(entry_ids))
+        if not target_ids:
+            return {}
+
+        value_prefetch = Prefetch(
+            "values",
+            queryset=AttributeValue.objects.filter(is_latest=True)
+            .select_related("referral", "group", "role")
+            .prefetch_related("data_array__referral", "data_array__group", "data_array__role"),
+            to_attr="prefetch_values",
+        )
+        attr_prefetch = Prefetch(
+            "attrs",
+            queryset=Attribute.objects.filter(is_active=True).prefetch_related(value_prefetch),
+            to_attr="prefetch_attrs",
+        )
+        entries = {
+            x.id: x
+            for x in Entry.objects.filter(id__in=target_ids)
+            .select_related("schema")
+            .prefetch_related(attr_prefetch)
+        }
+        if not entries:
+            return {}
+
+        entity_attrs: dict[int, list[EntityAttr]] = {
+            x: EntitySchema.get(x).attrs for x in {x.schema_id for x in entries.values()}
+        }
+
+        # This has same condition with Entry.get_referred_entries()
+        referrer_ids: dict[int, set[int]] = {}
+        for referral_id, referrer_id in AttributeValue.objects.filter(
+            Q(is_latest=True) | Q(parent_attrv__is_latest=True),
+            referral__in=list(entries),
+            parent_attr__is_active=True,
+            parent_attr__schema__is_active=True,
+        ).values_list("referral", "parent_attr__parent_entry"):
+            referrer_ids.setdefault(referral_id, set()).add(referrer_id)
+
+        referrers = {
+            x.id: x
+            for x in Entry.objects.filter(
+                id__in={x for ids in referrer_ids.values() for x in ids}, is_active=True
+            ).select_related("schema")
+        }
+
+        documents: dict[int, EntryDocument] = {}
+        for entry_id in target_ids:
+            entry = entries.get(entry_id)
+            if entry is None:
+                continue
+
+            setattr(
+                entry,
+                "prefetch_referrals",
+                [referrers[x] for x in sorted(referrer_ids.get(entry_id, [])) if x in referrers],
+            )
+            documents[entry_id] = entry.get_es_document(
+                entity_attrs=entity_attrs.get(entry.schema_id, [])
+            )
 
-        # elasticsearch: exists
-        # db: not esixts
-        # (or change entry name)
-        for refer in refers_from_es:
-            if refer not in refers_from_db:
-                entry = Entry.objects.get(id=refer["dst_entry_id"])
-                entry.register_es(es, recursive_call_stack + [self])
-
-        # elasticsearch: not exists
-        # db: esixts
-        for refer in refers_from_db:
-            if refer["dst_entry_id"] not in [x["dst_entry_id"] for x in refers_from_es]:
-                entry = Entry.objects.get(id=cast("int", refer["dst_entry_id"]))
-                entry.register_es(es, recursive_call_stack + [self])
+        return documents
 
     def unregister_es(self, es: ESS | None = None) -> None:
         if not es:
@@ -2,7 +2,6 @@ from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
 from django.db.models import Prefetch
-from elasticsearch import NotFoundError
 
 from airone.lib.acl import ACLType
 from airone.lib.elasticsearch import (
@@ -22,7 +21,7 @@ from airone.lib.elasticsearch import (
 from airone.lib.log import Logger
 from airone.lib.types import AttrType
 from entity.models import Entity, EntityAttr
-from entry.models import Attribute, AttributeValue, Entry
+from entry.models import Entry
 from user.models import User
 
 from .settings import CONFIG
@@ -480,81 +479,102 @@ class AdvancedSearchService:
 
     @classmethod
     def update_documents(kls, entity: Entity, is_update: bool = False) -> None:
+        """
+        This makes es-documents of specified Entity consistent with the database.
+
+        Both sides are read by pages of CONFIG.MAX_ES_BULK_DOCUMENTS, so this runs in
+        bounded memory and in linear time to the number of Entries.
+        - 1. Every es-document of the Entity is compared with the one that is built
+             from the database by its content_hash. It's updated when they are different
+             (or it doesn't have content_hash yet), and deleted when the Entry doesn't
+             exist any more.
+        - 2. Entries that don't have es-documents yet are registered.
+        """
         es = ESS()
+        page_size = CONFIG.MAX_ES_BULK_DOCUMENTS
         query = {
-            "query": {
-                "nested": {
-                    "path": "entity",
-                    "query": {"match": {"entity.id": entity.id}},
-                }
+            "nested": {
+                "path": "entity",
+                "query": {"match": {"entity.id": entity.id}},
             }
         }
-        res = es.search(body=query)
 
-        results_from_es = [x["_source"] for x in res["hits"]["hits"]]
-        entry_ids_from_es = [int(x["_id"]) for x in res["hits"]["hits"]]
+        # check & update & delete
+        hits: list[dict[str, Any]] = []
+        for hit in es.iterate_hits(query, source=["content_hash"], size=page_size):
+            hits.append(hit)
+            if len(hits) >= page_size:
+                kls._reconcile_documents(es, entity, hits, is_update)
+                hits = []
+        if hits:
+            kls._reconcile_documents(es, entity, hits, is_update)
+
+        # register
+        last_entry_id = 0
+        while True:
+            entry_ids = list(
+                Entry.objects.filter(schema=entity, is_active=True, id__gt=last_entry_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:page_size]
+            )
+            if not entry_ids:
+                break
 
-        entity_attrs = entity.attrs.filter(is_active=True)
+            res = es.search(
+                body={"query": {"ids": {"values": entry_ids}}, "_source": False},
+                size=len(entry_ids),
+            )
+            registered_ids = {int(x["_id"]) for x in res["hits"]["hits"]}
 
-        value_prefetch = Prefetch(
-            "values",
-            queryset=AttributeValue.objects.filter(is_latest=True)
-            .select_related("referral", "group", "role")
-            .prefetch_related("data_array__referral", "data_array__group", "data_array__role"),
-            to_attr="prefetch_values",
-        )
-        attr_prefetch = Prefetch(
-            "attrs",
-            queryset=Attribute.objects.filter(schema__in=entity_attrs, is_active=True)
-            .select_related("schema")
-            .prefetch_related(value_prefetch),
-            to_attr="prefetch_attrs",
-        )
+            register_docs: list[dict[str, Any]] = []
+            for entry_id, es_doc in Entry.build_es_documents(
+                [x for x in entry_ids if x not in registered_ids]
+            ).items():
+                if not is_update:
+                    Logger.warning("Update elasticsearch document (entry_id: %s)" % entry_id)
 
-        # This targets following Entries that belong to specified Entity
-        entry_list = (
-            Entry.objects.filter(schema=entity, is_active=True)
-            .select_related("schema")
-            .prefetch_related(attr_prefetch)
-        )
-
-        # check & update
-        start_pos = 0
-        exists: bool = True
-        while exists:
-            exists = False
-            register_docs = []
-            for entry in entry_list[start_pos : start_pos + 1000]:
-                exists = True
-                es_doc = entry.get_es_document(entity_attrs=entity_attrs)
-                if es_doc not in results_from_es:
-                    if not is_update:
-                        Logger.warning("Update elasticsearch document (entry_id: %s)" % entry.id)
-
-                    # Elasticsearch bulk API format is add meta information and data pairs as sets.
-                    # [
-                    #     {"index": {"_id": 1}}
-                    #     {"name": {...}, "entity": {...}, "attr": {...}, "is_readable": {...}}
-                    #     {"index": {"_id": 2}}
-                    #     {"name": {...}, "entity": {...}, "attr": {...}, "is_readable": {...}}
-                    # ]
-                    register_docs.append({"index": {"_id": entry.id}})
-                    register_docs.append(es_doc)
+                register_docs.append({"index": {"_id": entry_id}})
+                register_docs.append(dict(es_doc))
 
             if register_docs:
                 es.bulk(body=register_docs)
-            start_pos = start_pos + 1000
 
-        # delete
-        entry_ids_from_db = Entry.objects.filter(schema=entity, is_active=True).values_list(
-            "id", flat=True
-        )
-        for entry_id in set(entry_ids_from_es) - set(entry_ids_from_db):
-            if not is_update:
-                Logger.warning("Delete elasticsearch document (entry_id: %s)" % entry.id)
-            try:
-                es.delete(id=entry_id)
-            except NotFoundError:
-                pass
+            last_entry_id = entry_ids[-1]
 
         es.indices.refresh()
+
+    @classmethod
+    def _reconcile_documents(
+        kls, es: ESS, entity: Entity, hits: list[dict[str, Any]], is_update: bool
+    ) -> None:
+        documents = Entry.build_es_documents(
+            Entry.objects.filter(
+                id__in=[int(x["_id"]) for x in hits], schema=entity, is_active=True
+            ).values_list("id", flat=True)
+        )
+
+        # Elasticsearch bulk API format is add meta information and data pairs as sets.
+        # [
+        #     {"index": {"_id": 1}}
+        #     {"name": {...}, "entity": {...}, "attr": {...}, "is_readable": {...}}
+        #     {"delete": {"_id": 2}}
+        # ]
+        register_docs: list[dict[str, Any]] = []
+        for hit in hits:
+            entry_id = int(hit["_id"])
+            es_doc = documents.get(entry_id)
+            if es_doc is None:
+                if not is_update:
+                    Logger.warning("Delete elasticsearch document (entry_id: %s)" % entry_id)
+
+                register_docs.append({"delete": {"_id": entry_id}})
+
+            elif es_doc["content_hash"] != hit.get("_source", {}).get("content_hash"):
+                if not is_update:
+                    Logger.warning("Update elasticsearch document (entry_id: %s)" % entry_id)
+
+                register_docs.append({"index": {"_id": entry_id}})
+                register_docs.append(dict(es_doc))
+
+        if register_docs:
+            es.bulk(body=register_docs)
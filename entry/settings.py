@@ -20,6 +20,11 @@ CONFIG = Settings(
         "MAX_HISTORY_COUNT": 10,
         "MAX_QUERY_SIZE": 249,  # '.*' + '[aA]'*249 + '.*' = 1000
         "MAX_QUERY_COUNT": 1000,
+        "MAX_ES_BULK_DOCUMENTS": 1000,
+        "IMPORT_CHUNK_SIZE": 500,
+        "BULK_UPDATE_CHUNK_SIZE": 500,
+        "BULK_CREATE_MAX_ENTRIES": 10000,
+        "COPY_CHUNK_SIZE": 100,
         "SEARCH_CHAIN_ACCEPTABLE_RESULT_COUNT": 1000,
         "EMPTY_SEARCH_CHARACTER": "\\",
         "EMPTY_SEARCH_CHARACTER_CODE": chr(165),
@@ -1,18 +1,21 @@
 import csv
 import io
 import json
-from datetime import date, datetime
-from typing import Any, Callable, List, TypeAlias
+from datetime import date, datetime, timedelta
+from itertools import batched
+from typing import Any, Callable, Iterable, Iterator, List, TextIO, TypeAlias
 
 import yaml
 from celery import Task
 from django.conf import settings
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework.exceptions import ValidationError
 
 from acl.models import ACLBase
 from airone.celery import app
 from airone.lib import custom_view
-from airone.lib.acl import ACLType
+from airone.lib.acl import ACLType, filter_permitted
+from airone.lib.drf import YAMLListLoader, YAMLNotListError
 from airone.lib.elasticsearch import (
     AdvancedSearchResultRecord,
     AdvancedSearchResultRecordAttr,
@@ -31,14 +34,17 @@ from airone.lib.job import (
     register_job_task,
 )
 from airone.lib.log import Logger
+from airone.lib.permission_cache import permission_cache
 from airone.lib.types import AttrType
 from dashboard.tasks import _csv_export
-from entity.models import Entity, EntityAttr
+from entity.models import Entity, EntityAttr, EntitySchema, ItemNameType
 from entry.api_v2.serializers import (
     AdvancedSearchJoinAttrInfoList,
     AdvancedSearchResultExportSerializer,
+    EntryBulkCreateSerializer,
     EntryCreateSerializer,
     EntryImportEntitySerializer,
+    EntryImportSerializer,
     EntryUpdateSerializer,
     ExportedEntityEntries,
     ExportedEntry,
@@ -49,10 +55,11 @@ from entry.api_v2.serializers import (
     ExportTaskParams,
     ReferralEntry,
 )
-from entry.models import Attribute, Entry
+from entry.models import AliasEntry, Attribute, AttributeValue, Entry
 from entry.services import AdvancedSearchService
+from entry.settings import CONFIG
 from group.models import Group
-from job.models import Job, JobOperation, JobStatus, JobTarget
+from job.models import Job, JobBatch, JobOperation, JobStatus, JobTarget
 from role.models import Role
 from trigger.models import TriggerCondition
 from user.models import User
@@ -148,6 +155,18 @@ def _convert_data_value(attr: Attribute, info: dict[str, Any]) -> Any:
                 return recv_value
 
 
+def _get_entries_by_name(entity: Entity, names: list[str], **filters: Any) -> dict[str, Entry]:
+    """
+    This returns Entries of the Entity that have the specified names (the first one for each
+    name) with one query. Names are folded to lower case as the database collation does.
+    """
+    entries: dict[str, Entry] = {}
+    for entry in Entry.objects.filter(schema=entity, name__in=names, **filters).order_by("-id"):
+        entries[entry.name.lower()] = entry
+
+    return entries
+
+
 def _do_import_entries(job: Job) -> None:
     user: User = job.user
     entity: Entity = Entity.objects.get(id=job.target.id)
@@ -160,24 +179,63 @@ def _do_import_entries(job: Job) -> None:
 
     total_count = len(import_data)
 
-    # create or update entry
-    for index, entry_data in enumerate(import_data):
-        job_notify: Job | None = None
-        job.text = "Now importing... (progress: [%5d/%5d] for %s)" % (
-            index + 1,
-            total_count,
-            entity.name,
-        )
-        job.save(update_fields=["text"])
+    # Rows are imported by chunks of CONFIG.IMPORT_CHUNK_SIZE. The progress is saved and the
+    # job status is checked once for each chunk, instead of for every row. Notifications and
+    # TriggerActions of imported Entries are run by jobs that carry many of them.
+    with permission_cache(), JobBatch(user) as job_batch:
+        for chunk_index, chunk in enumerate(batched(import_data, CONFIG.IMPORT_CHUNK_SIZE)):
+            job.set_progress(
+                "Now importing... (progress: [%5d/%5d] for %s)"
+                % (chunk_index * CONFIG.IMPORT_CHUNK_SIZE + 1, total_count, entity.name)
+            )
 
-        # abort processing when job is canceled
-        if job.is_canceled():
-            return
+            # abort processing when job is canceled
+            if job.is_canceled(with_cache=True):
+                return
+
+            _import_entries_chunk(user, entity, list(chunk), custom_view_handler, job_batch)
+
+    job.update(status=JobStatus.DONE, text="")
 
-        entry: Entry = Entry.objects.filter(name=entry_data["name"], schema=entity).first()
-        if not entry:
-            # skip to create Item when another duplicated Alias exists
-            if not entity.is_available(entry_data["name"]):
+
+def _import_entries_chunk(
+    user: User,
+    entity: Entity,
+    chunk: list[dict[str, Any]],
+    custom_view_handler: str | None,
+    job_batch: JobBatch,
+) -> None:
+    """
+    This imports rows of a chunk. Existing Entries, their Attributes and permissions of them
+    are looked up at once for all rows, latest flags of the previous AttributeValues are
+    cleared with one query, and the imported Entries are registered to Elasticsearch by a
+    bulk request before their notifications are put to the job_batch.
+
+    NOTE:
+      Entries and Attributes are saved one by one because Django can't bulk create models of
+      multi-table inheritance (ACLBase), and AttributeValues are created by add_value()
+      because the ids of them are necessary to chain values and to make array values.
+    """
+    names = [x["name"] for x in chunk]
+    entries = _get_entries_by_name(entity, names)
+
+    # skip to create Item when another duplicated Alias exists
+    unavailable_names = {
+        x.lower()
+        for x in AliasEntry.objects.filter(
+            name__in=[x for x in names if x.lower() not in entries],
+            entry__schema=entity,
+            entry__is_active=True,
+        ).values_list("name", flat=True)
+    }
+
+    # (Entry, imported data, whether it's created) for each row
+    targets: list[tuple[Entry, dict[str, Any], bool]] = []
+    for entry_data in chunk:
+        entry = entries.get(entry_data["name"].lower())
+        is_created = entry is None
+        if entry is None:
+            if entry_data["name"].lower() in unavailable_names:
                 continue
 
             entry = Entry(name=entry_data["name"], schema=entity, created_user=user)
@@ -186,51 +244,76 @@ def _do_import_entries(job: Job) -> None:
             entry._history_user = user
 
             entry.save()
-
-            # create job to notify create event to the WebHook URL
-            job_notify = Job.new_notify_create_entry(user, entry)
-
+            entries[entry.name.lower()] = entry
         else:
             # for history record
             entry._history_user = user
 
-        if not user.has_permission(entry, ACLType.Writable):
+        targets.append((entry, entry_data, is_created))
+
+    writable_entries = filter_permitted(user, [x for (x, _, _) in targets], ACLType.Writable)
+    writable_entry_ids = {x.id for x in writable_entries}
+
+    # complement Attributes only for Entries that miss any of them
+    entity_attr_ids = set(EntitySchema.get(entity).attrs_by_id)
+    attr_schema_ids: dict[int, set[int]] = {x: set() for x in writable_entry_ids}
+    for entry_id, schema_id in Attribute.objects.filter(
+        parent_entry__in=writable_entry_ids, is_active=True
+    ).values_list("parent_entry", "schema"):
+        attr_schema_ids[entry_id].add(schema_id)
+    for entry in {x.id: x for x in writable_entries}.values():
+        if entity_attr_ids - attr_schema_ids[entry.id]:
+            entry.complement_attrs(user)
+
+    # Attributes of each Entry by their names
+    attr_names: set[tuple[int, str]] = set()
+    attrs: dict[tuple[int, str], list[Attribute]] = {}
+    for attr in (
+        Attribute.objects.filter(parent_entry__in=writable_entry_ids)
+        .select_related("schema")
+        .order_by("id")
+    ):
+        attr_names.add((attr.parent_entry_id, attr.schema.name))
+        if attr.is_active and attr.schema.parent_entity_id == entity.id:
+            attrs.setdefault((attr.parent_entry_id, attr.schema.name), []).append(attr)
+    writable_attr_ids = {
+        x.id for x in filter_permitted(user, [x[-1] for x in attrs.values()], ACLType.Writable)
+    }
+
+    added_values: list[AttributeValue] = []
+    # (Entry, whether it's created) of the Entries to be notified
+    notify_entries: list[tuple[Entry, bool]] = []
+    for entry, entry_data, is_created in targets:
+        if entry.id not in writable_entry_ids:
             continue
 
-        entry.complement_attrs(user)
         is_update: bool = False
         for attr_name, value in entry_data["attrs"].items():
             # If user doesn't have readable permission for target Attribute,
             # it won't be created.
-            if not entry.attrs.filter(schema__name=attr_name).exists():
+            if (entry.id, attr_name) not in attr_names:
                 continue
 
             # There should be only one EntityAttr that is specified by name and Entity.
             # Once there are multiple EntityAttrs, it must be an abnormal situation.
             # In that case, this aborts import processing for this entry and reports it
             # as an error.
-            attr_query = entry.attrs.filter(
-                schema__name=attr_name,
-                is_active=True,
-                schema__parent_entity=entry.schema,
-            )
-            if attr_query.count() > 1:
+            entry_attrs = attrs.get((entry.id, attr_name), [])
+            if len(entry_attrs) > 1:
                 Logger.error(
                     "[task.import_entry] Abnormal entry was detected(%s:%d)"
                     % (entry.name, entry.id)
                 )
                 break
 
-            attr: Attribute = attr_query.last()
-            if not user.has_permission(attr.schema, ACLType.Writable) or not user.has_permission(
-                attr, ACLType.Writable
-            ):
+            if not entry_attrs or entry_attrs[-1].id not in writable_attr_ids:
                 continue
 
+            attr = entry_attrs[-1]
             input_value = attr.convert_value_to_register(value)
-            if user.has_permission(attr.schema, ACLType.Writable) and attr.is_updated(input_value):
+            if attr.is_updated(input_value):
                 try:
-                    attr.add_value(user, input_value)
+                    added_values.append(attr.add_value(user, input_value, unset_latest=False))
                 except TypeError as e:
                     # add_value raises TypeError when the value fails attr-specific
                     # validation (e.g. SELECT choice not in EntityAttr.choices).
@@ -247,22 +330,22 @@ def _do_import_entries(job: Job) -> None:
             if custom_view_handler:
                 custom_view.call_custom(custom_view_handler, entity.name, user, entry, attr, value)
 
-        # Create job for TriggerAction
-        Job.new_invoke_trigger(
-            user, entry, entry.get_trigger_params(user, entry_data["attrs"].keys())
-        ).run()
-
-        if not job_notify and is_update:
-            job_notify = Job.new_notify_update_entry(user, entry)
+        # TriggerActions are run by a job for many Entries
+        job_batch.invoke_trigger(entry, entry.get_trigger_params(user, entry_data["attrs"].keys()))
 
-        if job_notify:
-            # register entry to the Elasticsearch
-            entry.register_es()
+        # notify create/update event to the WebHook URL
+        if is_created or is_update:
+            notify_entries.append((entry, is_created))
 
-            # run notification job
-            job_notify.run()
+    Attribute.unset_latest_flags(added_values)
 
-    job.update(status=JobStatus.DONE, text="")
+    # register entries to the Elasticsearch and notify their events
+    Entry.register_es_entries([entry for (entry, _) in notify_entries])
+    for entry, is_created in notify_entries:
+        if is_created:
+            job_batch.notify_create_entry(entry)
+        else:
+            job_batch.notify_update_entry(entry)
 
 
 def _yaml_export_v2(
@@ -374,7 +457,7 @@ def _yaml_export_v2(
         )
 
         # Abort processing when job is canceled
-        if index % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled():
+        if index % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled(with_cache=True):
             return None
 
         for attrinfo in recv_data["attrinfo"]:
@@ -443,8 +526,9 @@ def create_entry_attrs(self: Task, job: Job) -> JobStatus | None:
         return JobStatus.CANCELED
 
     recv_data = json.loads(job.params)
+    entity_attrs = EntitySchema.get(entry.schema_id).attrs
     # Create new Attributes objects based on the specified value
-    for entity_attr in entry.schema.attrs.filter(is_active=True):
+    for entity_attr in entity_attrs:
         # This creates Attibute object that contains AttributeValues.
         # But the add_attribute_from_base may return None when target Attribute instance
         # has already been created or is creating by other process. In that case, this job
@@ -456,7 +540,7 @@ def create_entry_attrs(self: Task, job: Job) -> JobStatus | None:
             continue
 
         # When job is canceled during this processing, abort it after deleting the created entry
-        if job.is_canceled():
+        if job.is_canceled(with_cache=True):
             entry.delete()
             return None
 
@@ -473,7 +557,7 @@ def create_entry_attrs(self: Task, job: Job) -> JobStatus | None:
             Logger.warning("(%s) attr_data: %s" % (e, str(attr_data[0])))
 
     # Delete duplicate attrs because this processing may execute concurrently
-    for entity_attr in entry.schema.attrs.filter(is_active=True):
+    for entity_attr in entity_attrs:
         if entry.attrs.filter(schema=entity_attr, is_active=True).count() > 1:
             query = entry.attrs.filter(schema=entity_attr, is_active=True)
             query.exclude(id=query.first().id).delete()
@@ -599,69 +683,166 @@ def restore_entry(self: Task, job: Job) -> JobStatus:
 @register_job_task(JobOperation.COPY_ENTRY)
 @app.task(bind=True)  # type: ignore[misc]
 @may_schedule_until_job_is_ready
-def copy_entry(self: Task, job: Job) -> tuple[JobStatus, str, None] | None:
+def copy_entry(self: Task, job: Job) -> JobStatus:
+    """
+    This splits names of the Items to be copied into chunks of CONFIG.COPY_CHUNK_SIZE and
+    copies each of them by a DO_COPY_ENTRY job, so that workers copy them in parallel. This
+    job is finished by the last one of them, which aggregates their progress and errors.
+    """
     src_entry = Entry.objects.get(id=job.target.id)
 
     params = json.loads(job.params)
-    total_count = len(params["new_name_list"])
-    for index, new_name in enumerate(params["new_name_list"]):
-        # abort processing when job is canceled
-        if job.is_canceled():
-            job.text = "Copy completed [%5d/%5d]" % (index, total_count)
-            job.save(update_fields=["text"])
-            return None
+    if not params["new_name_list"]:
+        return JobStatus.DONE
 
-        job.text = "Now copying... (progress: [%5d/%5d])" % (index + 1, total_count)
-        job.save(update_fields=["text"])
+    chunk_jobs = [
+        Job.new_do_copy(
+            job.user,
+            src_entry,
+            params=dict(params, new_name_list=list(chunk), parent_job_id=job.id),
+        )
+        for chunk in batched(params["new_name_list"], CONFIG.COPY_CHUNK_SIZE)
+    ]
 
-        params["new_name"] = new_name
-        job_do_copy_entry = Job.new_do_copy(job.user, src_entry, new_name, params)
-        job_do_copy_entry.run(will_delay=False)
+    # chunk jobs refer to this to aggregate their results into this job
+    params["chunk_job_ids"] = [x.id for x in chunk_jobs]
+    job.params = json.dumps(params, default=str)
+    job.save(update_fields=["params"])
 
-    # update job status and save it
-    return JobStatus.DONE, "Copy completed [%5d/%5d]" % (total_count, total_count), None
+    job.set_progress(
+        "Now copying... (progress: [%5d/%5d])" % (0, len(params["new_name_list"])), force=True
+    )
+    for chunk_job in chunk_jobs:
+        chunk_job.run()
 
+    return JobStatus.PROCESSING
 
-@register_job_task(JobOperation.DO_COPY_ENTRY)
-@app.task(bind=True)  # type: ignore[misc]
-@may_schedule_until_job_is_ready
-def do_copy_entry(self: Task, job: Job) -> tuple[JobStatus, str, None]:
-    src_entry = Entry.objects.get(id=job.target.id)
-    params = json.loads(job.params)
 
-    # abort this job when there is duplicated Alias exists
-    if not src_entry.schema.is_available(params["new_name"]):
-        return (
-            JobStatus.ERROR,
-            "Duplicated Alias(name=%s) exists in this model" % params["new_name"],
-            src_entry,
-        )
+def _copy_entries(user: User, src_entry: Entry, new_names: list[str], post_data: Any) -> list[str]:
+    """
+    This copies an Item to the specified names at once and returns messages of the names
+    that couldn't be copied.
+    """
+    errors: list[str] = []
+    dest_entries: list[Entry] = []
+    clone_names: list[str] = []
+    for new_name in new_names:
+        # skip the name when there is duplicated Item or Alias
+        if not src_entry.schema.is_available(new_name):
+            errors.append("Duplicated Alias(name=%s) exists in this model" % new_name)
+            continue
+
+        dest_entry = Entry.objects.filter(schema=src_entry.schema, name=new_name).first()
+        if dest_entry:
+            dest_entries.append(dest_entry)
+        else:
+            clone_names.append(new_name)
 
-    dest_entry = Entry.objects.filter(schema=src_entry.schema, name=params["new_name"]).first()
-    if not dest_entry:
-        dest_entry = src_entry.clone(job.user, name=params["new_name"])
+    cloned_entries = src_entry.clone_bulk(user, clone_names)
+    if len(cloned_entries) < len(clone_names):
+        errors.append("Permission denied to copy Item(name=%s)" % src_entry.name)
 
+    for dest_entry in cloned_entries:
         # for updating its name from attribute values
         dest_entry.save_autoname()
 
-        # update item name pj
-        dest_entry.register_es()
+    Entry.register_es_entries(cloned_entries)
+    dest_entries.extend(cloned_entries)
+
+    with JobBatch(user) as job_batch:
+        for dest_entry in dest_entries:
+            if custom_view.is_custom("after_copy_entry", src_entry.schema.name):
+                custom_view.call_custom(
+                    "after_copy_entry",
+                    src_entry.schema.name,
+                    user,
+                    src_entry,
+                    dest_entry,
+                    post_data,
+                )
 
-    if custom_view.is_custom("after_copy_entry", src_entry.schema.name):
-        custom_view.call_custom(
-            "after_copy_entry",
-            src_entry.schema.name,
-            job.user,
-            src_entry,
-            dest_entry,
-            params["post_data"],
+            job_batch.notify_create_entry(dest_entry)
+
+    return errors
+
+
+def _aggregate_copy_jobs(chunk_job: Job) -> None:
+    """
+    This is called when a DO_COPY_ENTRY job is finished (including when it raised an
+    exception). This reports progress of the DO_COPY_ENTRY jobs to the COPY_ENTRY job that
+    dispatched them, and finishes it with their errors when all of them are finished.
+    """
+    parent_job = Job.objects.filter(id=json.loads(chunk_job.params).get("parent_job_id")).first()
+    if not parent_job:
+        return
+
+    params = json.loads(parent_job.params)
+    total_count = len(params["new_name_list"])
+    chunk_jobs = list(Job.objects.filter(id__in=params["chunk_job_ids"]))
+
+    finished_jobs = [x for x in chunk_jobs if x.is_finished(with_refresh=False)]
+    copied_count = sum(
+        len(json.loads(x.params)["new_name_list"])
+        for x in finished_jobs
+        if x.status not in [JobStatus.CANCELED, JobStatus.ERROR]
+    )
+    if parent_job.is_canceled():
+        parent_job.set_progress(
+            "Copy completed [%5d/%5d]" % (copied_count, total_count), force=True
         )
+    elif len(finished_jobs) < len(chunk_jobs):
+        parent_job.set_progress(
+            "Now copying... (progress: [%5d/%5d])" % (copied_count, total_count), force=True
+        )
+    else:
+        errors = [e for x in chunk_jobs for e in json.loads(x.params).get("errors", [])]
+
+        # names of the chunks that were aborted by unexpected errors
+        errors += [
+            "Failed to copy Items(names=%s)" % json.loads(x.params)["new_name_list"]
+            for x in chunk_jobs
+            if x.status == JobStatus.ERROR
+        ]
+        if errors:
+            parent_job.update(
+                JobStatus.WARNING,
+                "Copy completed [%5d/%5d], Failed to copy Item: %s"
+                % (copied_count, total_count, errors),
+            )
+        else:
+            parent_job.update(
+                JobStatus.DONE, "Copy completed [%5d/%5d]" % (copied_count, total_count)
+            )
 
-    # create and run event notification job
-    job_notify_event = Job.new_notify_create_entry(job.user, dest_entry)
-    job_notify_event.run()
 
-    return JobStatus.DONE, "original entry: %s" % src_entry.name, dest_entry
+@register_job_task(JobOperation.DO_COPY_ENTRY)
+@app.task(bind=True)  # type: ignore[misc]
+@may_schedule_until_job_is_ready_with_handlers(on_finished=_aggregate_copy_jobs)
+def do_copy_entry(self: Task, job: Job) -> tuple[JobStatus, str, None]:
+    src_entry = Entry.objects.get(id=job.target.id)
+    params = json.loads(job.params)
+    parent_job = Job.objects.filter(id=params.get("parent_job_id")).first()
+
+    if parent_job and parent_job.is_canceled(with_cache=True):
+        (status, text) = (JobStatus.CANCELED, "original entry: %s" % src_entry.name)
+    else:
+        # DO_COPY_ENTRY jobs that were created for each name have "new_name" instead
+        new_names = params.get("new_name_list", [params.get("new_name")])
+        errors = _copy_entries(job.user, src_entry, new_names, params.get("post_data"))
+        if errors:
+            (status, text) = (
+                JobStatus.WARNING,
+                "original entry: %s, Failed to copy Item: %s" % (src_entry.name, errors),
+            )
+        else:
+            (status, text) = (JobStatus.DONE, "original entry: %s" % src_entry.name)
+
+        # the COPY_ENTRY job aggregates these errors when all chunks are finished
+        params["errors"] = errors
+        job.params = json.dumps(params, default=str)
+        job.save(update_fields=["params"])
+
+    return status, text, None
 
 
 @register_job_task(JobOperation.IMPORT_ENTRY)
@@ -682,48 +863,102 @@ def import_entries(self: Task, job: Job) -> tuple[JobStatus, str, None] | None:
 def import_entries_v2(self: Task, job: Job) -> tuple[JobStatus, str, None] | None:
     user: User = job.user
     entity = Entity.objects.get(id=job.target.id)
-    import_serializer = EntryImportEntitySerializer(data=json.loads(job.params))
-    import_serializer.is_valid()
-    context = {"request": DRFRequest(user)}
+    params = json.loads(job.params)
 
-    total_count = len(import_serializer.validated_data["entries"])
-    err_msg: list[str] = []
-    for index, entry_data in enumerate(import_serializer.validated_data["entries"]):
-        job.text = "Now importing... (progress: [%5d/%5d])" % (index + 1, total_count)
-        job.save(update_fields=["text"])
+    # Items are staged as the artifact of this job, except for jobs that were created
+    # before staging them and carry all of them in params.
+    rows: Iterable[dict[str, Any]]
+    if "entries" in params:
+        (rows, total_count) = (params["entries"], len(params["entries"]))
+    else:
+        (rows, total_count) = (job.iter_staged_rows(), params["entry_count"])
+
+    # Saved Entries are registered to Elasticsearch by a bulk request for each chunk, and
+    # their notifications and TriggerActions are run by jobs that carry many of them.
+    deferred_es_entries: list[Entry] = []
+    job_batch = JobBatch(user)
+    context = {
+        "request": DRFRequest(user),
+        "deferred_es_entries": deferred_es_entries,
+        "job_batch": job_batch,
+    }
+
+    def register_es() -> None:
+        Entry.register_es_entries(deferred_es_entries)
+        deferred_es_entries.clear()
 
-        # abort processing when job is canceled
-        if job.is_canceled():
-            job.status = JobStatus.CANCELED
-            job.save(update_fields=["status"])
-            return None
+    err_msg: list[str] = []
 
-        entry_data["schema"] = entity
+    # Rows are read, validated and imported by chunks of CONFIG.IMPORT_CHUNK_SIZE. The progress
+    # is saved and the job status is checked once for each chunk, and the Items to be updated
+    # are looked up by ids and names at once for all rows of a chunk.
+    with permission_cache(), job_batch:
+        for chunk_index, rows_chunk in enumerate(batched(rows, CONFIG.IMPORT_CHUNK_SIZE)):
+            job.set_progress(
+                "Now importing... (progress: [%5d/%5d])"
+                % (chunk_index * CONFIG.IMPORT_CHUNK_SIZE + 1, total_count)
+            )
 
-        # Identify the Item to be updated
-        entry: Entry | None = None
-        if entry_data.get("id") is not None:
-            entry = Entry.objects.filter(id=entry_data["id"], schema=entity, is_active=True).first()
+            # abort processing when job is canceled
+            if job.is_canceled(with_cache=True):
+                job.status = JobStatus.CANCELED
+                job.save(update_fields=["status"])
+                return None
 
-        if not entry:
-            entry = Entry.objects.filter(
-                name=entry_data["name"], schema=entity, is_active=True
-            ).first()
+            import_serializer = EntryImportEntitySerializer(
+                data={"entity": params["entity"], "entries": list(rows_chunk)}
+            )
+            import_serializer.is_valid()
+            chunk = import_serializer.validated_data["entries"]
 
-        if entry:
-            serializer = EntryUpdateSerializer(instance=entry, data=entry_data, context=context)
-        else:
-            serializer = EntryCreateSerializer(data=entry_data, context=context)
-        try:
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-        except ValidationError as e:
-            err_msg.append(entry_data["name"])
-            Logger.warning(
-                "failed to validate on entry import v2: entry=%s, error=%s"
-                % (entry_data["name"], e)
+            entries_by_id = Entry.objects.filter(
+                id__in=[x["id"] for x in chunk if x.get("id") is not None],
+                schema=entity,
+                is_active=True,
+            ).in_bulk()
+            entries_by_name = _get_entries_by_name(
+                entity, [x["name"] for x in chunk], is_active=True
             )
 
+            for entry_data in chunk:
+                entry_data["schema"] = entity
+
+                # Identify the Item to be updated
+                entry: Entry | None = None
+                if entry_data.get("id") is not None:
+                    entry = entries_by_id.get(entry_data["id"])
+
+                if not entry:
+                    entry = entries_by_name.get(entry_data["name"].lower())
+
+                # serializer changes name of the instance when it's renamed
+                current_name = entry.name.lower() if entry else None
+
+                if entry:
+                    serializer = EntryUpdateSerializer(
+                        instance=entry, data=entry_data, context=context
+                    )
+                else:
+                    serializer = EntryCreateSerializer(data=entry_data, context=context)
+                try:
+                    serializer.is_valid(raise_exception=True)
+                    saved_entry = serializer.save()
+                except ValidationError as e:
+                    err_msg.append(entry_data["name"])
+                    Logger.warning(
+                        "failed to validate on entry import v2: entry=%s, error=%s"
+                        % (entry_data["name"], e)
+                    )
+                    continue
+
+                # following rows find the saved Item by its current id and name
+                if current_name and entries_by_name.get(current_name) is saved_entry:
+                    del entries_by_name[current_name]
+                entries_by_name[saved_entry.name.lower()] = saved_entry
+                entries_by_id[saved_entry.id] = saved_entry
+
+            register_es()
+
     if err_msg:
         return (
             JobStatus.WARNING,
@@ -731,73 +966,252 @@ def import_entries_v2(self: Task, job: Job) -> tuple[JobStatus, str, None] | Non
             None,
         )
     else:
+        # staged Items are kept until their expiry only to rerun failed jobs
+        job.delete_cache()
         return JobStatus.DONE, "Imported Entry count: %d" % total_count, None
 
 
-@register_job_task(JobOperation.EXPORT_ENTRY)
+def _iter_import_blocks(job: Job) -> Iterator[tuple[dict[str, Any] | None, dict[str, Any]]]:
+    """
+    This returns each model block of the YAML that is staged to the job with the validation
+    errors of it, which are empty when it's valid. Blocks are parsed one at a time, so that
+    the whole of the YAML isn't in memory.
+    """
+    with job.open_staged_file() as fp:
+        for block in YAMLListLoader(fp).iter_items():
+            # Validation of the list (not a block by itself) skips resolving referred objects,
+            # which is done by each import job
+            import_serializer = EntryImportSerializer(data=[block])
+            if import_serializer.is_valid():
+                yield import_serializer.validated_data[0], {}
+            else:
+                yield None, import_serializer.errors[0]
+
+
+@register_job_task(JobOperation.DISPATCH_IMPORT_ENTRY_V2)
 @app.task(bind=True)  # type: ignore[misc]
 @may_schedule_until_job_is_ready
-def export_entries(self: Task, job: Job) -> None:
-    user = job.user
-    entity = Entity.objects.get(id=job.target.id)
+def dispatch_import_entries_v2(self: Task, job: Job) -> tuple[JobStatus, str, None]:
+    """
+    This parses and validates the YAML that is staged by EntryImportAPI, and dispatches an
+    IMPORT_ENTRY_V2 job for each model in it. Models that can't be imported are reported in
+    the text of this job.
+
+    The YAML is read twice, one model block at a time. All blocks are validated first, and
+    jobs are dispatched only when all of them are valid.
+    """
+    user: User = job.user
     params = json.loads(job.params)
 
-    exported_data = []
-
-    # This variable is used for job status check. When it's checked at every loop, this might send
-    # tons of query to the database. To prevent the sort of tragedy situation, checking status of
-    # this job should be skipped some times (which is specified in Job.STATUS_CHECK_FREQUENCY).
-    #
-    # NOTE:
-    #   This doesn't use enumerate() method to count loop. Because when a QuerySet value is
-    #   passed to the argument of enumerate() method, Django try to get result at once (this never
-    #   do lazy evaluation).
-    export_item_counter = 0
-    for entry in Entry.objects.filter(schema=entity, is_active=True):
+    try:
+        entity_names: set[str] = set()
+        errors: list[dict[str, Any]] = []
+        for import_data, block_errors in _iter_import_blocks(job):
+            if import_data is not None:
+                entity_names.add(import_data["entity"])
+            errors.append(block_errors)
+    except YAMLNotListError as e:
+        import_serializer = EntryImportSerializer(data=e.data)
+        import_serializer.is_valid()
+        return JobStatus.ERROR, "Invalid data: %s" % json.dumps(import_serializer.errors), None
+    except (ValueError, yaml.YAMLError) as e:
+        return JobStatus.ERROR, "YAML parse error - %s" % e, None
+
+    if any(errors):
+        return JobStatus.ERROR, "Invalid data: %s" % json.dumps(errors), None
+
+    entities = {x.name: x for x in Entity.objects.filter(name__in=entity_names, is_active=True)}
+
+    # limit import job to deny accidental frequent import for same entity
+    if not params.get("force"):
+        yesterday = datetime.now() - timedelta(days=1)
+        if Job.objects.filter(
+            status__in=[JobStatus.PREPARING, JobStatus.PROCESSING, JobStatus.DONE],
+            operation=JobOperation.IMPORT_ENTRY_V2,
+            target__in=list(entities.values()),
+            created_at__gte=yesterday,
+        ).exists():
+            return JobStatus.ERROR, "Import job for each entity can apply once a day.", None
+
+    job_ids: list[int] = []
+    error_list: list[str] = []
+    for import_data, _ in _iter_import_blocks(job):
+        assert import_data is not None
+        entity: Entity | None = entities.get(import_data["entity"])
+        if not entity:
+            error_list.append("%s: Entity does not exists." % import_data["entity"])
+            continue
+
+        if not user.has_permission(entity, ACLType.Writable):
+            error_list.append("%s: Entity is permission denied." % import_data["entity"])
+            continue
+
+        # Items are staged to the storage and read by chunks in the worker, so that the
+        # job table doesn't carry whole of them.
+        import_job = Job.new_import_v2(
+            user,
+            entity,
+            text="Preparing to import data",
+            params={
+                "entity": import_data["entity"],
+                "entry_count": len(import_data["entries"]),
+            },
+        )
+        import_job.stage_rows(import_data["entries"])
+        import_job.run()
+        job_ids.append(import_job.id)
+
+    # the staged file is kept until its expiry only to rerun failed jobs
+    job.delete_cache()
+
+    if error_list:
+        return (
+            JobStatus.WARNING,
+            "Dispatched import jobs: %s, Failed import Entity: %s" % (job_ids, error_list),
+            None,
+        )
+    else:
+        return JobStatus.DONE, "Dispatched import jobs: %s" % job_ids, None
+
+
+# A placeholder of the items in the template of YAML written by _write_yaml_items()
+_YAML_ITEMS_PLACEHOLDER = "__exported_items__"
+
+
+def _dump_yaml(data: Any) -> str:
+    return yaml.dump(data, default_flow_style=False, allow_unicode=True)
+
+
+def _write_yaml_items(
+    output: TextIO, container: Callable[[list[Any]], Any], chunks: Iterable[list[Any]]
+) -> None:
+    """
+    This writes the same YAML with _dump_yaml(container(items)) to the output while receiving
+    items by chunks, not to have all of them in memory. The container is dumped once with a
+    placeholder item to find where (and in which indentation) the items are put in it.
+    """
+    template = _dump_yaml(container([_YAML_ITEMS_PLACEHOLDER])).splitlines(keepends=True)
+    index = next(i for i, x in enumerate(template) if x.strip() == "- " + _YAML_ITEMS_PLACEHOLDER)
+    indent = template[index][: len(template[index]) - len(template[index].lstrip())]
+
+    is_written = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+
+        if not is_written:
+            output.write("".join(template[:index]))
+            is_written = True
+
+        for line in _dump_yaml(chunk).splitlines(keepends=True):
+            output.write(indent + line if line.strip() else line)
+
+    if is_written:
+        output.write("".join(template[index + 1 :]))
+    else:
+        # an empty list is dumped in flow style (e.g. "[]")
+        output.write(_dump_yaml(container([])))
+
+
+def _iter_permitted_entries(job: Job, entity: Entity) -> Iterator[list[Entry]]:
+    """
+    This returns readable Entries of the Entity by chunks of Job.STATUS_CHECK_FREQUENCY.
+    When the job status is checked at every loop, this might send tons of query to the
+    database. So it's checked once for each chunk, and permissions of the Entries in a chunk
+    are also resolved at once. This stops returning chunks when the job is canceled.
+
+    Attributes of the returned Entries and their latest values (including array elements
+    and referred objects) are also prefetched for each chunk, as Entry.build_es_documents()
+    does, so exporting them doesn't send queries for each Attribute.
+    """
+    schema = EntitySchema.get(entity.id)
+    value_prefetch = Prefetch(
+        "values",
+        queryset=AttributeValue.objects.filter(is_latest=True)
+        .select_related("referral", "group", "role")
+        .prefetch_related("data_array__referral", "data_array__group", "data_array__role")
+        .order_by("id"),
+        to_attr="prefetch_values",
+    )
+    attr_prefetch = Prefetch(
+        "attrs",
+        queryset=Attribute.objects.filter(is_active=True)
+        .select_related("schema")
+        .prefetch_related(value_prefetch),
+        to_attr="prefetch_attrs",
+    )
+
+    entries = Entry.objects.filter(schema=entity, is_active=True).select_related("schema")
+    for chunk in batched(
+        entries.iterator(chunk_size=Job.STATUS_CHECK_FREQUENCY), Job.STATUS_CHECK_FREQUENCY
+    ):
         # abort processing when job is canceled
-        if export_item_counter % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled():
+        if job.is_canceled(with_cache=True):
             return
 
-        if user.has_permission(entry, ACLType.Readable):
-            exported_data.append(entry.export(user))
+        permitted_entries = filter_permitted(job.user, chunk, ACLType.Readable)
 
-        # increment loop counter
-        export_item_counter += 1
+        # complement Attributes that are added after creating Entries, only for the
+        # Entries that actually lack some of them
+        attr_ids: dict[int, set[int]] = {x.id: set() for x in permitted_entries}
+        for entry_id, attr_id in Attribute.objects.filter(
+            parent_entry__in=permitted_entries, is_active=True
+        ).values_list("parent_entry", "schema"):
+            attr_ids[entry_id].add(attr_id)
+        for entry in permitted_entries:
+            if not set(schema.attrs_by_id) <= attr_ids[entry.id]:
+                entry.complement_attrs(job.user)
 
-    output = None
-    if params["export_format"] == "csv":
-        # newline is blank because csv module performs universal newlines
-        # https://docs.python.org/ja/3/library/csv.html#id3
-        output = io.StringIO(newline="")
-        # Use LF as the row terminator to match the LF used when joining array
-        # values; mixing CRLF terminators with bare-LF cell separators makes
-        # editors render the row-terminating CR as a stray ^M control character.
-        writer = csv.writer(output, lineterminator="\n")
+        prefetch_related_objects(permitted_entries, attr_prefetch)
 
-        attrs = [x.name for x in entity.attrs.filter(is_active=True)]
-        writer.writerow(["Name"] + attrs)
+        yield permitted_entries
 
-        def data2str(data: Any | None) -> str:
-            if not data:
-                return ""
-            return str(data)
 
-        for data in exported_data:
-            writer.writerow(
-                [data["name"]] + [data2str(data["attrs"][x]) for x in attrs if x in data["attrs"]]
-            )
-    else:
-        output = io.StringIO()
-        output.write(
-            yaml.dump(
-                {entity.name: exported_data},
-                default_flow_style=False,
-                allow_unicode=True,
+@register_job_task(JobOperation.EXPORT_ENTRY)
+@app.task(bind=True)  # type: ignore[misc]
+@may_schedule_until_job_is_ready
+def export_entries(self: Task, job: Job) -> None:
+    user = job.user
+    entity = Entity.objects.get(id=job.target.id)
+    params = json.loads(job.params)
+
+    # Exported data is written to the storage while Entries are exported by chunks, so
+    # worker memory doesn't depend on the number of Entries.
+    # (Permissions of the Entity and the Roles of the user are resolved once for all Entries.)
+    with permission_cache(), job.open_cache_stream() as output:
+        if params["export_format"] == "csv":
+            # Use LF as the row terminator to match the LF used when joining array
+            # values; mixing CRLF terminators with bare-LF cell separators makes
+            # editors render the row-terminating CR as a stray ^M control character.
+            writer = csv.writer(output, lineterminator="\n")
+
+            attrs = [x.name for x in EntitySchema.get(entity).attrs]
+            writer.writerow(["Name"] + attrs)
+
+            def data2str(data: Any | None) -> str:
+                if not data:
+                    return ""
+                return str(data)
+
+            for entries in _iter_permitted_entries(job, entity):
+                for data in [x.export(user) for x in entries]:
+                    writer.writerow(
+                        [data["name"]]
+                        + [data2str(data["attrs"][x]) for x in attrs if x in data["attrs"]]
+                    )
+        else:
+            _write_yaml_items(
+                output,
+                lambda items: {entity.name: items},
+                (
+                    [x.export(user) for x in entries]
+                    for entries in _iter_permitted_entries(job, entity)
+                ),
             )
-        )
 
-    if output:
-        job.set_cache(output.getvalue())
+    # the incomplete result of the canceled job is not left
+    if job.is_canceled():
+        job.delete_cache()
 
 
 @register_job_task(JobOperation.EXPORT_ENTRY_V2)
@@ -809,65 +1223,49 @@ def export_entries_v2(self: Task, job: Job) -> None:
     params = ExportTaskParams.model_validate_json(job.params)
     with_entity = params.export_format != "csv"
 
-    exported_entity: list[ExportedEntityEntries] = []
-    exported_entries: list[ExportedEntry] = []
-
-    # This variable is used for job status check. When it's checked at every loop, this might send
-    # tons of query to the database. To prevent the sort of tragedy situation, checking status of
-    # this job should be skipped some times (which is specified in Job.STATUS_CHECK_FREQUENCY).
-    #
-    # NOTE:
-    #   This doesn't use enumerate() method to count loop. Because when a QuerySet value is
-    #   passed to the argument of enumerate() method, Django try to get result at once (this never
-    #   do lazy evaluation).
-    export_item_counter = 0
-    for entry in Entry.objects.filter(schema=entity, is_active=True):
-        # abort processing when job is canceled
-        if export_item_counter % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled():
-            return
-
-        if user.has_permission(entry, ACLType.Readable):
-            exported_entries.append(entry.export_v2(user, with_entity=with_entity))
-
-        # increment loop counter
-        export_item_counter += 1
-
-    exported_entity.append(ExportedEntityEntries(entity=entity.name, entries=exported_entries))
-
-    output = None
-    if params.export_format == "csv":
-        # newline is blank because csv module performs universal newlines
-        # https://docs.python.org/ja/3/library/csv.html#id3
-        output = io.StringIO(newline="")
-        # Use LF as the row terminator to match the LF used when joining array
-        # values; mixing CRLF terminators with bare-LF cell separators makes
-        # editors render the row-terminating CR as a stray ^M control character.
-        writer = csv.writer(output, lineterminator="\n")
-
-        attrs = [x.name for x in entity.attrs.filter(is_active=True).order_by("index")]
-        writer.writerow(["Name"] + attrs)
-
-        def data2str(data: ExportedEntryAttributeValue | None) -> str:
-            if not data:
-                return ""
-            return str(data)
+    def _iter_exported_entries() -> Iterator[list[ExportedEntry]]:
+        for entries in _iter_permitted_entries(job, entity):
+            yield [
+                ExportedEntry.model_validate(x.export_v2(user, with_entity=with_entity))
+                for x in entries
+            ]
 
-        for data in exported_entity[0].entries:
-            writer.writerow(
-                [data.name] + [data2str(x.value) for x in data.attrs if x.name in attrs]
-            )
-    else:
-        output = io.StringIO()
-        output.write(
-            yaml.dump(
-                [x.dict(exclude_unset=True) for x in exported_entity],
-                default_flow_style=False,
-                allow_unicode=True,
+    # Exported data is written to the storage while Entries are exported by chunks, so
+    # worker memory doesn't depend on the number of Entries.
+    # (Permissions of the Entity and the Roles of the user are resolved once for all Entries.)
+    with permission_cache(), job.open_cache_stream() as output:
+        if params.export_format == "csv":
+            # Use LF as the row terminator to match the LF used when joining array
+            # values; mixing CRLF terminators with bare-LF cell separators makes
+            # editors render the row-terminating CR as a stray ^M control character.
+            writer = csv.writer(output, lineterminator="\n")
+
+            attrs = [x.name for x in EntitySchema.get(entity).sorted_attrs]
+            writer.writerow(["Name"] + attrs)
+
+            def data2str(data: ExportedEntryAttributeValue | None) -> str:
+                if not data:
+                    return ""
+                return str(data)
+
+            for exported_entries in _iter_exported_entries():
+                for data in exported_entries:
+                    writer.writerow(
+                        [data.name] + [data2str(x.value) for x in data.attrs if x.name in attrs]
+                    )
+        else:
+            _write_yaml_items(
+                output,
+                lambda items: [{"entity": entity.name, "entries": items}],
+                (
+                    [x.dict(exclude_unset=True) for x in exported_entries]
+                    for exported_entries in _iter_exported_entries()
+                ),
             )
-        )
 
-    if output:
-        job.set_cache(output.getvalue())
+    # the incomplete result of the canceled job is not left
+    if job.is_canceled():
+        job.delete_cache()
 
 
 def _csv_export_v2(
@@ -940,7 +1338,7 @@ def _csv_export_v2(
         return ""
 
     for index, entry_info in enumerate(values):
-        if index % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled():
+        if index % Job.STATUS_CHECK_FREQUENCY == 0 and job.is_canceled(with_cache=True):
             return None
 
         line_data = [entry_info.entry["name"]]
@@ -994,26 +1392,27 @@ def export_search_result_v2(self: Any, job: Job) -> tuple[JobStatus, str, ACLBas
             filter_key=hint_entry_raw.get("filter_key"),
         )
 
-    resp = AdvancedSearchService.search_entries(
-        user,
-        params["entities"],
-        hint_attrs,
-        settings.ES_CONFIG["MAXIMUM_RESULTS_NUM"],
-        entry_name=None,
-        hint_referral=referral_name,
-        is_output_all=False,
-        hint_referral_entity_id=None,
-        offset=0,
-        hint_entry=hint_entry,
-    )
+    with permission_cache():
+        resp = AdvancedSearchService.search_entries(
+            user,
+            params["entities"],
+            hint_attrs,
+            settings.ES_CONFIG["MAXIMUM_RESULTS_NUM"],
+            entry_name=None,
+            hint_referral=referral_name,
+            is_output_all=False,
+            hint_referral_entity_id=None,
+            offset=0,
+            hint_entry=hint_entry,
+        )
 
-    # Apply join_attrs in the same way as AdvancedSearchAPI.post() in views.py
-    join_attr_objects = AdvancedSearchJoinAttrInfoList.model_validate(join_attrs).root
-    resp = AdvancedSearchService.apply_join_attrs(
-        user,
-        resp,
-        join_attr_objects,
-    )
+        # Apply join_attrs in the same way as AdvancedSearchAPI.post() in views.py
+        join_attr_objects = AdvancedSearchJoinAttrInfoList.model_validate(join_attrs).root
+        resp = AdvancedSearchService.apply_join_attrs(
+            user,
+            resp,
+            join_attr_objects,
+        )
 
     output: io.StringIO | None = None
     match params["export_style"]:
@@ -1040,7 +1439,7 @@ def register_referrals(self: Task, job: Job) -> None:
     # register entries data which refer target entry to elasticsearch
     entry = Entry.objects.filter(id=job.target.id, is_active=True).first()
     if entry:
-        [r.register_es() for r in entry.get_referred_objects()]
+        Entry.register_es_bulk(entry.get_referred_objects().values_list("id", flat=True))
 
 
 def _notify_event(
@@ -1090,6 +1489,44 @@ def notify_delete_entry(self: Task, job: Job) -> tuple[JobStatus, str, None] | N
     return _notify_event(notify_entry_delete, job.target.id, job.user)
 
 
+def _notify_events(
+    notification_method: Callable[[Entry, User], None], entry_ids: list[int], user: User
+) -> tuple[JobStatus, str, None] | None:
+    """
+    This notifies events of many Entries. Notifications of the rest of Entries are sent
+    even when some of them fail, and the failures are reported together.
+    """
+    entries = Entry.objects.filter(id__in=entry_ids).select_related("schema").in_bulk()
+    errors = ["Failed to get job.target (%s)" % x for x in entry_ids if x not in entries]
+    for entry_id in entry_ids:
+        if entry_id not in entries:
+            continue
+
+        try:
+            notification_method(entries[entry_id], user)
+        except Exception as e:
+            errors.append("%s: %s" % (entries[entry_id].name, str(e)))
+
+    if errors:
+        return JobStatus.ERROR, "\n".join(errors), None
+
+    return None
+
+
+@register_job_task(JobOperation.NOTIFY_CREATE_ENTRIES)
+@app.task(bind=True)  # type: ignore[misc]
+@may_schedule_until_job_is_ready
+def notify_create_entries(self: Task, job: Job) -> tuple[JobStatus, str, None] | None:
+    return _notify_events(notify_entry_create, json.loads(job.params)["entry_ids"], job.user)
+
+
+@register_job_task(JobOperation.NOTIFY_UPDATE_ENTRIES)
+@app.task(bind=True)  # type: ignore[misc]
+@may_schedule_until_job_is_ready
+def notify_update_entries(self: Task, job: Job) -> tuple[JobStatus, str, None] | None:
+    return _notify_events(notify_entry_update, json.loads(job.params)["entry_ids"], job.user)
+
+
 @register_job_task(JobOperation.CREATE_ENTRY_V2)
 @app.task(bind=True)  # type: ignore[misc]
 @may_schedule_until_job_is_ready
@@ -1111,6 +1548,35 @@ def create_entry_v2(self: Task, job: Job) -> JobStatus:
     return JobStatus.DONE
 
 
+@register_job_task(JobOperation.BULK_CREATE_ENTRY)
+@app.task(bind=True)  # type: ignore[misc]
+@may_schedule_until_job_is_ready
+def bulk_create_entries(self: Task, job: Job) -> JobStatus | tuple[JobStatus, str, None]:
+    serializer = EntryBulkCreateSerializer(
+        data={"schema": job.target.id, "entries": list(job.iter_staged_rows())},
+        context={"_user": job.user},
+    )
+    if not serializer.is_valid():
+        return (JobStatus.ERROR, "Invalid data: %s" % json.dumps(serializer.errors), None)
+
+    with permission_cache():
+        entries = serializer.save()
+
+    # The staged Items are replaced with the result, which reports the created Items and the
+    # invalid ones with their indexes
+    job.set_cache(
+        {
+            "entries": [
+                {"index": entry_data["index"], "id": entry.id, "name": entry.name}
+                for (entry_data, entry) in zip(serializer.validated_data["entries"], entries)
+            ],
+            "errors": serializer.validated_data["errors"],
+        }
+    )
+
+    return JobStatus.DONE
+
+
 @register_job_task(JobOperation.EDIT_ENTRY_V2)
 @app.task(bind=True)  # type: ignore[misc]
 @may_schedule_until_job_is_ready
@@ -1156,6 +1622,75 @@ def delete_entry_v2(self: Task, job: Job) -> JobStatus:
     return JobStatus.DONE
 
 
+def _bulk_update_entries_chunk(
+    user: User,
+    entity: Entity,
+    entry_ids: list[int],
+    attrs_data: list[dict[str, Any]],
+    job_batch: JobBatch,
+) -> None:
+    """
+    This sets the same value to an Attribute of Entries in a chunk, as EntryUpdateSerializer
+    does for each of them. Attributes and permissions of them are looked up at once, latest
+    flags of the previous AttributeValues are cleared with one query, and the updated Entries
+    are registered to Elasticsearch by a bulk request. TriggerActions and webhook
+    notifications are buffered in the job_batch to be run by jobs for many Entries, so a
+    failure of them doesn't abort the bulk update.
+    """
+    entries = list(
+        Entry.objects.filter(id__in=entry_ids, schema=entity, is_active=True).select_related(
+            "schema"
+        )
+    )
+    entries_by_id = {x.id: x for x in entries}
+
+    updated_entries: list[Entry] = []
+    added_values: list[AttributeValue] = []
+    for attr_data in attrs_data:
+        entity_attr = EntityAttr.objects.get(id=attr_data["id"], parent_entity=entity)
+
+        attrs: dict[int, Attribute] = {}
+        for attr in Attribute.objects.filter(
+            parent_entry__in=entries, schema=entity_attr, is_active=True
+        ).order_by("-id"):
+            attrs[attr.parent_entry_id] = attr
+        for entry in entries:
+            if entry.id not in attrs:
+                attrs[entry.id] = entry.add_attribute_from_base(entity_attr, user)
+
+        for attr in filter_permitted(user, attrs.values(), ACLType.Writable):
+            # Check a new update value is specified, or not
+            if not attr.is_updated(attr_data["value"]):
+                continue
+
+            added_values.append(attr.add_value(user, attr_data["value"], unset_latest=False))
+            updated_entries.append(entries_by_id[attr.parent_entry_id])
+
+    Attribute.unset_latest_flags(added_values)
+
+    updated_entries = list({x.id: x for x in updated_entries}.values())
+    for entry in updated_entries:
+        # for history record
+        entry._history_user = user
+
+        # Updating its name from attribute values if it's necessary
+        if entity.item_name_type == ItemNameType.ATTR:
+            entry.save_autoname()
+
+    # update entry information to Elasticsearch
+    Entry.register_es_entries(updated_entries)
+
+    # run TriggerActions in response to TriggerCondition configuration
+    if TriggerCondition.get_invoked_actions(entity, attrs_data):
+        for entry in entries:
+            job_batch.invoke_trigger(entry, attrs_data)
+
+    # notify changing entry event to the WebHook URLs
+    if entity.webhooks.filter(is_enabled=True, is_verified=True).exists():
+        for entry in updated_entries:
+            job_batch.notify_update_entry(entry)
+
+
 @register_job_task(JobOperation.BULK_EDIT_ENTRY)
 @app.task(bind=True)  # type: ignore[misc]
 @may_schedule_until_job_is_ready
@@ -1179,36 +1714,73 @@ def bulk_update_entries(
     # update each items in accordance with job_params.value parameter
     context = {"request": DRFRequest(job.user)}
     total_count = resp.ret_count
-    for index, record in enumerate(resp.ret_values):
-        job.text = "Now updating... (progress: [%5d/%5d])" % (index + 1, total_count)
-        job.save(update_fields=["text"])
+    entry_ids = [x.entry["id"] for x in resp.ret_values]
+    if not entry_ids:
+        job.set_progress("Bulk update completed [%5d/%5d]" % (total_count, total_count), force=True)
+        return JobStatus.DONE
+
+    updating_data: dict[str, list[Any]] = {"attrs": []}
+    if job_params.get("value"):
+        updating_data["attrs"].append(
+            {
+                "id": job_params.get("value")["id"],
+                "value": job_params.get("value")["value"],
+            }
+        )
 
-        # abort processing when job is canceled
-        if job.is_canceled():
-            job.status = JobStatus.CANCELED
-            job.save(update_fields=["status"])
-            return None
+    # The same value is set to all items, so it's validated only once
+    serializer = EntryUpdateSerializer(
+        instance=Entry.objects.get(id=entry_ids[0]), data=updating_data, context=context
+    )
+    if not serializer.is_valid():
+        return (
+            JobStatus.ERROR,
+            "Validation error during bulk update (%s)" % serializer.error_messages,
+            None,
+        )
 
-        entry = Entry.objects.get(id=record.entry["id"])
-        updating_data: dict[str, list[Any]] = {"attrs": []}
-        if job_params.get("value"):
-            updating_data["attrs"].append(
-                {
-                    "id": job_params.get("value")["id"],
-                    "value": job_params.get("value")["value"],
-                }
+    entity = Entity.objects.get(id=job_params["modelid"])
+    is_custom = custom_view.is_custom(
+        "before_update_entry_v2", entity.name
+    ) or custom_view.is_custom("after_update_entry_v2", entity.name)
+
+    # Items are updated by chunks of CONFIG.BULK_UPDATE_CHUNK_SIZE. The progress is saved and the
+    # job status is checked once for each chunk. When custom_view hooks the update of each item,
+    # items are updated one by one by the serializer to call them.
+    with permission_cache(), JobBatch(job.user) as job_batch:
+        for chunk_index, chunk in enumerate(batched(entry_ids, CONFIG.BULK_UPDATE_CHUNK_SIZE)):
+            job.set_progress(
+                "Now updating... (progress: [%5d/%5d])"
+                % (chunk_index * CONFIG.BULK_UPDATE_CHUNK_SIZE + 1, total_count)
             )
 
-        serializer = EntryUpdateSerializer(instance=entry, data=updating_data, context=context)
-        if serializer.is_valid():
-            serializer.save()
-        else:
-            return (
-                JobStatus.ERROR,
-                "Validation error during bulk update (%s)" % serializer.error_messages,
-                None,
-            )
+            # abort processing when job is canceled
+            if job.is_canceled(with_cache=True):
+                job.status = JobStatus.CANCELED
+                job.save(update_fields=["status"])
+                return None
+
+            if is_custom:
+                for entry in Entry.objects.filter(id__in=chunk, is_active=True):
+                    entry_serializer = EntryUpdateSerializer(
+                        instance=entry, data=updating_data, context=context
+                    )
+                    if not entry_serializer.is_valid():
+                        return (
+                            JobStatus.ERROR,
+                            "Validation error during bulk update (%s)"
+                            % entry_serializer.error_messages,
+                            None,
+                        )
+                    entry_serializer.save()
+            else:
+                _bulk_update_entries_chunk(
+                    job.user,
+                    entity,
+                    list(chunk),
+                    serializer.validated_data.get("attrs", []),
+                    job_batch,
+                )
 
-    job.text = "Bulk update completed [%5d/%5d]" % (total_count, total_count)
-    job.save(update_fields=["text"])
+    job.set_progress("Bulk update completed [%5d/%5d]" % (total_count, total_count), force=True)
     return JobStatus.DONE
@@ -1858,6 +1858,7 @@ class ViewTest(BaseViewTest):
         self.assertIsNone(restored_value.referral)
 
     @mock.patch("entry.tasks.copy_entry.delay", mock.Mock(side_effect=tasks.copy_entry))
+    @mock.patch("entry.tasks.do_copy_entry.delay", mock.Mock(side_effect=tasks.do_copy_entry))
     def test_copy_entry(self):
         entry: Entry = self.add_entry(self.user, "entry", self.entity)
         params = {"copy_entry_names": ["copy1", "copy2"]}
@@ -1874,6 +1875,7 @@ class ViewTest(BaseViewTest):
         )
 
     @mock.patch("entry.tasks.copy_entry.delay", mock.Mock(side_effect=tasks.copy_entry))
+    @mock.patch("entry.tasks.do_copy_entry.delay", mock.Mock(side_effect=tasks.do_copy_entry))
     def test_copy_entry_for_autoname(self):
         (model_lb, model_sg) = self._create_lb_models_for_autoname()
 
@@ -2072,6 +2074,7 @@ class ViewTest(BaseViewTest):
         )
 
     @patch("entry.tasks.copy_entry.delay", Mock(side_effect=tasks.copy_entry))
+    @patch("entry.tasks.do_copy_entry.delay", Mock(side_effect=tasks.do_copy_entry))
     @mock.patch("airone.lib.custom_view.is_custom", mock.Mock(return_value=True))
     @mock.patch("airone.lib.custom_view.call_custom")
     def test_copy_entry_with_customview(self, mock_call_custom):
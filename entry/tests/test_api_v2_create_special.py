@@ -6,15 +6,18 @@ from unittest.mock import Mock, patch
 import yaml
 from rest_framework import status
 
-from airone.lib.elasticsearch import EntryFilterKey, FilterKey
+from airone.lib.elasticsearch import AttrHint, EntryFilterKey, FilterKey
 from airone.lib.types import (
     AttrType,
 )
 from entity.models import EntityAttr, ItemNameType
 from entry import tasks
 from entry.models import Entry
+from entry.services import AdvancedSearchService
 from entry.tests.test_api_v2 import BaseViewTest
 from job.models import Job, JobOperation, JobStatus
+from trigger import tasks as trigger_tasks
+from trigger.models import TriggerAction, TriggerCondition
 
 
 class ViewTest(BaseViewTest):
@@ -565,6 +568,10 @@ class ViewTest(BaseViewTest):
         item_sg.refresh_from_db()
         self.assertEqual(item_sg.name, "[LB0001] test.example.com:8080 #123.456")
 
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_update_items_for_autoname(self):
         (model_lb, model_sg) = self._create_lb_models_for_autoname()
@@ -800,6 +807,93 @@ class ViewTest(BaseViewTest):
             item = Entry.objects.get(name=itemname, schema=self.entity)
             self.assertEqual(item.get_attrv("val").value, expected_value)
 
+    @patch("entry.tasks.bulk_update_entries.delay", Mock(side_effect=tasks.bulk_update_entries))
+    @patch(
+        "trigger.tasks.may_invoke_triggers.delay",
+        Mock(side_effect=trigger_tasks.may_invoke_triggers),
+    )
+    @patch.dict("entry.settings.CONFIG.conf", {"BULK_UPDATE_CHUNK_SIZE": 2})
+    def test_bulk_update_items_by_chunks(self):
+        items = [
+            self.add_entry(self.user, "item-%s" % i, self.entity, values={"val": "foo"})
+            for i in range(5)
+        ]
+        updating_attr = self.entity.attrs.get(name="val")
+        TriggerCondition.register(
+            self.entity,
+            [{"attr_id": updating_attr.id, "cond": "updated"}],
+            [{"attr_id": self.entity.attrs.get(name="text").id, "value": "triggered"}],
+        )
+
+        params = {
+            "value": {"id": updating_attr.id, "value": "updated"},
+            "modelid": self.entity.id,
+            "attrinfo": [],
+        }
+        resp = self.client.put("/entry/api/v2/bulk/", params, "application/json")
+        self.assertEqual(resp.status_code, 202)
+
+        job = Job.objects.filter(operation=JobOperation.BULK_EDIT_ENTRY).last()
+        self.assertEqual(job.status, JobStatus.DONE)
+        for item in items:
+            attr = item.attrs.get(schema=updating_attr)
+            self.assertEqual([x.value for x in attr.values.filter(is_latest=True)], ["updated"])
+            self.assertEqual(item.get_attrv("text").value, "triggered")
+
+        # TriggerActions are run by jobs for many Items instead of jobs for each of them
+        self.assertFalse(Job.objects.filter(operation=JobOperation.MAY_INVOKE_TRIGGER).exists())
+        self.assertEqual(
+            [
+                sorted(x["id"] for x in json.loads(job.params)["entries"])
+                for job in Job.objects.filter(operation=JobOperation.MAY_INVOKE_TRIGGERS)
+            ],
+            [sorted(x.id for x in items)],
+        )
+
+        # updated values are registered to Elasticsearch
+        resp = AdvancedSearchService.search_entries(
+            self.user, [self.entity.id], [AttrHint(name="val")]
+        )
+        self.assertEqual(
+            [x.attrs["val"]["value"] for x in resp.ret_values], ["updated"] * len(items)
+        )
+
+    @patch("entry.tasks.bulk_update_entries.delay", Mock(side_effect=tasks.bulk_update_entries))
+    @patch(
+        "trigger.tasks.may_invoke_triggers.delay",
+        Mock(side_effect=trigger_tasks.may_invoke_triggers),
+    )
+    @patch.object(TriggerAction, "run", Mock(side_effect=RuntimeError("failed")))
+    def test_bulk_update_items_when_trigger_fails(self):
+        items = [
+            self.add_entry(self.user, "item-%s" % i, self.entity, values={"val": "foo"})
+            for i in range(3)
+        ]
+        updating_attr = self.entity.attrs.get(name="val")
+        TriggerCondition.register(
+            self.entity,
+            [{"attr_id": updating_attr.id, "cond": "updated"}],
+            [{"attr_id": self.entity.attrs.get(name="text").id, "value": "triggered"}],
+        )
+
+        params = {
+            "value": {"id": updating_attr.id, "value": "updated"},
+            "modelid": self.entity.id,
+            "attrinfo": [],
+        }
+        resp = self.client.put("/entry/api/v2/bulk/", params, "application/json")
+        self.assertEqual(resp.status_code, 202)
+
+        # failure of TriggerActions doesn't abort updating Items
+        job = Job.objects.filter(operation=JobOperation.BULK_EDIT_ENTRY).last()
+        self.assertEqual(job.status, JobStatus.DONE)
+        self.assertEqual(
+            Job.objects.filter(operation=JobOperation.MAY_INVOKE_TRIGGERS).last().status,
+            JobStatus.ERROR,
+        )
+        for item in items:
+            self.assertEqual(item.get_attrv("val").value, "updated")
+
     @patch("entry.tasks.bulk_update_entries.delay", Mock(side_effect=tasks.bulk_update_entries))
     def test_bulk_update_items_with_referral_name_filter(self):
         """
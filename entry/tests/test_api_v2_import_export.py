@@ -6,6 +6,8 @@ from datetime import date
 from unittest.mock import Mock, patch
 
 import yaml
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from airone.lib.elasticsearch import EntryFilterKey
 from airone.lib.log import Logger
@@ -169,6 +171,100 @@ class ViewTest(BaseViewTest):
         if e.exception.errno == errno.ENOENT:
             job.get_cache()
 
+    @patch("entry.tasks.export_entries_v2.delay", Mock(side_effect=tasks.export_entries_v2))
+    @patch.object(Job, "STATUS_CHECK_FREQUENCY", 2)
+    def test_post_export_by_chunks(self):
+        user = self.admin_login()
+        entity = self.create_entity(user, "Entity", attrs=[{"name": "text", "type": AttrType.TEXT}])
+        for index in range(5):
+            self.add_entry(user, "e-%d" % index, entity, values={"text": "1st\n2nd-%d" % index})
+
+        # exported data that is written by chunks is the same with the one dumped at once
+        self.client.post("/entry/api/v2/%d/export/" % entity.id, json.dumps({}), "application/json")
+        job = Job.objects.last()
+        self.assertEqual(job.status, JobStatus.DONE)
+        self.assertEqual(
+            job.get_cache(),
+            yaml.dump(
+                [
+                    {
+                        "entity": "Entity",
+                        "entries": [
+                            x.export_v2(user, with_entity=True)
+                            for x in Entry.objects.filter(schema=entity).order_by("id")
+                        ],
+                    }
+                ],
+                default_flow_style=False,
+                allow_unicode=True,
+            ),
+        )
+
+        self.client.post(
+            "/entry/api/v2/%d/export/" % entity.id,
+            json.dumps({"format": "CSV"}),
+            "application/json",
+        )
+        self.assertEqual(
+            Job.objects.last().get_cache(),
+            "Name,text\n" + "".join('e-%d,"1st\n2nd-%d"\n' % (x, x) for x in range(5)),
+        )
+
+        # no result is left when the job is canceled while exporting
+        export_v2 = Entry.export_v2
+
+        def _export_and_cancel(entry, *args, **kwargs):
+            Job.objects.filter(operation=JobOperation.EXPORT_ENTRY_V2).update(
+                status=JobStatus.CANCELED
+            )
+            return export_v2(entry, *args, **kwargs)
+
+        with patch.object(Entry, "export_v2", _export_and_cancel):
+            self.client.post(
+                "/entry/api/v2/%d/export/" % entity.id, json.dumps({}), "application/json"
+            )
+        job = Job.objects.last()
+        self.assertEqual(job.status, JobStatus.CANCELED)
+        with self.assertRaises(OSError):
+            job.get_cache()
+
+    def test_export_permitted_entries_issues_constant_number_of_queries(self):
+        user = self.admin_login()
+        entity = self.create_entity(
+            user,
+            "Entity",
+            attrs=[
+                {"name": "text", "type": AttrType.STRING},
+                {"name": "array", "type": AttrType.ARRAY_STRING},
+            ],
+        )
+        job = Job.new_export_v2(user, target=entity)
+
+        def _export():
+            return [
+                x.export_v2(user)
+                for entries in tasks._iter_permitted_entries(job, entity)
+                for x in entries
+            ]
+
+        self.add_entry(user, "e-0", entity, values={"text": "foo", "array": ["a", "b"]})
+        _export()
+        with CaptureQueriesContext(connection) as ctx:
+            _export()
+        baseline = len(ctx.captured_queries)
+
+        for index in range(1, 5):
+            self.add_entry(user, "e-%d" % index, entity, values={"text": "foo", "array": ["a"]})
+
+        with self.assertNumQueries(baseline):
+            exported = _export()
+
+        # exported data is the same with the one exported without prefetching
+        self.assertEqual(
+            exported,
+            [x.export_v2(user) for x in Entry.objects.filter(schema=entity).order_by("id")],
+        )
+
     @patch("entry.tasks.export_entries_v2.delay", Mock(side_effect=tasks.export_entries_v2))
     def test_post_export_with_referrals(self):
         user = self.admin_login()
@@ -468,7 +564,11 @@ class ViewTest(BaseViewTest):
             data = content.replace(header, "", 1).strip()
             self.assertEqual(data, '"%s,""ENTRY""",' % type_name + expected)
 
-    @patch("entry.tasks.notify_create_entry.delay", Mock(side_effect=tasks.notify_create_entry))
+    @patch("entry.tasks.notify_create_entries.delay", Mock(side_effect=tasks.notify_create_entries))
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_create_entry(self):
         fp = self.open_fixture_file("import_data_v2.yaml")
@@ -479,12 +579,17 @@ class ViewTest(BaseViewTest):
         job = Job.objects.get(operation=JobOperation.IMPORT_ENTRY_V2)
         self.assertEqual(job.status, JobStatus.DONE)
         self.assertEqual(job.text, "Imported Entry count: 1")
+
+        # the uploaded data is imported by the jobs that are dispatched by the job of response
+        dispatch_job = Job.objects.get(operation=JobOperation.DISPATCH_IMPORT_ENTRY_V2)
+        self.assertEqual(dispatch_job.status, JobStatus.DONE)
+        self.assertEqual(dispatch_job.text, "Dispatched import jobs: [%d]" % job.id)
         self.assertEqual(
             resp.json(),
             {
                 "result": {
                     "error": [],
-                    "job_ids": [job.id],
+                    "job_ids": [dispatch_job.id],
                 }
             },
         )
@@ -517,10 +622,54 @@ class ViewTest(BaseViewTest):
             self.assertEqual(result.ret_values[0].attrs[attr_name]["value"], attrs[attr_name])
 
         entry = Entry.objects.get(name="test-entry")
-        job_notify = Job.objects.get(target=entry, operation=JobOperation.NOTIFY_CREATE_ENTRY)
+        job_notify = Job.objects.get(
+            target=entry.schema, operation=JobOperation.NOTIFY_CREATE_ENTRIES
+        )
         self.assertEqual(job_notify.status, JobStatus.DONE)
+        self.assertEqual(json.loads(job_notify.params), {"entry_ids": [entry.id]})
+
+    @patch("entry.tasks.notify_create_entries.delay", Mock(side_effect=tasks.notify_create_entries))
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
+    @patch("entry.tasks.import_entries_v2.delay", Mock())
+    def test_import_staged_entries(self):
+        fp = self.open_fixture_file("import_data_v2.yaml")
+        resp = self.client.post("/entry/api/v2/import/", fp.read(), "application/yaml")
+        fp.close()
+        self.assertEqual(resp.status_code, 200)
+
+        # imported Items are staged to the storage instead of the params of the job
+        job = Job.objects.get(operation=JobOperation.IMPORT_ENTRY_V2)
+        self.assertEqual(json.loads(job.params), {"entity": "test-entity", "entry_count": 1})
+        self.assertEqual(
+            [x["name"] for x in job.iter_staged_rows()],
+            ["test-entry"],
+        )
 
-    @patch("entry.tasks.notify_update_entry.delay", Mock(side_effect=tasks.notify_update_entry))
+        # staged Items are removed after they are imported
+        job.run(will_delay=False)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.DONE)
+        self.assertEqual(job.text, "Imported Entry count: 1")
+        self.assertTrue(Entry.objects.filter(name="test-entry", schema=self.entity).exists())
+        with self.assertRaises(FileNotFoundError):
+            job.get_artifact()
+
+        # a job that was created before staging keeps its Items in params
+        params = {"entity": "test-entity", "entries": [{"name": "test-entry2", "attrs": []}]}
+        job = Job.new_import_v2(self.user, self.entity, params=params)
+        job.run(will_delay=False)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.DONE)
+        self.assertTrue(Entry.objects.filter(name="test-entry2", schema=self.entity).exists())
+
+    @patch("entry.tasks.notify_update_entries.delay", Mock(side_effect=tasks.notify_update_entries))
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_update_entry(self):
         entry = self.add_entry(self.user, "test-entry", self.entity)
@@ -558,8 +707,11 @@ class ViewTest(BaseViewTest):
         for attr_name in result.ret_values[0].attrs:
             self.assertEqual(result.ret_values[0].attrs[attr_name]["value"], attrs[attr_name])
 
-        job_notify = Job.objects.get(target=entry, operation=JobOperation.NOTIFY_UPDATE_ENTRY)
+        job_notify = Job.objects.get(
+            target=entry.schema, operation=JobOperation.NOTIFY_UPDATE_ENTRIES
+        )
         self.assertEqual(job_notify.status, JobStatus.DONE)
+        self.assertEqual(json.loads(job_notify.params), {"entry_ids": [entry.id]})
 
         # Update only some attributes
         fp = self.open_fixture_file("import_data_v2_update_some.yaml")
@@ -611,7 +763,11 @@ class ViewTest(BaseViewTest):
             if "value" in result.ret_values[0].attrs[attr_name]:
                 self.assertEqual(result.ret_values[0].attrs[attr_name]["value"], attrs[attr_name])
 
-    @patch("entry.tasks.notify_update_entry.delay", Mock(side_effect=tasks.notify_update_entry))
+    @patch("entry.tasks.notify_update_entries.delay", Mock(side_effect=tasks.notify_update_entries))
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_update_named_object_boolean_attrs(self):
         # Regression test: the boolean flag of (ARRAY_)NAMED_OBJECT_BOOLEAN was dropped
@@ -696,7 +852,11 @@ class ViewTest(BaseViewTest):
             [("key2", ref_entry.id)],
         )
 
-    @patch("entry.tasks.notify_update_entry.delay", Mock(side_effect=tasks.notify_update_entry))
+    @patch("entry.tasks.notify_update_entries.delay", Mock(side_effect=tasks.notify_update_entries))
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     @patch("entry.tasks.export_entries_v2.delay", Mock(side_effect=tasks.export_entries_v2))
     def test_import_update_entry_with_id(self):
@@ -739,7 +899,11 @@ class ViewTest(BaseViewTest):
         self.assertEqual(item.name, "OriginalItem")
         self.assertEqual(item.get_attrv("val").value, "initial value")
 
-    @patch("entry.tasks.notify_update_entry.delay", Mock(side_effect=tasks.notify_update_entry))
+    @patch("entry.tasks.notify_update_entries.delay", Mock(side_effect=tasks.notify_update_entries))
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     @patch("entry.tasks.export_entries_v2.delay", Mock(side_effect=tasks.export_entries_v2))
     def test_import_update_entry_with_id_prevent_duplicated_name(self):
@@ -779,6 +943,10 @@ class ViewTest(BaseViewTest):
             ["item-0", "item-1"],
         )
 
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_multi_entity(self):
         entity1 = self.create_entity(self.user, "test-entity1")
@@ -792,15 +960,8 @@ class ViewTest(BaseViewTest):
         job2 = Job.objects.get(target=entity2, operation=JobOperation.IMPORT_ENTRY_V2)
         self.assertEqual(job1.text, "Imported Entry count: 1")
         self.assertEqual(job2.text, "Imported Entry count: 1")
-        self.assertEqual(
-            resp.json(),
-            {
-                "result": {
-                    "error": [],
-                    "job_ids": [job1.id, job2.id],
-                }
-            },
-        )
+        dispatch_job = Job.objects.get(operation=JobOperation.DISPATCH_IMPORT_ENTRY_V2)
+        self.assertEqual(dispatch_job.text, "Dispatched import jobs: [%d, %d]" % (job1.id, job2.id))
 
         result = AdvancedSearchService.search_entries(self.user, [entity1.id, entity2.id])
         self.assertEqual(result.ret_count, 2)
@@ -809,7 +970,11 @@ class ViewTest(BaseViewTest):
         self.assertEqual(result.ret_values[1].entry["name"], "test-entry2")
         self.assertEqual(result.ret_values[1].entity["name"], "test-entity2")
 
-    @patch("entry.tasks.notify_create_entry.delay", Mock(side_effect=tasks.notify_create_entry))
+    @patch("entry.tasks.notify_create_entries.delay", Mock(side_effect=tasks.notify_create_entries))
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_entry_has_referrals_with_entities(self):
         ref_entity2: Entity = self.create_entity(self.user, "ref_entity2")
@@ -824,12 +989,17 @@ class ViewTest(BaseViewTest):
         job = Job.objects.get(operation=JobOperation.IMPORT_ENTRY_V2)
         self.assertEqual(job.status, JobStatus.DONE)
         self.assertEqual(job.text, "Imported Entry count: 1")
+
+        # the uploaded data is imported by the jobs that are dispatched by the job of response
+        dispatch_job = Job.objects.get(operation=JobOperation.DISPATCH_IMPORT_ENTRY_V2)
+        self.assertEqual(dispatch_job.status, JobStatus.DONE)
+        self.assertEqual(dispatch_job.text, "Dispatched import jobs: [%d]" % job.id)
         self.assertEqual(
             resp.json(),
             {
                 "result": {
                     "error": [],
-                    "job_ids": [job.id],
+                    "job_ids": [dispatch_job.id],
                 }
             },
         )
@@ -862,8 +1032,11 @@ class ViewTest(BaseViewTest):
             self.assertEqual(result.ret_values[0].attrs[attr_name]["value"], attrs[attr_name])
 
         entry = Entry.objects.get(name="test-entry")
-        job_notify = Job.objects.get(target=entry, operation=JobOperation.NOTIFY_CREATE_ENTRY)
+        job_notify = Job.objects.get(
+            target=entry.schema, operation=JobOperation.NOTIFY_CREATE_ENTRIES
+        )
         self.assertEqual(job_notify.status, JobStatus.DONE)
+        self.assertEqual(json.loads(job_notify.params), {"entry_ids": [entry.id]})
 
         with self.assertLogs(logger=Logger, level=logging.WARNING) as warning_log:
             fp = self.open_fixture_file("import_data_v2.yaml")
@@ -879,20 +1052,26 @@ class ViewTest(BaseViewTest):
                 ],
             )
 
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     def test_import_invalid_data(self):
+        def _post_import(content: str | None) -> Job:
+            resp = self.client.post("/entry/api/v2/import/", content, "application/yaml")
+            self.assertEqual(resp.status_code, 200)
+
+            # the uploaded data is parsed and validated by the job, instead of the request
+            job = Job.objects.get(id=resp.json()["result"]["job_ids"][0])
+            self.assertEqual(job.status, JobStatus.ERROR)
+            self.assertFalse(Job.objects.filter(operation=JobOperation.IMPORT_ENTRY_V2).exists())
+            return job
+
         # nothing data
-        resp = self.client.post("/entry/api/v2/import/", None, "application/yaml")
-        self.assertEqual(resp.status_code, 400)
+        job = _post_import(None)
         self.assertEqual(
-            resp.json(),
-            {
-                "non_field_errors": [
-                    {
-                        "code": "AE-121000",
-                        "message": 'Expected a list of items but got type "dict".',
-                    }
-                ]
-            },
+            json.loads(job.text.removeprefix("Invalid data: ")),
+            {"non_field_errors": ['Expected a list of items but got type "dict".']},
         )
 
         # wrong content-type
@@ -910,120 +1089,88 @@ class ViewTest(BaseViewTest):
 
         # faild parse yaml
         fp = self.open_fixture_file("import_data_v2_failed_parse.yaml")
-        resp = self.client.post("/entry/api/v2/import/", fp.read(), "application/yaml")
+        job = _post_import(fp.read())
         fp.close()
-        self.assertEqual(resp.status_code, 400)
-        self.assertEqual(resp.json()["code"], "AE-140000")
-        self.assertTrue("YAML parse error" in resp.json()["message"])
+        self.assertTrue(job.text.startswith("YAML parse error"))
 
         # faild scan yaml
         fp = self.open_fixture_file("import_data_v2_failed_scan.yaml")
-        resp = self.client.post("/entry/api/v2/import/", fp.read(), "application/yaml")
+        job = _post_import(fp.read())
         fp.close()
-        self.assertEqual(resp.status_code, 400)
-        self.assertEqual(resp.json()["code"], "AE-140000")
-        self.assertTrue("YAML parse error" in resp.json()["message"])
+        self.assertTrue(job.text.startswith("YAML parse error"))
 
         # invalid param
         fp = self.open_fixture_file("import_data_v2_invalid_param.yaml")
-        resp = self.client.post("/entry/api/v2/import/", fp.read(), "application/yaml")
+        job = _post_import(fp.read())
         fp.close()
-        self.assertEqual(resp.status_code, 400)
+        errors = json.loads(job.text.removeprefix("Invalid data: "))
 
         # invalid required param (entity, entries)
         self.assertEqual(
-            resp.json()[0],
-            {
-                "entity": [{"code": "AE-113000", "message": "This field is required."}],
-                "entries": [{"code": "AE-113000", "message": "This field is required."}],
-            },
+            errors[0],
+            {"entity": ["This field is required."], "entries": ["This field is required."]},
         )
 
         # invalid type param (entity, entries)
         self.assertEqual(
-            resp.json()[1],
+            errors[1],
             {
-                "entity": [{"code": "AE-121000", "message": "Not a valid string."}],
-                "entries": [
-                    {
-                        "code": "AE-121000",
-                        "message": 'Expected a list of items but got type "str".',
-                    }
-                ],
+                "entity": ["Not a valid string."],
+                "entries": ['Expected a list of items but got type "str".'],
             },
         )
 
         # invalid type param (entries)
         self.assertEqual(
-            resp.json()[2]["entries"]["0"],
-            {
-                "non_field_errors": [
-                    {
-                        "code": "AE-121000",
-                        "message": "Invalid data. Expected a dictionary, but got str.",
-                    }
-                ]
-            },
+            errors[2]["entries"]["0"],
+            {"non_field_errors": ["Invalid data. Expected a dictionary, but got str."]},
         )
 
         # invalid required param (entries)
-        self.assertEqual(
-            resp.json()[2]["entries"]["1"],
-            {"name": [{"code": "AE-113000", "message": "This field is required."}]},
-        )
+        self.assertEqual(errors[2]["entries"]["1"], {"name": ["This field is required."]})
 
         # invalid type param (name, attrs)
         self.assertEqual(
-            resp.json()[2]["entries"]["2"],
+            errors[2]["entries"]["2"],
             {
-                "attrs": [
-                    {
-                        "code": "AE-121000",
-                        "message": 'Expected a list of items but got type "str".',
-                    }
-                ],
-                "name": [{"code": "AE-121000", "message": "Not a valid string."}],
+                "attrs": ['Expected a list of items but got type "str".'],
+                "name": ["Not a valid string."],
             },
         )
 
         # invalid type param (attrs)
         self.assertEqual(
-            resp.json()[2]["entries"]["3"]["attrs"]["0"],
-            {
-                "non_field_errors": [
-                    {
-                        "code": "AE-121000",
-                        "message": "Invalid data. Expected a dictionary, but got str.",
-                    }
-                ]
-            },
+            errors[2]["entries"]["3"]["attrs"]["0"],
+            {"non_field_errors": ["Invalid data. Expected a dictionary, but got str."]},
         )
 
         # invalid required param (name, value)
         self.assertEqual(
-            resp.json()[2]["entries"]["3"]["attrs"]["1"],
-            {
-                "name": [{"code": "AE-113000", "message": "This field is required."}],
-                "value": [{"code": "AE-113000", "message": "This field is required."}],
-            },
+            errors[2]["entries"]["3"]["attrs"]["1"],
+            {"name": ["This field is required."], "value": ["This field is required."]},
         )
 
         # invalid type param (name)
-        self.assertEqual(
-            resp.json()[2]["entries"]["3"]["attrs"]["2"]["name"],
-            [{"code": "AE-121000", "message": "Not a valid string."}],
-        )
+        self.assertEqual(errors[2]["entries"]["3"]["attrs"]["2"]["name"], ["Not a valid string."])
 
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_invalid_data_value(self):
         fp = self.open_fixture_file("import_data_v2_invalid_value.yaml")
         resp = self.client.post("/entry/api/v2/import/", fp.read(), "application/yaml")
         fp.close()
-        job_id = resp.json()["result"]["job_ids"][0]
-        job = Job.objects.get(id=job_id)
+        self.assertEqual(resp.status_code, 200)
+        job = Job.objects.get(operation=JobOperation.IMPORT_ENTRY_V2)
         self.assertEqual(job.status, JobStatus.WARNING)
         self.assertTrue("Imported Entry count: 17" in job.text)
 
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_invalid_data_entity(self):
         # not exsits entity
@@ -1031,8 +1178,12 @@ class ViewTest(BaseViewTest):
         resp = self.client.post("/entry/api/v2/import/", fp.read(), "application/yaml")
         fp.close()
         self.assertEqual(resp.status_code, 200)
+        job = Job.objects.get(id=resp.json()["result"]["job_ids"][0])
+        self.assertEqual(job.status, JobStatus.WARNING)
         self.assertEqual(
-            resp.json()["result"], {"job_ids": [], "error": ["no-entity: Entity does not exists."]}
+            job.text,
+            "Dispatched import jobs: [], "
+            "Failed import Entity: ['no-entity: Entity does not exists.']",
         )
 
         # permission nothing entity
@@ -1042,9 +1193,11 @@ class ViewTest(BaseViewTest):
         resp = self.client.post("/entry/api/v2/import/", fp.read(), "application/yaml")
         fp.close()
         self.assertEqual(resp.status_code, 200)
+        job = Job.objects.get(id=resp.json()["result"]["job_ids"][0])
         self.assertEqual(
-            resp.json()["result"],
-            {"job_ids": [], "error": ["test-entity: Entity is permission denied."]},
+            job.text,
+            "Dispatched import jobs: [], "
+            "Failed import Entity: ['test-entity: Entity is permission denied.']",
         )
 
         # permission readble entity
@@ -1054,9 +1207,11 @@ class ViewTest(BaseViewTest):
         resp = self.client.post("/entry/api/v2/import/", fp.read(), "application/yaml")
         fp.close()
         self.assertEqual(resp.status_code, 200)
+        job = Job.objects.get(id=resp.json()["result"]["job_ids"][0])
         self.assertEqual(
-            resp.json()["result"],
-            {"job_ids": [], "error": ["test-entity: Entity is permission denied."]},
+            job.text,
+            "Dispatched import jobs: [], "
+            "Failed import Entity: ['test-entity: Entity is permission denied.']",
         )
 
         # permission writable entity
@@ -1067,8 +1222,15 @@ class ViewTest(BaseViewTest):
         fp.close()
         self.assertEqual(resp.status_code, 200)
         job = Job.objects.get(target=self.entity, operation=JobOperation.IMPORT_ENTRY_V2)
-        self.assertEqual(resp.json()["result"], {"job_ids": [job.id], "error": []})
+        self.assertEqual(
+            Job.objects.get(id=resp.json()["result"]["job_ids"][0]).text,
+            "Dispatched import jobs: [%d]" % job.id,
+        )
 
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_warning(self):
         fp = self.open_fixture_file("import_data_v2_warning.yaml")
@@ -1076,13 +1238,16 @@ class ViewTest(BaseViewTest):
         fp.close()
 
         self.assertEqual(resp.status_code, 200)
-        job_id = resp.json()["result"]["job_ids"][0]
-        job = Job.objects.get(id=job_id)
+        job = Job.objects.get(operation=JobOperation.IMPORT_ENTRY_V2)
         self.assertEqual(job.status, JobStatus.WARNING)
         self.assertEqual(job.text, "Imported Entry count: 2, Failed import Entry: ['test-entry1']")
         self.assertTrue(Entry.objects.filter(name="test-entry2").exists())
 
     @patch.object(Job, "is_canceled", Mock(return_value=True))
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_cancel(self):
         fp = self.open_fixture_file("import_data_v2.yaml")
@@ -1090,12 +1255,15 @@ class ViewTest(BaseViewTest):
         fp.close()
 
         self.assertEqual(resp.status_code, 200)
-        job_id = resp.json()["result"]["job_ids"][0]
-        job = Job.objects.get(id=job_id)
+        job = Job.objects.get(operation=JobOperation.IMPORT_ENTRY_V2)
         self.assertEqual(job.status, JobStatus.CANCELED)
         self.assertEqual(job.text, "Now importing... (progress: [    1/    1])")
         self.assertFalse(Entry.objects.filter(name="test-entry").exists())
 
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     def test_import_frequent_jobs(self):
         fp = self.open_fixture_file("import_data_v2.yaml")
@@ -1107,13 +1275,18 @@ class ViewTest(BaseViewTest):
         fp = self.open_fixture_file("import_data_v2.yaml")
         resp = self.client.post("/entry/api/v2/import/?force=false", fp.read(), "application/yaml")
         fp.close()
-        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.status_code, 200)
+        job = Job.objects.get(id=resp.json()["result"]["job_ids"][0])
+        self.assertEqual(job.status, JobStatus.ERROR)
+        self.assertEqual(job.text, "Import job for each entity can apply once a day.")
+        self.assertEqual(Job.objects.filter(operation=JobOperation.IMPORT_ENTRY_V2).count(), 1)
 
         # with force param, it should ignore the limit
         fp = self.open_fixture_file("import_data_v2.yaml")
         resp = self.client.post("/entry/api/v2/import/?force=true", fp.read(), "application/yaml")
         fp.close()
         self.assertEqual(resp.status_code, 200)
+        self.assertEqual(Job.objects.filter(operation=JobOperation.IMPORT_ENTRY_V2).count(), 2)
 
     @patch(
         "entry.tasks.export_search_result_v2.delay", Mock(side_effect=tasks.export_search_result_v2)
@@ -1770,6 +1943,10 @@ class ViewTest(BaseViewTest):
             "which makes editors render the CR as a stray ^M. raw=%r" % content,
         )
 
+    @patch(
+        "entry.tasks.dispatch_import_entries_v2.delay",
+        Mock(side_effect=tasks.dispatch_import_entries_v2),
+    )
     @patch("entry.tasks.import_entries_v2.delay", Mock(side_effect=tasks.import_entries_v2))
     @patch(
         "entry.tasks.export_search_result_v2.delay", Mock(side_effect=tasks.export_search_result_v2)
@@ -1,3 +1,6 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from airone.lib.acl import ACLType
 from airone.lib.http import DRFRequest
 from airone.lib.test import AironeViewTest
@@ -5,6 +8,7 @@ from airone.lib.types import AttrType
 from entry.api_v2.serializers import (
     EntrySelfHistoryRestoreSerializer,
     EntrySelfHistorySerializer,
+    EntryUpdateSerializer,
     PrivilegedEntryCreateSerializer,
     PrivilegedEntryUpdateSerializer,
 )
@@ -88,6 +92,45 @@ class ViewTest(AironeViewTest):
         self.assertEqual(changed_entry.name, "e0 changed")
         self.assertEqual(changed_entry.get_attrv("secret").value, "caput draconis")
 
+    def test_update_entry_only_specified_attrs(self):
+        user: User = self.admin_login()
+
+        query_counts = []
+        for attr_count in [2, 20]:
+            entity = self.create_entity(
+                user,
+                "Entity%d" % attr_count,
+                attrs=[{"name": "attr%d" % i, "type": AttrType.STRING} for i in range(attr_count)],
+            )
+            entry = self.add_entry(user, "e0", entity, values={"attr0": "foo", "attr1": "bar"})
+
+            serializer = EntryUpdateSerializer(
+                instance=entry,
+                data={
+                    "attrs": [
+                        {"id": entity.attrs.get(name="attr0").id, "value": "baz"},
+                        {"id": entity.attrs.get(name="attr1").id, "value": "bar"},
+                    ],
+                    "delay_trigger": False,
+                },
+                context={"request": DRFRequest(user), "deferred_es_entries": []},
+            )
+            serializer.is_valid(raise_exception=True)
+            with CaptureQueriesContext(connection) as ctx:
+                serializer.save()
+            query_counts.append(len(ctx.captured_queries))
+
+            # only the changed Attribute has a new value, which is the only latest one
+            self.assertEqual(entry.get_attrv("attr0").value, "baz")
+            self.assertEqual(entry.attrs.get(schema__name="attr0").values.count(), 2)
+            self.assertEqual(
+                entry.attrs.get(schema__name="attr0").values.filter(is_latest=True).count(), 1
+            )
+            self.assertEqual(entry.attrs.get(schema__name="attr1").values.count(), 1)
+
+        # the number of queries doesn't depend on the number of attributes of the model
+        self.assertEqual(query_counts[0], query_counts[1])
+
 
 class EntrySelfHistorySerializerTest(AironeViewTest):
     def setUp(self):
@@ -1,10 +1,13 @@
 from datetime import date
+from unittest import mock
 
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from elasticsearch import NotFoundError
 
 from acl.models import ACLBase
-from airone.lib.elasticsearch import AdvancedSearchResultRecord, AttrHint
+from airone.lib.elasticsearch import AdvancedSearchResultRecord, AttrHint, get_document_hash
 from airone.lib.types import AttrType
 from entity.models import Entity, EntityAttr
 from entry.models import Attribute, Entry
@@ -369,6 +372,183 @@ class ModelElasticsearchTest(BaseModelTest):
         res = self._es.get(index=settings.ES_CONFIG["INDEX_NAME"], id=entry.id)
         self.assertEqual(res["_source"]["attr"][0]["value"], "fuga")
 
+    def test_register_es_updates_referral_documents_by_one_bulk_request(self):
+        user = User.objects.create(username="hoge")
+        ref_entity = Entity.objects.create(name="ref_entity", created_user=user)
+        ref_entries = [
+            Entry.objects.create(name="ref-%d" % i, schema=ref_entity, created_user=user)
+            for i in range(3)
+        ]
+        for ref_entry in ref_entries:
+            ref_entry.register_es()
+
+        entity = Entity.objects.create(name="entity", created_user=user)
+        entity_attr = EntityAttr.objects.create(
+            name="refs", type=AttrType.ARRAY_OBJECT, created_user=user, parent_entity=entity
+        )
+        entity_attr.referral.add(ref_entity)
+        entry = Entry.objects.create(name="entry", schema=entity, created_user=user)
+        entry.complement_attrs(user)
+        entry.attrs.get(schema=entity_attr).add_value(
+            user, [str(ref_entries[0].id), str(ref_entries[1].id)]
+        )
+        entry.register_es()
+
+        def referrals(ref_entry):
+            res = self._es.get(index=settings.ES_CONFIG["INDEX_NAME"], id=ref_entry.id)
+            return [x["name"] for x in res["_source"]["referrals"]]
+
+        self.assertEqual([referrals(x) for x in ref_entries], [["entry"], ["entry"], []])
+
+        # stop referring ref-0, start referring ref-2 and rename the entry at once
+        entry.attrs.get(schema=entity_attr).add_value(
+            user, [str(ref_entries[1].id), str(ref_entries[2].id)]
+        )
+        entry.name = "renamed"
+        entry.save()
+
+        es = self._es
+        with (
+            mock.patch.object(es, "bulk", wraps=es.bulk) as mock_bulk,
+            mock.patch.object(es, "refresh", wraps=es.refresh) as mock_refresh,
+        ):
+            entry.register_es(es=es)
+
+        self.assertEqual(mock_bulk.call_count, 1)
+        self.assertEqual(mock_refresh.call_count, 1)
+        self.assertEqual(
+            [int(x["index"]["_id"]) for x in mock_bulk.call_args.kwargs["body"][::2]],
+            [entry.id] + [x.id for x in ref_entries],
+        )
+        self.assertEqual([referrals(x) for x in ref_entries], [[], ["renamed"], ["renamed"]])
+
+    def test_register_es_without_refresh(self):
+        entry = Entry.objects.create(name="entry", schema=self._entity, created_user=self._user)
+
+        es = self._es
+        with mock.patch.object(es, "refresh", wraps=es.refresh) as mock_refresh:
+            entry.register_es(es=es, refresh=False)
+
+        mock_refresh.assert_not_called()
+        es.refresh()
+        res = es.get(index=settings.ES_CONFIG["INDEX_NAME"], id=entry.id)
+        self.assertEqual(res["_source"]["name"], "entry")
+
+    def test_register_es_skips_unchanged_documents(self):
+        entry = Entry.objects.create(name="entry", schema=self._entity, created_user=self._user)
+        entry.complement_attrs(self._user)
+        entry.register_es()
+
+        es = self._es
+        with (
+            mock.patch.object(es, "bulk", wraps=es.bulk) as mock_bulk,
+            mock.patch.object(es, "refresh", wraps=es.refresh) as mock_refresh,
+        ):
+            entry.register_es(es=es)
+            mock_bulk.assert_not_called()
+            mock_refresh.assert_not_called()
+
+            entry.attrs.get(schema__name="attr").add_value(self._user, "new value")
+            entry.register_es(es=es)
+            self.assertEqual(mock_bulk.call_count, 1)
+            self.assertEqual(mock_refresh.call_count, 1)
+
+        document = entry.get_es_document()
+        self.assertEqual(document["content_hash"], get_document_hash(document))
+        res = es.get(index=settings.ES_CONFIG["INDEX_NAME"], id=entry.id)
+        self.assertEqual(res["_source"]["content_hash"], document["content_hash"])
+
+    def test_register_es_compares_unrefreshed_documents(self):
+        entry = Entry.objects.create(name="entry", schema=self._entity, created_user=self._user)
+        entry.complement_attrs(self._user)
+        attr = entry.attrs.get(schema__name="attr")
+        attr.add_value(self._user, "X")
+        entry.register_es()
+
+        # changes that are written without refreshing the index (e.g. by imports) are
+        # compared with the latest documents, even when they're reverted before a refresh
+        attr.add_value(self._user, "Y")
+        entry.register_es(refresh=False)
+        attr.add_value(self._user, "X")
+        entry.register_es(refresh=False)
+
+        self._es.refresh()
+        res = self._es.get(index=settings.ES_CONFIG["INDEX_NAME"], id=entry.id)
+        self.assertEqual(res["_source"]["content_hash"], entry.get_es_document()["content_hash"])
+
+    def test_build_es_documents_with_constant_queries(self):
+        user = User.objects.create(username="hoge")
+        test_group = Group.objects.create(name="test-group")
+        test_role = Role.objects.create(name="test-role")
+
+        ref_entity = Entity.objects.create(name="Referred Entity", created_user=user)
+        ref_entry = Entry.objects.create(name="r0", schema=ref_entity, created_user=user)
+
+        entity = self.create_entity_with_all_type_attributes(user)
+        EntityAttr.objects.create(
+            name="select",
+            type=AttrType.SELECT,
+            created_user=user,
+            parent_entity=entity,
+            choices=[{"value": "active", "label": "Active"}],
+        )
+        referrer_attr = EntityAttr.objects.create(
+            name="ref", type=AttrType.OBJECT, created_user=user, parent_entity=ref_entity
+        )
+        referrer_attr.referral.add(entity)
+
+        def create_entries(start, end):
+            entries = []
+            for index in range(start, end):
+                entry = Entry.objects.create(name="e-%d" % index, schema=entity, created_user=user)
+                entry.complement_attrs(user)
+                for info in self._get_attrinfo_template(ref_entry, test_group, test_role):
+                    entry.attrs.get(schema__name=info["name"]).add_value(user, info["set_val"])
+                entry.attrs.get(schema__name="select").add_value(user, "active")
+
+                # each entry is referred by another one
+                referrer = Entry.objects.create(
+                    name="referrer-%d" % index, schema=ref_entity, created_user=user
+                )
+                referrer.complement_attrs(user)
+                referrer.attrs.get(schema=referrer_attr).add_value(user, entry)
+                entries.append(entry)
+            return entries
+
+        entries = create_entries(0, 2)
+        with CaptureQueriesContext(connection) as few_queries:
+            Entry.build_es_documents([x.id for x in entries])
+
+        entries += create_entries(2, 10)
+        with CaptureQueriesContext(connection) as many_queries:
+            documents = Entry.build_es_documents([x.id for x in entries])
+
+        self.assertEqual(
+            len(many_queries),
+            len(few_queries),
+            msg=(
+                f"query count scales with entries: 2 entries => {len(few_queries)}, "
+                f"10 entries => {len(many_queries)}"
+            ),
+        )
+
+        # documents are same with the ones that are built for each entry
+        self.assertEqual(list(documents.keys()), [x.id for x in entries])
+        for entry in entries:
+            self.assertEqual(documents[entry.id], entry.get_es_document())
+            self.assertEqual(
+                [x["name"] for x in documents[entry.id]["referrals"]],
+                ["referrer-%s" % entry.name[2:]],
+            )
+            self.assertEqual(
+                [x["value"] for x in documents[entry.id]["attr"] if x["name"] == "select"],
+                ["Active"],
+            )
+
+    def test_build_es_documents_with_unknown_entries(self):
+        self.assertEqual(Entry.build_es_documents([]), {})
+        self.assertEqual(Entry.build_es_documents([9999]), {})
+
     def test_search_entries_from_elasticsearch(self):
         user = User.objects.create(username="hoge")
 
@@ -702,6 +702,53 @@ class ModelOperationsTest(BaseModelTest):
         role.users.add(unknown_user)
         self.assertIsNotNone(entry.clone(unknown_user))
 
+    def test_clone_bulk(self):
+        for name, attrtype in [("str", AttrType.STRING), ("arr", AttrType.ARRAY_STRING)]:
+            EntityAttr.objects.create(
+                name=name, type=attrtype, created_user=self._user, parent_entity=self._entity
+            )
+
+        entry = Entry.objects.create(name="entry", schema=self._entity, created_user=self._user)
+        entry.complement_attrs(self._user)
+        entry.attrs.get(schema__name="str").add_value(self._user, "foo")
+        entry.attrs.get(schema__name="arr").add_value(self._user, ["a", "b", "c"])
+
+        cloned_entries = entry.clone_bulk(self._user, ["copy1", "copy2"])
+
+        self.assertEqual([x.name for x in cloned_entries], ["copy1", "copy2"])
+        for cloned_entry in cloned_entries:
+            cloned_entry.refresh_from_db()
+            self.assertFalse(cloned_entry.get_status(Entry.STATUS_CREATING))
+            self.assertEqual(cloned_entry.attrs.count(), entry.attrs.count())
+
+            cloned_attr = cloned_entry.attrs.get(schema__name="str")
+            self.assertEqual(cloned_attr.values.count(), 1)
+            self.assertEqual(cloned_attr.get_latest_value().value, "foo")
+            self.assertEqual(cloned_attr.get_latest_value().created_user, self._user)
+
+            # checks co-AttributeValues are cloned for the cloned AttributeValue
+            cloned_attr = cloned_entry.attrs.get(schema__name="arr")
+            cloned_attrv = cloned_attr.get_latest_value()
+            self.assertEqual(cloned_attrv.parent_attr, cloned_attr)
+            self.assertEqual(
+                sorted([x.value for x in cloned_attrv.data_array.all()]), ["a", "b", "c"]
+            )
+            for co_attrv in cloned_attrv.data_array.all():
+                self.assertEqual(co_attrv.parent_attr, cloned_attr)
+
+        # original values are not changed
+        self.assertEqual(entry.attrs.get(schema__name="str").values.count(), 1)
+        self.assertEqual(entry.get_attrv("arr").data_array.count(), 3)
+
+    def test_clone_bulk_without_permission(self):
+        unknown_user = User.objects.create(username="unknown_user")
+        entry = Entry.objects.create(
+            name="entry", schema=self._entity, created_user=self._user, is_public=False
+        )
+
+        self.assertEqual(entry.clone_bulk(unknown_user, ["copy1"]), [])
+        self.assertFalse(Entry.objects.filter(name="copy1").exists())
+
     def test_set_value_method(self):
         user = User.objects.create(username="hoge")
         test_groups = [Group.objects.create(name=x) for x in ["g1", "g2"]]
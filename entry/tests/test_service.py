@@ -1,7 +1,9 @@
 import logging
 from datetime import date, datetime, timezone
+from unittest import mock
 
 from django.conf import settings
+from elasticsearch import NotFoundError
 
 from airone.lib.elasticsearch import AttrHint, EntryFilterKey, EntryHint, FilterKey
 from airone.lib.log import Logger
@@ -1035,6 +1037,56 @@ class AdvancedSearchServiceTest(AironeTestCase):
         res = AdvancedSearchService.search_entries(self._user, [self._entity.id])
         self.assertEqual(res.ret_count, 1)
 
+    def test_update_documents_by_pages(self):
+        entries = [self._entry] + [
+            Entry.objects.create(name="e-%d" % i, created_user=self._user, schema=self._entity)
+            for i in range(6)
+        ]
+        for entry in entries[:4]:
+            entry.register_es()
+
+        # make es-documents inconsistent with the database
+        entries[1].name = "changed"
+        entries[1].save()
+        entries[2].is_active = False
+        entries[2].save()
+
+        es = self._es
+        with (
+            mock.patch.dict(CONFIG.conf, {"MAX_ES_BULK_DOCUMENTS": 2}),
+            mock.patch.object(es, "bulk", wraps=es.bulk) as mock_bulk,
+            mock.patch("entry.services.ESS", return_value=es),
+        ):
+            AdvancedSearchService.update_documents(self._entity, True)
+
+            # only outdated documents are written
+            self.assertEqual(
+                sorted(
+                    (action, int(meta["_id"]))
+                    for call in mock_bulk.call_args_list
+                    for x in call.kwargs["body"]
+                    for action, meta in x.items()
+                    if action in ["index", "delete"]
+                ),
+                sorted(
+                    [("index", entries[1].id), ("delete", entries[2].id)]
+                    + [("index", x.id) for x in entries[4:]]
+                ),
+            )
+
+            # nothing is written when documents are consistent with the database
+            mock_bulk.reset_mock()
+            AdvancedSearchService.update_documents(self._entity, True)
+            mock_bulk.assert_not_called()
+
+        for entry in entries:
+            if entry.is_active:
+                res = es.get(index=settings.ES_CONFIG["INDEX_NAME"], id=entry.id)
+                self.assertEqual(res["_source"], entry.get_es_document())
+            else:
+                with self.assertRaises(NotFoundError):
+                    es.get(index=settings.ES_CONFIG["INDEX_NAME"], id=entry.id)
+
     def test_search_entries_allow_missing_attributes(self):
         # 1. Setup Entities
         alpha_entity = Entity.objects.create(
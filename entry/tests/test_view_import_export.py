@@ -479,11 +479,11 @@ class ViewImportExportTest(BaseViewTest):
         job_expectations = [
             {"operation": JobOperation.IMPORT_ENTRY, "status": JobStatus.DONE},
             {
-                "operation": JobOperation.MAY_INVOKE_TRIGGER,
+                "operation": JobOperation.MAY_INVOKE_TRIGGERS,
                 "status": JobStatus.PREPARING,
             },
             {
-                "operation": JobOperation.NOTIFY_CREATE_ENTRY,
+                "operation": JobOperation.NOTIFY_CREATE_ENTRIES,
                 "status": JobStatus.PREPARING,
             },
         ]
@@ -498,8 +498,8 @@ class ViewImportExportTest(BaseViewTest):
         self.assertTrue(res["found"])
 
     @patch(
-        "trigger.tasks.may_invoke_trigger.delay",
-        Mock(side_effect=trigger_tasks.may_invoke_trigger),
+        "trigger.tasks.may_invoke_triggers.delay",
+        Mock(side_effect=trigger_tasks.may_invoke_triggers),
     )
     @patch("entry.tasks.import_entries.delay", Mock(side_effect=tasks.import_entries))
     def test_import_when_duplicated_named_alias_exists(self):
@@ -529,8 +529,8 @@ class ViewImportExportTest(BaseViewTest):
         )
 
     @patch(
-        "trigger.tasks.may_invoke_trigger.delay",
-        Mock(side_effect=trigger_tasks.may_invoke_trigger),
+        "trigger.tasks.may_invoke_triggers.delay",
+        Mock(side_effect=trigger_tasks.may_invoke_triggers),
     )
     @patch("entry.tasks.import_entries.delay", Mock(side_effect=tasks.import_entries))
     def test_import_entry_when_trigger_is_set(self):
@@ -780,7 +780,7 @@ class ViewImportExportTest(BaseViewTest):
         job = Job.objects.filter(operation=JobOperation.IMPORT_ENTRY).last()
         self.assertEqual(job.status, JobStatus.DONE)
 
-        self.assertTrue(Job.objects.filter(operation=JobOperation.NOTIFY_CREATE_ENTRY).exists())
+        self.assertTrue(Job.objects.filter(operation=JobOperation.NOTIFY_CREATE_ENTRIES).exists())
 
         ret = AdvancedSearchService.search_entries(user, [self._entity.id], [AttrHint(name="test")])
         self.assertEqual(ret.ret_count, 1)
@@ -797,7 +797,7 @@ class ViewImportExportTest(BaseViewTest):
         job = Job.objects.filter(operation=JobOperation.IMPORT_ENTRY).last()
         self.assertEqual(job.status, JobStatus.DONE)
 
-        self.assertFalse(Job.objects.filter(operation=JobOperation.NOTIFY_UPDATE_ENTRY).exists())
+        self.assertFalse(Job.objects.filter(operation=JobOperation.NOTIFY_UPDATE_ENTRIES).exists())
 
         Job.objects.all().delete()
 
@@ -809,13 +809,121 @@ class ViewImportExportTest(BaseViewTest):
         job = Job.objects.filter(operation=JobOperation.IMPORT_ENTRY).last()
         self.assertEqual(job.status, JobStatus.DONE)
 
-        self.assertTrue(Job.objects.filter(operation=JobOperation.NOTIFY_UPDATE_ENTRY).exists())
+        self.assertTrue(Job.objects.filter(operation=JobOperation.NOTIFY_UPDATE_ENTRIES).exists())
 
         ret = AdvancedSearchService.search_entries(user, [self._entity.id], [AttrHint(name="test")])
         self.assertEqual(ret.ret_count, 1)
         self.assertEqual(ret.ret_values[0].entry["name"], "entry")
         self.assertEqual(ret.ret_values[0].attrs["test"]["value"], "piyo")
 
+    @patch("entry.tasks.import_entries.delay", Mock(side_effect=tasks.import_entries))
+    @patch.dict("entry.settings.CONFIG.conf", {"IMPORT_CHUNK_SIZE": 2})
+    def test_import_entry_by_chunks(self):
+        user = self.admin_login()
+        self.add_entry(user, "existing", self._entity, values={"test": "old"})
+
+        # rows of the same name in a chunk and over chunks are imported in order
+        params = [
+            {"name": "existing", "attrs": {"test": "v1"}},
+            {"name": "new", "attrs": {"test": "v2"}},
+            {"name": "new", "attrs": {"test": "v3"}},
+            {"name": "existing", "attrs": {"test": "v4"}},
+            {"name": "other", "attrs": {"test": "v5"}},
+        ]
+        job = Job.new_import(user, self._entity, params=params)
+        job.run()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.DONE)
+        self.assertEqual(
+            sorted(Entry.objects.filter(schema=self._entity).values_list("name", flat=True)),
+            ["existing", "new", "other"],
+        )
+        for name, value in [("existing", "v4"), ("new", "v3"), ("other", "v5")]:
+            entry = Entry.objects.get(name=name, schema=self._entity)
+            attr = entry.attrs.get(schema__name="test")
+            self.assertEqual([x.value for x in attr.values.filter(is_latest=True)], [value])
+
+            res = self._es.get(index=settings.ES_CONFIG["INDEX_NAME"], id=entry.id)
+            self.assertEqual(res["_source"]["attr"][0]["value"], value)
+
+    @patch("entry.tasks.import_entries.delay", Mock(side_effect=tasks.import_entries))
+    @patch("entry.tasks.notify_create_entries.delay", Mock(side_effect=tasks.notify_create_entries))
+    @patch(
+        "trigger.tasks.may_invoke_triggers.delay",
+        Mock(side_effect=trigger_tasks.may_invoke_triggers),
+    )
+    @patch.dict("job.settings.CONFIG.conf", {"BATCH_JOB_SIZE": 2})
+    def test_import_entry_with_batch_jobs(self):
+        user = self.admin_login()
+        params = [{"name": "e-%d" % x, "attrs": {"test": "v%d" % x}} for x in range(5)]
+        job = Job.new_import(user, self._entity, params=params)
+        job.run()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.DONE)
+
+        # notifications and TriggerActions of 5 items are run by 3 jobs for each of them
+        entry_ids = list(
+            Entry.objects.filter(schema=self._entity).order_by("id").values_list("id", flat=True)
+        )
+        notify_jobs = Job.objects.filter(
+            operation=JobOperation.NOTIFY_CREATE_ENTRIES, target=self._entity
+        ).order_by("id")
+        self.assertEqual(
+            [json.loads(x.params)["entry_ids"] for x in notify_jobs],
+            [entry_ids[0:2], entry_ids[2:4], entry_ids[4:]],
+        )
+        self.assertTrue(all(x.status == JobStatus.DONE for x in notify_jobs))
+
+        trigger_jobs = Job.objects.filter(
+            operation=JobOperation.MAY_INVOKE_TRIGGERS, target=self._entity
+        ).order_by("id")
+        self.assertEqual(
+            [[y["id"] for y in json.loads(x.params)["entries"]] for x in trigger_jobs],
+            [entry_ids[0:2], entry_ids[2:4], entry_ids[4:]],
+        )
+        self.assertTrue(all(x.status == JobStatus.DONE for x in trigger_jobs))
+
+        # no job is made for each item
+        self.assertFalse(
+            Job.objects.filter(
+                operation__in=[JobOperation.NOTIFY_CREATE_ENTRY, JobOperation.MAY_INVOKE_TRIGGER]
+            ).exists()
+        )
+
+    @patch("entry.tasks.import_entries.delay", Mock(side_effect=tasks.import_entries))
+    @patch("entry.tasks.notify_create_entries.delay", Mock(side_effect=tasks.notify_create_entries))
+    @patch(
+        "trigger.tasks.may_invoke_triggers.delay",
+        Mock(side_effect=trigger_tasks.may_invoke_triggers),
+    )
+    def test_import_entry_with_failed_trigger_actions(self):
+        def _run_action(user, entry):
+            if entry.name == "e-1":
+                raise RuntimeError("action failed")
+            invoked.append(entry.name)
+
+        invoked = []
+        action = Mock()
+        action.run.side_effect = _run_action
+
+        user = self.admin_login()
+        params = [{"name": "e-%d" % x, "attrs": {"test": "v%d" % x}} for x in range(3)]
+        with patch(
+            "trigger.tasks.TriggerCondition.get_invoked_actions", Mock(return_value=[action])
+        ):
+            job = Job.new_import(user, self._entity, params=params)
+            job.run()
+
+        # actions of the rest of items are run, and the failure is reported
+        self.assertEqual(invoked, ["e-0", "e-2"])
+        trigger_job = Job.objects.get(
+            operation=JobOperation.MAY_INVOKE_TRIGGERS, target=self._entity
+        )
+        self.assertEqual(trigger_job.status, JobStatus.ERROR)
+        self.assertEqual(trigger_job.text, "e-1: action failed")
+
     def test_get_copy_with_invalid_entry(self):
         self.admin_login()
 
@@ -888,6 +996,7 @@ class ViewImportExportTest(BaseViewTest):
                 copied_entry.delete()
 
     @patch("entry.tasks.copy_entry.delay", Mock(side_effect=tasks.copy_entry))
+    @patch("entry.tasks.do_copy_entry.delay", Mock(side_effect=tasks.do_copy_entry))
     def test_copy_when_duplicated_named_alias_exists(self):
         user = self.admin_login()
 
@@ -907,32 +1016,34 @@ class ViewImportExportTest(BaseViewTest):
         )
         self.assertEqual(resp.status_code, 200)
 
-        # check Chomolungma copy job was failed
+        # check Chomolungma was reported as the failure of copy job
         copy_job = Job.objects.filter(user=user, operation=JobOperation.COPY_ENTRY).first()
-        self.assertEqual(copy_job.text, "Copy completed [%5d/%5d]" % (3, 3))
+        self.assertEqual(
+            copy_job.text,
+            "Copy completed [%5d/%5d], Failed to copy Item: %s"
+            % (3, 3, ["Duplicated Alias(name=Chomolungma) exists in this model"]),
+        )
         self.assertEqual(copy_job.target.entry, item_src)
-        self.assertEqual(copy_job.status, JobStatus.DONE)
+        self.assertEqual(copy_job.status, JobStatus.WARNING)
 
         # check Job of COPY has expected attributes
-        do_copy_jobs = Job.objects.filter(user=user, operation=JobOperation.DO_COPY_ENTRY)
-        self.assertEqual(do_copy_jobs.count(), 3)
-
-        EXPECTED_PARAMS = [
-            ("Mt.Fuji", JobStatus.DONE, "original entry: Everest"),
-            ("K2", JobStatus.DONE, "original entry: Everest"),
-            (
-                "Chomolungma",
-                JobStatus.ERROR,
-                "Duplicated Alias(name=Chomolungma) exists in this model",
-            ),
-        ]
-        for index, (name, status, text) in enumerate(EXPECTED_PARAMS):
-            job = do_copy_jobs[index]
-            self.assertEqual(json.loads(job.params)["new_name"], name)
-            self.assertEqual(job.status, status)
-            self.assertEqual(job.text, text)
+        do_copy_job = Job.objects.get(user=user, operation=JobOperation.DO_COPY_ENTRY)
+        self.assertEqual(
+            json.loads(do_copy_job.params)["new_name_list"], ["Mt.Fuji", "K2", "Chomolungma"]
+        )
+        self.assertEqual(do_copy_job.status, JobStatus.WARNING)
+        self.assertEqual(
+            do_copy_job.text,
+            "original entry: Everest, Failed to copy Item: %s"
+            % ["Duplicated Alias(name=Chomolungma) exists in this model"],
+        )
+        self.assertEqual(
+            sorted(Entry.objects.filter(schema=model).values_list("name", flat=True)),
+            ["Everest", "K2", "Mt.Fuji"],
+        )
 
     @patch("entry.tasks.copy_entry.delay", Mock(side_effect=tasks.copy_entry))
+    @patch("entry.tasks.do_copy_entry.delay", Mock(side_effect=tasks.do_copy_entry))
     def test_post_copy_with_valid_entry(self):
         user = self.admin_login()
 
@@ -973,23 +1084,132 @@ class ViewImportExportTest(BaseViewTest):
         self.assertEqual(copy_job.target.entry, entry)
         self.assertEqual(copy_job.status, JobStatus.DONE)
 
-        do_copy_jobs = Job.objects.filter(user=user, operation=JobOperation.DO_COPY_ENTRY)
-        self.assertEqual(do_copy_jobs.count(), 3)
-        for obj in do_copy_jobs.all():
-            self.assertTrue(any([obj.target.name == x for x in ["foo", "bar", "baz"]]))
-            self.assertEqual(obj.text, "original entry: %s" % entry.name)
-            self.assertEqual(obj.target_type, JobTarget.ENTRY)
-            self.assertEqual(obj.status, JobStatus.DONE)
-            self.assertNotEqual(obj.created_at, obj.updated_at)
-            self.assertTrue((obj.updated_at - obj.created_at).total_seconds() > 0)
+        do_copy_job = Job.objects.get(user=user, operation=JobOperation.DO_COPY_ENTRY)
+        self.assertEqual(json.loads(do_copy_job.params)["new_name_list"], ["foo", "bar", "baz"])
+        self.assertEqual(do_copy_job.text, "original entry: %s" % entry.name)
+        self.assertEqual(do_copy_job.target.entry, entry)
+        self.assertEqual(do_copy_job.target_type, JobTarget.ENTRY)
+        self.assertEqual(do_copy_job.status, JobStatus.DONE)
 
-        # check notification jobs were create in the copy entry's processing
-        notify_jobs = Job.objects.filter(
-            operation=JobOperation.NOTIFY_CREATE_ENTRY,
+        # check a notification job of all copied entries was created in the copy's processing
+        notify_job = Job.objects.get(
+            operation=JobOperation.NOTIFY_CREATE_ENTRIES,
             status=JobStatus.PREPARING,
             user=user,
         )
-        self.assertEqual(notify_jobs.count(), do_copy_jobs.count())
+        self.assertEqual(
+            sorted(json.loads(notify_job.params)["entry_ids"]),
+            sorted(
+                Entry.objects.filter(
+                    name__in=["foo", "bar", "baz"], schema=self._entity
+                ).values_list("id", flat=True)
+            ),
+        )
+
+    @patch("entry.tasks.copy_entry.delay", Mock(side_effect=tasks.copy_entry))
+    @patch("entry.tasks.do_copy_entry.delay", Mock(side_effect=tasks.do_copy_entry))
+    @patch.dict("entry.settings.CONFIG.conf", {"COPY_CHUNK_SIZE": 2})
+    def test_post_copy_by_chunks(self):
+        user = self.admin_login()
+
+        model = self.create_entity(
+            user,
+            "Mountain",
+            attrs=[
+                {"name": "height", "type": AttrType.STRING},
+                {"name": "routes", "type": AttrType.ARRAY_STRING},
+            ],
+        )
+        item_src = self.add_entry(
+            user, "Everest", model, values={"height": "8848", "routes": ["South", "North"]}
+        )
+
+        names = ["copy-%d" % x for x in range(5)]
+        resp = self.client.post(
+            reverse("entry:do_copy", args=[item_src.id]),
+            json.dumps({"entries": "\n".join(names)}),
+            "application/json",
+        )
+        self.assertEqual(resp.status_code, 200)
+
+        # names are copied by jobs of each chunk and the copy job aggregates them
+        copy_job = Job.objects.get(user=user, operation=JobOperation.COPY_ENTRY)
+        self.assertEqual(copy_job.status, JobStatus.DONE)
+        self.assertEqual(copy_job.text, "Copy completed [%5d/%5d]" % (5, 5))
+
+        do_copy_jobs = Job.objects.filter(user=user, operation=JobOperation.DO_COPY_ENTRY).order_by(
+            "id"
+        )
+        self.assertEqual(
+            [json.loads(x.params)["new_name_list"] for x in do_copy_jobs],
+            [["copy-0", "copy-1"], ["copy-2", "copy-3"], ["copy-4"]],
+        )
+        self.assertEqual(json.loads(copy_job.params)["chunk_job_ids"], [x.id for x in do_copy_jobs])
+        self.assertTrue(all([x.status == JobStatus.DONE for x in do_copy_jobs]))
+
+        # check all attribute values including ones of array were copied
+        for name in names:
+            entry = Entry.objects.get(name=name, schema=model, is_active=True)
+            self.assertFalse(entry.get_status(Entry.STATUS_CREATING))
+            self.assertEqual(entry.get_attrv("height").value, "8848")
+            self.assertEqual(
+                sorted([x.value for x in entry.get_attrv("routes").data_array.all()]),
+                ["North", "South"],
+            )
+            self.assertNotEqual(entry.get_attrv("height"), item_src.get_attrv("height"))
+
+        res = AdvancedSearchService.get_all_es_docs()
+        self.assertEqual(res["hits"]["total"]["value"], 6)
+
+    @patch("entry.tasks.copy_entry.delay", Mock(side_effect=tasks.copy_entry))
+    @patch("entry.tasks.do_copy_entry.delay", Mock(side_effect=tasks.do_copy_entry))
+    @patch.dict("entry.settings.CONFIG.conf", {"COPY_CHUNK_SIZE": 2})
+    def test_post_copy_by_chunks_with_aborted_chunk(self):
+        user = self.admin_login()
+        model = self.create_entity(user, "Mountain")
+        item_src = self.add_entry(user, "Everest", model)
+
+        copy_entries = tasks._copy_entries
+
+        def _copy_entries(user, src_entry, new_names, post_data):
+            if "copy-2" in new_names:
+                raise RuntimeError("unexpected error")
+            return copy_entries(user, src_entry, new_names, post_data)
+
+        names = ["copy-%d" % x for x in range(5)]
+        with (
+            patch("entry.tasks._copy_entries", Mock(side_effect=_copy_entries)),
+            self.assertLogs(logger=Logger, level=logging.ERROR),
+        ):
+            resp = self.client.post(
+                reverse("entry:do_copy", args=[item_src.id]),
+                json.dumps({"entries": "\n".join(names)}),
+                "application/json",
+            )
+        self.assertEqual(resp.status_code, 200)
+
+        # the copy job is finished with the names of the aborted chunk
+        do_copy_jobs = Job.objects.filter(user=user, operation=JobOperation.DO_COPY_ENTRY).order_by(
+            "id"
+        )
+        self.assertEqual(
+            [x.status for x in do_copy_jobs], [JobStatus.DONE, JobStatus.ERROR, JobStatus.DONE]
+        )
+        copy_job = Job.objects.get(user=user, operation=JobOperation.COPY_ENTRY)
+        self.assertEqual(copy_job.status, JobStatus.WARNING)
+        self.assertEqual(
+            copy_job.text,
+            "Copy completed [%5d/%5d], Failed to copy Item: %s"
+            % (3, 5, ["Failed to copy Items(names=['copy-2', 'copy-3'])"]),
+        )
+        self.assertEqual(
+            sorted(
+                Entry.objects.filter(schema=model, name__startswith="copy-").values_list(
+                    "name", flat=True
+                )
+            ),
+            ["copy-0", "copy-1", "copy-4"],
+        )
 
     @patch("entry.tasks.import_entries.delay", Mock(side_effect=tasks.import_entries))
     def test_import_entry_with_abnormal_entry_which_has_multiple_attrs_of_same_name(
@@ -65,7 +65,6 @@ const aironeAPIErrors: Record<string, string> = {
   "AE-220000": "入力データが既存のデータと重複しています",
   "AE-240000":
     "紐づくアイテムが残っているため削除できません。先に全てのアイテムを削除してください。",
-  "AE-260000": "短期間に同じターゲットに対してインポートが発生しました",
 };
 
 const extractErrorDetail = (errorDetail: ErrorDetail): string =>
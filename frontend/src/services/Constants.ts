@@ -185,6 +185,8 @@ export const JobOperations = {
   EDIT_ENTRY_V2: 28,
   DELETE_ENTRY_V2: 29,
   BULK_EDIT_ENTRY: 31,
+  DISPATCH_IMPORT_ENTRY_V2: 36,
+  BULK_CREATE_ENTRY: 37,
 };
 
 export const JobRefreshIntervalMilliSec = 60 * 1000;
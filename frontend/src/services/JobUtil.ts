@@ -51,6 +51,7 @@ export const jobOperationLabel = (jobOperation: number | undefined): string => {
     case JobOperations.CREATE_ENTITY:
     case JobOperations.CREATE_ENTITY_V2:
     case JobOperations.CREATE_ENTRY_V2:
+    case JobOperations.BULK_CREATE_ENTRY:
       return "作成";
     case JobOperations.EDIT_ENTRY:
     case JobOperations.EDIT_ENTITY:
@@ -64,6 +65,7 @@ export const jobOperationLabel = (jobOperation: number | undefined): string => {
       return "削除";
     case JobOperations.IMPORT_ENTRY:
     case JobOperations.IMPORT_ENTRY_V2:
+    case JobOperations.DISPATCH_IMPORT_ENTRY_V2:
       return "インポート";
     case JobOperations.EXPORT_ENTRY:
     case JobOperations.EXPORT_SEARCH_RESULT:
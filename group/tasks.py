@@ -3,6 +3,7 @@ from typing import Any, cast
 
 from airone.celery import app
 from airone.lib.job import may_schedule_until_job_is_ready, register_job_task
+from entry.models import Entry
 from group.models import Group
 from job.models import Job, JobOperation, JobStatus
 
@@ -14,7 +15,6 @@ def edit_group_referrals(self: Any, job: Job) -> JobStatus:
     params = json.loads(job.params)
     group = cast(Group, Group.objects.get(id=params["group_id"]))
 
-    for entry in [x for x in group.get_referred_entries()]:
-        entry.register_es()
+    Entry.register_es_bulk(group.get_referred_entries().values_list("id", flat=True))
 
     return JobStatus.DONE
@@ -38,13 +38,26 @@ class IsolationParent(models.Model):
     def is_entry_isolated(self, entry: "Entry", requesting_entity: Any) -> bool:
         return self.applies_to(requesting_entity) and self.conditions_match(entry)
 
+    def get_match_query(self) -> models.Q:
+        """
+        Returns a query of Entries that match ALL conditions (AND logic). This is same as
+        what conditions_match() checks for each entry.
+        """
+        query = models.Q(schema_id=self.entity_id)
+        for condition in self.conditions.all():
+            if condition.attr.is_active:
+                query &= condition.get_match_query()
+        return query
+
     @classmethod
     def get_isolated_entry_ids(
         cls, candidate_entries: "QuerySet[Entry]", requesting_entity: Any
     ) -> set[int]:
         """
         Returns the set of entry IDs that are isolated from requesting_entity.
-        Iterates only IsolationParents whose actions apply to requesting_entity.
+        Conditions of all IsolationParents whose actions apply to requesting_entity are
+        translated into a query, so that candidates are evaluated by a single query however
+        many they are.
         """
         # Collect entity IDs present in the candidate entries
         schema_ids = candidate_entries.values_list("schema_id", flat=True).distinct()
@@ -58,16 +71,15 @@ class IsolationParent(models.Model):
             .prefetch_related("conditions", "conditions__attr")
         )
 
-        if not applicable_parents.exists():
+        query: models.Q | None = None
+        for parent in applicable_parents:
+            # any matched IsolationParent isolates the entry (OR logic)
+            query = parent.get_match_query() if query is None else query | parent.get_match_query()
+
+        if query is None:
             return set()
 
-        isolated_ids: set[int] = set()
-        for entry in candidate_entries:
-            for parent in applicable_parents.filter(entity_id=entry.schema_id):
-                if parent.conditions_match(entry):
-                    isolated_ids.add(entry.id)
-                    break
-        return isolated_ids
+        return set(candidate_entries.filter(query).values_list("id", flat=True))
 
     def save_conditions(self, conditions_data: list[dict[str, Any]]) -> None:
         from entity.models import EntityAttr
@@ -131,6 +143,75 @@ class IsolationCondition(models.Model):
 
         return (not result) if self.is_unmatch else result
 
+    def get_match_query(self) -> models.Q:
+        """
+        Returns a query of Entries whose current attribute value matches this condition.
+        This is same as what is_match_for_entry() checks for each entry.
+        """
+        from entry.models import AttributeValue
+
+        def _const(value: bool) -> models.Q:
+            return models.Q() if value else models.Q(pk__in=[])
+
+        latest_values = AttributeValue.objects.filter(
+            parent_attr__parent_entry=models.OuterRef("pk"),
+            parent_attr__schema=self.attr,
+            is_latest=True,
+            parent_attrv__isnull=True,
+        )
+        result = models.Exists(latest_values.filter(self._get_attrv_query())) | (
+            _const(self._is_empty_condition()) & ~models.Exists(latest_values)
+        )
+
+        return ~result if self.is_unmatch else result
+
+    def _get_attrv_query(self) -> models.Q:
+        """Returns a query of AttributeValues that _check_attrv() accepts."""
+        from entry.models import AttributeValue
+
+        children = AttributeValue.objects.filter(parent_attrv=models.OuterRef("pk"))
+        ref_query = (
+            models.Q(referral__isnull=True)
+            if self.ref_cond_id is None
+            else models.Q(referral_id=self.ref_cond_id)
+        )
+        try:
+            match self.ATTR_TYPE:
+                case AttrType.STRING | AttrType.TEXT:
+                    return models.Q(value=self.str_cond)
+
+                case AttrType.OBJECT:
+                    return ref_query
+
+                case AttrType.BOOLEAN:
+                    return models.Q(boolean=self.bool_cond)
+
+                case AttrType.NAMED_OBJECT:
+                    return models.Q(value=self.str_cond or "") & ref_query
+
+                case AttrType.ARRAY_STRING:
+                    query = models.Q(models.Exists(children.filter(value=self.str_cond)))
+                    if self.str_cond == "" or self.str_cond is None:
+                        query |= ~models.Exists(children)
+                    return query
+
+                case AttrType.ARRAY_OBJECT:
+                    if self.ref_cond_id is None:
+                        return ~models.Exists(children)
+                    return models.Q(models.Exists(children.filter(referral_id=self.ref_cond_id)))
+
+                case AttrType.ARRAY_NAMED_OBJECT:
+                    query = models.Q(
+                        models.Exists(children.filter(ref_query, value=self.str_cond or ""))
+                    )
+                    if self._is_empty_condition():
+                        query |= ~models.Exists(children)
+                    return query
+
+        except ValueError:
+            pass
+        return models.Q(pk__in=[])
+
     def _is_empty_condition(self) -> bool:
         """Returns True when the condition represents an empty/unset value."""
         try:
@@ -138,11 +219,13 @@ class IsolationCondition(models.Model):
                 case AttrType.STRING | AttrType.TEXT | AttrType.ARRAY_STRING:
                     return self.str_cond == "" or self.str_cond is None
                 case AttrType.OBJECT | AttrType.ARRAY_OBJECT:
-                    return self.ref_cond is None
+                    return self.ref_cond_id is None
                 case AttrType.BOOLEAN:
                     return self.bool_cond is False
                 case AttrType.NAMED_OBJECT | AttrType.ARRAY_NAMED_OBJECT:
-                    return self.ref_cond is None and (self.str_cond == "" or self.str_cond is None)
+                    return self.ref_cond_id is None and (
+                        self.str_cond == "" or self.str_cond is None
+                    )
         except ValueError:
             pass
         return False
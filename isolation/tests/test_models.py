@@ -184,3 +184,74 @@ class IsolationModelTest(AironeTestCase):
         isolated = IsolationParent.get_isolated_entry_ids(qs, self.entity_consumer)
 
         self.assertEqual(isolated, set())
+
+    def test_get_isolated_entry_ids_is_same_as_each_entry_evaluation(self):
+        from entry.models import Entry
+
+        ref_entries = [self.add_entry(self.user, "ref%d" % i, self.entity_other) for i in range(2)]
+        entity = self.create_entity(
+            self.user,
+            "ArrayItem",
+            attrs=[
+                {"name": "tags", "type": AttrType.ARRAY_STRING},
+                {"name": "refs", "type": AttrType.ARRAY_OBJECT, "ref": self.entity_other},
+                {"name": "ref", "type": AttrType.OBJECT, "ref": self.entity_other},
+            ],
+        )
+        for i, values in enumerate(
+            [
+                {},
+                {"tags": ["a", "b"]},
+                {"tags": ["b"], "refs": [ref_entries[0]]},
+                {"refs": [ref_entries[0], ref_entries[1]], "ref": ref_entries[1]},
+                {"ref": ref_entries[0]},
+            ]
+        ):
+            self.add_entry(self.user, "item%d" % i, entity, values=values)
+
+        def _get_attr(name):
+            return entity.attrs.get(name=name)
+
+        CONDITION_SETS = [
+            [{"attr": _get_attr("tags"), "str_cond": "a"}],
+            [{"attr": _get_attr("tags"), "str_cond": ""}],
+            [{"attr": _get_attr("tags"), "str_cond": "b", "is_unmatch": True}],
+            [{"attr": _get_attr("refs"), "ref_cond": ref_entries[0]}],
+            [{"attr": _get_attr("refs"), "ref_cond": None}],
+            [{"attr": _get_attr("ref"), "ref_cond": None}],
+            [
+                {"attr": _get_attr("ref"), "ref_cond": ref_entries[1]},
+                {"attr": _get_attr("refs"), "ref_cond": ref_entries[0]},
+            ],
+        ]
+        for conditions in CONDITION_SETS:
+            parent = IsolationParent.objects.create(entity=entity)
+            IsolationAction.objects.create(parent=parent, is_prevent_all=True)
+            for condition in conditions:
+                IsolationCondition.objects.create(parent=parent, **condition)
+
+            qs = Entry.objects.filter(schema=entity, is_active=True)
+            self.assertEqual(
+                IsolationParent.get_isolated_entry_ids(qs, self.entity_consumer),
+                set([x.id for x in qs if parent.is_entry_isolated(x, self.entity_consumer)]),
+                conditions,
+            )
+            parent.delete()
+
+    def test_get_isolated_entry_ids_with_constant_queries(self):
+        from entry.models import Entry
+
+        parent = self._make_parent(prevent_from=self.entity_consumer)
+        self._add_string_condition(parent, "status", "inactive")
+        self._add_bool_condition(parent, "is_active", False)
+
+        qs = Entry.objects.filter(schema=self.entity_item, is_active=True)
+        for count in [2, 20]:
+            for i in range(qs.count(), count):
+                self.add_entry(
+                    self.user, "item%d" % i, self.entity_item, values={"status": "inactive"}
+                )
+
+            with self.assertNumQueries(4):
+                isolated = IsolationParent.get_isolated_entry_ids(qs, self.entity_consumer)
+            self.assertEqual(isolated, set(qs.values_list("id", flat=True)))
@@ -29,6 +29,7 @@ class JobSerializers(serializers.ModelSerializer[Job]):
     user: serializers.SlugRelatedField[User] = serializers.SlugRelatedField(
         slug_field="username", read_only=True
     )
+    text = serializers.CharField(source="get_progress", read_only=True)
     target = serializers.SerializerMethodField(method_name="get_target")
     passed_time = serializers.SerializerMethodField(method_name="get_passed_time")
 
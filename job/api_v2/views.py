@@ -13,11 +13,11 @@ from rest_framework.response import Response
 
 from airone.lib.acl import ACLObjType
 from airone.lib.drf import FileIsNotExistsError, InvalidValueError, JobIsNotDoneError
-from airone.lib.http import get_download_response
+from airone.lib.http import get_download_response, get_streaming_download_response
 from airone.lib.import_preview import PREVIEW_SUMMARY_KEYS
 from entry.models import Entry
 from job.api_v2.serializers import ImportPreviewSerializer, JobSerializers
-from job.models import Job, JobOperation, JobStatus
+from job.models import Job, JobArtifact, JobOperation, JobStatus
 from user.models import User
 
 
@@ -75,16 +75,24 @@ class JobAPI(viewsets.ModelViewSet[Job]):
         if job.status != JobStatus.DONE:
             raise JobIsNotDoneError("Target job has not yet done")
 
-        # get value associated this Job from cache
-        io_stream = io.StringIO()
+        # send value associated this Job from cache while reading it
         try:
-            io_stream.write(job.get_cache())
+            chunks = job.iter_cache()
         except OSError as e:
             # errno.ENOENT is the errno of FileNotFoundError
             if e.errno == errno.ENOENT:
                 raise FileIsNotExistsError("Target file is not exists")
+            raise
+
+        response = get_streaming_download_response(chunks, job.text, encode_param)
+
+        # results stored before JobArtifact don't have their sizes
+        artifact = JobArtifact.objects.filter(job=job).first()
+        if encode_param == "utf-8" and artifact:
+            # the artifact is sent as it is, so its size is known before sending it
+            response["Content-Length"] = artifact.size
 
-        return cast(Response, get_download_response(io_stream, job.text, encode_param))
+        return cast(Response, response)
 
     @extend_schema(
         parameters=[
@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from job.models import JobArtifact
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove results of jobs (JobArtifact) that have passed their expiry "
+        "(ARTIFACT_TTL_SECONDS of job settings). Run this periodically, e.g. by cron."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        count = JobArtifact.cleanup_expired()
+        self.stdout.write("Removed %d expired job artifact(s)" % count)
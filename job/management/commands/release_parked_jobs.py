@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from job.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Send parked Jobs to the queue again when their dependent Jobs have been finished "
+        "without releasing them (e.g. they have been timed out). Run this periodically."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        count = Job.release_parked_jobs()
+        self.stdout.write("Released %d parked job(s)" % count)
@@ -1,15 +1,22 @@
+import codecs
 import enum
+import errno
+import gzip
+import io
 import json
 import os
 import pickle
+import shutil
 import time
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from importlib import import_module
 from types import ModuleType
-from typing import Any, Callable, TypeAlias
+from typing import IO, Any, Callable, Iterable, Iterator, TextIO, TypeAlias
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage
 from django.db import models
 
@@ -23,6 +30,12 @@ from entry.models import Entry
 from job.settings import CONFIG as JOB_CONFIG
 from user.models import User
 
+try:
+    # zstd is available in the standard library from Python 3.14
+    from compression import zstd  # type: ignore[import-not-found]
+except ImportError:
+    zstd = None
+
 TaskReturnType: TypeAlias = "JobStatus | tuple[JobStatus, str, ACLBase | None] | None"
 
 TaskHandler: TypeAlias = Callable[[Any, "Job"], TaskReturnType]
@@ -91,6 +104,11 @@ class JobOperation(BaseIntEnum):
     IMPORT_ROLE_V2 = 30
     BULK_EDIT_ENTRY = 31
     IMPORT_ENTITY_PREVIEW = 32
+    NOTIFY_CREATE_ENTRIES = 33
+    NOTIFY_UPDATE_ENTRIES = 34
+    MAY_INVOKE_TRIGGERS = 35
+    DISPATCH_IMPORT_ENTRY_V2 = 36
+    BULK_CREATE_ENTRY = 37
 
 
 @enum.unique
@@ -143,6 +161,9 @@ class Job(models.Model):
         JobOperation.NOTIFY_DELETE_ENTRY,
         JobOperation.UPDATE_DOCUMENT,
         JobOperation.MAY_INVOKE_TRIGGER,
+        JobOperation.NOTIFY_CREATE_ENTRIES,
+        JobOperation.NOTIFY_UPDATE_ENTRIES,
+        JobOperation.MAY_INVOKE_TRIGGERS,
         JobOperation.GROUP_REGISTER_REFERRAL,
         JobOperation.ROLE_REGISTER_REFERRAL,
         # An import preview lives inside the import dialog that started it and is
@@ -156,6 +177,7 @@ class Job(models.Model):
         JobOperation.COPY_ENTRY,
         JobOperation.IMPORT_ENTRY,
         JobOperation.IMPORT_ENTRY_V2,
+        JobOperation.DISPATCH_IMPORT_ENTRY_V2,
         JobOperation.EXPORT_ENTRY,
         JobOperation.EXPORT_ENTRY_V2,
         JobOperation.REGISTER_REFERRALS,
@@ -169,9 +191,12 @@ class Job(models.Model):
         JobOperation.NOTIFY_CREATE_ENTRY,
         JobOperation.NOTIFY_UPDATE_ENTRY,
         JobOperation.NOTIFY_DELETE_ENTRY,
+        JobOperation.NOTIFY_CREATE_ENTRIES,
+        JobOperation.NOTIFY_UPDATE_ENTRIES,
         JobOperation.COPY_ENTRY,
         JobOperation.DO_COPY_ENTRY,
         JobOperation.IMPORT_ENTRY,
+        JobOperation.DISPATCH_IMPORT_ENTRY_V2,
         JobOperation.EXPORT_ENTRY,
         JobOperation.UPDATE_DOCUMENT,
         # A preview writes nothing, so it never has to wait for another job on
@@ -190,6 +215,7 @@ class Job(models.Model):
         JobOperation.EXPORT_ENTRY_V2,
         JobOperation.EXPORT_SEARCH_RESULT,
         JobOperation.EXPORT_SEARCH_RESULT_V2,
+        JobOperation.BULK_CREATE_ENTRY,
     ] + CUSTOM_DOWNLOADABLE_OPERATIONS
 
     user = models.ForeignKey(User, on_delete=models.DO_NOTHING)
@@ -210,24 +236,62 @@ class Job(models.Model):
     # When this has another job, this job have to wait until it would be finished.
     dependent_job = models.ForeignKey("Job", null=True, on_delete=models.SET_NULL)
 
+    # This is when set_progress() saved the progress to the database at last in this process
+    _progress_saved_at: float | None = None
+
+    # This is set while this job is waiting for its dependent job without being queued.
+    # Such a job is sent to the queue again by release() when its dependent job is finished.
+    is_parked = models.BooleanField(default=False, db_index=True)
+
     def may_schedule(self) -> bool:
         # Operations that can run in parallel exclude checking for dependent jobs
         if self.operation in self.PARALLELIZABLE_OPERATIONS:
             return False
 
-        # When there is dependent job, this re-send a request to run same job
+        # When there is dependent job, this is parked until it would be finished instead of
+        # re-sending a request to run same job, which occupies a worker and the MQ.
         if self.dependent_job and not self.dependent_job.is_finished():
-            # This delay is needed to prevent sending excessive message to MQ
-            # when there are many dependent jobs.
-            time.sleep(JOB_CONFIG.RESCHEDULING_DELAY_SECONDS)
+            Job.objects.filter(id=self.id).update(is_parked=True)
+            self.is_parked = True
 
-            # This sends request to reschedule this job.
-            self.run()
+            # The dependent job might be finished before this is parked. Then nobody else
+            # releases this job.
+            if self.dependent_job.is_finished():
+                self.release()
 
             return True
         else:
             return False
 
+    def release(self) -> bool:
+        """
+        This sends a request to run this job again when it's parked. The flag is cleared by
+        a conditional update, so a parked job is sent only once even when it's released by
+        multiple processes at the same time.
+        """
+        if not Job.objects.filter(id=self.id, is_parked=True).update(is_parked=False):
+            return False
+
+        self.is_parked = False
+        self.run()
+        return True
+
+    def release_dependents(self) -> int:
+        """This releases parked jobs that depend on this job, and returns the number of them"""
+        return sum(x.release() for x in Job.objects.filter(dependent_job=self, is_parked=True))
+
+    @classmethod
+    def release_parked_jobs(kls) -> int:
+        """
+        This releases parked jobs whose dependent jobs have been finished without releasing
+        them (e.g. they have been timed out because their workers stopped).
+        """
+        return sum(
+            x.release()
+            for x in kls.objects.filter(is_parked=True).select_related("dependent_job")
+            if x.dependent_job is None or x.dependent_job.is_finished()
+        )
+
     def is_timeout(self, with_refresh: bool = True) -> bool:
         if with_refresh:
             # Sync updated_at time information with the data which is stored in database
@@ -253,12 +317,54 @@ class Job(models.Model):
 
         return self.status in finished_status or self.is_timeout(with_refresh=with_refresh)
 
-    def is_canceled(self) -> bool:
-        # Sync status flag information with the data which is stored in database
-        self.refresh_from_db(fields=["status"])
+    def is_canceled(self, with_cache: bool = False) -> bool:
+        """
+        Long-running tasks can check it with_cache in their loops. Then the status is
+        read from the cache that update() fills, and it's synced with the database only
+        once in STATUS_CACHE_SECONDS instead of every time.
+        """
+        status = cache.get(self._get_cache_key("status")) if with_cache else None
+        if status is None:
+            # Sync status flag information with the data which is stored in database
+            self.refresh_from_db(fields=["status"])
+            if with_cache:
+                self._set_status_cache()
+        else:
+            self.status = status
 
         return self.status == JobStatus.CANCELED
 
+    def set_progress(self, text: str, force: bool = False) -> None:
+        """
+        This puts the progress of this job to the cache, which get_progress() returns.
+        It's saved to the database at most once in PROGRESS_SAVE_INTERVAL_SECONDS (or when
+        it's forced), not to issue a query for every processed row.
+        """
+        self.text = text
+        cache.set(self._get_cache_key("progress"), text, self._get_job_timeout())
+
+        if (
+            force
+            or self._progress_saved_at is None
+            or time.monotonic() - self._progress_saved_at
+            >= JOB_CONFIG.PROGRESS_SAVE_INTERVAL_SECONDS
+        ):
+            self.save(update_fields=["text"])
+            self._progress_saved_at = time.monotonic()
+
+    def get_progress(self) -> str:
+        """This returns the latest progress while this job is processed"""
+        if self.status == JobStatus.PROCESSING:
+            return cache.get(self._get_cache_key("progress")) or self.text
+
+        return self.text
+
+    def _get_cache_key(self, name: str) -> str:
+        return "airone:job:%d:%s" % (self.id, name)
+
+    def _set_status_cache(self) -> None:
+        cache.set(self._get_cache_key("status"), self.status, JOB_CONFIG.STATUS_CACHE_SECONDS)
+
     def proceed_if_ready(self) -> bool:
         # In this case, job is finished (might be canceled or proceeded same job by other process)
         if self.is_finished() or self.status == JobStatus.PROCESSING:
@@ -297,6 +403,14 @@ class Job(models.Model):
 
         self.save(update_fields=update_fields)
 
+        # running tasks check cancellation with this cache
+        if "status" in update_fields:
+            self._set_status_cache()
+
+        # jobs that wait for this job can be run when this is finished (e.g. canceled)
+        if "status" in update_fields and self.is_finished(with_refresh=False):
+            self.release_dependents()
+
     def to_json(self) -> dict[str, Any]:
         # For advanced search results export, target is assumed to be empty.
         return {
@@ -310,7 +424,7 @@ class Job(models.Model):
             }
             if self.target
             else {},
-            "text": self.text,
+            "text": self.get_progress(),
             "status": self.status,
             "operation": self.operation,
             "created_at": self.created_at,
@@ -507,6 +621,16 @@ class Job(models.Model):
             params=params,
         )
 
+    @classmethod
+    def new_dispatch_import_v2(kls, user: User, text: str = "", params: JobParams = {}) -> "Job":
+        return kls._create_new_job(
+            user=user,
+            target=None,
+            operation=JobOperation.DISPATCH_IMPORT_ENTRY_V2,
+            text=text,
+            params=params,
+        )
+
     @classmethod
     def new_import_entity_preview(kls, user: User, params: JobParams) -> "Job":
         return kls._create_new_job(
@@ -673,6 +797,40 @@ class Job(models.Model):
             depend_on=dependent_job,
         )
 
+    @classmethod
+    def new_notify_create_entries(kls, user: User, target: Entity, entry_ids: list[int]) -> "Job":
+        return kls._create_new_job(
+            user=user,
+            target=target,
+            operation=JobOperation.NOTIFY_CREATE_ENTRIES,
+            text="",
+            params={"entry_ids": entry_ids},
+        )
+
+    @classmethod
+    def new_notify_update_entries(kls, user: User, target: Entity, entry_ids: list[int]) -> "Job":
+        return kls._create_new_job(
+            user=user,
+            target=target,
+            operation=JobOperation.NOTIFY_UPDATE_ENTRIES,
+            text="",
+            params={"entry_ids": entry_ids},
+        )
+
+    @classmethod
+    def new_invoke_triggers(
+        kls, user: User, target: Entity, entries: list[dict[str, Any]]
+    ) -> "Job":
+        # each element of entries has "id" of an Entry and "attrs" that are
+        # same as the recv_attrs of new_invoke_trigger()
+        return kls._create_new_job(
+            user=user,
+            target=target,
+            operation=JobOperation.MAY_INVOKE_TRIGGERS,
+            text="",
+            params={"entries": entries},
+        )
+
     @classmethod
     def new_create_entity_v2(
         kls, user: User, target: Entity, text: str = "", params: JobParams = {}
@@ -721,6 +879,18 @@ class Job(models.Model):
             params=params,
         )
 
+    @classmethod
+    def new_bulk_create_entries(
+        kls, user: User, target: Entity, text: str = "", params: JobParams = {}
+    ) -> "Job":
+        return kls._create_new_job(
+            user=user,
+            target=target,
+            operation=JobOperation.BULK_CREATE_ENTRY,
+            text=text,
+            params=params,
+        )
+
     @classmethod
     def new_edit_entry_v2(
         kls, user: User, target: Entry, text: str = "", params: JobParams = {}
@@ -746,14 +916,142 @@ class Job(models.Model):
         )
 
     def set_cache(self, value: Any) -> None:
-        with default_storage.open("job_%d" % self.id, "wb") as fp:
-            pickle.dump(value, fp)
+        """
+        This stores the result of this job as an artifact. Text is stored as it is, and
+        other values are stored as JSON.
+        """
+        if isinstance(value, str):
+            content_type, data = JobArtifact.CONTENT_TYPE_TEXT, value
+        else:
+            content_type, data = JobArtifact.CONTENT_TYPE_JSON, json.dumps(value)
+
+        with JobArtifact.open_writer(self, content_type) as fp:
+            fp.write(data.encode("utf-8"))
+
+    @contextmanager
+    def open_cache_stream(self) -> Iterator[TextIO]:
+        """
+        This opens the cache of this job to write text (e.g. exported data) to the storage
+        incrementally, instead of building whole of it in memory to pass to set_cache().
+        The cache is removed when writing is aborted by an exception.
+        """
+        with JobArtifact.open_writer(self, JobArtifact.CONTENT_TYPE_TEXT) as fp:
+            stream = io.TextIOWrapper(fp, encoding="utf-8", newline="")
+            try:
+                yield stream
+                stream.flush()
+            finally:
+                # fp is closed by the writer instead of this wrapper
+                stream.detach()
+
+    def stage_rows(self, rows: Iterable[Any]) -> int:
+        """
+        This stores rows (e.g. Items to be imported) as the artifact of this job to be read
+        by iter_staged_rows() in the worker, instead of carrying all of them in params.
+        This returns the number of the stored rows.
+        """
+        count = 0
+        with JobArtifact.open_writer(self, JobArtifact.CONTENT_TYPE_JSON_LINES) as fp:
+            for row in rows:
+                line = json.dumps(row, default=_support_time_default, sort_keys=True) + "\n"
+                fp.write(line.encode("utf-8"))
+                count += 1
+
+        return count
+
+    def stage_file(self, stream: IO[bytes], content_type: str) -> None:
+        """
+        This stores an uploaded file as it is as the artifact of this job, copying it from the
+        stream by chunks, to be read by open_staged_file() in the worker.
+        """
+        with JobArtifact.open_writer(self, content_type) as fp:
+            shutil.copyfileobj(stream, fp)
+
+    @contextmanager
+    def open_staged_file(self) -> Iterator[IO[bytes] | gzip.GzipFile]:
+        """
+        This opens the file stored by stage_file() to read it. FileNotFoundError is raised
+        when it has been removed by its expiry.
+        """
+        with self.get_artifact().open_reader() as fp:
+            yield fp
+
+    def iter_staged_rows(self) -> Iterator[Any]:
+        """
+        This returns the rows stored by stage_rows() one by one, without loading whole of
+        them. FileNotFoundError is raised when they have been removed by its expiry.
+        """
+        artifact = self.get_artifact()
+        with artifact.open_reader() as fp:
+            for line in fp:
+                yield json.loads(line)
+
+    def delete_cache(self) -> None:
+        artifact = JobArtifact.objects.filter(job=self).first()
+        if artifact:
+            artifact.delete()
+
+    def get_artifact(self) -> "JobArtifact":
+        """
+        This returns the artifact of this job. FileNotFoundError is raised when this job
+        has no result or it has been removed by its expiry.
+        """
+        artifact = JobArtifact.objects.filter(job=self).first()
+        if not artifact:
+            raise FileNotFoundError(errno.ENOENT, "Job result is not exists", "job_%d" % self.id)
+
+        return artifact
+
+    def _get_legacy_cache(self) -> Any:
+        """
+        This reads the result that was stored as "job_<id>" before JobArtifact (pickled, or
+        plain text for streamed exports), until ARTIFACT_TTL_SECONDS has passed since the job
+        was created. FileNotFoundError is raised when it doesn't exist or has expired.
+        """
+        name = "job_%d" % self.id
+        expires_at = self.created_at + timedelta(seconds=JOB_CONFIG.ARTIFACT_TTL_SECONDS)
+        if expires_at < datetime.now(ZoneInfo(settings.TIME_ZONE)):
+            raise FileNotFoundError(errno.ENOENT, "Job result is not exists", name)
+
+        with default_storage.open(name, "rb") as fp:
+            # Pickled data always starts with the PROTO opcode (0x80), which can't start
+            # UTF-8 text.
+            if fp.read(1) != pickle.PROTO:
+                fp.seek(0)
+                return fp.read().decode("utf-8")
+
+            fp.seek(0)
+            return pickle.load(fp)
 
     def get_cache(self) -> Any:
-        value = ""
-        with default_storage.open("job_%d" % self.id, "rb") as fp:
-            value = pickle.load(fp)
-        return value
+        artifact = JobArtifact.objects.filter(job=self).first()
+        if not artifact:
+            return self._get_legacy_cache()
+
+        with artifact.open_reader() as fp:
+            data = fp.read().decode("utf-8")
+
+        if artifact.content_type == JobArtifact.CONTENT_TYPE_JSON:
+            return json.loads(data)
+        return data
+
+    def iter_cache(self, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """
+        This returns text of the cache by chunks to send it without loading whole of it.
+        OSError is raised here (not while iterating) when the cache doesn't exist. A result
+        stored before JobArtifact is loaded at once and returned as one chunk.
+        """
+        artifact = JobArtifact.objects.filter(job=self).first()
+        if not artifact:
+            return iter([str(self._get_legacy_cache())])
+
+        def _iter_chunks() -> Iterator[str]:
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            for chunk in artifact.iter_chunks(chunk_size=chunk_size):
+                yield decoder.decode(chunk)
+            yield decoder.decode(b"", final=True)
+
+        return _iter_chunks()
 
     @classmethod
     def _get_job_timeout(kls) -> int:
@@ -776,3 +1074,211 @@ class Job(models.Model):
         return kls._create_new_job(
             user=user, target=target, operation=JobOperation.BULK_EDIT_ENTRY, text="", params=params
         )
+
+
+class JobBatch(object):
+    """
+    This buffers the hidden jobs of each Entry (event notifications and TriggerActions)
+    per Entity, then creates and runs them as jobs that carry many Entries. The buffered
+    ones are flushed when BATCH_JOB_SIZE Entries are buffered and when this is closed.
+
+    Example:
+    with JobBatch(user) as job_batch:
+        for entry in entries:
+            job_batch.notify_create_entry(entry)
+    """
+
+    def __init__(self, user: User, batch_size: int | None = None):
+        self.user = user
+        self.batch_size = batch_size or JOB_CONFIG.BATCH_JOB_SIZE
+
+        # buffered Entry ids (or trigger params) by operation and Entity
+        self._buffers: dict[tuple[int, Entity], list[Any]] = {}
+
+    def __enter__(self) -> "JobBatch":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        # Entries are already saved even when an error is raised, so they must be notified
+        self.flush()
+
+    def notify_create_entry(self, entry: Entry) -> None:
+        self._append(JobOperation.NOTIFY_CREATE_ENTRIES, entry.schema, entry.id)
+
+    def notify_update_entry(self, entry: Entry) -> None:
+        self._append(JobOperation.NOTIFY_UPDATE_ENTRIES, entry.schema, entry.id)
+
+    def invoke_trigger(self, entry: Entry, recv_attrs: list[Any] | dict[str, Any]) -> None:
+        self._append(
+            JobOperation.MAY_INVOKE_TRIGGERS, entry.schema, {"id": entry.id, "attrs": recv_attrs}
+        )
+
+    def flush(self) -> list[Job]:
+        jobs = [self._flush(key) for key in list(self._buffers.keys())]
+        return [x for x in jobs if x is not None]
+
+    def _append(self, operation: int, entity: Entity, item: Any) -> None:
+        key = (operation, entity)
+        self._buffers.setdefault(key, []).append(item)
+        if len(self._buffers[key]) >= self.batch_size:
+            self._flush(key)
+
+    def _flush(self, key: tuple[int, Entity]) -> Job | None:
+        items = self._buffers.pop(key, [])
+        if not items:
+            return None
+
+        (operation, entity) = key
+        match operation:
+            case JobOperation.NOTIFY_CREATE_ENTRIES:
+                job = Job.new_notify_create_entries(self.user, entity, items)
+            case JobOperation.NOTIFY_UPDATE_ENTRIES:
+                job = Job.new_notify_update_entries(self.user, entity, items)
+            case _:
+                job = Job.new_invoke_triggers(self.user, entity, items)
+
+        job.run()
+        return job
+
+
+class _CountingWriter(io.RawIOBase):
+    """This writes data to the stream while counting the size of it"""
+
+    def __init__(self, stream: IO[bytes]):
+        self.stream = stream
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self.stream.write(data)
+        self.size += len(data)
+        return len(data)
+
+
+class JobArtifact(models.Model):
+    """
+    This describes the result (e.g. exported data) or the staged input (e.g. imported data)
+    of a Job, whose bytes are kept in the storage with compression. This has the content
+    type to decode it, the sizes of raw and stored data, and the expiry after which it's
+    removed by "cleanup_job_artifacts".
+    """
+
+    CONTENT_TYPE_TEXT = "text/plain; charset=utf-8"
+    CONTENT_TYPE_JSON = "application/json"
+    CONTENT_TYPE_JSON_LINES = "application/jsonl"
+    CONTENT_TYPE_YAML = "application/yaml"
+
+    ENCODING_GZIP = "gzip"
+    ENCODING_ZSTD = "zstd"
+
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, related_name="artifact")
+    content_type = models.CharField(max_length=100)
+    encoding = models.CharField(max_length=16, blank=True, default="")
+    size = models.BigIntegerField(default=0)
+    stored_size = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    @property
+    def storage_name(self) -> str:
+        return "job_artifact_%d" % self.job_id
+
+    @classmethod
+    def _get_encoding(kls) -> str:
+        encoding: str = JOB_CONFIG.ARTIFACT_COMPRESSION
+        if encoding == kls.ENCODING_ZSTD and zstd is None:
+            Logger.warning("zstd is not available, job artifacts are compressed by gzip")
+            return kls.ENCODING_GZIP
+
+        return encoding
+
+    @classmethod
+    @contextmanager
+    def open_writer(kls, job: Job, content_type: str) -> Iterator[IO[bytes]]:
+        """
+        This opens the artifact of the job to write bytes to the storage incrementally, and
+        (re)registers its metadata when writing is finished. The written data is removed when
+        writing is aborted by an exception.
+        """
+        artifact = kls(
+            job=job,
+            content_type=content_type,
+            encoding=kls._get_encoding(),
+            expires_at=datetime.now(ZoneInfo(settings.TIME_ZONE))
+            + timedelta(seconds=JOB_CONFIG.ARTIFACT_TTL_SECONDS),
+        )
+        try:
+            with default_storage.open(artifact.storage_name, "wb") as fp:
+                compressor: Any
+                match artifact.encoding:
+                    case kls.ENCODING_GZIP:
+                        compressor = gzip.GzipFile(fileobj=fp, mode="wb")
+                    case kls.ENCODING_ZSTD:
+                        compressor = zstd.ZstdFile(fp, mode="wb")
+                    case _:
+                        compressor = fp
+
+                writer = _CountingWriter(compressor)
+                stream = io.BufferedWriter(writer)
+                yield stream
+
+                stream.flush()
+                if compressor is not fp:
+                    compressor.close()
+        except BaseException:
+            kls.objects.filter(job=job).delete()
+            default_storage.delete(artifact.storage_name)
+            raise
+
+        artifact.size = writer.size
+        artifact.stored_size = default_storage.size(artifact.storage_name)
+
+        # The previous artifact has been overwritten in the storage by this one
+        kls.objects.filter(job=job).delete()
+        artifact.save()
+
+    @contextmanager
+    def open_reader(self) -> Iterator[IO[bytes] | gzip.GzipFile]:
+        """This opens the artifact to read the raw (decompressed) bytes of it"""
+        with default_storage.open(self.storage_name, "rb") as fp:
+            match self.encoding:
+                case self.ENCODING_GZIP:
+                    with gzip.GzipFile(fileobj=fp, mode="rb") as reader:
+                        yield reader
+                case self.ENCODING_ZSTD:
+                    with zstd.ZstdFile(fp, mode="rb") as reader:
+                        yield reader
+                case _:
+                    yield fp
+
+    def iter_chunks(
+        self, offset: int = 0, length: int | None = None, chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """
+        This returns the raw bytes from the offset by chunks. The part before the offset is
+        skipped by decompressing it when the artifact is compressed.
+        """
+        remaining = self.size - offset if length is None else length
+        with self.open_reader() as fp:
+            fp.seek(offset)
+            while remaining > 0 and (chunk := fp.read(min(chunk_size, remaining))):
+                remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        default_storage.delete(self.storage_name)
+        return super().delete(*args, **kwargs)
+
+    @classmethod
+    def cleanup_expired(kls) -> int:
+        """This removes the expired artifacts and returns the number of them"""
+        count = 0
+        for artifact in kls.objects.filter(
+            expires_at__lt=datetime.now(ZoneInfo(settings.TIME_ZONE))
+        ).iterator():
+            artifact.delete()
+            count += 1
+
+        return count
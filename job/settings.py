@@ -5,6 +5,15 @@ CONFIG = Settings(
         "MAX_LIST_VIEW": 50,
         "MAX_LIST_NAV": 10,
         "RECENT_SECONDS": 3600,
-        "RESCHEDULING_DELAY_SECONDS": 1,
+        # Running tasks see the status of their jobs (e.g. canceled) in the cache for this
+        # period, and their progress is saved to the database at most once in the interval
+        "STATUS_CACHE_SECONDS": 10,
+        "PROGRESS_SAVE_INTERVAL_SECONDS": 5,
+        # Max number of Entries that a job of event notifications or TriggerActions carries
+        "BATCH_JOB_SIZE": 1000,
+        # Compression of the results of jobs in the storage ("gzip", "zstd" or "")
+        "ARTIFACT_COMPRESSION": "gzip",
+        # Results of jobs are removed by "cleanup_job_artifacts" after this period
+        "ARTIFACT_TTL_SECONDS": 7 * 24 * 60 * 60,
     }
 )
@@ -170,6 +170,20 @@ class ViewTest(AironeViewTest):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.json()["count"], 2)
 
+    def test_get_progress_of_processing_job(self):
+        user = self.guest_login()
+
+        job = Job.new_export(user)
+        job.update(JobStatus.PROCESSING)
+        job.set_progress("Now exporting... (1/3)")
+        job.set_progress("Now exporting... (2/3)")
+
+        # the latest progress is returned even if it isn't saved to the database yet
+        resp = self.client.get(f"/job/api/v2/jobs?limit={_TEST_MAX_LIST_VIEW + 100}&offset=0")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["results"][0]["text"], "Now exporting... (2/3)")
+        self.assertEqual(Job.objects.get(id=job.id).text, "Now exporting... (1/3)")
+
     def test_get_recent_job(self):
         user = self.guest_login()
 
@@ -446,17 +460,27 @@ class ViewTest(AironeViewTest):
         resp = self.client.get("/job/api/v2/%d/download" % job.id)
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp["Content-Disposition"], 'attachment; filename="hoge"')
-        self.assertEqual(resp.content.decode("utf-8"), "日本語")
+        self.assertEqual(resp.getvalue().decode("utf-8"), "日本語")
 
         # send request to download job with utf-8 param
         resp = self.client.get("/job/api/v2/%d/download?encode=utf-8" % job.id)
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(resp.content.decode("utf-8"), "日本語")
+        self.assertEqual(resp.getvalue().decode("utf-8"), "日本語")
 
         # send request to download job with shift_jis param
         resp = self.client.get("/job/api/v2/%d/download?encode=shift_jis" % job.id)
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(resp.content.decode("shift_jis"), "日本語")
+        self.assertEqual(resp.getvalue().decode("shift_jis"), "日本語")
+
+        # send request to download job whose result is written by a stream
+        with job.open_cache_stream() as output:
+            output.write("日本語,テキスト\n" * 10000)
+
+        resp = self.client.get("/job/api/v2/%d/download?encode=shift_jis" % job.id)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp.getvalue().decode("shift_jis"), "日本語,テキスト\n" * 10000)
+        self.assertEqual(job.get_cache(), "日本語,テキスト\n" * 10000)
 
         # send request to download job with invalid encoding param
         resp = self.client.get("/job/api/v2/%d/download?encode=hoge" % job.id)
@@ -1,14 +1,22 @@
 import json
+import pickle
+from datetime import date
+from io import StringIO
 from unittest import mock
 
 from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
 
 from airone.celery import app
+from airone.lib.job import may_schedule_until_job_is_ready
 from airone.lib.test import AironeTestCase
 from custom_view.lib.task import JobOperationCustom
 from entity.models import Entity
 from entry.models import Entry
-from job.models import Job, JobOperation, JobStatus, JobTarget
+from job.models import Job, JobArtifact, JobBatch, JobOperation, JobStatus, JobTarget
+from job.settings import CONFIG as JOB_CONFIG
 from user.models import User
 
 
@@ -74,6 +82,100 @@ class ModelTest(AironeTestCase):
             job.set_cache(json.dumps(value))
             self.assertEqual(job.get_cache(), json.dumps(value))
 
+        # values other than text are stored as JSON
+        job.set_cache({"hoge": "fuga", "foo": ["a", "b"]})
+        self.assertEqual(job.get_cache(), {"hoge": "fuga", "foo": ["a", "b"]})
+        self.assertEqual(job.artifact.content_type, JobArtifact.CONTENT_TYPE_JSON)
+
+    def test_artifact(self):
+        job = Job.new_export(self.guest, text="hoge")
+        value = "日本語,テキスト\n" * 10000
+
+        for compression in ["gzip", "zstd", ""]:
+            with mock.patch.dict(JOB_CONFIG.conf, {"ARTIFACT_COMPRESSION": compression}):
+                with job.open_cache_stream() as output:
+                    output.write(value)
+
+            artifact = JobArtifact.objects.get(job=job)
+            self.assertEqual(artifact.content_type, JobArtifact.CONTENT_TYPE_TEXT)
+            self.assertEqual(artifact.size, len(value.encode("utf-8")))
+            if artifact.encoding:
+                self.assertLess(artifact.stored_size, artifact.size)
+            else:
+                self.assertEqual(artifact.stored_size, artifact.size)
+
+            self.assertEqual(job.get_cache(), value)
+            self.assertEqual("".join(job.iter_cache(chunk_size=1000)), value)
+
+            # ranged read of the raw bytes
+            self.assertEqual(
+                b"".join(artifact.iter_chunks(offset=len("日本語,".encode()), length=19)),
+                "テキスト\n日本".encode(),
+            )
+
+        # artifact is removed with its data when writing is aborted
+        with self.assertRaises(RuntimeError):
+            with job.open_cache_stream() as output:
+                output.write(value)
+                raise RuntimeError()
+        self.assertFalse(JobArtifact.objects.filter(job=job).exists())
+        with self.assertRaises(OSError):
+            job.get_cache()
+
+    def test_cleanup_expired_artifacts(self):
+        (job1, job2) = [Job.new_export(self.guest, text="hoge") for _ in range(2)]
+        job1.set_cache("foo")
+        with mock.patch.dict(JOB_CONFIG.conf, {"ARTIFACT_TTL_SECONDS": -1}):
+            job2.set_cache("bar")
+
+        call_command("cleanup_job_artifacts", stdout=StringIO())
+        self.assertEqual(job1.get_cache(), "foo")
+        with self.assertRaises(OSError):
+            job2.get_cache()
+        self.assertEqual(JobArtifact.cleanup_expired(), 0)
+
+    def test_legacy_cache(self):
+        job = Job.new_export(self.guest, text="hoge")
+        with default_storage.open("job_%d" % job.id, "wb") as fp:
+            pickle.dump("日本語,テキスト\n", fp)
+
+        # results that were pickled before JobArtifact are still read until they expire
+        self.assertEqual(job.get_cache(), "日本語,テキスト\n")
+        self.assertEqual("".join(job.iter_cache()), "日本語,テキスト\n")
+        with mock.patch.dict(JOB_CONFIG.conf, {"ARTIFACT_TTL_SECONDS": -1}):
+            with self.assertRaises(FileNotFoundError):
+                job.get_cache()
+
+        # the artifact is read instead of it when it's stored
+        job.set_cache("foo")
+        self.assertEqual(job.get_cache(), "foo")
+        default_storage.delete("job_%d" % job.id)
+
+    def test_staged_rows(self):
+        job = Job.new_import(self.guest, self.entity, params={"entry_count": 3})
+        rows = [
+            {"name": "entry-%d" % x, "attrs": {"date": date(2018, 12, 31), "text": "foo\nbar"}}
+            for x in range(3)
+        ]
+
+        for compression in ["gzip", "zstd", ""]:
+            with mock.patch.dict(JOB_CONFIG.conf, {"ARTIFACT_COMPRESSION": compression}):
+                self.assertEqual(job.stage_rows(iter(rows)), 3)
+
+            self.assertEqual(job.get_artifact().content_type, JobArtifact.CONTENT_TYPE_JSON_LINES)
+            self.assertEqual(
+                list(job.iter_staged_rows()),
+                [
+                    {"name": "entry-%d" % x, "attrs": {"date": "2018-12-31", "text": "foo\nbar"}}
+                    for x in range(3)
+                ],
+            )
+
+        # staged rows can't be read after they are removed
+        job.delete_cache()
+        with self.assertRaises(FileNotFoundError):
+            list(job.iter_staged_rows())
+
     def test_dependent_job(self):
         (job1, job2) = [Job.new_edit(self.guest, self.entry) for x in range(2)]
         self.assertIsNone(job1.dependent_job)
@@ -125,6 +227,56 @@ class ModelTest(AironeTestCase):
         # confirms that is_canceled would be true by changing job status parameter
         self.assertTrue(job.is_canceled())
 
+    def test_is_canceled_with_cache(self):
+        job = Job.new_create(self.guest, self.entry)
+        job.update(JobStatus.PROCESSING)
+
+        # other processes see the status that is put to the cache without querying database
+        another = Job.objects.get(id=job.id)
+        Job.objects.get(id=job.id).update(JobStatus.CANCELED)
+        with self.assertNumQueries(0):
+            self.assertTrue(another.is_canceled(with_cache=True))
+
+        # the status changed without update() is seen after the cached one is expired
+        Job.objects.filter(id=job.id).update(status=JobStatus.PROCESSING)
+        with self.assertNumQueries(0):
+            self.assertTrue(job.is_canceled(with_cache=True))
+
+        cache.delete("airone:job:%d:status" % job.id)
+        with self.assertNumQueries(1):
+            self.assertFalse(job.is_canceled(with_cache=True))
+        with self.assertNumQueries(0):
+            self.assertFalse(job.is_canceled(with_cache=True))
+
+    @mock.patch("job.models.time")
+    def test_set_progress(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        job = Job.new_create(self.guest, self.entry, "original text")
+        job.update(JobStatus.PROCESSING)
+
+        # the first progress is saved to the database
+        job.set_progress("progress-1")
+        self.assertEqual(Job.objects.get(id=job.id).text, "progress-1")
+
+        # following ones are saved only once in the interval, but they're visible
+        with self.assertNumQueries(0):
+            job.set_progress("progress-2")
+        self.assertEqual(Job.objects.get(id=job.id).text, "progress-1")
+        self.assertEqual(Job.objects.get(id=job.id).get_progress(), "progress-2")
+        self.assertEqual(Job.objects.get(id=job.id).to_json()["text"], "progress-2")
+
+        mock_time.monotonic.return_value += JOB_CONFIG.PROGRESS_SAVE_INTERVAL_SECONDS
+        job.set_progress("progress-3")
+        self.assertEqual(Job.objects.get(id=job.id).text, "progress-3")
+
+        # it's saved when it's forced
+        job.set_progress("progress-4", force=True)
+        self.assertEqual(Job.objects.get(id=job.id).text, "progress-4")
+
+        # the text of finished job is returned as it is
+        job.update(JobStatus.DONE, "finished")
+        self.assertEqual(Job.objects.get(id=job.id).get_progress(), "finished")
+
     def test_update_method(self):
         job = Job.new_create(self.guest, self.entry, "original text")
         self.assertEqual(job.status, JobStatus.PREPARING)
@@ -221,13 +373,133 @@ class ModelTest(AironeTestCase):
             self.assertFalse(job1.may_schedule())
             self.assertEqual(self.test_data, 0)
 
-            # job2 depends on job1 so this will be rescheduled by calling run method
+            # job2 depends on job1 so this will be parked without calling run method
             self.assertTrue(job2.may_schedule())
-            self.assertEqual(self.test_data, 1)
+            self.assertTrue(Job.objects.get(id=job2.id).is_parked)
+            self.assertEqual(self.test_data, 0)
 
-            # This checks proceed_if_ready() method also call rescheduling method
+            # This checks proceed_if_ready() method also parks the job
             self.assertFalse(job2.proceed_if_ready())
-            self.assertEqual(self.test_data, 2)
+            self.assertEqual(self.test_data, 0)
+
+            # job2 is sent to the queue again only once when job1 is finished
+            job1.update(JobStatus.DONE)
+            self.assertFalse(Job.objects.get(id=job2.id).is_parked)
+            self.assertEqual(self.test_data, 1)
+
+            job1.release_dependents()
+            self.assertEqual(self.test_data, 1)
+
+    def test_may_schedule_when_dependent_job_is_finished_while_parking(self):
+        [job1, job2] = [Job.new_create(self.guest, self.entry) for _ in range(2)]
+
+        def is_finished(job, with_refresh=True):
+            # job1 is finished just after job2 checks it at the first time
+            if job.id == job1.id and not job2.is_parked:
+                return False
+            return True
+
+        with (
+            mock.patch.object(Job, "run") as mock_run,
+            mock.patch.object(Job, "is_finished", autospec=True, side_effect=is_finished),
+        ):
+            self.assertTrue(job2.may_schedule())
+
+        # job2 is released by itself because nobody else does it
+        self.assertFalse(Job.objects.get(id=job2.id).is_parked)
+        mock_run.assert_called_once()
+
+    def test_release_parked_jobs(self):
+        [job1, job2] = [Job.new_create(self.guest, self.entry) for _ in range(2)]
+        with mock.patch.object(Job, "run") as mock_run:
+            self.assertTrue(job2.may_schedule())
+
+            # job1 is still running, then job2 is kept parked
+            self.assertEqual(Job.release_parked_jobs(), 0)
+
+            # job1 is finished without releasing job2 (e.g. its worker was stopped)
+            Job.objects.filter(id=job1.id).update(status=JobStatus.TIMEOUT)
+
+            out = StringIO()
+            call_command("release_parked_jobs", stdout=out)
+            self.assertIn("Released 1 parked job(s)", out.getvalue())
+
+        self.assertFalse(Job.objects.get(id=job2.id).is_parked)
+        mock_run.assert_called_once()
+
+    def test_may_schedule_with_chained_jobs(self):
+        # This is a load test of 1,000 jobs, which are chained on one item and are sent to
+        # the queue all at once in the reverse order (i.e. the worst case).
+        job_count = 1000
+        jobs: list[Job] = []
+        for _ in range(job_count):
+            job = Job.new_edit(self.guest, self.entry)
+            job.dependent_job = jobs[-1] if jobs else None
+            job.save(update_fields=["dependent_job"])
+            jobs.append(job)
+
+        queue: list[int] = [x.id for x in reversed(jobs)]
+        dispatched: list[int] = list(queue)
+        processed: list[int] = []
+
+        def enqueue(job):
+            queue.append(job.id)
+            dispatched.append(job.id)
+
+        def handler(kls, job):
+            processed.append(job.id)
+
+        task = may_schedule_until_job_is_ready(handler)
+        with (
+            mock.patch.object(Job, "run", autospec=True, side_effect=enqueue),
+            mock.patch("time.sleep") as mock_sleep,
+        ):
+            # This emulates a worker that consumes the queue
+            while queue:
+                task(None, queue.pop(0))
+
+        # Each job is processed only once in the chained order, and is sent to the queue at
+        # most twice (i.e. at the beginning and when its dependent job is finished).
+        self.assertEqual(processed, [x.id for x in jobs])
+        self.assertEqual(len(dispatched), job_count * 2 - 1)
+        self.assertFalse(mock_sleep.called)
+        self.assertEqual(
+            Job.objects.filter(id__in=processed, status=JobStatus.DONE).count(), job_count
+        )
+        self.assertFalse(Job.objects.filter(is_parked=True).exists())
+
+    def test_job_batch(self):
+        entries = [
+            Entry.objects.create(name="e-%d" % x, created_user=self.guest, schema=self.entity)
+            for x in range(3)
+        ]
+        with mock.patch.object(Job, "run") as mock_run:
+            with JobBatch(self.guest, batch_size=2) as job_batch:
+                for entry in entries:
+                    job_batch.notify_create_entry(entry)
+                job_batch.invoke_trigger(entries[0], [{"id": 1, "value": "foo"}])
+
+                # a job is run when the buffered Entries reach the batch_size
+                self.assertEqual(mock_run.call_count, 1)
+
+            # the rest of them are run when the batch is closed
+            self.assertEqual(mock_run.call_count, 3)
+
+        notify_jobs = Job.objects.filter(operation=JobOperation.NOTIFY_CREATE_ENTRIES)
+        self.assertEqual(
+            [json.loads(x.params) for x in notify_jobs.order_by("id")],
+            [{"entry_ids": [entries[0].id, entries[1].id]}, {"entry_ids": [entries[2].id]}],
+        )
+        self.assertTrue(all(x.target.id == self.entity.id for x in notify_jobs))
+
+        trigger_job = Job.objects.get(operation=JobOperation.MAY_INVOKE_TRIGGERS)
+        self.assertEqual(
+            json.loads(trigger_job.params),
+            {"entries": [{"id": entries[0].id, "attrs": [{"id": 1, "value": "foo"}]}]},
+        )
+
+        # nothing is left to be flushed
+        self.assertEqual(job_batch.flush(), [])
 
     def test_may_schedule_with_parallelizable_operation(self):
         [job1, job2] = [Job.new_notify_update_entry(self.guest, self.entry) for _ in range(2)]
@@ -32,7 +32,7 @@ def index(request: HttpRequest) -> HttpResponse:
             {
                 "id": x.id,
                 "target": x.target,
-                "text": x.text,
+                "text": x.get_progress(),
                 "status": x.status,
                 "operation": x.operation,
                 "can_cancel": x.operation in Job.CANCELABLE_OPERATIONS,
@@ -25,7 +25,7 @@ def get_permitted_roles(user: User, base_queryset: QuerySet[Role]) -> QuerySet[R
     if user.is_superuser:
         return base_queryset
 
-    user_group_ids = [g.id for g in user.belonging_groups()]
+    user_group_ids = user.effective_group_ids()
     return base_queryset.filter(
         Q(users=user)
         | Q(admin_users=user)
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class RoleConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "role"
+
+    def ready(self) -> None:
+        from . import signals
+
+        post_migrate.connect(signals.backfill_object_permissions, sender=self)
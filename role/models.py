@@ -37,7 +37,7 @@ class Role(models.Model):
         if user.id in [u.id for u in admin_users]:
             return True
 
-        if bool(set([g.id for g in user.belonging_groups()]) & set([g.id for g in admin_groups])):
+        if bool(set(user.effective_group_ids()) & set([g.id for g in admin_groups])):
             return True
 
         return False
@@ -57,7 +57,7 @@ class Role(models.Model):
             return True
 
         if bool(
-            set([g.id for g in user.belonging_groups()])
+            set(user.effective_group_ids())
             & set(
                 [
                     g.id
@@ -86,12 +86,10 @@ class Role(models.Model):
           this method don't care about hieralchical data structure
           (e.g. Entity/Entry, EntityAttr/Attribute).
         """
-        return any(
-            [
-                permission_level.id <= x.get_aclid()  # type: ignore[attr-defined]
-                for x in self.permissions.filter(codename__startswith=(str(target_obj.id) + "."))
-            ]
-        )
+        return self.permissions.filter(
+            object_permission__object_id=target_obj.id,
+            object_permission__acl_type__gte=permission_level.id,
+        ).exists()
 
     def save(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -189,7 +187,86 @@ class HistoricalPermission(Permission):
         Q(codename="%s.%s" % (aclbase.id, ACLType.Writable.id))|
         Q(codename="%s.%s" % (aclbase.id, ACLType.Readable.id))
     )
+
+    Filtering by the indexed integer columns of ObjectPermission doesn't need any of them.
+    OK: HistoricalPermission.objects.filter(object_permission__object_id=aclbase.id)
     """
 
     roles = models.ManyToManyField(Role, related_name="permissions", blank=True)
     history = HistoricalRecords(m2m_fields=[roles])
+
+    def get_typed_values(self) -> tuple[int, int] | None:
+        """This returns (object_id, acl_type) of the codename, or None if it isn't of ACLType"""
+        if self.name not in [x.name for x in ACLType.all()]:
+            return None
+
+        (object_id, _, acl_type) = self.codename.partition(".")
+        return (int(object_id), int(acl_type))
+
+
+class ObjectPermission(models.Model):
+    """
+    This has the target ACLBase object and the ACLType of a HistoricalPermission as
+    integer columns, which are the ones that are encoded in its codename
+    ("<object_id>.<acl_type>"). Permission checks filter with them instead of codename.
+
+    A row is created for each HistoricalPermission of ACLType by role.signals, and the
+    ones that are missing (e.g. permissions that exist before this model) are filled
+    by backfill() after every migration.
+    """
+
+    BACKFILL_CHUNK_SIZE = 10000
+
+    permission = models.OneToOneField(
+        HistoricalPermission, on_delete=models.CASCADE, related_name="object_permission"
+    )
+    object_id = models.IntegerField()
+    acl_type = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["object_id", "acl_type"]),
+        ]
+
+    @classmethod
+    def sync(kls, permission: HistoricalPermission, created: bool = False) -> None:
+        values = permission.get_typed_values()
+        if created:
+            # a new HistoricalPermission never has its row yet
+            if values is not None:
+                kls.objects.create(permission=permission, object_id=values[0], acl_type=values[1])
+        elif values is None:
+            kls.objects.filter(permission=permission).delete()
+        else:
+            kls.objects.update_or_create(
+                permission=permission, defaults={"object_id": values[0], "acl_type": values[1]}
+            )
+
+    @classmethod
+    def backfill(kls) -> int:
+        """This creates missing rows and returns the number of them"""
+        count = 0
+        last_id = 0
+        while True:
+            permissions = list(
+                HistoricalPermission.objects.filter(
+                    id__gt=last_id,
+                    object_permission__isnull=True,
+                    name__in=[x.name for x in ACLType.all()],
+                    codename__regex=r"^[0-9]+\.[0-9]+$",
+                ).order_by("id")[: kls.BACKFILL_CHUNK_SIZE]
+            )
+            if not permissions:
+                return count
+
+            object_permissions = []
+            for permission in permissions:
+                values = permission.get_typed_values()
+                if values is not None:
+                    object_permissions.append(
+                        kls(permission=permission, object_id=values[0], acl_type=values[1])
+                    )
+
+            kls.objects.bulk_create(object_permissions)
+            count += len(object_permissions)
+            last_id = permissions[-1].id
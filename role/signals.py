@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.apps import AppConfig
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import HistoricalPermission, ObjectPermission
+
+
+@receiver(post_save, sender=HistoricalPermission)
+def sync_object_permission(
+    sender: type[HistoricalPermission], instance: HistoricalPermission, created: bool, **kwargs: Any
+) -> None:
+    ObjectPermission.sync(instance, created)
+
+
+def backfill_object_permissions(sender: AppConfig, **kwargs: Any) -> None:
+    ObjectPermission.backfill()
@@ -5,6 +5,7 @@ from acl.models import ACLBase
 from airone.celery import app
 from airone.lib.job import may_schedule_until_job_is_ready, register_job_task
 from airone.lib.log import Logger
+from entry.models import Entry
 from group.models import Group
 from job.models import Job, JobOperation, JobStatus
 from role.models import Role
@@ -18,8 +19,7 @@ def edit_role_referrals(self: Any, job: Job) -> JobStatus:
     params = json.loads(job.params)
     role = Role.objects.get(id=params["role_id"])
 
-    for entry in [x for x in role.get_referred_entries()]:
-        entry.register_es()
+    Entry.register_es_bulk(role.get_referred_entries().values_list("id", flat=True))
 
     return JobStatus.DONE
 
@@ -33,11 +33,10 @@ def import_role_v2(self: Any, job: Job) -> tuple[JobStatus, str, None] | None:
     total_count = len(import_data)
 
     for index, role_data in enumerate(import_data):
-        job.text = "Now importing roles... (progress: [%5d/%5d])" % (index + 1, total_count)
-        job.save(update_fields=["text"])
+        job.set_progress("Now importing roles... (progress: [%5d/%5d])" % (index + 1, total_count))
 
         # Interrupt processing if the job is canceled
-        if job.is_canceled():
+        if job.is_canceled(with_cache=True):
             job.status = JobStatus.CANCELED
             job.save(update_fields=["status"])
             return None
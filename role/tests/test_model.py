@@ -9,7 +9,7 @@ from entity.models import Entity
 from entry.services import AdvancedSearchService
 from group.models import Group
 from role import tasks
-from role.models import Role
+from role.models import ObjectPermission, Role
 
 from .base import RoleTestBase
 
@@ -147,6 +147,30 @@ class ModelTest(RoleTestBase):
         self.assertTrue(self.role.is_permitted(entity, ACLType.Writable))
         self.assertFalse(self.role.is_permitted(entity, ACLType.Full))
 
+    def test_object_permission(self):
+        user = self.users["userA"]
+        entity = Entity.objects.create(name="Entity", created_user=user, is_public=False)
+
+        # typed rows are created with the HistoricalPermissions of the Entity
+        self.assertEqual(
+            sorted(
+                ObjectPermission.objects.filter(object_id=entity.id).values_list(
+                    "acl_type", "permission__codename"
+                )
+            ),
+            [(x.id, "%s.%s" % (entity.id, x.id)) for x in ACLType.availables()],
+        )
+
+        # missing rows are filled by backfill
+        ObjectPermission.objects.filter(object_id=entity.id).delete()
+        self.assertFalse(self.role.is_permitted(entity, ACLType.Readable))
+        self.assertEqual(ObjectPermission.backfill(), 3)
+        self.assertEqual(ObjectPermission.backfill(), 0)
+
+        entity.full.roles.add(self.role)
+        self.assertTrue(self.role.is_permitted(entity, ACLType.Full))
+        self.assertEqual(entity.full.object_permission.acl_type, ACLType.Full.id)
+
     def test_delete(self):
         self.role.delete()
 
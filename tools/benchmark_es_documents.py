@@ -0,0 +1,129 @@
+"""
+Throughput benchmark for building es-documents of Entries (Entry.build_es_documents()).
+
+Creates a model that has attributes of every type and items that refer to each
+other, then builds es-documents of all of them twice -- once by calling
+Entry.get_es_document() for each item, which is what register_es() did for every
+referral, and once by Entry.build_es_documents() -- and reports documents per
+second and the number of issued queries of each. Everything this creates is
+rolled back at the end.
+
+How to use:
+$ python tools/benchmark_es_documents.py [options]
+- --sizes: comma separated item counts (default: 100,1000,5000)
+- --user: username of the user who creates items (default: admin)
+"""
+
+import os
+import sys
+import time
+from optparse import OptionParser, Values
+
+import configurations
+
+# append airone directory to the default path
+sys.path.append("./")
+
+# prepare to load the data models of AirOne
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airone.settings")
+os.environ.setdefault("DJANGO_CONFIGURATION", "Dev")
+
+# load AirOne application
+configurations.setup()
+
+from django.db import connection, transaction  # NOQA
+from django.test.utils import CaptureQueriesContext  # NOQA
+
+from airone.lib.types import AttrType  # NOQA
+from entity.models import Entity, EntityAttr  # NOQA
+from entry.models import Entry  # NOQA
+from group.models import Group  # NOQA
+from role.models import Role  # NOQA
+from user.models import User  # NOQA
+
+ATTRS = {
+    "str": AttrType.STRING,
+    "obj": AttrType.OBJECT,
+    "group": AttrType.GROUP,
+    "role": AttrType.ROLE,
+    "select": AttrType.SELECT,
+    "arr_str": AttrType.ARRAY_STRING,
+    "arr_obj": AttrType.ARRAY_OBJECT,
+}
+
+
+def create_entries(user: User, size: int) -> list[int]:
+    group = Group.objects.create(name="benchmark-es-documents")
+    role = Role.objects.create(name="benchmark-es-documents")
+    entity = Entity.objects.create(name="benchmark-es-documents", created_user=user)
+    for name, attr_type in ATTRS.items():
+        entity_attr = EntityAttr.objects.create(
+            name=name,
+            type=attr_type,
+            created_user=user,
+            parent_entity=entity,
+            choices=[{"value": "v", "label": "label"}] if attr_type == AttrType.SELECT else [],
+        )
+        if attr_type & AttrType.OBJECT:
+            entity_attr.referral.add(entity)
+
+    entries: list[Entry] = []
+    for index in range(size):
+        entry = Entry.objects.create(name="item-%d" % index, schema=entity, created_user=user)
+        entry.complement_attrs(user)
+
+        # each item refers to the previous two items
+        values = {
+            "str": "value-%d" % index,
+            "obj": entries[-1] if entries else None,
+            "group": group,
+            "role": role,
+            "select": "v",
+            "arr_str": ["foo", "bar"],
+            "arr_obj": entries[-2:],
+        }
+        for attr in entry.attrs.select_related("schema"):
+            attr.add_value(user, values[attr.schema.name])
+        entries.append(entry)
+
+    return [x.id for x in entries]
+
+
+def measure(entry_ids: list[int], build: str) -> tuple[float, int]:
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        if build == "each":
+            for entry in Entry.objects.filter(id__in=entry_ids):
+                entry.get_es_document()
+        else:
+            Entry.build_es_documents(entry_ids)
+        elapsed = time.perf_counter() - started
+
+    return len(entry_ids) / elapsed, len(queries)
+
+
+def run(sizes: list[int], username: str) -> None:
+    user = User.objects.get(username=username)
+    print("%8s  %-22s %12s %10s" % ("items", "builder", "docs/sec", "queries"))
+    for size in sizes:
+        with transaction.atomic():
+            entry_ids = create_entries(user, size)
+            for label, build in [("get_es_document()", "each"), ("build_es_documents()", "bulk")]:
+                (throughput, query_count) = measure(entry_ids, build)
+                print("%8d  %-22s %12.1f %10d" % (size, label, throughput, query_count))
+
+            transaction.set_rollback(True)
+
+
+def get_options() -> tuple[Values, list[str]]:
+    parser = OptionParser()
+    parser.add_option("--sizes", type=str, dest="sizes", default="100,1000,5000")
+    parser.add_option("--user", type=str, dest="user", default="admin")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    (options, _) = get_options()
+
+    run([int(x) for x in options.sizes.split(",")], options.user)
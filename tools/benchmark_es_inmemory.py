@@ -0,0 +1,164 @@
+"""
+Query latency benchmark for the in-memory search engine (airone/lib/es_inmemory.py).
+
+Indexes synthetic documents shaped like Entry.get_es_document() and times the
+queries Pagoda issues most -- an advanced search restricted to one model, the
+"who refers to this item" lookup of Entry.register_es() and an id lookup --
+once through the planned search and once through a plain scan of every
+document, which is how the engine evaluated every query before postings.
+
+How to use:
+$ python tools/benchmark_es_inmemory.py [options]
+- --sizes: comma separated document counts (default: 10000,100000,1000000)
+- --repeat: how many times each query is run per size (default: 5)
+"""
+
+import os
+import random
+import sys
+import time
+from optparse import OptionParser, Values
+from typing import Any
+
+import configurations
+
+# append airone directory to the default path
+sys.path.append("./")
+
+# prepare to load the data models of AirOne
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airone.settings")
+os.environ.setdefault("DJANGO_CONFIGURATION", "Dev")
+
+# load AirOne application
+configurations.setup()
+
+from django.test import override_settings  # NOQA
+
+from airone.lib.elasticsearch import EntryDocument  # NOQA
+from airone.lib.es_inmemory import (  # NOQA
+    STORE,
+    InMemoryElasticsearch,
+    Scope,
+    _InnerHitCollector,
+    _score_clause,
+)
+
+INDEX = "benchmark-es-inmemory"
+NUM_ENTITIES = 100
+NUM_ATTRS = 10
+
+
+def make_document(entry_id: int) -> EntryDocument:
+    entity_id = entry_id % NUM_ENTITIES
+    return {
+        "entity": {"id": entity_id, "name": "model-%d" % entity_id},
+        "name": "item-%d" % entry_id,
+        "attr": [
+            {
+                "name": "attr-%d" % index,
+                "type": 2,
+                "key": "",
+                "value": "value-%d" % random.randrange(1000),
+                "date_value": None,
+                "referral_id": "",
+                "boolean": False,
+                "is_readable": True,
+            }
+            for index in range(NUM_ATTRS)
+        ],
+        "referrals": [
+            {
+                "id": referral_id,
+                "name": "item-%d" % referral_id,
+                "schema": {"id": referral_id % NUM_ENTITIES, "name": "model"},
+            }
+            for referral_id in random.sample(range(max(entry_id, 1)), min(entry_id, 2))
+        ],
+        "is_readable": True,
+    }
+
+
+def make_queries(size: int) -> dict[str, dict[str, Any]]:
+    return {
+        "advanced search": {
+            "bool": {
+                "filter": [
+                    {"nested": {"path": "entity", "query": {"term": {"entity.id": 7}}}},
+                    {
+                        "nested": {
+                            "path": "attr",
+                            "query": {
+                                "bool": {
+                                    "filter": [
+                                        {"term": {"attr.name": "attr-3"}},
+                                        {"term": {"attr.value": "value-42"}},
+                                    ]
+                                }
+                            },
+                        }
+                    },
+                ]
+            }
+        },
+        "referrals lookup": {
+            "nested": {"path": "referrals", "query": {"term": {"referrals.id": size // 2}}}
+        },
+        "ids": {"ids": {"values": [str(i) for i in range(0, size, max(size // 100, 1))]}},
+    }
+
+
+def scan(query: dict[str, Any]) -> int:
+    """Evaluate a query against every document, as the engine did before postings."""
+    matched = 0
+    for doc_id, source in STORE.docs(INDEX).items():
+        if _score_clause(query, Scope(source, doc_id), _InnerHitCollector()) is not None:
+            matched += 1
+    return matched
+
+
+def measure(func: Any, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    es = InMemoryElasticsearch(INDEX)
+    print("%10s  %-18s %12s %12s %9s" % ("docs", "query", "scan [ms]", "planned [ms]", "speedup"))
+    for size in sizes:
+        STORE.reset()
+        es.indices.create(index=INDEX)
+        for start in range(0, size, 10000):
+            body: list[dict[str, Any]] = []
+            for entry_id in range(start, min(start + 10000, size)):
+                body += [{"index": {"_id": entry_id}}, dict(make_document(entry_id))]
+            es.bulk(body=body)
+
+        for label, query in make_queries(size).items():
+            planned_hits = es.search(body={"query": query})["hits"]["total"]["value"]
+            if planned_hits != scan(query):
+                raise RuntimeError("planned search disagrees with the scan for %s" % label)
+
+            scanned = measure(lambda: scan(query), repeat)
+            planned = measure(lambda: es.search(body={"query": query}), repeat)
+            print(
+                "%10d  %-18s %12.2f %12.2f %8.1fx"
+                % (size, label, scanned, planned, scanned / max(planned, 1e-6))
+            )
+
+
+def get_options() -> tuple[Values, list[str]]:
+    parser = OptionParser()
+    parser.add_option("--sizes", type=str, dest="sizes", default="10000,100000,1000000")
+    parser.add_option("--repeat", type=int, dest="repeat", default=5)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    (options, _) = get_options()
+
+    random.seed(0)
+    with override_settings(ES_CONFIG={"INDEX_NAME": INDEX, "PERSIST_PATH": None}):
+        run([int(x) for x in options.sizes.split(",")], options.repeat)
@@ -0,0 +1,123 @@
+"""
+Throughput benchmark for importing Entries (entry.tasks._do_import_entries()).
+
+Creates a model that has string attributes and an import job of the specified number
+of rows, half of them create new items and the other half update existing ones. Then
+it imports them twice -- once with IMPORT_CHUNK_SIZE of 1, which looks up, checks
+permissions and registers es-documents row by row as the import did before chunking,
+and once with the configured IMPORT_CHUNK_SIZE -- and reports rows per second and the
+number of issued queries of each. Everything this creates is rolled back at the end.
+
+How to use:
+$ python tools/benchmark_import_entries.py [options]
+- --sizes: comma separated row counts (default: 1000,10000,100000)
+- --user: username of the user who imports items (default: admin)
+"""
+
+import os
+import sys
+import time
+from optparse import OptionParser, Values
+from unittest.mock import patch
+
+import configurations
+
+# append airone directory to the default path
+sys.path.append("./")
+
+# prepare to load the data models of AirOne
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airone.settings")
+os.environ.setdefault("DJANGO_CONFIGURATION", "Dev")
+
+# load AirOne application
+configurations.setup()
+
+from django.db import connection, transaction  # NOQA
+from django.test.utils import CaptureQueriesContext  # NOQA
+
+from airone.lib.types import AttrType  # NOQA
+from entity.models import Entity, EntityAttr  # NOQA
+from entry.models import Entry  # NOQA
+from entry.settings import CONFIG  # NOQA
+from entry.tasks import _do_import_entries  # NOQA
+from job.models import Job  # NOQA
+from user.models import User  # NOQA
+
+ATTR_NAMES = ["attr-%d" % x for x in range(5)]
+
+
+def create_entity(user: User, size: int) -> Entity:
+    entity = Entity.objects.create(name="benchmark-import-entries", created_user=user)
+    for name in ATTR_NAMES:
+        EntityAttr.objects.create(
+            name=name, type=AttrType.STRING, created_user=user, parent_entity=entity
+        )
+
+    # the half of rows update these existing items
+    for index in range(0, size, 2):
+        entry = Entry.objects.create(name="item-%d" % index, schema=entity, created_user=user)
+        entry.complement_attrs(user)
+
+    return entity
+
+
+def measure(
+    user: User, entity: Entity, size: int, chunk_size: int, label: str
+) -> tuple[float, int]:
+    params = [
+        {"name": "item-%d" % x, "attrs": {name: "%s-%d" % (label, x) for name in ATTR_NAMES}}
+        for x in range(size)
+    ]
+    job = Job.new_import(user, entity, params=params)
+
+    # batch jobs of notifications and TriggerActions are created, but not sent to workers
+    # because they would run against the rows that are rolled back
+    with patch.dict(CONFIG.conf, {"IMPORT_CHUNK_SIZE": chunk_size}), patch.object(Job, "run"):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            _do_import_entries(job)
+            elapsed = time.perf_counter() - started
+
+    return (size / elapsed, len(ctx.captured_queries))
+
+
+def run(user: User, sizes: list[int]) -> None:
+    print(
+        "%10s %14s %14s %14s %14s %9s"
+        % ("rows", "per-row [/s]", "queries", "chunked [/s]", "queries", "speedup")
+    )
+    for size in sizes:
+        with transaction.atomic():
+            entity = create_entity(user, size)
+            (per_row, per_row_queries) = measure(user, entity, size, 1, "per-row")
+            (chunked, chunked_queries) = measure(
+                user, entity, size, CONFIG.IMPORT_CHUNK_SIZE, "chunked"
+            )
+            print(
+                "%10d %14.1f %14d %14.1f %14d %8.1fx"
+                % (
+                    size,
+                    per_row,
+                    per_row_queries,
+                    chunked,
+                    chunked_queries,
+                    chunked / max(per_row, 1e-6),
+                )
+            )
+
+            transaction.set_rollback(True)
+
+
+def get_options() -> tuple[Values, list[str]]:
+    parser = OptionParser()
+    parser.add_option("--sizes", type=str, dest="sizes", default="1000,10000,100000")
+    parser.add_option("--user", type=str, dest="user", default="admin")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    (options, _) = get_options()
+
+    user = User.objects.get(username=options.user)
+    run(user, [int(x) for x in options.sizes.split(",")])
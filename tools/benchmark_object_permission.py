@@ -0,0 +1,191 @@
+"""
+Query cost benchmark of permission lookups by codename and by ObjectPermission.
+
+Creates permissions of synthetic ACL objects (three HistoricalPermissions for each
+of them, same as the ones of ACLBase), fills their ObjectPermission rows by
+ObjectPermission.backfill() and grants one percent of them to a Role. Then it times
+the permission lookups of Role.is_permitted() and of loading all permissions of the
+Role, once by parsing codename as they did before ObjectPermission and once by the
+indexed integer columns of ObjectPermission. Everything this creates is rolled back
+at the end.
+
+How to use:
+$ python tools/benchmark_object_permission.py [options]
+- --sizes: comma separated ACL object counts (default: 10000,100000,1000000)
+- --repeat: how many objects are looked up per size (default: 1000)
+"""
+
+import os
+import random
+import sys
+import time
+from optparse import OptionParser, Values
+from typing import Any, Callable
+
+import configurations
+
+# append airone directory to the default path
+sys.path.append("./")
+
+# prepare to load the data models of AirOne
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airone.settings")
+os.environ.setdefault("DJANGO_CONFIGURATION", "Dev")
+
+# load AirOne application
+configurations.setup()
+
+from django.contrib.auth.models import Permission  # NOQA
+from django.contrib.contenttypes.models import ContentType  # NOQA
+from django.db import connection, transaction  # NOQA
+from django.db.models import Max  # NOQA
+
+from acl.models import ACLBase  # NOQA
+from airone.lib.acl import ACLType  # NOQA
+from role.models import HistoricalPermission, ObjectPermission, Role  # NOQA
+
+# synthetic ACL objects have ids from here not to collide with the existing ones
+OBJECT_ID_BASE = 10**9
+BATCH_SIZE = 10000
+
+
+def create_permissions(size: int) -> float:
+    content_type = ContentType.objects.get_for_model(ACLBase)
+    last_id = Permission.objects.aggregate(Max("id"))["id__max"] or 0
+    for start in range(0, size, BATCH_SIZE):
+        Permission.objects.bulk_create(
+            [
+                Permission(
+                    name=acltype.name,
+                    codename="%s.%s" % (OBJECT_ID_BASE + index, acltype.id),
+                    content_type=content_type,
+                )
+                for index in range(start, min(start + BATCH_SIZE, size))
+                for acltype in ACLType.availables()
+            ]
+        )
+
+    # HistoricalPermission can't be bulk created because it inherits Permission
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO %s (permission_ptr_id) SELECT id FROM %s WHERE id > %%s"
+            % (HistoricalPermission._meta.db_table, Permission._meta.db_table),
+            [last_id],
+        )
+
+    started = time.perf_counter()
+    ObjectPermission.backfill()
+    return time.perf_counter() - started
+
+
+def grant_permissions(role: Role, size: int) -> list[int]:
+    object_ids = [OBJECT_ID_BASE + x for x in random.sample(range(size), max(size // 100, 1))]
+    permission_ids = list(
+        ObjectPermission.objects.filter(
+            object_id__in=object_ids, acl_type=ACLType.Writable.id
+        ).values_list("permission", flat=True)
+    )
+    for start in range(0, len(permission_ids), BATCH_SIZE):
+        role.permissions.add(*permission_ids[start : start + BATCH_SIZE])
+
+    return object_ids
+
+
+def is_permitted_by_codename(role: Role, object_id: int) -> bool:
+    return any(
+        ACLType.Readable.id <= x.get_aclid()  # type: ignore[attr-defined]
+        for x in role.permissions.filter(codename__startswith=(str(object_id) + "."))
+    )
+
+
+def is_permitted_by_object_permission(role: Role, object_id: int) -> bool:
+    return role.permissions.filter(
+        object_permission__object_id=object_id,
+        object_permission__acl_type__gte=ACLType.Readable.id,
+    ).exists()
+
+
+def load_by_codename(role: Role) -> dict[int, int]:
+    permissions: dict[int, int] = {}
+    for x in role.permissions.all():
+        permissions[x.get_objid()] = max(  # type: ignore[attr-defined]
+            permissions.get(x.get_objid(), 0),  # type: ignore[attr-defined]
+            x.get_aclid(),  # type: ignore[attr-defined]
+        )
+    return permissions
+
+
+def load_by_object_permission(role: Role) -> dict[int, int]:
+    return dict(
+        ObjectPermission.objects.filter(permission__roles=role)
+        .values("object_id")
+        .annotate(max_acl_type=Max("acl_type"))
+        .values_list("object_id", "max_acl_type")
+    )
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    print(
+        "%10s  %-22s %14s %14s %9s"
+        % ("objects", "lookup", "codename [ms]", "typed [ms]", "speedup")
+    )
+    for size in sizes:
+        with transaction.atomic():
+            backfill_time = create_permissions(size)
+            role = Role.objects.create(name="benchmark-object-permission")
+            granted_ids = grant_permissions(role, size)
+            lookup_ids = [OBJECT_ID_BASE + random.randrange(size) for _ in range(repeat)]
+            lookup_ids += random.sample(granted_ids, min(len(granted_ids), repeat))
+
+            results = {
+                "is_permitted()": (
+                    measure(lambda: [is_permitted_by_codename(role, x) for x in lookup_ids], 1)
+                    / len(lookup_ids),
+                    measure(
+                        lambda: [is_permitted_by_object_permission(role, x) for x in lookup_ids], 1
+                    )
+                    / len(lookup_ids),
+                ),
+                "role permissions": (
+                    measure(lambda: load_by_codename(role), 5),
+                    measure(lambda: load_by_object_permission(role), 5),
+                ),
+            }
+            if load_by_codename(role) != load_by_object_permission(role):
+                raise RuntimeError("typed permissions disagree with the codenames")
+
+            for label, (by_codename, by_object_permission) in results.items():
+                print(
+                    "%10d  %-22s %14.3f %14.3f %8.1fx"
+                    % (
+                        size,
+                        label,
+                        by_codename,
+                        by_object_permission,
+                        by_codename / max(by_object_permission, 1e-6),
+                    )
+                )
+            print("%10d  %-22s %14.1f [sec]" % (size, "backfill", backfill_time))
+
+            transaction.set_rollback(True)
+
+
+def get_options() -> tuple[Values, list[str]]:
+    parser = OptionParser()
+    parser.add_option("--sizes", type=str, dest="sizes", default="10000,100000,1000000")
+    parser.add_option("--repeat", type=int, dest="repeat", default=1000)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    (options, _) = get_options()
+
+    random.seed(0)
+    run([int(x) for x in options.sizes.split(",")], options.repeat)
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class TriggerConfig(AppConfig):
+    name = "trigger"
+
+    def ready(self) -> None:
+        from . import signals  # noqa
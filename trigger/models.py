@@ -4,13 +4,15 @@ from collections.abc import Mapping, Sequence
 from typing import TYPE_CHECKING, Any
 
 from django.db import models
+from django.db.models import Prefetch, QuerySet
 
 from acl.models import ACLBase
 from airone.exceptions.trigger import InvalidInputException
 from airone.lib.http import DRFRequest
 from airone.lib.log import Logger
+from airone.lib.process_wide_cache import ProcessWideCache
 from airone.lib.types import AttrType
-from entity.models import Entity, EntityAttr
+from entity.models import Entity, EntityAttr, EntitySchema
 from entry.api_v2.serializers import EntryUpdateSerializer
 from entry.models import Entry
 
@@ -19,6 +21,10 @@ if TYPE_CHECKING:
 
     from user.models import User
 
+_matchers: ProcessWideCache["TriggerMatcher"] = ProcessWideCache(
+    "trigger", "TRIGGER_CACHE_PROCESS_WIDE"
+)
+
 
 ## These are internal classes for AirOne trigger and action
 class InputTriggerCondition(object):
@@ -234,24 +240,7 @@ class TriggerParent(models.Model):
         context to reduce DB query to get it from Attribute instance.
         """
 
-        def _is_match(condition: TriggerCondition) -> bool:
-            for attr_info in [x for x in recv_attrs if x["attr_id"] == condition.attr.id]:
-                if condition.is_match_condition(attr_info["value"]):
-                    if not condition.is_unmatch:
-                        return True
-                else:
-                    if condition.is_unmatch:
-                        return True
-
-            return False
-
-        if all([_is_match(c) for c in self.conditions.filter(attr__is_active=True)]):
-            # In this case, all recv_attrs are matched with configured TriggerCondition,
-            # then return corresponding TriggerAction.
-            return list(TriggerAction.objects.filter(condition=self))
-
-        else:
-            return []
+        return TriggerMatcher(TriggerParent.objects.filter(id=self.id)).get_actions(recv_attrs)
 
     def clear(self, *args: Any, **kwargs: Any) -> None:
         # delete TriggerActionValues, which are associated with TriggerAction instance
@@ -463,9 +452,14 @@ class TriggerCondition(models.Model):
 
         result = []
         for entry, entity_attr_ids in affected.values():
+            matcher = TriggerMatcher.get(entry.schema)
+            entity_schema = EntitySchema.get(entry.schema_id)
             recv_attrs = []
             for aid in entity_attr_ids:
-                ea = EntityAttr.objects.get(id=aid)
+                ea = entity_schema.attrs_by_id.get(aid)
+                if ea is None:
+                    # the EntityAttr has been deleted after looking up the values above
+                    continue
                 if ea.type & AttrType._ARRAY:
                     attr = entry.attrs.filter(schema_id=aid, is_active=True).first()
                     parent_attrv = attr.values.filter(is_latest=True).first() if attr else None
@@ -483,11 +477,7 @@ class TriggerCondition(models.Model):
                 else:
                     recv_attrs.append({"attr_id": aid, "value": None})
 
-            actions = [
-                a
-                for p in TriggerParent.objects.filter(entity=entry.schema)
-                for a in p.get_actions(recv_attrs)
-            ]
+            actions = matcher.get_actions(recv_attrs)
             if actions:
                 result.append((entry, actions))
         return result
@@ -533,15 +523,17 @@ class TriggerCondition(models.Model):
         # But in the APIv1, the "id" parameter in the recv_data variable means Attribute ID
         # of Entry. So, it's necessary to refer "entity_attr_id" parameter to be compatible
         # with both API versions.
+        matcher = TriggerMatcher.get(entity)
         if any(["entity_attr_id" in x for x in recv_data]):
-            # This is for APIv1
+            # This is for APIv1. Values of the EntityAttrs that no TriggerCondition refers to
+            # are skipped because they never affect the result.
             params = []
             for data in recv_data:
-                entity_attr = EntityAttr.objects.filter(id=data["entity_attr_id"]).first()
-                if entity_attr is None:
+                attr_type = matcher.attr_types.get(int(data["entity_attr_id"]))
+                if attr_type is None:
                     continue
 
-                if entity_attr.type & AttrType._NAMED and entity_attr.type & AttrType.OBJECT:
+                if attr_type & AttrType._NAMED and attr_type & AttrType.OBJECT:
                     # merge name and id value to the data parameter to be compatible with APIv2
                     # for naemd_object typed Attribute
                     v = [
@@ -557,18 +549,14 @@ class TriggerCondition(models.Model):
                             sorted(data["referral_key"], key=lambda x: x["index"]),
                         )
                     ]
-                    params.append({"attr_id": int(entity_attr.id), "value": v})
+                    params.append({"attr_id": int(data["entity_attr_id"]), "value": v})
                 else:
-                    params.append({"attr_id": int(entity_attr.id), "value": data["value"]})
+                    params.append({"attr_id": int(data["entity_attr_id"]), "value": data["value"]})
         else:
             # This is for APIv2
             params = [{"attr_id": int(x["id"]), "value": x["value"]} for x in recv_data]
 
-        actions = []
-        for parent_condition in TriggerParent.objects.filter(entity=entity):
-            actions += parent_condition.get_actions(params)
-
-        return actions
+        return matcher.get_actions(params)
 
 
 class TriggerAction(models.Model):
@@ -648,3 +636,94 @@ class TriggerActionValue(models.Model):
     bool_cond = models.BooleanField(default=False)
 
     # TODO: Add method to register value to Attribute when action is invoked
+
+
+class TriggerMatcher(object):
+    """
+    TriggerConditions and TriggerActions of TriggerParents that are loaded at once and
+    indexed by EntityAttr id, so that received attributes are matched with them without
+    any query.
+
+    When AIRONE["TRIGGER_CACHE_PROCESS_WIDE"] is set, the TriggerMatcher of each Entity is
+    kept in the process, tagged with a version that is stored in Django's cache. The signal
+    handlers in trigger.signals change the version whenever triggers are edited, which
+    invalidates the TriggerMatchers of every process that shares the cache backend.
+    """
+
+    def __init__(self, parents: QuerySet[TriggerParent]):
+        # (TriggerConditions, TriggerActions) of each TriggerParent
+        self.rules: list[tuple[list[TriggerCondition], list[TriggerAction]]] = []
+        # EntityAttr id -> indexes of the rules that have TriggerConditions of it
+        self.rule_indexes: dict[int, set[int]] = {}
+        # indexes of the rules that have no TriggerCondition, which are invoked by anything
+        self.unconditional_indexes: set[int] = set()
+        # EntityAttr id -> AttrType of the EntityAttrs that TriggerConditions refer to
+        self.attr_types: dict[int, int] = {}
+        # This is set when a TriggerCondition refers to a deleted Item. It would be matched
+        # again when the Item is restored, so this can't be kept.
+        self.is_volatile = False
+
+        parents = parents.order_by("id").prefetch_related(
+            Prefetch(
+                "conditions",
+                queryset=TriggerCondition.objects.filter(attr__is_active=True).select_related(
+                    "attr", "ref_cond"
+                ),
+            ),
+            Prefetch(
+                "actions", queryset=TriggerAction.objects.select_related("attr").order_by("id")
+            ),
+        )
+        for index, parent in enumerate(parents):
+            conditions = list(parent.conditions.all())
+            self.rules.append((conditions, list(parent.actions.all())))
+
+            if not conditions:
+                self.unconditional_indexes.add(index)
+
+            for condition in conditions:
+                self.rule_indexes.setdefault(condition.attr.id, set()).add(index)
+                self.attr_types[condition.attr.id] = condition.attr.type
+                if condition.ref_cond and not condition.ref_cond.is_active:
+                    self.is_volatile = True
+
+    @classmethod
+    def get(kls, entity: Entity) -> "TriggerMatcher":
+        return _matchers.get_or_load(
+            entity.id,
+            lambda: kls(TriggerParent.objects.filter(entity=entity)),
+            is_keepable=lambda x: not x.is_volatile,
+        )
+
+    def get_actions(self, recv_attrs: Sequence[Mapping[str, Any]]) -> list[TriggerAction]:
+        """
+        This returns TriggerActions of the TriggerParents whose TriggerConditions are all
+        matched with recv_attrs. The recv_attrs format should be compatible with APIv2 standard.
+        """
+        recv_values: dict[int, list[Any]] = {}
+        for attr_info in recv_attrs:
+            recv_values.setdefault(attr_info["attr_id"], []).append(attr_info["value"])
+
+        # only the rules that have TriggerConditions of the received attributes can be matched
+        indexes = set(self.unconditional_indexes)
+        for attr_id in recv_values:
+            indexes |= self.rule_indexes.get(attr_id, set())
+
+        def _is_match(condition: TriggerCondition) -> bool:
+            return any(
+                condition.is_match_condition(value) != condition.is_unmatch
+                for value in recv_values.get(condition.attr.id, [])
+            )
+
+        actions: list[TriggerAction] = []
+        for index in sorted(indexes):
+            (conditions, rule_actions) = self.rules[index]
+            if all([_is_match(c) for c in conditions]):
+                actions += rule_actions
+
+        return actions
+
+
+def invalidate_matchers() -> None:
+    """Discard TriggerMatchers of all processes. This is called when triggers are edited."""
+    _matchers.invalidate()
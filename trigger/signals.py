@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from entity.models import EntityAttr
+from entry.models import Entry
+
+from .models import (
+    TriggerAction,
+    TriggerActionValue,
+    TriggerCondition,
+    TriggerParent,
+    invalidate_matchers,
+)
+
+
+# These invalidate cached TriggerMatchers (see trigger.models.TriggerMatcher)
+@receiver(post_save, sender=TriggerParent)
+@receiver(post_save, sender=TriggerCondition)
+@receiver(post_save, sender=TriggerAction)
+@receiver(post_save, sender=TriggerActionValue)
+@receiver(post_save, sender=EntityAttr)
+@receiver(post_delete, sender=TriggerParent)
+@receiver(post_delete, sender=TriggerCondition)
+@receiver(post_delete, sender=TriggerAction)
+@receiver(post_delete, sender=TriggerActionValue)
+@receiver(post_delete, sender=EntityAttr)
+def invalidate_trigger_matchers_by_edit(sender: Any, **kwargs: Any) -> None:
+    if settings.AIRONE.get("TRIGGER_CACHE_PROCESS_WIDE", False):
+        invalidate_matchers()
+
+
+@receiver(post_save, sender=Entry)
+def invalidate_trigger_matchers_by_deleted_entry(
+    sender: type[Entry], instance: Entry, **kwargs: Any
+) -> None:
+    # TriggerConditions that refer to deleted Items are never matched
+    if (
+        settings.AIRONE.get("TRIGGER_CACHE_PROCESS_WIDE", False)
+        and not instance.is_active
+        and TriggerCondition.objects.filter(ref_cond=instance).exists()
+    ):
+        invalidate_matchers()
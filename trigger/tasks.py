@@ -28,3 +28,39 @@ def may_invoke_trigger(self: Any, job: Job) -> JobStatus:
         action.run(user, entry)
 
     return JobStatus.DONE
+
+
+@register_job_task(JobOperation.MAY_INVOKE_TRIGGERS)
+@app.task(bind=True)
+@may_schedule_until_job_is_ready
+def may_invoke_triggers(self: Any, job: Job) -> JobStatus | tuple[JobStatus, str, None]:
+    """
+    This is same as may_invoke_trigger() for each Entry that is carried by a JobBatch.
+    Triggers of the rest of Entries are invoked even when some of them fail, and the
+    failures are reported together.
+    """
+    user = User.objects.filter(id=job.user.id).first()
+    recv_entries = json.loads(job.params)["entries"]
+    entries = (
+        Entry.objects.filter(id__in=[x["id"] for x in recv_entries], is_active=True)
+        .select_related("schema")
+        .in_bulk()
+    )
+
+    assert user is not None
+    errors: list[str] = []
+    for recv_entry in recv_entries:
+        entry = entries.get(recv_entry["id"])
+        if entry is None:
+            continue
+
+        try:
+            for action in TriggerCondition.get_invoked_actions(entry.schema, recv_entry["attrs"]):
+                action.run(user, entry)
+        except Exception as e:
+            errors.append("%s: %s" % (entry.name, str(e)))
+
+    if errors:
+        return JobStatus.ERROR, "\n".join(errors), None
+
+    return JobStatus.DONE
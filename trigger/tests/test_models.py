@@ -1,7 +1,7 @@
 import json
 from unittest import mock
 
-from airone.lib.test import AironeTestCase
+from airone.lib.test import AironeTestCase, with_airone_settings
 from airone.lib.types import AttrType
 from entry.models import AttributeValue
 from trigger import tasks as trigger_tasks
@@ -1131,3 +1131,77 @@ class ModelTest(AironeTestCase):
         results = TriggerCondition.get_invoked_actions_on_delete(ref_entry_a)
 
         self.assertEqual(results, [])
+
+    @with_airone_settings({"TRIGGER_CACHE_PROCESS_WIDE": True})
+    def test_get_invoked_actions_with_cached_matcher(self):
+        str_attr = self.entity.attrs.get(name="str_trigger")
+        ref_attr = self.entity.attrs.get(name="ref_trigger")
+        str_action_attr = self.entity.attrs.get(name="str_action")
+        parent_condition = TriggerCondition.register(
+            self.entity,
+            [{"attr_id": str_attr.id, "cond": "test"}],
+            [{"attr_id": str_action_attr.id, "value": "changed"}],
+        )
+        TriggerCondition.register(
+            self.entity,
+            [{"attr_id": ref_attr.id, "cond": self.entry_refs[0]}],
+            [{"attr_id": str_action_attr.id, "value": "changed_by_ref"}],
+        )
+
+        def _get_action_values(recv_data):
+            return [
+                x.get_serializer_acceptable_value()
+                for x in TriggerCondition.get_invoked_actions(self.entity, recv_data)
+            ]
+
+        self.assertEqual(_get_action_values([{"id": str_attr.id, "value": "test"}]), ["changed"])
+
+        # compiled TriggerConditions are evaluated without any query
+        with self.assertNumQueries(0):
+            actions = TriggerCondition.get_invoked_actions(
+                self.entity,
+                [
+                    {"id": str_attr.id, "value": "test"},
+                    {"id": ref_attr.id, "value": self.entry_refs[0].id},
+                ],
+            )
+        self.assertEqual(len(actions), 2)
+
+        # the compiled TriggerConditions are invalidated when they're edited
+        parent_condition.clear()
+        parent_condition.update(
+            [{"attr_id": str_attr.id, "cond": "updated"}],
+            [{"attr_id": str_action_attr.id, "value": "changed"}],
+        )
+        self.assertEqual(_get_action_values([{"id": str_attr.id, "value": "test"}]), [])
+        self.assertEqual(_get_action_values([{"id": str_attr.id, "value": "updated"}]), ["changed"])
+
+        # a TriggerCondition never matches with the Item that it refers to after it's deleted
+        self.entry_refs[0].delete()
+        self.assertEqual(
+            _get_action_values([{"id": ref_attr.id, "value": self.entry_refs[0].id}]), []
+        )
+        self.entry_refs[0].restore()
+        self.assertEqual(
+            _get_action_values([{"id": ref_attr.id, "value": self.entry_refs[0].id}]),
+            ["changed_by_ref"],
+        )
+
+    @mock.patch("airone.lib.process_wide_cache.cache")
+    def test_get_invoked_actions_without_process_wide_setting(self, mock_cache):
+        str_attr = self.entity.attrs.get(name="str_trigger")
+        TriggerCondition.register(
+            self.entity,
+            [{"attr_id": str_attr.id, "cond": "test"}],
+            [{"attr_id": self.entity.attrs.get(name="str_action").id, "value": "changed"}],
+        )
+        str_attr.save()
+
+        actions = TriggerCondition.get_invoked_actions(
+            self.entity, [{"id": str_attr.id, "value": "test"}]
+        )
+        self.assertEqual(len(actions), 1)
+
+        # Django's cache isn't accessed unless TRIGGER_CACHE_PROCESS_WIDE is set
+        mock_cache.get_or_set.assert_not_called()
+        mock_cache.set.assert_not_called()
@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class UserConfig(AppConfig):
     name = "user"
+
+    def ready(self) -> None:
+        from . import signals
+
+        post_migrate.connect(signals.backfill_closure_rows, sender=self)
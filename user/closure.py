@@ -0,0 +1,147 @@
+"""Maintenance of the closure tables of Group and Role memberships.
+
+UserGroupClosure and UserRoleClosure materialise what User.belonging_groups() and
+User.belonging_roles() compute by walking Group hierarchy and Role memberships, so
+that the effective Roles of a User are a single indexed lookup on the hot path of
+User.has_permission(). The signal handlers in user.signals call update_closure()
+for the Users affected by each change of memberships, Groups or Roles.
+"""
+
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import Q
+
+from role.models import Role
+from user.models import User, UserGroupClosure, UserRoleClosure
+
+# The number of Users whose closure rows are rebuilt in a transaction
+REBUILD_CHUNK_SIZE = 500
+
+_GroupRows = dict[int, bool]
+_RoleRows = dict[int, tuple[bool, bool]]
+
+
+def _compute_rows(user: User) -> tuple[_GroupRows, _RoleRows]:
+    direct_group_ids = {g.id for g in user.airone_groups}
+    group_rows = {g.id: g.id in direct_group_ids for g in user.belonging_groups()}
+    role_rows = {x.role.id: (x.is_direct, x.is_admin) for x in user.belonging_roles()}
+
+    return (group_rows, role_rows)
+
+
+def _stored_rows(user_ids: Iterable[int]) -> dict[int, tuple[_GroupRows, _RoleRows]]:
+    rows: dict[int, tuple[_GroupRows, _RoleRows]] = {x: ({}, {}) for x in user_ids}
+    for user_id, group_id, is_direct in UserGroupClosure.objects.filter(
+        user__in=rows.keys()
+    ).values_list("user", "group", "is_direct"):
+        rows[user_id][0][group_id] = is_direct
+    for user_id, role_id, is_direct, is_admin in UserRoleClosure.objects.filter(
+        user__in=rows.keys()
+    ).values_list("user", "role", "is_direct", "is_admin"):
+        rows[user_id][1][role_id] = (is_direct, is_admin)
+
+    return rows
+
+
+def update_closure(user_ids: Iterable[int]) -> None:
+    """Recompute closure rows of the specified Users from their current memberships"""
+    users = list(User.objects.filter(id__in=set(user_ids)))
+    if not users:
+        return
+
+    group_closures: list[UserGroupClosure] = []
+    role_closures: list[UserRoleClosure] = []
+    for user in users:
+        (group_rows, role_rows) = _compute_rows(user)
+        group_closures += [
+            UserGroupClosure(user=user, group_id=group_id, is_direct=is_direct)
+            for (group_id, is_direct) in group_rows.items()
+        ]
+        role_closures += [
+            UserRoleClosure(user=user, role_id=role_id, is_direct=is_direct, is_admin=is_admin)
+            for (role_id, (is_direct, is_admin)) in role_rows.items()
+        ]
+
+    with transaction.atomic():
+        UserGroupClosure.objects.filter(user__in=users).delete()
+        UserRoleClosure.objects.filter(user__in=users).delete()
+        UserGroupClosure.objects.bulk_create(group_closures)
+        UserRoleClosure.objects.bulk_create(role_closures)
+
+
+def rebuild_closure() -> int:
+    """Recompute closure rows of all Users. This returns the number of processed Users."""
+    user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+    for index in range(0, len(user_ids), REBUILD_CHUNK_SIZE):
+        update_closure(user_ids[index : index + REBUILD_CHUNK_SIZE])
+
+    # rows of Users that no longer exist are removed by CASCADE
+    return len(user_ids)
+
+
+def backfill_closure() -> int:
+    """
+    Recompute closure rows of the Users who belong to some Groups or Roles but don't have
+    any rows (e.g. ones who exist before the closure tables). This returns their number.
+    """
+    user_ids = list(
+        User.objects.filter(
+            Q(groups__isnull=False) | Q(role__isnull=False) | Q(admin_role__isnull=False),
+            group_closures__isnull=True,
+            role_closures__isnull=True,
+        )
+        .order_by("id")
+        .distinct()
+        .values_list("id", flat=True)
+    )
+    for index in range(0, len(user_ids), REBUILD_CHUNK_SIZE):
+        update_closure(user_ids[index : index + REBUILD_CHUNK_SIZE])
+
+    return len(user_ids)
+
+
+def check_closure() -> list[int]:
+    """This returns IDs of Users whose closure rows differ from their current memberships"""
+    inconsistent_user_ids: list[int] = []
+    user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+    for index in range(0, len(user_ids), REBUILD_CHUNK_SIZE):
+        chunk = user_ids[index : index + REBUILD_CHUNK_SIZE]
+        stored = _stored_rows(chunk)
+        for user in User.objects.filter(id__in=chunk).order_by("id"):
+            if _compute_rows(user) != stored[user.id]:
+                inconsistent_user_ids.append(user.id)
+
+    return inconsistent_user_ids
+
+
+def get_users_of_groups(group_ids: Iterable[int]) -> set[int]:
+    """
+    This returns IDs of Users who belong to the Groups, or to any of their hierarchical
+    inferior Groups, according to the closure rows and the direct memberships.
+    """
+    group_ids = set(group_ids)
+    if not group_ids:
+        return set()
+
+    return set(
+        UserGroupClosure.objects.filter(group__in=group_ids).values_list("user", flat=True)
+    ) | set(User.groups.through.objects.filter(group__in=group_ids).values_list("user", flat=True))
+
+
+def get_users_of_role(role_id: int) -> set[int]:
+    """This returns IDs of Users who belong to the Role now or according to closure rows"""
+    role = Role.objects.filter(id=role_id).first()
+    user_ids = set(UserRoleClosure.objects.filter(role=role_id).values_list("user", flat=True))
+    if role is None:
+        return user_ids
+
+    group_ids = list(role.groups.values_list("id", flat=True)) + list(
+        role.admin_groups.values_list("id", flat=True)
+    )
+    return (
+        user_ids
+        | set(role.users.values_list("id", flat=True))
+        | set(role.admin_users.values_list("id", flat=True))
+        | get_users_of_groups(group_ids)
+    )
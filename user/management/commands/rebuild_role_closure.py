@@ -0,0 +1,33 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from user.closure import check_closure, rebuild_closure
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild closure tables of Group and Role memberships (UserGroupClosure and "
+        "UserRoleClosure) from the current memberships."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report Users whose closure rows are inconsistent, without rebuilding",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["check"]:
+            user_ids = check_closure()
+            if user_ids:
+                raise CommandError(
+                    "Closure rows of %d user(s) are inconsistent: %s"
+                    % (len(user_ids), ", ".join(str(x) for x in user_ids))
+                )
+            self.stdout.write("Closure rows of all users are consistent")
+            return
+
+        count = rebuild_closure()
+        self.stdout.write("Rebuilt closure rows of %d user(s)" % count)
@@ -11,8 +11,9 @@ from django.db.models import QuerySet
 from rest_framework.authtoken.models import Token
 
 from airone.lib.acl import ACLType
+from airone.lib.permission_cache import get_permission_cache
 from group.models import Group
-from role.models import Role
+from role.models import HistoricalPermission, Role
 
 if TYPE_CHECKING:
     from acl.models import ACLBase
@@ -161,6 +162,14 @@ class User(AbstractUser):
 
         return list(belonging.values())
 
+    def effective_group_ids(self) -> list[int]:
+        """This returns IDs of the same Groups with belonging_groups() from UserGroupClosure"""
+        return list(self.group_closures.values_list("group", flat=True))
+
+    def effective_roles(self) -> "QuerySet[Role]":
+        """This returns the same Roles with belonging_roles() from UserRoleClosure"""
+        return Role.objects.filter(user_closures__user=self)
+
     def has_permission(self, target_obj: "ACLBase", permission_level: ACLType | int | None) -> bool:
         # A bypass processing to rapidly return.
         # This condition is effective when the public objects are majority.
@@ -179,6 +188,25 @@ class User(AbstractUser):
         if self.is_readonly and permission_level > ACLType.Readable:
             return False
 
+        # Reuse the decision that has already been made in the current scope
+        # (e.g. for the parent Entity of every Entry in a search result).
+        cache = get_permission_cache()
+        if cache is None:
+            return self._has_permission(target_obj, permission_level)
+
+        key = (
+            self.id,
+            target_obj.id,
+            permission_level.id,
+            target_obj.is_public,
+            target_obj.default_permission,
+        )
+        if key not in cache.decisions:
+            cache.decisions[key] = self._has_permission(target_obj, permission_level)
+            cache.acl_flags[target_obj.id] = (target_obj.is_public, target_obj.default_permission)
+        return cache.decisions[key]
+
+    def _has_permission(self, target_obj: "ACLBase", permission_level: ACLType) -> bool:
         # doesn't permit, access to the children's objects are also not permitted.
         if (
             isinstance(target_obj, import_module("entry.models").Entry)
@@ -209,11 +237,15 @@ class User(AbstractUser):
 
         # This checks Roles that this user and groups, which this user belongs to,
         # have permission of specified permission_level
-        for belonging in self.belonging_roles():
-            if belonging.role.is_permitted(target_obj, permission_level):
-                return True
+        cache = get_permission_cache()
+        if cache is not None:
+            return permission_level.id <= cache.get_role_permissions(self).get(target_obj.id, 0)
 
-        return False
+        return HistoricalPermission.objects.filter(
+            roles__user_closures__user=self,
+            object_permission__object_id=target_obj.id,
+            object_permission__acl_type__gte=permission_level.id,
+        ).exists()
 
     def is_permitted_to_change(
         self,
@@ -258,7 +290,8 @@ class User(AbstractUser):
             return True
 
         admin_roles = Role.objects.filter(
-            permissions__codename=f"{target_obj.id}.{ACLType.Full.id}"
+            permissions__object_permission__object_id=target_obj.id,
+            permissions__object_permission__acl_type=ACLType.Full.id,
         )
         if (
             len(
@@ -307,6 +340,42 @@ class User(AbstractUser):
         return History.register(self, target, History.DEL_ENTRY)
 
 
+class UserGroupClosure(models.Model):
+    """This is a Group that a User belongs to, including hierarchical superior ones.
+
+    Rows are the same with User.belonging_groups() and are kept updated by user.closure
+    whenever memberships or the hierarchy of Groups change.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="group_closures")
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="user_closures")
+    # True when the User is registered to the Group itself
+    is_direct = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "group"], name="unique_user_group_closure")
+        ]
+
+
+class UserRoleClosure(models.Model):
+    """This is an active Role that a User belongs to in any of the paths of BelongingRole.
+
+    Rows are the same with User.belonging_roles() and are kept updated by user.closure
+    whenever memberships of Roles or Groups change.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="role_closures")
+    role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name="user_closures")
+    is_direct = models.BooleanField(default=False)
+    is_admin = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "role"], name="unique_user_role_closure")
+        ]
+
+
 class History(models.Model):
     """
     These constants describe operations of History and bit-map construct following
@@ -0,0 +1,110 @@
+from typing import Any
+
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from api_v1.auth import invalidate_token_auth_cache
+from group.models import Group
+from role.models import Role
+
+from .closure import backfill_closure, get_users_of_groups, get_users_of_role, update_closure
+from .models import User
+
+# These keep closure rows of Group and Role memberships (see user.closure) updated.
+#
+# NOTE:
+#   Closure rows of the affected Users still describe the state before each change when
+#   these are called. So the Users who have left a Group or a Role (e.g. by clear()) are
+#   also found from them.
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def update_closure_by_group_membership(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    if not action.startswith("post_"):
+        return
+
+    if reverse:
+        # Users were added to or removed from the Group
+        update_closure(get_users_of_groups([instance.id]) | (pk_set or set()))
+    else:
+        update_closure([instance.id])
+
+
+@receiver(m2m_changed, sender=Role.users.through)
+@receiver(m2m_changed, sender=Role.admin_users.through)
+def update_closure_by_role_users(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    if not action.startswith("post_"):
+        return
+
+    if reverse:
+        update_closure([instance.id])
+    else:
+        update_closure(get_users_of_role(instance.id) | (pk_set or set()))
+
+
+@receiver(m2m_changed, sender=Role.groups.through)
+@receiver(m2m_changed, sender=Role.admin_groups.through)
+def update_closure_by_role_groups(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    if not action.startswith("post_"):
+        return
+
+    if reverse:
+        update_closure(get_users_of_groups([instance.id]))
+    else:
+        update_closure(get_users_of_role(instance.id) | get_users_of_groups(pk_set or set()))
+
+
+@receiver(post_save, sender=Group)
+def update_closure_by_group(sender: Any, instance: Group, created: bool, **kwargs: Any) -> None:
+    # A new Group has neither members nor inferior Groups yet
+    if not created:
+        update_closure(get_users_of_groups([instance.id]))
+
+
+@receiver(post_save, sender=Role)
+def update_closure_by_role(sender: Any, instance: Role, created: bool, **kwargs: Any) -> None:
+    if not created:
+        update_closure(get_users_of_role(instance.id))
+
+
+@receiver(pre_delete, sender=Group)
+def keep_users_of_deleting_group(sender: Any, instance: Group, **kwargs: Any) -> None:
+    # Closure rows of the Group are removed by CASCADE before post_delete
+    instance._closure_user_ids = get_users_of_groups([instance.id])  # type: ignore[attr-defined]
+
+
+@receiver(post_delete, sender=Group)
+def update_closure_by_deleted_group(sender: Any, instance: Group, **kwargs: Any) -> None:
+    update_closure(getattr(instance, "_closure_user_ids", set()))
+
+
+def backfill_closure_rows(sender: AppConfig, **kwargs: Any) -> None:
+    # This is connected to post_migrate to fill closure rows of the existing Users
+    backfill_closure()
+
+
+# These invalidate Users and Tokens that are cached by api_v1.auth.AironeTokenAuth
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token_auth_by_token(sender: Any, instance: Token, **kwargs: Any) -> None:
+    invalidate_token_auth_cache(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_token_auth_by_user(
+    sender: Any, instance: User, created: bool, **kwargs: Any
+) -> None:
+    # e.g. token_lifetime or is_active of the User is changed, or the User is deleted
+    if not created:
+        for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+            invalidate_token_auth_cache(key)
@@ -0,0 +1,103 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from group.models import Group
+from role.models import Role
+from user.closure import backfill_closure, check_closure, rebuild_closure
+from user.models import User, UserGroupClosure, UserRoleClosure
+
+
+class ClosureTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user")
+        self.parent_group = Group.objects.create(name="parent_group")
+        self.child_group = Group.objects.create(name="child_group", parent_group=self.parent_group)
+        self.role = Role.objects.create(name="role")
+
+    def assertClosure(self, user, group_names, role_names):
+        self.assertEqual(check_closure(), [])
+        self.assertEqual(
+            sorted(Group.objects.get(id=x).name for x in user.effective_group_ids()),
+            sorted(group_names),
+        )
+        self.assertEqual(sorted(x.name for x in user.effective_roles()), sorted(role_names))
+
+    def test_closure_follows_memberships(self):
+        # joining a Group also joins its hierarchical superior Groups
+        self.user.groups.add(self.child_group)
+        self.assertClosure(self.user, ["child_group", "parent_group"], [])
+
+        # Roles of the superior Groups are also effective
+        self.role.admin_groups.add(self.parent_group)
+        self.assertClosure(self.user, ["child_group", "parent_group"], ["role"])
+        self.assertTrue(UserRoleClosure.objects.get(user=self.user, role=self.role).is_admin)
+
+        # changing the hierarchy is reflected to the members of inferior Groups
+        self.child_group.parent_group = None
+        self.child_group.save()
+        self.assertClosure(self.user, ["child_group"], [])
+
+        # registering the User to the Role directly
+        self.role.users.add(self.user)
+        self.assertClosure(self.user, ["child_group"], ["role"])
+        self.assertTrue(UserRoleClosure.objects.get(user=self.user, role=self.role).is_direct)
+
+        # inactive Roles are not effective
+        self.role.delete()
+        self.assertClosure(self.user, ["child_group"], [])
+
+    def test_closure_follows_clear_and_group_deletion(self):
+        other_user = User.objects.create(username="other_user")
+        self.child_group.user_set.add(self.user, other_user)
+        self.role.groups.add(self.child_group)
+        self.assertClosure(self.user, ["child_group", "parent_group"], ["role"])
+        self.assertClosure(other_user, ["child_group", "parent_group"], ["role"])
+
+        self.role.groups.clear()
+        self.assertClosure(self.user, ["child_group", "parent_group"], [])
+
+        self.child_group.user_set.clear()
+        self.assertClosure(self.user, [], [])
+        self.assertClosure(other_user, [], [])
+
+        self.user.groups.add(self.child_group)
+        self.child_group.delete()
+        self.assertClosure(self.user, [], [])
+
+    def test_check_and_rebuild_closure(self):
+        self.user.groups.add(self.child_group)
+        self.role.users.add(self.user)
+
+        # break closure rows behind the signals
+        UserGroupClosure.objects.filter(user=self.user, group=self.parent_group).delete()
+        UserRoleClosure.objects.filter(user=self.user).update(is_admin=True)
+        self.assertEqual(check_closure(), [self.user.id])
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_role_closure", "--check", stdout=StringIO())
+
+        self.assertEqual(rebuild_closure(), User.objects.count())
+        self.assertClosure(self.user, ["child_group", "parent_group"], ["role"])
+
+        # rebuild by the management command
+        UserRoleClosure.objects.filter(user=self.user).delete()
+        call_command("rebuild_role_closure", stdout=StringIO())
+        self.assertClosure(self.user, ["child_group", "parent_group"], ["role"])
+
+    def test_backfill_closure(self):
+        other_user = User.objects.create(username="other_user")
+        self.user.groups.add(self.child_group)
+        self.role.users.add(self.user)
+
+        # Users who have memberships but no closure rows (e.g. ones before the tables)
+        UserGroupClosure.objects.all().delete()
+        UserRoleClosure.objects.all().delete()
+
+        self.assertEqual(backfill_closure(), 1)
+        self.assertClosure(self.user, ["child_group", "parent_group"], ["role"])
+        self.assertClosure(other_user, [], [])
+
+        # nothing is left to be filled
+        self.assertEqual(backfill_closure(), 0)
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.conf import settings
 from django.db import connection
 from django.test import TestCase
@@ -6,6 +8,7 @@ from rest_framework.authtoken.models import Token
 from social_django.models import UserSocialAuth
 
 from airone.lib.acl import ACLType
+from airone.lib.permission_cache import permission_cache
 from airone.lib.types import AttrType
 from entity.models import Entity, EntityAttr
 from entry.models import Entry
@@ -174,6 +177,73 @@ class ModelTest(TestCase):
         role.admin_users.add(user)
         self.assertTrue(user.has_permission(entity, ACLType.Full))
 
+    def test_has_permission_with_permission_cache(self):
+        user = User.objects.create(username="user")
+        group = Group.objects.create(name="group")
+        role = Role.objects.create(name="role")
+        entity = Entity.objects.create(
+            name="entity", created_user=user, is_public=False, default_permission=ACLType.Nothing.id
+        )
+        entries = [
+            Entry.objects.create(name="e-%d" % i, schema=entity, created_user=user, is_public=False)
+            for i in range(5)
+        ]
+        entity.writable.roles.add(role)
+        for entry in entries[:3]:
+            entry.writable.roles.add(role)
+
+        with permission_cache():
+            # user doesn't belong to the role yet
+            self.assertFalse(user.has_permission(entries[0], ACLType.Readable))
+
+            # membership changes are reflected through signals
+            user.groups.add(group)
+            role.groups.add(group)
+            self.assertTrue(user.has_permission(entries[0], ACLType.Writable))
+
+            # decisions for the rest of entries don't need to resolve roles again
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(
+                    [user.has_permission(x, ACLType.Writable) for x in entries],
+                    [True, True, True, False, False],
+                )
+            self.assertEqual(len(ctx.captured_queries), 0)
+
+            # permission changes of roles are reflected through signals
+            entity.writable.roles.remove(role)
+            self.assertFalse(user.has_permission(entries[0], ACLType.Writable))
+
+            # and so are ACL changes of parent objects
+            entity.is_public = True
+            entity.save()
+            self.assertTrue(user.has_permission(entries[0], ACLType.Writable))
+
+            # but saving objects without changing their ACL doesn't discard decisions
+            entries[0].save()
+            with self.assertNumQueries(0):
+                self.assertTrue(user.has_permission(entries[0], ACLType.Writable))
+
+        # decisions are same with the ones without cache
+        for entry in entries:
+            self.assertEqual(
+                user.has_permission(entry, ACLType.Writable),
+                entry.id in [x.id for x in entries[:3]],
+            )
+
+    @patch("airone.lib.process_wide_cache.cache")
+    def test_permission_cache_without_process_wide_setting(self, mock_cache):
+        user = User.objects.create(username="user")
+        role = Role.objects.create(name="role")
+        entity = Entity.objects.create(name="entity", created_user=user, is_public=False)
+
+        with permission_cache():
+            role.users.add(user)
+            self.assertFalse(user.has_permission(entity, ACLType.Readable))
+
+        # Django's cache isn't accessed unless PERMISSION_CACHE_PROCESS_WIDE is set
+        mock_cache.get_or_set.assert_not_called()
+        mock_cache.set.assert_not_called()
+
     def test_belonging_roles(self):
         # This checks all the four paths (member/admin x direct/via-group) are
         # collected, and that hierarchical superior groups are traversed.